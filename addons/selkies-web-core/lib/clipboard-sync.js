@@ -96,13 +96,15 @@ export async function readLocalClipboard(binaryEnabled) {
  * Multipart server->client clipboard download state, shared by both
  * transports. begin() arms a transfer, push() accumulates base64 chunks while
  * tracking the decoded byte count incrementally (nothing decodes on the main
- * thread until the caller assembles), and assemble() joins the chunks and
- * resets. A truncated stream must never be delivered as content, so callers
- * compare receivedSize against totalSize themselves — before assembling, or
- * against the decoded byteLength after — and discard on a mismatch.
+ * thread until the caller assembles), pushBytes() accumulates the raw chunks
+ * of a binary-framed transfer, and assemble() joins the chunks and resets. A
+ * truncated stream must never be delivered as content, so callers compare
+ * receivedSize against totalSize themselves — before assembling, or against
+ * the decoded byteLength after — and discard on a mismatch.
  */
 export function createMultipartClipboardState() {
     let chunks = [];
+    let rawChunks = [];
     let mimeType = null;
     let totalSize = 0;
     let receivedSize = 0;
@@ -117,6 +119,7 @@ export function createMultipartClipboardState() {
     return {
         begin(mime, total) {
             chunks = [];
+            rawChunks = [];
             mimeType = mime;
             totalSize = total;
             receivedSize = 0;
@@ -127,15 +130,34 @@ export function createMultipartClipboardState() {
             chunks.push(b64);
             receivedSize += base64DecodedSize(b64);
         },
-        /** Join the accumulated base64 chunks and reset; null when no transfer is in progress. */
+        /** Accumulate one raw chunk (an ArrayBuffer the caller hands over). */
+        pushBytes(buffer) {
+            if (!inProgress) return;
+            rawChunks.push(buffer);
+            receivedSize += buffer.byteLength;
+        },
+        /**
+         * Join the accumulated chunks and reset; null when no transfer is in
+         * progress. A binary-framed transfer yields `bytes` and a null `base64`.
+         */
         assemble() {
             if (!inProgress) return null;
-            const result = { base64: chunks.join(''), mimeType, totalSize };
+            let bytes = null;
+            if (rawChunks.length) {
+                bytes = new Uint8Array(receivedSize);
+                let offset = 0;
+                for (const chunk of rawChunks) {
+                    bytes.set(new Uint8Array(chunk), offset);
+                    offset += chunk.byteLength;
+                }
+            }
+            const result = { base64: bytes ? null : chunks.join(''), bytes, mimeType, totalSize };
             this.reset();
             return result;
         },
         reset() {
             chunks = [];
+            rawChunks = [];
             mimeType = null;
             totalSize = 0;
             receivedSize = 0;
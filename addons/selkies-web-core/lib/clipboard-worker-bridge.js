@@ -75,6 +75,17 @@ export class ClipboardWorkerBridge {
             this.worker.postMessage({ id, action: 'DECODE_FROM_B64', payload: base64String, mimeType });
         });
     }
+
+    // decode() for an assembled multipart download: a binary-framed transfer
+    // already holds raw bytes, so only text needs a (UTF-8) decode and the
+    // worker round trip is skipped; base64 transfers go to the worker as before.
+    async decodeAssembled({ base64, bytes, mimeType }) {
+        if (bytes === null) return this.decode(base64, mimeType);
+        if (mimeType === 'text/plain') {
+            return { result: new TextDecoder().decode(bytes), mimeType, byteLength: bytes.byteLength };
+        }
+        return { result: bytes.buffer, mimeType, byteLength: bytes.byteLength };
+    }
 }
 
 // Base64 one clipboard byte-run off the main thread. A fresh slice gives the
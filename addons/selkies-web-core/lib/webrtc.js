@@ -457,6 +457,9 @@ export class WebRTCClient {
 			if (typeof CompressionStream !== 'undefined') {
 				this._send_channel.send('_gz,1');
 			}
+			// Binary clipboard framing: the server then sends clipboard payloads
+			// as raw 0x06 messages instead of base64 JSON chunks.
+			this._send_channel.send('_cb,1');
 			if (this.ondatachannelopen !== null)
 				this.ondatachannelopen();
 		};
@@ -505,6 +508,14 @@ export class WebRTCClient {
 				}).catch((e) => this._setError("failed to handle data channel message: " + e));
 				return;
 			}
+			if (head[0] === 0x06) {
+				// Raw clipboard chunk between clipboard-msg-start and
+				// clipboard-msg-end: routed in order like the JSON chunk it replaces.
+				const msg = { type: 'clipboard-msg-data', data: { bytes: event.data.slice(1) } };
+				this._recvQueue = this._recvQueue.then(() => this._routeDataChannelMessage(msg))
+					.catch((e) => this._setError("failed to handle data channel message: " + e));
+				return;
+			}
 			this._setError("unexpected binary data channel message");
 			return;
 		}
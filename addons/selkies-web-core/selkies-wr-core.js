@@ -1850,7 +1850,11 @@ export default function webrtc() {
 				console.log(`Starting multi-part download: ${mimeType}, expected raw size: ${msg.data.total_size}`);
 				return { isMultipart: true, mimeType, content: null };
 			case "clipboard-msg-data":
-				multipartClipboard.push(msg.data.content);
+				if (msg.data.bytes) {
+					multipartClipboard.pushBytes(msg.data.bytes);
+				} else {
+					multipartClipboard.push(msg.data.content);
+				}
 				return { isMultipart: true, mimeType, content: null };
 			case "clipboard-msg-end":
 				if (!multipartClipboard.inProgress) {
@@ -1858,9 +1862,8 @@ export default function webrtc() {
 				}
 				const assembled = multipartClipboard.assemble();
 				mimeType = assembled.mimeType;
-				const fullBase64 = assembled.base64;
 				try {
-					const { result, byteLength } = await clipboardWorker.decode(fullBase64, mimeType);
+					const { result, byteLength } = await clipboardWorker.decodeAssembled(assembled);
 					if (byteLength !== assembled.totalSize) {
 						console.warn(`Size mismatch! Expected ${assembled.totalSize}, got ${byteLength}`);
 						return { isMultipart: false, mimeType, content: null };
@@ -4297,6 +4297,9 @@ function initWebsockets() {
     if (typeof DecompressionStream !== 'undefined') {
       try { websocket.send('_gz,1'); } catch (e) { /* handshake is best-effort */ }
     }
+    // Advertise binary clipboard framing: the server then sends clipboard
+    // payloads as raw 0x06 frames instead of base64 text chunks.
+    try { websocket.send('_cb,1'); } catch (e) { /* handshake is best-effort */ }
     window.postMessage({ type: 'trackpadModeUpdate', enabled: trackpadMode }, window.location.origin);
     if (!isSharedMode) {
       const settingsPrefix = `${storageAppName}_`;
@@ -5286,8 +5289,9 @@ function initWebsockets() {
                     // locally (consumed before the async decode so message order
                     // still defines which payload settles the fetch).
                     const isInitClipboardFetch = consumeInitClipboardFetch();
-                    const { base64: fullBase64, mimeType: mpMime } = multipartClipboard.assemble();
-                    clipboardWorker.decode(fullBase64, mpMime).then(({ result }) => {
+                    const assembled = multipartClipboard.assemble();
+                    const mpMime = assembled.mimeType;
+                    clipboardWorker.decodeAssembled(assembled).then(({ result }) => {
                         if (mpMime === 'text/plain') {
                             const text = result;
                             // Cache-settle check happens before resolveServer
@@ -5529,6 +5533,17 @@ function initWebsockets() {
         });
         return;
       }
+      if (d.byteLength >= 1 && new Uint8Array(d, 0, 1)[0] === 0x06) {
+        // Raw clipboard chunk between clipboard_start and clipboard_finish:
+        // control order, so it waits behind any pending inflation too.
+        const chunk = d.slice(1);
+        if (__wsGzPending > 0) {
+          __wsCtrlChain = __wsCtrlChain.then(() => multipartClipboard.pushBytes(chunk));
+        } else {
+          multipartClipboard.pushBytes(chunk);
+        }
+        return;
+      }
       // Media frame: dispatch immediately (keeps the video/audio hot path sync).
       __rawWsMessage(event);
       return;
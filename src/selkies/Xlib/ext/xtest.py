@@ -19,6 +19,8 @@
 #    Suite 330,
 #    Boston, MA 02111-1307 USA
 
+import struct
+
 from .. import X
 from ..protocol import rq
 
@@ -90,17 +92,63 @@ class FakeInput(rq.Request):
                          rq.Pad(8)
                          )
 
+# FakeInput is fixed-size with no variable fields, so it is packed straight
+# from one precompiled struct instead of through FakeInput._request. Input is
+# the hottest request this library sends; the generic path allocates a
+# Request, a keyword dict and a pack-item list per event.
+_fake_input = struct.Struct('=BBHBB2xII8xhh8x')
+_FAKE_INPUT_LENGTH = _fake_input.size // 4
+_root = rq.Window('root')
+
+
+class _RawRequests(object):
+    """Pre-encoded requests without replies, queued like one rq.Request."""
+
+    __slots__ = ('_binary', '_serial')
+
+    def __init__(self, binary):
+        self._binary = binary
+        self._serial = None
+
+
+def _queue_raw(display, binary, count):
+    # Same bookkeeping as Display.send_request, with the serial advanced once
+    # per request in `binary` so later replies still match their sequence.
+    if display.socket_error:
+        raise display.socket_error
+    req = _RawRequests(binary)
+    display.request_queue_lock.acquire()
+    req._serial = display.request_serial
+    display.request_serial = (display.request_serial + count) % 65536
+    display.request_queue.append((req, False))
+    display.request_queue_lock.release()
+
+
 def fake_input(self, event_type, detail = 0, time = X.CurrentTime,
                root = X.NONE, x = 0, y = 0):
 
-    FakeInput(display = self.display,
-              opcode = self.display.get_extension_major(extname),
-              event_type = event_type,
-              detail = detail,
-              time = time,
-              root = root,
-              x = x,
-              y = y)
+    display = self.display
+    _queue_raw(display,
+               _fake_input.pack(display.get_extension_major(extname), 2,
+                                _FAKE_INPUT_LENGTH, event_type, detail, time,
+                                _root.check_value(root), x, y),
+               1)
+
+def fake_input_batch(self, events):
+    """Queue several FakeInput requests as one write.
+
+    Each event is an (event_type, detail, x, y) tuple with root NONE and
+    CurrentTime; for motion, detail is True for a relative move. Like
+    fake_input, nothing is sent until the next flush() or sync().
+    """
+    display = self.display
+    opcode = display.get_extension_major(extname)
+    pack = _fake_input.pack
+    binary = b''.join([pack(opcode, 2, _FAKE_INPUT_LENGTH, event_type, detail,
+                            X.CurrentTime, X.NONE, x, y)
+                       for event_type, detail, x, y in events])
+    if binary:
+        _queue_raw(display, binary, len(binary) // _fake_input.size)
 
 class GrabControl(rq.Request):
     _request = rq.Struct(rq.Card8('opcode'),
@@ -119,4 +167,5 @@ def init(disp, info):
     disp.extension_add_method('display', 'xtest_get_version', get_version)
     disp.extension_add_method('window', 'xtest_compare_cursor', compare_cursor)
     disp.extension_add_method('display', 'xtest_fake_input', fake_input)
+    disp.extension_add_method('display', 'xtest_fake_input_batch', fake_input_batch)
     disp.extension_add_method('display', 'xtest_grab_control', grab_control)
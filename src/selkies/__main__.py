@@ -18,14 +18,19 @@ import asyncio
 import logging
 
 from .settings import settings
-from .webrtc_mode import WebRTCService
 from .selkies import DataStreamingServer
-from .stream_server import CentralizedStreamServer
+from .stream_server import BaseStreamingService, CentralizedStreamServer
 
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# The paths WebRTCService.register_routes adds, reserved before webrtc_mode is
+# imported so a probe of the signaling endpoint still gets its 409 while the
+# server streams over WebSockets. tests/unit/test_lazy_services.py checks they
+# match that method.
+WEBRTC_ROUTES = ("/api/webrtc/signaling{slash:/?}", "/api/ws", "/api/turn")
+
 
 async def wait_for_app_ready(ready_file: str, app_wait_ready: bool = False) -> None:
     """Wait for the streaming app's ready signal.
@@ -97,7 +102,15 @@ async def run() -> None:
 
     server = CentralizedStreamServer(settings)
 
-    server.register_service("webrtc", WebRTCService(server))
+    # The WebRTC stack (aiortc-derived transport, PyAV, cryptography, SRTP) is
+    # only imported on the first switch into it. The websockets service stays
+    # eager: webrtc_mode imports its module anyway, and /api/tokens must answer
+    # in either mode.
+    def build_webrtc() -> BaseStreamingService:
+        from .webrtc_mode import WebRTCService
+        return WebRTCService(server)
+
+    server.register_service("webrtc", build_webrtc, routes=WEBRTC_ROUTES)
     server.register_service("websockets", DataStreamingServer(server))
 
     logger.info(f"Initiating server with {settings.mode} mode")
@@ -0,0 +1,286 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Adaptive bitrate for the websockets transport's shared encoders.
+
+In websockets mode every viewer of a display decodes the same encoder output,
+so the only per-client lever is the video relay's skip-ahead. A viewer whose
+link cannot carry the stream overflows its relay budget, loses its backlog and
+waits for a keyframe. That is a visible freeze, and it repeats every few
+seconds for as long as the link stays short. This controller instead steers
+the shared encoder's bitrate to what the slowest active consumer sustains,
+between a configured floor and the display's configured bitrate.
+
+Each consumer is sampled once per backpressure tick from its relay's
+cumulative counters: bytes delivered, seconds spent with a non-empty backlog,
+and skip-ahead drops. The display owner also reports its ACK round-trip time.
+A relay that stayed busy for most of the interval is link-limited, and what it
+drained is its sustainable rate. A round trip still growing well past its own
+baseline means frames are queueing past the socket buffer, where the relay
+cannot see them.
+
+Hysteresis keeps the stream steady. A step down needs the shortfall on
+consecutive ticks and lands below the slowest rate with headroom. A step up
+needs every consumer keeping up for a hold period and climbs by a fixed factor
+toward the ceiling; each step down doubles that hold, so probing a link that
+keeps refusing more rate backs off. Changes of a few percent are not applied
+at all.
+
+With a low rendition running (a second, lighter encode of the same display),
+RenditionRouter applies the same shortfall test per viewer instead: a viewer
+short of the main stream moves to the low one, and moves back after keeping
+up for the hold, which doubles after every failed return.
+"""
+
+from typing import Dict, Hashable, NamedTuple, Optional
+
+# A relay busy for at least this share of the interval is link-limited.
+BUSY_FRACTION = 0.8
+# A link-limited consumer draining below this share of the stream rate is
+# short of it.
+SHORTFALL_FRACTION = 0.9
+# Round-trip growth over the consumer's baseline that counts as queueing.
+RTT_QUEUE_MS = 250.0
+# How fast the round-trip baseline follows a sustained rise (per tick), so
+# a route change does not read as congestion forever.
+RTT_BASELINE_DRIFT = 0.02
+# Consecutive short ticks before stepping down.
+DOWN_TICKS = 2
+# A step down lands this far below the slowest consumer's rate...
+DOWN_HEADROOM = 0.85
+# ...but never below this share of the current bitrate in one step.
+MAX_DOWN_STEP = 0.5
+# Seconds every consumer must keep up (and since the last change) before a
+# step up. Each step down doubles the hold, up to the maximum, so a probe
+# that keeps failing against the same link is retried less and less often;
+# reaching the ceiling resets it.
+UP_HOLD_S = 8.0
+UP_HOLD_MAX_S = 64.0
+UP_STEP = 1.15
+# Relative changes below this are not applied.
+MIN_CHANGE = 0.03
+
+
+class ConsumerSample(NamedTuple):
+    """Cumulative delivery counters of one consumer's relay.
+
+    Attributes:
+        sent_bytes: Bytes written to the socket.
+        busy_s: Seconds the relay had data waiting or in flight.
+        drops: Skip-ahead drops (budget overflows).
+        rtt_ms: Smoothed ACK round trip, for the display owner only.
+    """
+
+    sent_bytes: int
+    busy_s: float
+    drops: int
+    rtt_ms: Optional[float] = None
+
+
+class _Consumer:
+    __slots__ = ("sample", "time", "rtt_baseline")
+
+    def __init__(self, sample: ConsumerSample, now: float) -> None:
+        self.sample = sample
+        self.time = now
+        self.rtt_baseline: Optional[float] = None
+
+
+def _shortfall(consumer: _Consumer, sample: ConsumerSample,
+               current_kbps: float, now: float) -> Optional[float]:
+    """The consumer's sustainable rate in kbps if it is short of the stream,
+    else None."""
+    elapsed = now - consumer.time
+    if elapsed <= 0:
+        return None
+    prev = consumer.sample
+    rate_kbps = (sample.sent_bytes - prev.sent_bytes) * 8 / 1000 / elapsed
+    limited = sample.busy_s - prev.busy_s >= elapsed * BUSY_FRACTION
+    dropped = sample.drops > prev.drops
+    shortfall = None
+    if dropped or (limited and rate_kbps < current_kbps * SHORTFALL_FRACTION):
+        shortfall = min(rate_kbps, current_kbps * SHORTFALL_FRACTION)
+    rtt = sample.rtt_ms
+    if rtt:
+        baseline = consumer.rtt_baseline
+        if baseline is None or rtt < baseline:
+            consumer.rtt_baseline = rtt
+        else:
+            # Only a still-growing queue: one that drains after a step
+            # down must not keep stepping down until it is empty.
+            if rtt > baseline + RTT_QUEUE_MS and prev.rtt_ms and rtt > prev.rtt_ms:
+                queued = current_kbps * SHORTFALL_FRACTION
+                shortfall = queued if shortfall is None else min(shortfall, queued)
+            consumer.rtt_baseline = baseline + (rtt - baseline) * RTT_BASELINE_DRIFT
+    return shortfall
+
+
+class AdaptiveBitrate:
+    """Bitrate controller for one display's shared encoder."""
+
+    def __init__(self) -> None:
+        self._consumers: Dict[Hashable, _Consumer] = {}
+        self._down_ticks = 0
+        self._clear_since: Optional[float] = None
+        self._last_change = float("-inf")
+        self._up_hold = UP_HOLD_S
+        self.slowest_kbps: Optional[float] = None
+
+    def update(self, current_kbps: float, floor_kbps: float, ceiling_kbps: float,
+               samples: Dict[Hashable, ConsumerSample], now: float) -> Optional[int]:
+        """Fold in one tick of consumer samples and pick the next bitrate.
+
+        Args:
+            current_kbps: The encoder's current bitrate.
+            floor_kbps: Lowest bitrate to steer to.
+            ceiling_kbps: The display's configured bitrate; never exceeded.
+            samples: Current counters per active consumer. Consumers missing
+                from it are forgotten.
+            now: Monotonic time in seconds.
+
+        Returns:
+            The new bitrate in kbps, or None to keep the current one.
+        """
+        ceiling_kbps = max(floor_kbps, ceiling_kbps)
+        for key in [k for k in self._consumers if k not in samples]:
+            del self._consumers[key]
+            # The consumer that held the rate down may be the one leaving.
+            self._up_hold = UP_HOLD_S
+        shortfalls = []
+        for key, sample in samples.items():
+            consumer = self._consumers.get(key)
+            if consumer is None:
+                # A first sample has no interval to judge yet.
+                self._consumers[key] = _Consumer(sample, now)
+                continue
+            shortfall = _shortfall(consumer, sample, current_kbps, now)
+            if shortfall is not None:
+                shortfalls.append(shortfall)
+            consumer.sample = sample
+            consumer.time = now
+        self.slowest_kbps = min(shortfalls) if shortfalls else None
+
+        if current_kbps > ceiling_kbps:
+            target = ceiling_kbps
+        elif shortfalls:
+            self._clear_since = None
+            self._down_ticks += 1
+            if self._down_ticks < DOWN_TICKS:
+                return None
+            self._down_ticks = 0
+            target = max(min(shortfalls) * DOWN_HEADROOM, current_kbps * MAX_DOWN_STEP)
+            self._up_hold = min(self._up_hold * 2, UP_HOLD_MAX_S)
+        else:
+            self._down_ticks = 0
+            if self._clear_since is None:
+                self._clear_since = now
+            if current_kbps >= ceiling_kbps:
+                self._up_hold = UP_HOLD_S
+                return None
+            if (not self._consumers
+                    or now - self._clear_since < self._up_hold
+                    or now - self._last_change < self._up_hold):
+                return None
+            target = current_kbps * UP_STEP
+        target = max(floor_kbps, min(ceiling_kbps, target))
+        if abs(target - current_kbps) < current_kbps * MIN_CHANGE and target < ceiling_kbps:
+            return None
+        if round(target) == round(current_kbps):
+            return None
+        self._last_change = now
+        return int(round(target))
+
+
+class _Routed:
+    __slots__ = ("consumer", "low", "down_ticks", "clear_since", "last_change", "hold",
+                 "probed")
+
+    def __init__(self, sample: ConsumerSample, now: float) -> None:
+        self.consumer = _Consumer(sample, now)
+        self.low = False
+        self.down_ticks = 0
+        self.clear_since: Optional[float] = None
+        self.last_change = now
+        self.hold = UP_HOLD_S
+        # Moved back to the main rendition since the last demotion.
+        self.probed = False
+
+
+class RenditionRouter:
+    """Routes each consumer of a display to its main or low rendition.
+
+    The display owner is never routed: its ACKs pace the main encoder.
+    """
+
+    def __init__(self) -> None:
+        self._routed: Dict[Hashable, _Routed] = {}
+
+    def update(self, main_kbps: float, low_kbps: float,
+               samples: Dict[Hashable, ConsumerSample], now: float) -> Dict[Hashable, bool]:
+        """Fold in one tick of consumer samples and pick each one's rendition.
+
+        Args:
+            main_kbps: The main encoder's current bitrate.
+            low_kbps: The low rendition's bitrate.
+            samples: Current counters per routable consumer. Consumers missing
+                from it are forgotten.
+            now: Monotonic time in seconds.
+
+        Returns:
+            The consumers whose rendition changes: True to move to the low
+            rendition, False to move back to the main one.
+        """
+        for key in [k for k in self._routed if k not in samples]:
+            del self._routed[key]
+        changes: Dict[Hashable, bool] = {}
+        for key, sample in samples.items():
+            routed = self._routed.get(key)
+            if routed is None:
+                self._routed[key] = _Routed(sample, now)
+                continue
+            consumer = routed.consumer
+            stream_kbps = low_kbps if routed.low else main_kbps
+            short = _shortfall(consumer, sample, stream_kbps, now) is not None
+            consumer.sample = sample
+            consumer.time = now
+            if main_kbps <= low_kbps:
+                # The main stream is no heavier (adaptive bitrate or a lowered
+                # setting): the low rendition buys nothing.
+                if routed.low:
+                    changes[key] = self._switch(routed, False, now)
+                continue
+            if short:
+                routed.clear_since = None
+                if routed.low:
+                    # Short even of the low rendition: nothing lighter to offer.
+                    continue
+                routed.down_ticks += 1
+                if routed.down_ticks >= DOWN_TICKS:
+                    changes[key] = self._switch(routed, True, now)
+                continue
+            routed.down_ticks = 0
+            if routed.clear_since is None:
+                routed.clear_since = now
+            if routed.low:
+                if (now - routed.clear_since >= routed.hold
+                        and now - routed.last_change >= routed.hold):
+                    changes[key] = self._switch(routed, False, now)
+            elif now - routed.last_change >= UP_HOLD_MAX_S:
+                # A promotion that held: the next demotion starts probing
+                # from the short hold again.
+                routed.hold = UP_HOLD_S
+                routed.probed = False
+        return changes
+
+    @staticmethod
+    def _switch(routed: _Routed, low: bool, now: float) -> bool:
+        if low and routed.probed:
+            # A probe of the main rendition failed: wait longer next time.
+            routed.hold = min(routed.hold * 2, UP_HOLD_MAX_S)
+        routed.probed = not low
+        routed.low = low
+        routed.down_ticks = 0
+        routed.clear_since = None
+        routed.last_change = now
+        return low
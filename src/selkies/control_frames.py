@@ -0,0 +1,176 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Content-addressed cache of serialized (and gzip'd) control frames.
+
+Cursor shapes, the display roster, settings and the stats dicts are broadcast
+over and over with identical content: an IDE cursor flapping between two
+shapes re-sends the same PNG hundreds of times a minute, and each data
+channel is sent the same stats dict every tick. Both transports look those
+payloads up here instead of re-running ``json.dumps`` and level-6 gzip per
+send.
+
+Entries are keyed by a caller-chosen *kind* — one per wire format, e.g.
+``"ws:cursor"`` or ``"dc:cursor"``, since the websockets and data-channel
+envelopes differ — plus the payload content. A flat dict of hashable values
+is keyed by its items (no serialization needed to hit); anything else is
+keyed by its rendered text. The cache is bounded by bytes (text plus any gzip
+produced), evicts least-recently-used, and is thread-safe: cursor changes
+arrive on capture threads while the loop serves stats and settings.
+"""
+
+import gzip
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+# Byte budget of the shared cache: a few dozen cursor shapes (tens of KiB of
+# base64 PNG each, plus their gzip) and every current stats/settings payload.
+CONTROL_FRAME_CACHE_BYTES = 4 * 1024 * 1024
+
+# Payloads larger than this share of the budget (a clipboard chunk) are
+# rendered but never retained: one of them would flush every cursor shape.
+_MAX_ENTRY_SHARE = 4
+
+_GZIP_LEVEL = 6
+
+
+class ControlFrame:
+    """One serialized control message and, on demand, its gzip form.
+
+    Attributes:
+        text: The message exactly as sent uncompressed.
+    """
+
+    __slots__ = ("text", "_gz", "_cache")
+
+    def __init__(self, text: str, cache: Optional["ControlFrameCache"] = None) -> None:
+        self.text = text
+        self._gz: Optional[bytes] = None
+        self._cache = cache
+
+    def gzipped(self) -> bytes:
+        """Return the gzip of the UTF-8 text, compressing at most once per
+        cached entry.
+
+        Safe to call from an executor thread: a race between two first calls
+        only costs a duplicate compression, never a wrong frame.
+        """
+        gz = self._gz
+        if gz is None:
+            gz = gzip.compress(self.text.encode("utf-8"), _GZIP_LEVEL)
+            cache = self._cache
+            if cache is not None:
+                cache._attach_gzip(self, gz)
+            else:
+                self._gz = gz
+        return gz
+
+
+def _payload_key(data: Any) -> Optional[Hashable]:
+    """Key a flat payload by its content without serializing it.
+
+    Items keep insertion order and values carry their type (``True == 1`` and
+    ``1 == 1.0`` but they serialize differently), so equal keys always render
+    to identical text. Returns None for payloads that are not flat dicts of
+    hashable values.
+    """
+    if not isinstance(data, dict):
+        return None
+    key = tuple((k, type(v), v) for k, v in data.items())
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+class ControlFrameCache:
+    """Byte-bounded LRU of `ControlFrame`s keyed by kind and payload content."""
+
+    def __init__(self, max_bytes: int = CONTROL_FRAME_CACHE_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, ControlFrame]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        """Bytes currently held: every entry's text plus any gzip produced."""
+        return self._bytes
+
+    def lookup(self, kind: str, data: Any, render: Callable[[Any], str]) -> ControlFrame:
+        """Return the cached frame for `data`, rendering it on a miss.
+
+        Args:
+            kind: Wire format of the message; two kinds never share an entry.
+            data: The payload `render` serializes.
+            render: Builds the exact message text from `data`. Must be a pure
+                function of `data` for a given `kind`.
+
+        Returns:
+            The frame; its `gzipped()` result is memoized with the entry.
+        """
+        content = _payload_key(data)
+        text = None
+        if content is None:
+            text = render(data)
+            content = text
+        key = (kind, content)
+        with self._lock:
+            frame = self._entries.get(key)
+            if frame is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return frame
+            self.misses += 1
+        if text is None:
+            text = render(data)
+        if len(text) * _MAX_ENTRY_SHARE > self.max_bytes:
+            return ControlFrame(text)
+        frame = ControlFrame(text, self)
+        with self._lock:
+            current = self._entries.get(key)
+            if current is not None:
+                # Another thread rendered the same payload meanwhile.
+                return current
+            self._entries[key] = frame
+            self._bytes += len(text)
+            self._evict()
+        return frame
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            for frame in self._entries.values():
+                frame._cache = None
+            self._entries.clear()
+            self._bytes = 0
+
+    def _attach_gzip(self, frame: ControlFrame, gz: bytes) -> None:
+        with self._lock:
+            if frame._gz is not None:
+                return
+            frame._gz = gz
+            # Only a frame still held here counts against the budget.
+            if frame._cache is self:
+                self._bytes += len(gz)
+                self._evict()
+
+    def _evict(self) -> None:
+        # Caller holds the lock. An evicted frame stays valid for whoever holds
+        # it; it just stops counting against the budget.
+        while self._bytes > self.max_bytes and self._entries:
+            _, frame = self._entries.popitem(last=False)
+            frame._cache = None
+            self._bytes -= len(frame.text) + len(frame._gz or b"")
+
+
+# Shared by both transports.
+control_frames = ControlFrameCache()
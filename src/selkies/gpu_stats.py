@@ -17,15 +17,21 @@ captures/encodes on (PCI match when the source knows its address, else a
 vendor-unique match), so the monitored GPU is always the one doing the work.
 Objects expose ``.load`` as a 0..1 fraction and ``.memoryTotal`` /
 ``.memoryUsed`` in MiB, the units the stats collectors serialize.
+
+``get_gpus`` re-enumerates every source per call. Periodic consumers instead
+share a ``GPUSampler`` (``acquire_sampler``/``release_sampler``), which
+resolves its GPU once and samples only that device on its own thread.
 """
 
+import collections
 import glob
 import logging
 import os
 import shutil
 import subprocess
 import threading
-from typing import Any, Dict, List, Optional, Set
+import time
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
 
 try:
     import pynvml
@@ -380,3 +386,232 @@ def get_gpus(dri_node: Optional[str] = None) -> List[GPUStat]:
                 return matched
         logger.debug("No unique GPU stats source matches %s", dri_node)
     return gpus
+
+
+# Samples a GPUSampler keeps: about a minute of history at the default rate.
+GPU_SAMPLE_HISTORY: int = 64
+
+# A sample older than this many intervals is stale: the device stopped
+# answering, and consumers should report nothing rather than a frozen value.
+_STALE_INTERVALS: int = 3
+
+
+def _pick_gpu(gpus: List[GPUStat], gpu_id: int, dri_node: Optional[str]) -> Optional[GPUStat]:
+    """The GPU the stats describe: a dri_node match returns exactly the
+    pipeline's GPU; the index only applies to the unfiltered list."""
+    idx = 0 if (dri_node and len(gpus) == 1) else gpu_id
+    return gpus[idx] if 0 <= idx < len(gpus) else None
+
+
+def _nvml_reader(target: GPUStat) -> Optional[Callable[[], GPUStat]]:
+    """Read `target` from an NVML handle resolved once, or None when NVML
+    did not report it."""
+    if target.vendor != "nvidia" or not _nvml_ready:
+        return None
+    try:
+        count = pynvml.nvmlDeviceGetCount()
+        handles = [pynvml.nvmlDeviceGetHandleByIndex(i) for i in range(count)]
+        handle = None
+        for h in handles:
+            bus_id = pynvml.nvmlDeviceGetPciInfo(h).busId
+            if isinstance(bus_id, bytes):
+                bus_id = bus_id.decode("ascii", "replace")
+            if target.pci and _normalize_pci(bus_id) == target.pci:
+                handle = h
+                break
+        if handle is None and target.pci is None and target.id < count:
+            handle = handles[target.id]
+    except Exception as exc:
+        logger.debug("NVML handle lookup failed: %s", exc)
+        return None
+    if handle is None:
+        return None
+
+    def read() -> GPUStat:
+        util = pynvml.nvmlDeviceGetUtilizationRates(handle).gpu
+        mem = pynvml.nvmlDeviceGetMemoryInfo(handle)
+        return GPUStat(target.id, util / 100.0, mem.total / (1024 * 1024),
+                       mem.used / (1024 * 1024), target.pci, "nvidia")
+
+    return read
+
+
+def _amdgpu_reader(
+    target: GPUStat, dri_node: Optional[str], fds: List[int], root: Optional[str] = None
+) -> Optional[Callable[[], GPUStat]]:
+    """Read `target` from its amdgpu counter files, held open and re-read
+    with pread; None when it is not an amdgpu card with those counters.
+
+    The opened descriptors are appended to `fds` for the caller to close.
+    """
+    if target.vendor != "amd":
+        return None
+    root = root or _SYSFS_DRM_ROOT
+    pci = target.pci or _pci_of_node(dri_node, root)
+    devices = []
+    for card in sorted(glob.glob(os.path.join(root, "card[0-9]*"))):
+        if "-" in os.path.basename(card):
+            continue
+        device = os.path.join(card, "device")
+        try:
+            driver = os.path.basename(os.readlink(os.path.join(device, "driver")))
+        except OSError:
+            continue
+        if driver in ("amdgpu", "radeon") and (
+                pci is None or _normalize_pci(os.path.basename(os.path.realpath(device))) == pci):
+            devices.append(device)
+    if len(devices) != 1:
+        return None
+    opened = []
+    try:
+        for name in ("gpu_busy_percent", "mem_info_vram_total", "mem_info_vram_used"):
+            opened.append(os.open(os.path.join(devices[0], name), os.O_RDONLY))
+    except OSError:
+        for fd in opened:
+            os.close(fd)
+        return None
+    fds.extend(opened)
+    busy_fd, total_fd, used_fd = opened
+
+    def number(fd: int) -> float:
+        try:
+            return float(os.pread(fd, 32, 0).strip() or 0)
+        except (OSError, ValueError):
+            return 0.0
+
+    def read() -> GPUStat:
+        return GPUStat(target.id, number(busy_fd) / 100.0, number(total_fd) / (1024 * 1024),
+                       number(used_fd) / (1024 * 1024), target.pci, "amd")
+
+    return read
+
+
+class GPUSampler:
+    """Samples one GPU on a background thread into a ring buffer.
+
+    ``start`` picks the GPU once, the way the stats collectors do (dri_node
+    match, else ``gpu_id`` index into the full list), then reads only that
+    device every ``interval`` seconds: through an NVML handle kept for the
+    sampler's life, through the amdgpu counter files held open, or — for the
+    sources with no per-device handle (aitop, nvidia-smi) — through
+    ``get_gpus`` as before. Readers never block: ``latest`` returns the newest
+    sample, ``history`` the buffered ones.
+    """
+
+    def __init__(
+        self,
+        gpu_id: int = 0,
+        dri_node: str = "",
+        interval: float = 1.0,
+        history: int = GPU_SAMPLE_HISTORY,
+    ) -> None:
+        self.gpu_id = gpu_id
+        self.dri_node = dri_node
+        self.interval = max(0.1, float(interval))
+        self.samples: Deque[Tuple[float, GPUStat]] = collections.deque(maxlen=history)
+        self.source: Optional[str] = None
+        self._read: Optional[Callable[[], Optional[GPUStat]]] = None
+        self._fds: List[int] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> bool:
+        """Resolve the GPU and start sampling; blocking.
+
+        Returns:
+            False when no GPU matches, in which case nothing is started.
+        """
+        target = _pick_gpu(get_gpus(self.dri_node), self.gpu_id, self.dri_node)
+        if target is None:
+            return False
+        self._read = _nvml_reader(target)
+        self.source = "nvml"
+        if self._read is None:
+            self._read = _amdgpu_reader(target, self.dri_node, self._fds)
+            self.source = "sysfs"
+        if self._read is None:
+            self._read = lambda: _pick_gpu(get_gpus(self.dri_node), self.gpu_id, self.dri_node)
+            self.source = "enumerate"
+        self.samples.append((time.monotonic(), target))
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="gpu-sampler", daemon=True)
+        self._thread.start()
+        logger.info("Sampling GPU %s (%s) via %s every %.1fs", target.id,
+                    target.pci or target.vendor, self.source, self.interval)
+        return True
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                sample = self._read()
+            except Exception as exc:
+                logger.debug("GPU sample failed: %s", exc)
+                continue
+            if sample is not None:
+                self.samples.append((time.monotonic(), sample))
+
+    def latest(self) -> Optional[GPUStat]:
+        """The newest sample, or None when there is none or it is stale."""
+        if not self.samples:
+            return None
+        stamp, sample = self.samples[-1]
+        if time.monotonic() - stamp > self.interval * _STALE_INTERVALS:
+            return None
+        return sample
+
+    def history(self) -> List[Tuple[float, GPUStat]]:
+        """The buffered `(monotonic time, sample)` pairs, oldest first."""
+        return list(self.samples)
+
+    def stop(self) -> None:
+        """Stop the thread and close any held counter files; blocking."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 5)
+            self._thread = None
+        for fd in self._fds:
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self._fds.clear()
+
+
+_samplers: Dict[Tuple[int, str], List[Any]] = {}
+_samplers_lock = threading.Lock()
+
+
+def acquire_sampler(gpu_id: int = 0, dri_node: str = "", interval: float = 1.0) -> Optional[GPUSampler]:
+    """Return the running sampler for this GPU, starting one if needed; blocking.
+
+    Consumers of the same GPU (the websockets collector, the WebRTC monitor)
+    share one sampler; each acquire must be paired with ``release_sampler``.
+    The first acquirer's interval wins.
+
+    Returns:
+        The sampler, or None when no GPU matches.
+    """
+    key = (gpu_id, dri_node or "")
+    with _samplers_lock:
+        entry = _samplers.get(key)
+        if entry is None:
+            sampler = GPUSampler(gpu_id, dri_node, interval)
+            if not sampler.start():
+                return None
+            entry = _samplers[key] = [sampler, 0]
+        entry[1] += 1
+        return entry[0]
+
+
+def release_sampler(sampler: GPUSampler) -> None:
+    """Drop one reference to `sampler`, stopping it after the last; blocking."""
+    with _samplers_lock:
+        key = (sampler.gpu_id, sampler.dri_node or "")
+        entry = _samplers.get(key)
+        if entry is None or entry[0] is not sampler:
+            return
+        entry[1] -= 1
+        if entry[1] > 0:
+            return
+        del _samplers[key]
+    sampler.stop()
@@ -0,0 +1,199 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""
+Server-reflexive and TURN relay results shared across ICE connections.
+
+Every :class:`~.ice.Connection` gathers its own candidates. Without this
+cache, each new peer resolves the STUN hostname, queries the STUN server and
+allocates on the TURN server before it can offer, which adds a round trip or
+more to every connection. This module keeps three things per event loop
+thread:
+
+- Resolved STUN hostnames, for :data:`RESOLVE_TTL` seconds.
+- Server-reflexive mappings, keyed by the local socket address and the STUN
+  server, for :data:`SRFLX_TTL` seconds. A mapping belongs to a local
+  socket, so it is only reused when connections share one, as with the
+  single-port UDP mux. Ephemeral host sockets never hit.
+- A small pool of TURN allocations per server and credentials. The pool is
+  filled in the background after the first allocation a connection needs.
+  A pooled allocation is kept alive by the TURN client's own refresh loop
+  and handed to the next connection instead of allocating on its critical
+  path. A pool nobody draws from for :data:`TURN_POOL_IDLE` seconds is
+  released.
+
+:func:`invalidate` drops everything on every thread, for instance when the
+STUN/TURN servers or credentials change.
+"""
+
+import asyncio
+import logging
+import socket
+import threading
+import time
+from typing import Any, Optional
+
+from . import turn
+
+logger = logging.getLogger(__name__)
+
+# Seconds a server-reflexive mapping is reused: shorter than common NAT UDP
+# idle timeouts, so an idle shared socket is re-queried before its mapping
+# could have moved.
+SRFLX_TTL = 30.0
+
+# Seconds a resolved STUN hostname is reused.
+RESOLVE_TTL = 300.0
+
+# TURN allocations kept ready per server and credentials (0 disables).
+TURN_POOL_SIZE = 2
+
+# Seconds an unused TURN pool keeps its allocations before releasing them.
+TURN_POOL_IDLE = 600.0
+
+_cache = threading.local()
+_generation = 0
+
+
+def invalidate() -> None:
+    """
+    Drop every cached result and pooled allocation, on every thread.
+
+    Safe to call from any thread; each loop's cache notices on next use.
+    """
+    global _generation
+    _generation += 1
+
+
+def get_candidate_cache() -> "CandidateCache":
+    """
+    Return this thread's cache, replacing it if :func:`invalidate` ran since.
+    """
+    cache = getattr(_cache, "cache", None)
+    if cache is None or cache.generation != _generation:
+        if cache is not None:
+            cache.close()
+        cache = _cache.cache = CandidateCache(_generation)
+    return cache
+
+
+class CandidateCache:
+    """
+    One event loop thread's shared gathering results.
+
+    :param generation: The :func:`invalidate` generation the cache belongs to.
+    """
+
+    def __init__(self, generation: int = 0) -> None:
+        self.generation = generation
+        self._resolved: dict[str, tuple[float, str]] = {}
+        self._srflx: dict[tuple[Any, ...], tuple[float, tuple[str, int]]] = {}
+        self._turn_pools: dict[tuple[Any, ...], list[turn.TurnTransport]] = {}
+        self._turn_wanted: dict[tuple[Any, ...], asyncio.Event] = {}
+        self._turn_keepers: dict[tuple[Any, ...], asyncio.Task] = {}
+
+    async def resolve(self, host: str) -> str:
+        """
+        Resolve `host` to an IPv4 address, reusing a recent answer.
+        """
+        now = time.monotonic()
+        entry = self._resolved.get(host)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+        loop = asyncio.get_running_loop()
+        address = await loop.run_in_executor(None, socket.gethostbyname, host)
+        self._resolved[host] = (now + RESOLVE_TTL, address)
+        return address
+
+    def get_srflx(
+        self, local_addr: tuple[str, int], stun_server: tuple[str, int]
+    ) -> Optional[tuple[str, int]]:
+        """
+        Return the mapped address last seen for `local_addr` via `stun_server`.
+        """
+        key = (tuple(local_addr), tuple(stun_server))
+        entry = self._srflx.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._srflx[key]
+            return None
+        return entry[1]
+
+    def put_srflx(
+        self,
+        local_addr: tuple[str, int],
+        stun_server: tuple[str, int],
+        mapped_addr: tuple[str, int],
+    ) -> None:
+        """
+        Remember the mapped address `stun_server` reported for `local_addr`.
+        """
+        key = (tuple(local_addr), tuple(stun_server))
+        self._srflx[key] = (time.monotonic() + SRFLX_TTL, tuple(mapped_addr))
+
+    def take_turn(self, **params: Any) -> Optional[turn.TurnTransport]:
+        """
+        Take a pooled TURN allocation matching `params`, the keyword arguments
+        of :func:`~.turn.create_turn_allocation`, and have the pool refilled.
+
+        Returns `None` when the pool is empty or disabled; the caller then
+        allocates as usual.
+        """
+        if TURN_POOL_SIZE <= 0:
+            return None
+        key = tuple(sorted(params.items()))
+        pool = self._turn_pools.setdefault(key, [])
+        allocation = None
+        while pool:
+            candidate = pool.pop(0)
+            if candidate.allocated:
+                allocation = candidate
+                break
+            candidate.close()
+
+        keeper = self._turn_keepers.get(key)
+        if keeper is None or keeper.done():
+            self._turn_wanted[key] = asyncio.Event()
+            self._turn_keepers[key] = asyncio.create_task(self._keep_turn_pool(key, params))
+        else:
+            self._turn_wanted[key].set()
+        return allocation
+
+    async def _keep_turn_pool(self, key: tuple[Any, ...], params: dict[str, Any]) -> None:
+        pool = self._turn_pools[key]
+        wanted = self._turn_wanted[key]
+        try:
+            while True:
+                while len(pool) < TURN_POOL_SIZE:
+                    try:
+                        pool.append(await turn.create_turn_allocation(**params))
+                    except Exception as exc:
+                        # Retried when the next connection draws from the pool.
+                        logger.info("Could not pre-allocate on TURN server - %s", exc)
+                        break
+                wanted.clear()
+                try:
+                    await asyncio.wait_for(wanted.wait(), TURN_POOL_IDLE)
+                except asyncio.TimeoutError:
+                    break
+        finally:
+            self._turn_pools.pop(key, None)
+            self._turn_wanted.pop(key, None)
+            self._turn_keepers.pop(key, None)
+            for allocation in pool:
+                allocation.close()
+
+    def close(self) -> None:
+        """
+        Release every pooled TURN allocation.
+        """
+        for pool in self._turn_pools.values():
+            for allocation in pool:
+                allocation.close()
+            pool.clear()
+        for keeper in list(self._turn_keepers.values()):
+            keeper.cancel()
+        self._resolved.clear()
+        self._srflx.clear()
@@ -47,7 +47,7 @@ from typing import Optional, Union, cast
 
 import ifaddr
 
-from . import mdns, stun, turn
+from . import candidate_cache, mdns, mux, stun, turn
 from .candidate import Candidate, candidate_foundation, candidate_priority
 from .utils import random_string
 
@@ -136,16 +136,24 @@ async def relayed_candidate(
 ) -> tuple[Candidate, "StunProtocol"]:
     """
     Connect to a TURN server to obtain a relayed candidate.
+
+    A pre-warmed allocation from the shared pool is used when one is ready.
     """
-    # Connect to TURN server.
-    _, protocol = await turn.create_turn_endpoint(
-        protocol_factory,
+    cache = candidate_cache.get_candidate_cache()
+    params = dict(
         server_addr=turn_server,
         username=turn_username,
         password=turn_password,
         ssl=turn_ssl,
         transport=turn_transport,
     )
+    allocation = cache.take_turn(**params)
+    if allocation is not None:
+        protocol = protocol_factory()
+        allocation.attach(protocol)
+    else:
+        # Connect to TURN server.
+        _, protocol = await turn.create_turn_endpoint(protocol_factory, **params)
 
     # Build relayed candidate.
     candidate_address = protocol.transport.get_extra_info("sockname")
@@ -170,18 +178,21 @@ async def server_reflexive_candidate(
     """
     Query STUN server to obtain a server-reflexive candidate.
     """
+    cache = candidate_cache.get_candidate_cache()
+
     # lookup address
-    loop = asyncio.get_running_loop()
-    stun_server = (
-        await loop.run_in_executor(None, socket.gethostbyname, stun_server[0]),
-        stun_server[1],
-    )
+    stun_server = (await cache.resolve(stun_server[0]), stun_server[1])
 
-    # perform STUN query
-    request = stun.Message(
-        message_method=stun.Method.BINDING, message_class=stun.Class.REQUEST
-    )
-    response, _ = await protocol.request(request, stun_server)
+    # reuse the mapping of a shared local socket, or perform STUN query
+    local_addr = protocol.transport.get_extra_info("sockname")
+    mapped_addr = cache.get_srflx(local_addr, stun_server)
+    if mapped_addr is None:
+        request = stun.Message(
+            message_method=stun.Method.BINDING, message_class=stun.Class.REQUEST
+        )
+        response, _ = await protocol.request(request, stun_server)
+        mapped_addr = response.attributes["XOR-MAPPED-ADDRESS"]
+        cache.put_srflx(local_addr, stun_server, mapped_addr)
 
     local_candidate = protocol.local_candidate
     return Candidate(
@@ -189,8 +200,8 @@ async def server_reflexive_candidate(
         component=local_candidate.component,
         transport=local_candidate.transport,
         priority=candidate_priority(local_candidate.component, "srflx"),
-        host=response.attributes["XOR-MAPPED-ADDRESS"][0],
-        port=response.attributes["XOR-MAPPED-ADDRESS"][1],
+        host=mapped_addr[0],
+        port=mapped_addr[1],
         type="srflx",
         related_address=local_candidate.host,
         related_port=local_candidate.port,
@@ -296,17 +307,27 @@ class StunProtocol(asyncio.DatagramProtocol):
         self.transport = cast(asyncio.DatagramTransport, transport)
 
     def datagram_received(self, data: Union[bytes, str], addr: tuple) -> None:
-        # force IPv6 four-tuple to a two-tuple
-        addr = (addr[0], addr[1])
         data = cast(bytes, data)
 
+        # RFC 7983 demultiplexing: DTLS and SRTP/SRTCP go straight to the
+        # connection queue instead of paying a failed STUN parse each.
+        if not stun.is_stun_message(data):
+            self.receiver.data_received(data, self.local_candidate.component)
+            return
+
+        # force IPv6 four-tuple to a two-tuple
+        addr = (addr[0], addr[1])
         try:
             message = stun.parse_message(data)
-            self.__log_debug("< %s %s", addr, message)
         except ValueError:
             self.receiver.data_received(data, self.local_candidate.component)
             return
+        self.message_received(message, addr, data)
 
+    def message_received(
+        self, message: stun.Message, addr: tuple[str, int], data: bytes
+    ) -> None:
+        self.__log_debug("< %s %s", addr, message)
         if (
             message.message_class == stun.Class.RESPONSE
             or message.message_class == stun.Class.ERROR
@@ -352,6 +373,14 @@ class StunProtocol(asyncio.DatagramProtocol):
     async def send_data(self, data: bytes, addr: tuple[str, int]) -> None:
         self.transport.sendto(data, addr)
 
+    async def send_data_batch(self, batch: list[bytes], addr: tuple[str, int]) -> None:
+        # asyncio exposes no sendmmsg; one synchronous pass of sendto is the
+        # batched write it allows (each goes straight to the socket while the
+        # transport's buffer is empty), without a coroutine hop per datagram.
+        sendto = self.transport.sendto
+        for data in batch:
+            sendto(data, addr)
+
     def send_stun(self, message: stun.Message, addr: tuple[str, int]) -> None:
         """
         Send a STUN message.
@@ -366,6 +395,39 @@ class StunProtocol(asyncio.DatagramProtocol):
         return "protocol(%s)" % self.id
 
 
+class MuxStunProtocol(StunProtocol):
+    """
+    A connection's host candidate on the shared socket of a UDP mux.
+
+    Inbound datagrams arrive already routed by the mux; closing only
+    removes this connection's routes and leaves the socket open.
+    """
+
+    def __init__(self, receiver: "Connection", mux_socket: mux.UdpMuxSocket) -> None:
+        super().__init__(receiver)
+        self.mux_socket = mux_socket
+        self.transport = mux_socket.transport
+
+    async def close(self) -> None:
+        self.mux_socket.unregister(self)
+        self.connection_lost(None)
+
+    async def request(
+        self,
+        request: stun.Message,
+        addr: tuple[str, int],
+        integrity_key: Optional[bytes] = None,
+        retransmissions: Optional[int] = None,
+    ) -> tuple[stun.Message, tuple[str, int]]:
+        self.mux_socket.transactions[request.transaction_id] = self
+        try:
+            return await super().request(
+                request, addr, integrity_key=integrity_key, retransmissions=retransmissions
+            )
+        finally:
+            self.mux_socket.transactions.pop(request.transaction_id, None)
+
+
 class ConnectionEvent:
     pass
 
@@ -397,6 +459,10 @@ class Connection:
                         advertise in host candidates of the matching family
                         (static 1:1 NAT), otherwise host candidates use the
                         bound address.
+    :param udp_mux_port: An optional fixed local port whose socket on each host
+                         address is shared with every other connection using
+                         the same port (single-port UDP mux), otherwise host
+                         candidates bind their own ephemeral sockets.
     """
 
     def __init__(
@@ -415,11 +481,14 @@ class Connection:
         local_username: Optional[str] = None,
         local_password: Optional[str] = None,
         nat1to1_ips: Optional[list[str]] = None,
+        udp_mux_port: Optional[int] = None,
     ) -> None:
         self.ice_controlling = ice_controlling
 
         if local_username is None:
-            local_username = random_string(4)
+            # The UDP mux routes requests by ufrag, so make it unique across
+            # every connection sharing the port, not just this session.
+            local_username = random_string(16 if udp_mux_port else 4)
         else:
             validate_username(local_username)
 
@@ -471,6 +540,8 @@ class Connection:
         self._tie_breaker = secrets.randbits(64)
         self._use_ipv4 = use_ipv4
         self._use_ipv6 = use_ipv6
+        self._udp_mux: Optional[mux.UdpMux] = None
+        self._udp_mux_port = udp_mux_port
 
         # NAT1TO1: validated public addresses keyed by IP version. A host
         # candidate of a configured family advertises the mapped address in
@@ -684,6 +755,11 @@ class Connection:
         for protocol in self._protocols:
             await protocol.close()
         self._protocols.clear()
+
+        # unreference the UDP mux
+        if self._udp_mux is not None:
+            await mux.unref_udp_mux(self)
+            self._udp_mux = None
         self._local_candidates.clear()
 
         # emit event
@@ -759,6 +835,20 @@ class Connection:
         else:
             raise ConnectionError("Cannot send data, not connected")
 
+    async def send_batch(self, batch: list[bytes]) -> None:
+        """
+        Send several datagrams on the first component in one write pass.
+
+        If the connection is not established, a `ConnectionError` is raised.
+
+        :param batch: The datagrams to be sent, in order.
+        """
+        active_pair = self._nominated.get(1)
+        if active_pair:
+            await active_pair.protocol.send_data_batch(batch, active_pair.remote_addr)
+        else:
+            raise ConnectionError("Cannot send data, not connected")
+
     def set_selected_pair(
         self, component: int, local_foundation: str, remote_foundation: str
     ) -> None:
@@ -1027,19 +1117,28 @@ class Connection:
         # gather host candidates
         host_protocols = []
         for address in addresses:
-            # create transport
-            try:
-                transport, protocol = await loop.create_datagram_endpoint(
-                    lambda: StunProtocol(self), local_addr=(address, 0)
-                )
-                sock = transport.get_extra_info("socket")
-                if sock is not None:
-                    sock.setsockopt(
-                        socket.SOL_SOCKET, socket.SO_RCVBUF, turn.UDP_SOCKET_BUFFER_SIZE
+            # share the UDP mux socket (RTP and RTCP components would need a
+            # socket each, so only the first component is multiplexed) ...
+            protocol: Optional[StunProtocol] = None
+            if self._udp_mux_port and component == 1:
+                protocol = await self._create_mux_protocol(address)
+
+            # ... or create a transport of our own
+            if protocol is None:
+                try:
+                    transport, protocol = await loop.create_datagram_endpoint(
+                        lambda: StunProtocol(self), local_addr=(address, 0)
                     )
-            except OSError as exc:
-                self.__log_info("Could not bind to %s - %s", address, exc)
-                continue
+                    sock = transport.get_extra_info("socket")
+                    if sock is not None:
+                        sock.setsockopt(
+                            socket.SOL_SOCKET,
+                            socket.SO_RCVBUF,
+                            turn.UDP_SOCKET_BUFFER_SIZE,
+                        )
+                except OSError as exc:
+                    self.__log_info("Could not bind to %s - %s", address, exc)
+                    continue
             host_protocols.append(protocol)
 
             # add host candidate
@@ -1108,6 +1207,27 @@ class Connection:
 
         return candidates
 
+    async def _create_mux_protocol(self, address: str) -> Optional[StunProtocol]:
+        """
+        Register on the UDP mux socket for `address`, or return `None` to
+        fall back to a socket of our own.
+        """
+        if self._udp_mux is None:
+            self._udp_mux = await mux.get_or_create_udp_mux(self._udp_mux_port, self)
+        try:
+            mux_socket = await self._udp_mux.bind(address)
+            protocol = MuxStunProtocol(self, mux_socket)
+            mux_socket.register(self.local_username, protocol)
+        except (OSError, ValueError) as exc:
+            self.__log_info(
+                "Could not use the UDP mux on %s:%d - %s",
+                address,
+                self._udp_mux_port,
+                exc,
+            )
+            return None
+        return protocol
+
     def _prune_components(self) -> None:
         """
         Remove components for which the remote party did not provide any candidates.
@@ -0,0 +1,180 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""
+Single-port UDP multiplexing of ICE host candidates.
+
+Without a mux every :class:`~.ice.Connection` binds an ephemeral UDP socket
+per host address. With one, every connection's host candidate on an address
+shares a single socket bound to a fixed port, and inbound datagrams are
+routed to the right connection:
+
+- STUN requests by the local ufrag, the first half of their USERNAME. The
+  source address of a request is learned for its connection.
+- STUN responses and errors by transaction id (connectivity checks and
+  server-reflexive queries alike).
+- Everything else (DTLS, SRTP/SRTCP) by source address, learned from the
+  remote party's checks, which always precede its media.
+
+Requests are authenticated by the connection the mux hands them to, exactly
+as on a socket of its own.
+"""
+
+import asyncio
+import logging
+import socket
+import threading
+from typing import Any, Optional, Union, cast
+
+from . import stun, turn
+
+logger = logging.getLogger(__name__)
+
+_udp_mux = threading.local()
+
+
+class UdpMuxSocket(asyncio.DatagramProtocol):
+    """
+    The shared socket of a :class:`UdpMux` on one host address.
+
+    Protocols registered on it must provide ``local_candidate``,
+    ``receiver`` and ``message_received(message, addr, data)``.
+    """
+
+    def __init__(self, address: str) -> None:
+        self.address = address
+        self.transport: Optional[asyncio.DatagramTransport] = None
+        self.transactions: dict[bytes, Any] = {}
+        self._by_addr: dict[tuple[str, int], Any] = {}
+        self._by_ufrag: dict[str, Any] = {}
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = cast(asyncio.DatagramTransport, transport)
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        protocols = list(self._by_ufrag.values())
+        self._by_addr.clear()
+        self._by_ufrag.clear()
+        self.transactions.clear()
+        for protocol in protocols:
+            protocol.connection_lost(exc)
+
+    def datagram_received(self, data: Union[bytes, str], addr: tuple) -> None:
+        data = cast(bytes, data)
+        addr = (addr[0], addr[1])
+
+        if not stun.is_stun_message(data):
+            protocol = self._by_addr.get(addr)
+            if protocol is not None:
+                protocol.receiver.data_received(
+                    data, protocol.local_candidate.component
+                )
+            return
+
+        try:
+            message = stun.parse_message(data)
+        except ValueError:
+            protocol = self._by_addr.get(addr)
+            if protocol is not None:
+                protocol.receiver.data_received(
+                    data, protocol.local_candidate.component
+                )
+            return
+
+        if (
+            message.message_class == stun.Class.RESPONSE
+            or message.message_class == stun.Class.ERROR
+        ):
+            protocol = self.transactions.get(message.transaction_id)
+        elif message.message_class == stun.Class.REQUEST:
+            username = message.attributes.get("USERNAME", "")
+            protocol = self._by_ufrag.get(username.split(":", 1)[0])
+            if protocol is not None:
+                self._by_addr[addr] = protocol
+        else:
+            protocol = self._by_addr.get(addr)
+
+        if protocol is not None:
+            protocol.message_received(message, addr, data)
+
+    def error_received(self, exc: Exception) -> None:
+        logger.debug("UdpMuxSocket(%s) error_received(%s)", self.address, exc)
+
+    def register(self, ufrag: str, protocol: Any) -> None:
+        """
+        Route requests for `ufrag` to `protocol`.
+
+        Raises `ValueError` if another connection already uses `ufrag`.
+        """
+        if ufrag in self._by_ufrag:
+            raise ValueError("ICE ufrag %s is already in use on the mux" % ufrag)
+        self._by_ufrag[ufrag] = protocol
+
+    def unregister(self, protocol: Any) -> None:
+        """
+        Forget every route to `protocol`.
+        """
+        for routes in (self._by_ufrag, self._by_addr, self.transactions):
+            for key in [k for k, v in routes.items() if v is protocol]:
+                del routes[key]
+
+
+class UdpMux:
+    """
+    One UDP socket per host address on a fixed `port`, shared by every
+    connection gathering through the mux.
+    """
+
+    def __init__(self, port: int) -> None:
+        self.port = port
+        self._lock = asyncio.Lock()
+        self._sockets: dict[str, UdpMuxSocket] = {}
+
+    async def bind(self, address: str) -> UdpMuxSocket:
+        """
+        Return the shared socket on `address`, binding it on first use.
+
+        Raises `OSError` if the port cannot be bound on that address.
+        """
+        async with self._lock:
+            mux_socket = self._sockets.get(address)
+            if mux_socket is None or mux_socket.transport.is_closing():
+                loop = asyncio.get_running_loop()
+                transport, mux_socket = await loop.create_datagram_endpoint(
+                    lambda: UdpMuxSocket(address), local_addr=(address, self.port)
+                )
+                sock = transport.get_extra_info("socket")
+                if sock is not None:
+                    sock.setsockopt(
+                        socket.SOL_SOCKET, socket.SO_RCVBUF, turn.UDP_SOCKET_BUFFER_SIZE
+                    )
+                self._sockets[address] = mux_socket
+            return mux_socket
+
+    def close(self) -> None:
+        for mux_socket in self._sockets.values():
+            if mux_socket.transport is not None:
+                mux_socket.transport.close()
+        self._sockets.clear()
+
+
+async def get_or_create_udp_mux(port: int, subscriber: object) -> UdpMux:
+    if not hasattr(_udp_mux, "lock"):
+        _udp_mux.lock = asyncio.Lock()
+        _udp_mux.muxes = {}
+        _udp_mux.subscribers = {}
+    async with _udp_mux.lock:
+        mux = _udp_mux.muxes.get(port)
+        if mux is None:
+            mux = _udp_mux.muxes[port] = UdpMux(port)
+        _udp_mux.subscribers[subscriber] = port
+    return mux
+
+
+async def unref_udp_mux(subscriber: object) -> None:
+    if hasattr(_udp_mux, "lock"):
+        async with _udp_mux.lock:
+            port = _udp_mux.subscribers.pop(subscriber, None)
+            if port is not None and port not in _udp_mux.subscribers.values():
+                _udp_mux.muxes.pop(port).close()
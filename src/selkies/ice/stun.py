@@ -43,6 +43,7 @@ from typing import Optional, Protocol
 from .utils import random_transaction_id
 
 COOKIE = 0x2112A442
+COOKIE_BYTES = pack("!I", COOKIE)
 FINGERPRINT_LENGTH = 8
 FINGERPRINT_XOR = 0x5354554E
 HEADER_LENGTH = 20
@@ -54,6 +55,20 @@ RETRY_MAX = 6
 RETRY_RTO = 0.5
 
 
+def is_stun_message(data: bytes) -> bool:
+    """
+    Cheap RFC 7983 test for a STUN datagram, made before attempting a parse.
+
+    STUN starts with a byte in 0-3 (DTLS uses 20-63, RTP/RTCP 128-191) and
+    carries the RFC 5389 magic cookie at offset 4.
+    """
+    return (
+        len(data) >= HEADER_LENGTH
+        and data[0] < 4
+        and data[4:8] == COOKIE_BYTES
+    )
+
+
 def set_body_length(data: bytes, length: int) -> bytes:
     return data[0:2] + pack("!H", length) + data[4:]
 
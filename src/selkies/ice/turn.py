@@ -183,6 +183,8 @@ class TurnClientMixin:
 
             return
 
+        if not stun.is_stun_message(data):
+            return
         try:
             message = stun.parse_message(data)
             logger.debug("%s < %s %s", self, addr, message)
@@ -394,6 +396,21 @@ class TurnTransport:
         """
         asyncio.create_task(self.__inner_protocol.delete())
 
+    @property
+    def allocated(self) -> bool:
+        """
+        Whether the allocation exists and is still being refreshed.
+        """
+        task = self.__inner_protocol.refresh_task
+        return task is not None and not task.done()
+
+    def attach(self, protocol: asyncio.DatagramProtocol) -> None:
+        """
+        Start relaying received data to `protocol`.
+        """
+        self.__inner_protocol.receiver = protocol
+        protocol.connection_made(cast(asyncio.DatagramTransport, self))
+
     def get_extra_info(self, name: str, default: Any = None) -> Any:
         """
         Return optional transport information.
@@ -415,14 +432,9 @@ class TurnTransport:
         """
         asyncio.create_task(self.__inner_protocol.send_data(data, addr))
 
-    async def _connect(self, protocol: asyncio.DatagramProtocol) -> None:
+    async def _connect(self) -> None:
         self.__relayed_address = await self.__inner_protocol.connect()
 
-        # Once the allocation has succeeded, notify the protocol
-        # and start relaying received data.
-        self.__inner_protocol.receiver = protocol
-        protocol.connection_made(cast(asyncio.DatagramTransport, self))
-
 
 async def create_turn_endpoint(
     protocol_factory: Callable[[], _ProtocolT],
@@ -437,6 +449,36 @@ async def create_turn_endpoint(
     """
     Create datagram connection relayed over TURN.
     """
+    turn_transport = await create_turn_allocation(
+        server_addr,
+        username=username,
+        password=password,
+        lifetime=lifetime,
+        channel_refresh_time=channel_refresh_time,
+        ssl=ssl,
+        transport=transport,
+    )
+
+    # Once the allocation has succeeded, notify the protocol
+    # and start relaying received data.
+    protocol = protocol_factory()
+    turn_transport.attach(protocol)
+    return turn_transport, protocol
+
+
+async def create_turn_allocation(
+    server_addr: tuple[str, int],
+    username: Optional[str],
+    password: Optional[str],
+    lifetime: int = DEFAULT_ALLOCATION_LIFETIME,
+    channel_refresh_time: int = DEFAULT_CHANNEL_REFRESH_TIME,
+    ssl: Optional[Union[bool, ssl.SSLContext]] = None,
+    transport: str = "udp",
+) -> TurnTransport:
+    """
+    Create a TURN allocation that relays to nobody until
+    :meth:`TurnTransport.attach` is called.
+    """
     loop = asyncio.get_running_loop()
     inner_protocol: TurnClientProtocol
     inner_transport: asyncio.BaseTransport
@@ -469,11 +511,10 @@ async def create_turn_endpoint(
             sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, UDP_SOCKET_BUFFER_SIZE)
 
     try:
-        protocol = protocol_factory()
         turn_transport = TurnTransport(inner_protocol)
-        await turn_transport._connect(protocol)
-    except Exception:
+        await turn_transport._connect()
+    except BaseException:
         inner_transport.close()
         raise
 
-    return turn_transport, protocol
+    return turn_transport
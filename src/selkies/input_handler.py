@@ -53,6 +53,7 @@ import ctypes
 import fcntl
 import functools
 import logging
+import queue
 import select
 import struct
 import threading
@@ -79,6 +80,7 @@ from .display_utils import (
 )
 from .media_pipeline import RateControlMode
 from .settings import settings, WS_MAX_MESSAGE_BYTES
+from .x11_isolation import IsolatedClipboardMonitor, IsolatedXTestInjector
 try:
     from pixelflux import VirtualKeyboardUnavailable as PixelfluxVkUnavailable
 except Exception:
@@ -1003,13 +1005,18 @@ class _XTestKeyboard:
 
     Injects key events through the already-open self.xdisplay connection; a
     separate second X-display connection whose blocking sync could spin at
-    100% CPU inside connect() is deliberately avoided.
+    100% CPU inside connect() is deliberately avoided (the injector's own
+    connection is opened on its thread, never on the loop).
 
     Keysyms the layout lacks (Unicode, exotic symbols) bind on demand to spare
     keycodes past the base layout, so they inject in-process via XTEST instead
     of forking xdotool. The bindings are round-robin recycled; the reverse of
     TigerVNC/x0vncserver's XkbAddKeyKeysym, done through core
     ChangeKeyboardMapping.
+
+    With an _XTestInjector the key events themselves are queued to its thread,
+    in order with the pointer's; keymap lookups and rebinds stay on xdisplay,
+    and a rebind first waits for every queued key to reach the server.
     """
 
     # Settle after rebinding a RECYCLED keycode: the server applies the mapping
@@ -1017,8 +1024,10 @@ class _XTestKeyboard:
     # asynchronously and could translate the queued press with the old symbol.
     _RECYCLE_SETTLE_S = 0.01
 
-    def __init__(self, xdisplay: Any) -> None:
+    def __init__(self, xdisplay: Any,
+                 injector: Optional["_XTestInjector"] = None) -> None:
         self._d = xdisplay
+        self._inject = injector
         # XK_Shift_L; may be 0 on an exotic keymap (then capitals just skip shift).
         self._shift_kc = xdisplay.keysym_to_keycode(0xffe1)
         # XK_Shift_R: a client-held Shift may be down on either keycode.
@@ -1152,6 +1161,7 @@ class _XTestKeyboard:
         kc, needs_settle = self._alloc_overlay_keycode(keysym)
         # Assign the keysym at levels 0 and 1 so an accidental Shift can't change it.
         bind_value = overlay_bind_keysym(keysym)
+        self._settle_injected()
         self._d.change_keyboard_mapping(kc, [[bind_value, bind_value]])
         self._d.sync()
         if needs_settle:
@@ -1214,6 +1224,7 @@ class _XTestKeyboard:
             self._overlay_order.append(ks)
             assigns.append((kc, ks))
         assigns.sort()
+        self._settle_injected()
         i = 0
         while i < len(assigns):
             j = i
@@ -1228,6 +1239,24 @@ class _XTestKeyboard:
             time.sleep(self._RECYCLE_SETTLE_S)
         return True
 
+    def _settle_injected(self) -> None:
+        """Let every queued key reach the server before a keycode is rebound:
+        a press still queued would otherwise type the keycode's NEW glyph."""
+        if self._inject is not None:
+            self._inject.sync()
+
+    def fake_key(self, event_type: int, keycode: int) -> None:
+        """Queue (or write) one XTEST key event; flush() sends it."""
+        if self._inject is not None:
+            self._inject.event(event_type, keycode)
+        else:
+            xtest.fake_input(self._d, event_type, keycode)
+
+    def flush(self) -> None:
+        """Send the key events written so far (the injector flushes per batch)."""
+        if self._inject is None:
+            self._d.flush()
+
     def bindings_intact(self) -> bool:
         """True when every overlay binding still resolves to its keysym in the
         server's map. Distinguishes our own MappingNotify from a foreign layout
@@ -1378,22 +1407,22 @@ class _XTestKeyboard:
         # Ctrl+Shift+X keeps its held modifiers.
         lifted = self._mods_to_lift(set(mods), down) if neutralize else []
         for m in lifted:
-            xtest.fake_input(self._d, Xlib.X.KeyRelease, m)
+            self.fake_key(Xlib.X.KeyRelease, m)
         # Synthesize only modifiers not already down (a required Shift held on
         # either side counts); release only those on release().
         synth = [m for m in mods
                  if m not in down
                  and not (m == self._shift_kc and self._shift_r_kc in down)]
         for m in synth:
-            xtest.fake_input(self._d, Xlib.X.KeyPress, m)
+            self.fake_key(Xlib.X.KeyPress, m)
         if synth:
             self._synth_mods[keysym] = synth
-        xtest.fake_input(self._d, Xlib.X.KeyPress, kc)
+        self.fake_key(Xlib.X.KeyPress, kc)
         # Replay this exact keycode on release.
         self._pressed_kc[keysym] = kc
         for m in reversed(lifted):
-            xtest.fake_input(self._d, Xlib.X.KeyPress, m)
-        self._d.flush()
+            self.fake_key(Xlib.X.KeyPress, m)
+        self.flush()
 
     def release(self, keysym: int) -> None:
         # Replay the press-time keycode; only re-resolve if the press wasn't tracked
@@ -1401,17 +1430,22 @@ class _XTestKeyboard:
         kc = self._pressed_kc.pop(keysym, None)
         if kc is None:
             kc, _ = self._resolve(keysym)
-        xtest.fake_input(self._d, Xlib.X.KeyRelease, kc)
+        self.fake_key(Xlib.X.KeyRelease, kc)
         for m in reversed(self._synth_mods.pop(keysym, ())):
-            xtest.fake_input(self._d, Xlib.X.KeyRelease, m)
-        self._d.flush()
+            self.fake_key(Xlib.X.KeyRelease, m)
+        self.flush()
 
 
 class _XTestMouse:
-    """Mouse controller backed by the bundled python-xlib XTEST extension."""
+    """Mouse controller backed by the bundled python-xlib XTEST extension.
 
-    def __init__(self, xdisplay: Any) -> None:
+    Writes through an _XTestInjector when given one, else straight to xdisplay.
+    """
+
+    def __init__(self, xdisplay: Any,
+                 injector: Optional["_XTestInjector"] = None) -> None:
         self._d = xdisplay
+        self._inject = injector
 
     @property
     def position(self) -> tuple:
@@ -1422,31 +1456,168 @@ class _XTestMouse:
     @position.setter
     def position(self, xy: tuple) -> None:
         x, y = xy
+        if self._inject is not None:
+            self._inject.motion(int(x), int(y))
+            return
         xtest.fake_input(self._d, Xlib.X.MotionNotify, detail=False,
                          root=Xlib.X.NONE, x=int(x), y=int(y))
         self._d.flush()
 
     def scroll(self, dx: int, dy: int) -> None:
-        d = self._d
         # X core pointer scroll buttons: 4=up, 5=down, 6=left, 7=right. The sign
         # convention is the callers': positive dy scrolls up, positive dx right.
         def _clicks(btn, n):
             for _ in range(int(abs(n))):
-                xtest.fake_input(d, Xlib.X.ButtonPress, btn)
-                xtest.fake_input(d, Xlib.X.ButtonRelease, btn)
+                self._button(Xlib.X.ButtonPress, btn)
+                self._button(Xlib.X.ButtonRelease, btn)
         if dy:
             _clicks(4 if dy > 0 else 5, dy)
         if dx:
             _clicks(7 if dx > 0 else 6, dx)
-        d.flush()
+        self._flush()
 
     def press(self, button: int) -> None:
-        xtest.fake_input(self._d, Xlib.X.ButtonPress, int(button))
-        self._d.flush()
+        self._button(Xlib.X.ButtonPress, int(button))
+        self._flush()
 
     def release(self, button: int) -> None:
-        xtest.fake_input(self._d, Xlib.X.ButtonRelease, int(button))
-        self._d.flush()
+        self._button(Xlib.X.ButtonRelease, int(button))
+        self._flush()
+
+    def _button(self, event_type: int, button: int) -> None:
+        if self._inject is not None:
+            self._inject.event(event_type, button)
+        else:
+            xtest.fake_input(self._d, event_type, button)
+
+    def _flush(self) -> None:
+        if self._inject is None:
+            self._d.flush()
+
+
+class _XTestInjector:
+    """XTEST writer thread with an X connection of its own.
+
+    The event loop only queues pointer and key events; the worker drains
+    whatever queued since its last pass, encodes it as one FakeInput batch
+    and flushes once, so a high-rate pointer stream costs one socket write
+    per pass instead of one blocking write per event on the loop. Within a pass each run of
+    consecutive absolute motions collapses to its last position: a button,
+    key or relative event ends the run, so nothing is reordered or merged
+    across a transition. Under a flood the passes grow and coalesce more; at
+    rest each event is written as soon as it arrives.
+
+    The connection is opened on the worker thread (a slow server costs the
+    worker, not the loop) and reopened after a failure. Round trips that
+    must observe the injected events, such as a keymap rebind, call sync().
+    """
+
+    _MOTION, _RELATIVE, _EVENT, _SYNC = range(4)
+    # Floor between connection attempts after a failure; events queued in
+    # between are dropped, as they would be on a dead connection.
+    _RETRY_S = 1.0
+
+    def __init__(self, display_name: Optional[str] = None) -> None:
+        self._display_name = display_name
+        self._d = None
+        self._retry_at = 0.0
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.coalesced = 0
+        self._thread = threading.Thread(target=self._run, name="x-input-inject",
+                                        daemon=True)
+        self._thread.start()
+
+    def motion(self, x: int, y: int) -> None:
+        """Queue an absolute pointer move."""
+        self._queue.put((self._MOTION, x, y))
+
+    def relative(self, dx: int, dy: int) -> None:
+        """Queue a relative pointer move."""
+        self._queue.put((self._RELATIVE, dx, dy))
+
+    def event(self, event_type: int, detail: int) -> None:
+        """Queue a button or key press/release."""
+        self._queue.put((self._EVENT, event_type, detail))
+
+    def sync(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything queued so far was processed by the server.
+
+        Returns:
+            False when the worker did not get there within `timeout`
+            (INPUT_X_REPLY_TIMEOUT_S by default).
+        """
+        done = threading.Event()
+        self._queue.put((self._SYNC, done))
+        return done.wait(INPUT_X_REPLY_TIMEOUT_S if timeout is None else timeout)
+
+    def stop(self) -> None:
+        """Write what is queued, then close the connection and end the thread."""
+        self._queue.put(None)
+
+    def _connect(self) -> Any:
+        if self._d is None and time.monotonic() >= self._retry_at:
+            try:
+                self._d = display.Display(self._display_name,
+                                          blocking_timeout=INPUT_X_REPLY_TIMEOUT_S)
+            except Exception as e:
+                self._retry_at = time.monotonic() + self._RETRY_S
+                logger_webrtc_input.error(f"XTEST injector could not connect: {e}")
+        return self._d
+
+    def _close(self) -> None:
+        d, self._d = self._d, None
+        if d is not None:
+            try:
+                d.close()
+            except Exception:
+                pass
+
+    def _run(self) -> None:
+        get, get_nowait = self._queue.get, self._queue.get_nowait
+        motion, relative, event, sync = (self._MOTION, self._RELATIVE,
+                                         self._EVENT, self._SYNC)
+        while True:
+            batch = [get()]
+            try:
+                while batch[-1] is not None:
+                    batch.append(get_nowait())
+            except queue.Empty:
+                pass
+            stopping = batch[-1] is None
+            if stopping:
+                batch.pop()
+            d = self._connect()
+            waiters = []
+            events = []
+            try:
+                last = len(batch) - 1
+                for i, op in enumerate(batch):
+                    kind = op[0]
+                    if kind == motion:
+                        if i < last and batch[i + 1][0] == motion:
+                            self.coalesced += 1
+                            continue
+                        events.append((X.MotionNotify, False, op[1], op[2]))
+                    elif kind == event:
+                        events.append((op[1], op[2], 0, 0))
+                    elif kind == relative:
+                        events.append((X.MotionNotify, True, op[1], op[2]))
+                    elif kind == sync:
+                        waiters.append(op[1])
+                if d is not None:
+                    xtest.fake_input_batch(d, events)
+                    if waiters:
+                        d.sync()
+                    else:
+                        d.flush()
+            except Exception as e:
+                logger_webrtc_input.warning(f"XTEST injection failed, reconnecting: {e}")
+                self._close()
+            for done in waiters:
+                done.set()
+            if stopping:
+                self._close()
+                return
 
 
 logger_webrtc_input = logging.getLogger("webrtc_input")
@@ -1845,6 +2016,21 @@ def get_evdev_events_packed(ev_type: int, ev_code: int, ev_value: float,
     syn_event_data = struct.pack(event_fmt, ts_sec, ts_usec, EV_SYN, SYN_REPORT, 0)
     return event_data + syn_event_data
 
+_EVDEV_EVENT_STRUCTS = {64: struct.Struct("=qqHHi"), 32: struct.Struct("=llHHi")}
+
+def get_evdev_frame_packed(events: list, client_arch_bits: int) -> bytes:
+    """Pack several (type, code, value) events as one frame: the events, then a
+    single SYN_REPORT, all sharing one timestamp. Same layout per event as
+    get_evdev_events_packed."""
+    now = time.time()
+    ts_sec = int(now)
+    ts_usec = int((now - ts_sec) * 1_000_000)
+    pack = _EVDEV_EVENT_STRUCTS[64 if client_arch_bits == 64 else 32].pack
+    parts = [pack(ts_sec, ts_usec, ev_type, ev_code, int(ev_value))
+             for ev_type, ev_code, ev_value in events]
+    parts.append(pack(ts_sec, ts_usec, EV_SYN, SYN_REPORT, 0))
+    return b"".join(parts)
+
 def normalize_axis_value(client_value: float, is_trigger: bool, is_hat: bool,
                          for_js_event: bool = False) -> int:
     """Normalize a client axis value into the evdev/joydev range.
@@ -2129,8 +2315,9 @@ class UInputGamepad:
             if entry.startswith(("event", "js"))
         )
 
-    def emit(self, ev_type: int, ev_code: int, ev_value: float) -> None:
-        os.write(self.fd, get_evdev_events_packed(ev_type, ev_code, ev_value, LOCAL_ARCH_BITS))
+    def emit(self, events: list) -> None:
+        """Write (type, code, value) events as one SYN_REPORT frame."""
+        os.write(self.fd, get_evdev_frame_packed(events, LOCAL_ARCH_BITS))
 
     def destroy(self) -> None:
         if self.fd is None:
@@ -2267,13 +2454,13 @@ class SelkiesGamepad:
                 "so applications cannot open it. Add the account to the 'input' group."
             )
 
-    def _emit_uinput(self, ev_type: int, ev_code: int, ev_value: float) -> None:
-        """Mirror one event onto the kernel device, tearing it down on write failure."""
+    def _emit_uinput(self, events: list) -> None:
+        """Mirror one frame onto the kernel device, tearing it down on write failure."""
         self.ensure_uinput()
         if self.uinput is None:
             return
         try:
-            self.uinput.emit(ev_type, ev_code, ev_value)
+            self.uinput.emit(events)
         except OSError as e:
             logger_selkies_gamepad.error(
                 f"Gamepad {self.js_sock_path}: kernel device write failed ({e}); tearing it down."
@@ -2625,61 +2812,118 @@ class SelkiesGamepad:
             parts.append(get_js_event_packed(JS_EVENT_AXIS | JS_EVENT_INIT, idx, value))
         return b"".join(parts)
 
+    # Hats carry the d-pad, whose taps are edges like buttons; sticks and
+    # triggers are levels, where only the latest sample matters.
+    _LEVEL_AXIS_EXCLUDED = frozenset((ABS_HAT0X, ABS_HAT0Y))
+
+    @classmethod
+    def _frame_events(cls, batch: list) -> list:
+        """Split a drained batch into frames of `(js_parts, evdev_events)`.
+
+        Stick and trigger updates coalesce in place to the latest value per
+        axis. A button or hat that already changed in the current frame starts
+        a new one instead, so a tap inside one batch still reaches every client
+        as a press and a release.
+        """
+        frames = []
+        js_parts: list = []
+        evdev_events: list = []
+        slots: dict = {}
+        for event_package in batch:
+            js_data = event_package.get('js_event_data')
+            template = event_package.get('evdev_event_template')
+            key = (template[0], template[1]) if template else None
+            level = (key is not None and key[0] == EV_ABS
+                     and key[1] not in cls._LEVEL_AXIS_EXCLUDED)
+            slot = slots.get(key) if key is not None else None
+            if slot is not None and level:
+                js_index, evdev_index = slot
+                if js_index is not None and js_data:
+                    js_parts[js_index] = js_data
+                if evdev_index is not None:
+                    evdev_events[evdev_index] = template
+                continue
+            if slot is not None:
+                frames.append((js_parts, evdev_events))
+                js_parts, evdev_events, slots = [], [], {}
+            js_index = evdev_index = None
+            if js_data:
+                js_index = len(js_parts)
+                js_parts.append(js_data)
+            if template:
+                evdev_index = len(evdev_events)
+                evdev_events.append(template)
+            if key is not None:
+                slots[key] = (js_index, evdev_index)
+        if js_parts or evdev_events:
+            frames.append((js_parts, evdev_events))
+        return frames
+
+    async def _write_client(self, writer: asyncio.StreamWriter, data: bytes,
+                            label: str) -> None:
+        """Write one client's share of a wakeup with a bounded drain: a game
+        that stops reading its socket must not hold up the other consumers."""
+        try:
+            writer.write(data)
+            await asyncio.wait_for(writer.drain(), timeout=1.0)
+        except asyncio.TimeoutError:
+            logger_selkies_gamepad.warning(f"Gamepad {self.js_sock_path}: {label} stalled; closing it.")
+            writer.close()
+        except (ConnectionResetError, BrokenPipeError):
+            pass
+        except Exception as e:
+            logger_selkies_gamepad.error(f"Error sending to {label}: {e}", exc_info=True)
+
     async def _process_event_queue(self) -> None:
-        """Drain the event queue, fanning each event out to JS, EVDEV, and
-        uinput consumers with bounded per-client drains."""
+        """Drain the event queue, fanning each wakeup's events out to JS, EVDEV,
+        and uinput consumers.
+
+        Every wakeup takes all queued events at once and frames them (see
+        _frame_events). Each client gets one buffer per wakeup, packed once per
+        client architecture, and all clients are written concurrently.
+        """
         logger_selkies_gamepad.info(f"Gamepad {self.js_sock_path}: Event processor started.")
         while self.running:
             try:
-                event_package = await self.events_queue.get()
-                # None is the sentinel for shutdown.
-                if event_package is None:
+                batch = [await self.events_queue.get()]
+                while not self.events_queue.empty():
+                    batch.append(self.events_queue.get_nowait())
+                for _ in batch:
                     self.events_queue.task_done()
-                    break
-                
-                logger_selkies_gamepad.debug(f"Gamepad {self.js_sock_path}: Dequeued event: {event_package}")
-                
-                js_data = event_package.get('js_event_data')
-                evdev_template = event_package.get('evdev_event_template') 
+                # None is the sentinel for shutdown; what precedes it still goes out.
+                stopping = None in batch
+                if stopping:
+                    batch = batch[:batch.index(None)]
+
+                logger_selkies_gamepad.debug(f"Gamepad {self.js_sock_path}: Dequeued {len(batch)} events.")
+                frames = self._frame_events(batch)
 
-                # Send to JS clients
+                js_data = b"".join(b"".join(js_parts) for js_parts, _ in frames)
+                evdev_frames = [events for _, events in frames if events]
+                evdev_by_arch: dict = {}
+                for events in evdev_frames:
+                    self._emit_uinput(events)
+
+                writes = []
                 if js_data:
-                    for i, (writer, _client_info) in enumerate(list(self.js_clients.items())):
+                    for i, writer in enumerate(list(self.js_clients)):
                         if not writer.is_closing():
-                            try:
-                                writer.write(js_data)
-                                # Bounded: a game that stops reading its socket must
-                                # not freeze this gamepad's event processor for the
-                                # other consumers.
-                                await asyncio.wait_for(writer.drain(), timeout=1.0)
-                                logger_selkies_gamepad.debug(f"Gamepad {self.js_sock_path}: JS event drained to client #{i}.")
-                            except asyncio.TimeoutError:
-                                logger_selkies_gamepad.warning(f"Gamepad {self.js_sock_path}: JS client #{i} stalled; closing it.")
-                                writer.close()
-                            except (ConnectionResetError, BrokenPipeError): pass
-                            except Exception as e:
-                                logger_selkies_gamepad.error(f"Error sending to JS client #{i}: {e}", exc_info=True)
-                
-                # Send to EVDEV clients
-                if evdev_template:
-                    ev_type, ev_code, ev_value = evdev_template
-                    self._emit_uinput(ev_type, ev_code, ev_value)
+                            writes.append(self._write_client(writer, js_data, f"JS client #{i}"))
+                if evdev_frames:
                     for i, (writer, client_info) in enumerate(list(self.evdev_clients.items())):
-                        if not writer.is_closing():
-                            try:
-                                client_arch_bits = client_info.get('arch_bits', 64) 
-                                evdev_data = get_evdev_events_packed(ev_type, ev_code, ev_value, client_arch_bits)
-                                writer.write(evdev_data)
-                                await asyncio.wait_for(writer.drain(), timeout=1.0)
-                                logger_selkies_gamepad.debug(f"Gamepad {self.js_sock_path}: EVDEV event drained to client #{i}.")
-                            except asyncio.TimeoutError:
-                                logger_selkies_gamepad.warning(f"Gamepad {self.js_sock_path}: EVDEV client #{i} stalled; closing it.")
-                                writer.close()
-                            except (ConnectionResetError, BrokenPipeError): pass
-                            except Exception as e:
-                                logger_selkies_gamepad.error(f"Error sending to EVDEV client #{i}: {e}", exc_info=True)
-                
-                self.events_queue.task_done()
+                        if writer.is_closing():
+                            continue
+                        arch_bits = client_info.get('arch_bits', 64)
+                        evdev_data = evdev_by_arch.get(arch_bits)
+                        if evdev_data is None:
+                            evdev_data = evdev_by_arch[arch_bits] = b"".join(
+                                get_evdev_frame_packed(events, arch_bits)
+                                for events in evdev_frames)
+                        writes.append(self._write_client(writer, evdev_data, f"EVDEV client #{i}"))
+                if writes:
+                    await asyncio.gather(*writes)
+                if stopping:
+                    break
             except asyncio.CancelledError:
                 logger_selkies_gamepad.info(f"Gamepad {self.js_sock_path}: Event processor task cancelled.")
                 break
@@ -2837,7 +3081,12 @@ class WebRTCInput:
         wayland_socket_index: int = 0,
         app_wayland_display: str = "",
         uinput_gamepad: str = "auto",
+        x11_isolation: bool = False,
     ) -> None:
+        # Host XTEST injection and the X11 clipboard monitor in helper
+        # processes (x11_isolation) so their pure-Python X work has a GIL of
+        # its own.
+        self.x11_isolation = x11_isolation
         self.wayland_socket_index = wayland_socket_index
         # Socket of the compositor apps run under (input + clipboard target) when
         # it differs from the pixelflux capture compositor; resolved lazily since
@@ -2934,6 +3183,9 @@ class WebRTCInput:
         self.keyboard = None
         self.mouse = None
         self.xdisplay = None
+        # XTEST writer thread shared by keyboard and mouse (X11 only); it keeps
+        # its own connection, so it outlives an xdisplay reconnect.
+        self.x_injector: Optional[_XTestInjector] = None
         self.button_mask = 0
         self.last_x = -1
         self.last_y = -1
@@ -3117,7 +3369,7 @@ class WebRTCInput:
         except Exception:
             logger_webrtc_input.debug("command_error notify failed", exc_info=True)
 
-    def __keyboard_connect(self) -> None: self.keyboard = _XTestKeyboard(self.xdisplay) if self.xdisplay else None
+    def __keyboard_connect(self) -> None: self.keyboard = _XTestKeyboard(self.xdisplay, self.x_injector) if self.xdisplay else None
 
     def _apply_input_x_reply_bound(self) -> None:
         """Bound the wait for an X REPLY on the shared input connection so an
@@ -3247,7 +3499,7 @@ class WebRTCInput:
         self._arm_x_event_watcher()
         self.__keyboard_connect()
         if not self.is_wayland:
-            self.mouse = _XTestMouse(self.xdisplay)
+            self.mouse = _XTestMouse(self.xdisplay, self.x_injector)
         if self.cursors_running:
             try:
                 screen = self.xdisplay.screen()
@@ -3299,7 +3551,7 @@ class WebRTCInput:
             logger_webrtc_input.info(f"Connecting to uinput mouse socket: {self.uinput_mouse_socket_path}")
             self.uinput_mouse_socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
         if not self.is_wayland and self.xdisplay:
-            self.mouse = _XTestMouse(self.xdisplay)
+            self.mouse = _XTestMouse(self.xdisplay, self.x_injector)
     def __mouse_disconnect(self) -> None:
         if self.mouse: del self.mouse; self.mouse = None
         if self.uinput_mouse_socket is not None:
@@ -3420,6 +3672,9 @@ class WebRTCInput:
             if self._x_event_wake is None:
                 self._x_event_wake = asyncio.Event()
             self._arm_x_event_watcher()
+            if self.xdisplay is not None and self.x_injector is None:
+                self.x_injector = (IsolatedXTestInjector() if self.x11_isolation
+                                   else _XTestInjector())
         if self.xdisplay:
             try:
                 screen = self.xdisplay.screen()
@@ -3521,6 +3776,10 @@ class WebRTCInput:
         # otherwise stay pressed in the desktop with nothing left to release it.
         await self.release_mouse_buttons()
         self.__mouse_disconnect()
+        if self.x_injector is not None:
+            # Queued behind the releases above, so they are still written.
+            self.x_injector.stop()
+            self.x_injector = None
         self._disarm_x_event_watcher()
         # Closed, not just dropped: the keyboard shim holds the same Display and
         # python-xlib's root-window back-reference makes the graph a cycle with no
@@ -3814,10 +4073,20 @@ class WebRTCInput:
         # server Lock inverts every letter — typing uppercase, with Shift yielding
         # lowercase. CapsLock is not forwarded from the browser, but a prior session
         # or the desktop's own startup can leave Lock engaged; toggle it back off.
+        # The releases above are still queued on the injector's own connection:
+        # sync it first, or a pending Caps_Lock event leaves the Lock read stale
+        # and the toggle below would engage Lock instead of clearing it.
         try:
-            if self.xdisplay.screen().root.query_pointer().mask & Xlib.X.LockMask:
+            if self.x_injector and not await asyncio.to_thread(
+                    self.x_injector.sync, INPUT_X_REPLY_TIMEOUT_S):
+                logger_webrtc_input.warning(
+                    "Could not normalize Lock modifier: injector sync timed out")
+            elif self.xdisplay.screen().root.query_pointer().mask & Xlib.X.LockMask:
                 caps_kc = self.xdisplay.keysym_to_keycode(0xffe5)
-                if caps_kc:
+                if caps_kc and self.x_injector:
+                    self.x_injector.event(Xlib.X.KeyPress, caps_kc)
+                    self.x_injector.event(Xlib.X.KeyRelease, caps_kc)
+                elif caps_kc:
                     xtest.fake_input(self.xdisplay, Xlib.X.KeyPress, caps_kc)
                     xtest.fake_input(self.xdisplay, Xlib.X.KeyRelease, caps_kc)
                     self.xdisplay.flush()
@@ -3867,6 +4136,8 @@ class WebRTCInput:
             if self.uinput_mouse_socket_path:
                 self.__mouse_emit(UINPUT_REL_X, x, syn=False)
                 self.__mouse_emit(UINPUT_REL_Y, y)
+            elif self.x_injector:
+                self.x_injector.relative(x, y)
             elif self.xdisplay:
                 xtest.fake_input(self.xdisplay, Xlib.X.MotionNotify, detail=True, root=Xlib.X.NONE, x=x, y=y)
                 # flush() (send, no round-trip) suffices — XTEST needs no reply; sync()
@@ -4000,6 +4271,9 @@ class WebRTCInput:
             if allow_xtest and xtest is not None and self.xdisplay is not None:
                 try:
                     keycode = self.xdisplay.keysym_to_keycode(keysym)
+                    if keycode and self.x_injector:
+                        self.x_injector.event(X.KeyPress if down else X.KeyRelease, keycode)
+                        return
                     if keycode:
                         xtest.fake_input(
                             self.xdisplay,
@@ -4086,16 +4360,16 @@ class WebRTCInput:
                     self.active_modifiers & self.LEVEL_MODIFIER_KEYSYMS)
                 lifted = self.keyboard._mods_to_lift(set(), down)
             for m in lifted:
-                xtest.fake_input(self.keyboard._d, Xlib.X.KeyRelease, m)
+                self.keyboard.fake_key(Xlib.X.KeyRelease, m)
             try:
                 for ks in keysyms:
                     self.keyboard.press(ks)
                     self.keyboard.release(ks)
             finally:
                 for m in reversed(lifted):
-                    xtest.fake_input(self.keyboard._d, Xlib.X.KeyPress, m)
+                    self.keyboard.fake_key(Xlib.X.KeyPress, m)
                 if lifted:
-                    self.keyboard._d.flush()
+                    self.keyboard.flush()
             return True
         except Exception as e:
             logger_webrtc_input.debug(f"in-process type failed ({e}); falling back to xdotool")
@@ -4643,7 +4917,7 @@ class WebRTCInput:
                 
             self.button_mask = button_mask
 
-        if not relative and self.xdisplay:
+        if not relative and self.xdisplay and not self.x_injector:
             # flush() (send, no round-trip) suffices for the injected events; sync()
             # would add a blocking server round-trip per mouse event.
             self.xdisplay.flush()
@@ -5231,7 +5505,8 @@ class WebRTCInput:
         if self.is_wayland or not X11_LIBS_AVAILABLE:
             return None
         try:
-            self._x11_clipboard_monitor = _X11ClipboardMonitor()
+            self._x11_clipboard_monitor = (IsolatedClipboardMonitor() if self.x11_isolation
+                                           else _X11ClipboardMonitor())
             self._x11_monitor_unavail_logged = False
             logger_webrtc_input.info("X11 clipboard: XFixes event monitor active (no polling).")
         except Exception as e:
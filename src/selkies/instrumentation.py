@@ -0,0 +1,191 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Always-on timing hooks for the streaming hot paths.
+
+Frame jitter can come from the encoder, the fan-out, the senders or a stalled
+event loop, and telling them apart needs numbers from inside the pipeline.
+This module is the seam between the hot paths and whatever exports those
+numbers (``webrtc_utils.Metrics``, when the metrics endpoint is on):
+
+- :func:`observe_stage` records how long a frame spent in one pipeline stage.
+  With no sink installed it is a global read and a ``None`` check, so the hot
+  paths call it unconditionally.
+- :func:`track_queue` registers a zero-argument callable reporting a queue's
+  depth. Probes are only called when the metrics are scraped.
+- :class:`LoopMonitor` measures event loop lag with one short sleep per
+  interval, and a watchdog thread that samples the loop thread's stack only
+  while a callback is overrunning, naming the offender.
+
+The module only depends on the standard library, so the vendored WebRTC
+stack can import it.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Seconds between loop lag samples.
+LOOP_LAG_INTERVAL = 0.1
+# A loop callback running longer than this is counted as a slow callback.
+SLOW_CALLBACK_SECONDS = 0.1
+# Distinct slow callback names exported before the rest are counted as "other".
+MAX_SLOW_CALLBACK_NAMES = 32
+
+_sink: Optional[Any] = None
+_queues: Dict[str, Callable[[], int]] = {}
+
+
+def install(sink: Any) -> None:
+    """Send stage timings to `sink`, which must have an
+    ``observe_stage(stage, seconds)`` method."""
+    global _sink
+    _sink = sink
+
+
+def uninstall(sink: Any) -> None:
+    """Stop sending stage timings to `sink`, if it is the installed one."""
+    global _sink
+    if _sink is sink:
+        _sink = None
+
+
+def observe_stage(stage: str, seconds: float) -> None:
+    """Record that one item spent `seconds` in pipeline stage `stage`."""
+    sink = _sink
+    if sink is not None:
+        sink.observe_stage(stage, seconds)
+
+
+def track_queue(name: str, probe: Callable[[], int]) -> None:
+    """Report `probe()` as the depth of queue `name` whenever metrics are
+    collected. Replaces an earlier probe of the same name."""
+    _queues[name] = probe
+
+
+def untrack_queue(name: str, probe: Optional[Callable[[], int]] = None) -> None:
+    """Stop reporting queue `name`; with `probe`, only if it is still the
+    registered one."""
+    if probe is None or _queues.get(name) == probe:
+        _queues.pop(name, None)
+
+
+def queue_depths() -> Dict[str, int]:
+    """Current depth of every tracked queue. A failing probe is skipped."""
+    depths = {}
+    for name, probe in list(_queues.items()):
+        try:
+            depths[name] = int(probe())
+        except Exception:
+            logger.debug("Queue depth probe %s failed", name, exc_info=True)
+    return depths
+
+
+def _describe(frame: Any) -> str:
+    """Name the code a stalled loop thread is running: the innermost selkies
+    function on the stack, else the innermost function."""
+    innermost = frame
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module == "selkies" or module.startswith("selkies."):
+            break
+        frame = frame.f_back
+    if frame is None:
+        frame = innermost
+        module = frame.f_globals.get("__name__", "?")
+    code = frame.f_code
+    return f"{module}.{getattr(code, 'co_qualname', code.co_name)}"
+
+
+class LoopMonitor:
+    """Event loop lag and slow callback sampling for one loop.
+
+    A task on the loop sleeps `interval` seconds at a time and reports how
+    late each sleep returns as ``sink.observe_loop_lag(seconds)``. A watchdog
+    thread checks the task's heartbeat every `interval`; once it is more than
+    `slow` seconds overdue, the loop thread's current stack is sampled and
+    ``sink.count_slow_callback(name)`` is called once for that stall.
+
+    Args:
+        sink: Receiver of the samples.
+        interval: Seconds between lag samples and watchdog checks.
+        slow: Overrun past the interval that counts as a slow callback.
+    """
+
+    def __init__(self, sink: Any, interval: float = LOOP_LAG_INTERVAL,
+                 slow: float = SLOW_CALLBACK_SECONDS) -> None:
+        self.sink = sink
+        self.interval = interval
+        self.slow = slow
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._loop_thread_id = 0
+        self._beat = 0.0
+        self._names: set = set()
+
+    def start(self) -> None:
+        """Start sampling the running loop. Must be called on its thread."""
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._beat = time.perf_counter()
+        self._stopped.clear()
+        self._task = self._loop.create_task(self._run(), name="LoopMonitor")
+        self._thread = threading.Thread(
+            target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling. Safe to call from any thread."""
+        self._stopped.set()
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            try:
+                self._loop.call_soon_threadsafe(task.cancel)
+            except RuntimeError:
+                pass
+        thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=self.interval * 2)
+
+    async def _run(self) -> None:
+        interval = self.interval
+        clock = time.perf_counter
+        while True:
+            start = clock()
+            self._beat = start
+            await asyncio.sleep(interval)
+            self.sink.observe_loop_lag(max(clock() - start - interval, 0.0))
+
+    def _watch(self) -> None:
+        reported = 0.0
+        while not self._stopped.wait(self.interval):
+            beat = self._beat
+            if beat == reported:
+                continue
+            if time.perf_counter() - beat < self.interval + self.slow:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            reported = beat
+            name = _describe(frame)
+            del frame
+            if name not in self._names:
+                if len(self._names) >= MAX_SLOW_CALLBACK_NAMES:
+                    name = "other"
+                else:
+                    self._names.add(name)
+            try:
+                self.sink.count_slow_callback(name)
+            except Exception:
+                logger.debug("Slow callback sample failed", exc_info=True)
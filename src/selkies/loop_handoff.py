@@ -0,0 +1,85 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Coalesced handoff of encoded chunks from a capture thread to the loop.
+
+pixelflux calls back on its own thread once per encoded chunk, and in striped
+modes that is dozens of chunks per frame. Scheduling each one with
+``loop.call_soon_threadsafe`` costs a self-pipe write and a loop wakeup per
+chunk. A handoff instead appends the chunk to a lock-protected list and only
+schedules the loop when the list goes from empty to non-empty; the loop then
+takes everything queued so far and passes it to the drain callback in one go.
+
+Chunks keep their order and none is dropped here: the per-client relays
+downstream already decide what to skip.
+
+A handoff given a stage name reports, once per batch, how long the batch's
+oldest chunk waited for the loop (see ``selkies.instrumentation``).
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Callable, List, Optional
+
+from .instrumentation import observe_stage
+
+
+class LoopHandoff:
+    """One producer thread's queue of chunks for one asyncio loop.
+
+    Args:
+        loop: Loop the drain callback runs on.
+        drain: Called on the loop with every chunk queued since its last call,
+            oldest first. Never called with an empty list.
+        stage: Pipeline stage name the wait for the loop is reported under,
+            or None.
+    """
+
+    __slots__ = ('loop', 'wakeups', 'stage', '_drain', '_lock', '_items',
+                 '_scheduled', '_since')
+
+    def __init__(self, loop: asyncio.AbstractEventLoop,
+                 drain: Callable[[List[Any]], None],
+                 stage: Optional[str] = None) -> None:
+        self.loop = loop
+        self.stage = stage
+        # Loop wakeups requested so far (one per empty-to-non-empty transition).
+        self.wakeups = 0
+        self._drain = drain
+        self._lock = threading.Lock()
+        self._items: List[Any] = []
+        self._scheduled = False
+        self._since = 0.0
+
+    def put(self, item: Any) -> None:
+        """Queue `item` from the producer thread, waking the loop if it is idle.
+
+        Raises:
+            RuntimeError: When the loop is closed; the item is discarded.
+        """
+        with self._lock:
+            self._items.append(item)
+            if self._scheduled:
+                return
+            self._scheduled = True
+            self._since = time.perf_counter()
+        try:
+            self.loop.call_soon_threadsafe(self._run)
+        except RuntimeError:
+            with self._lock:
+                self._items.clear()
+                self._scheduled = False
+            raise
+        self.wakeups += 1
+
+    def _run(self) -> None:
+        with self._lock:
+            items, self._items = self._items, []
+            self._scheduled = False
+            since = self._since
+        if items:
+            if self.stage is not None:
+                observe_stage(self.stage, time.perf_counter() - since)
+            self._drain(items)
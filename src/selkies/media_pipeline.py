@@ -23,8 +23,9 @@
 
 Owns one display's capture: pixelflux encodes H.264 on its own capture
 thread, pcmflux encodes Opus on its own audio thread, and both hand
-zero-copy buffers back into the asyncio loop via `call_soon_threadsafe` for
-the transport's `produce_data` to packetize as RTP. Because RTP senders are
+zero-copy buffers back into the asyncio loop (video through a `LoopHandoff`
+that batches chunks per wakeup, audio via `call_soon_threadsafe`) for the
+transport's `produce_data` to packetize as RTP. Because RTP senders are
 live across capture restarts, the pipeline keeps its own monotonic pts
 clocks (video: 90 kHz wall-clock anchor; audio: an epoch offset over
 pcmflux's re-zeroing sample clock) so pts never jumps backward.
@@ -47,10 +48,11 @@ import re
 import time
 from enum import Enum
 from abc import ABCMeta, abstractmethod
-from typing import Any, Callable, Dict, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from .settings import settings as app_settings
 from .display_utils import apply_common_capture_settings, format_pixelflux_cursor
+from .loop_handoff import LoopHandoff
 
 # C-API (non-abi3) wheels: a missing/ABI-skewed build raises ImportError or
 # RuntimeError at import. Degrade to None so plain WS mode and module import
@@ -217,6 +219,9 @@ class MediaPipelinePixel(MediaPipeline):
         # restarts and fps changes can never rewind pts on a live RTP sender.
         self._video_pts_anchor: Optional[float] = None
         self._last_video_pts = -1
+        # Capture-thread -> loop handoff of (buffer, pts) video chunks.
+        self._video_handoff = LoopHandoff(async_event_loop, self._deliver_video,
+                                          stage="webrtc_handoff")
         # Audio pts continuity: pcmflux's sample clock re-zeros on every capture
         # restart, which is a backward RTP jump on a live sender. Anchor each new
         # capture epoch one frame step past the last emitted pts instead. Only
@@ -536,16 +541,19 @@ class MediaPipelinePixel(MediaPipeline):
                 if pts <= self._last_video_pts:
                     pts = self._last_video_pts + 1
                 self._last_video_pts = pts
-                # consume_data is synchronous, so the lighter call_soon_threadsafe
-                # is enough -- no per-frame Future/Task allocation -- matching the
-                # websockets path.
-                self.async_event_loop.call_soon_threadsafe(
-                    self.produce_data, data_bytes, pts, "video"
-                )
+                # consume_data is synchronous, so no per-frame Future/Task is
+                # needed; the handoff wakes the loop once per batch of chunks
+                # rather than once per chunk, matching the websockets path.
+                self._video_handoff.put((data_bytes, pts))
 
         except Exception as e:
             logger.error(f"Error in capture callback: {e}", exc_info=False)
 
+    def _deliver_video(self, chunks: List[Tuple[memoryview, int]]) -> None:
+        """Pass a batch of handed-off video chunks to `produce_data`, in order."""
+        for data_bytes, pts in chunks:
+            self.produce_data(data_bytes, pts, "video")
+
     def _pixelflux_cursor_handler(
         self, msg_type: str, data_bytes: Optional[bytes], hot_x: int, hot_y: int
     ) -> None:
@@ -743,8 +751,8 @@ class MediaPipelinePixel(MediaPipeline):
                 """Deliver one Opus frame; runs on the pcmflux capture thread."""
                 try:
                     if len(frame) > 0:
-                        # zero-copy view; consume_data wraps it in av.Packet(buf) (zero-copy)
-                        # and keeps a reference so `frame` stays alive.
+                        # zero-copy view; it keeps `frame` alive until consume_data
+                        # copies it once into the EncodedAudioFrame all senders share.
                         data_bytes = memoryview(frame)
                         # Map the per-capture sample clock onto a continuous one:
                         # pcmflux re-zeros pts on every start, and a backward RTP
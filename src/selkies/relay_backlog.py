@@ -0,0 +1,166 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""Per-client video backlog that coalesces stripes instead of flushing.
+
+A websockets video relay queues the encoded chunks one client has not been
+sent yet. Both stripe formats carry their stripe row (wire-header y_start,
+bytes 4:6), and the row is what the queue is organised by:
+
+- JPEG chunks (0x03) are complete images of their row, so a newer chunk for a
+  row replaces the one still queued, in its place. The backlog then holds at
+  most one chunk per row whatever the client's link, and every row keeps its
+  turn: appending the replacement instead would let the top rows starve the
+  rest whenever the whole screen repaints faster than the link drains. The
+  replacement carries a newer frame id than the chunks queued behind it, so
+  pop() relabels a JPEG chunk that would step back to the newest id already
+  sent: the client ACKs and groups stripes by that id, and must see it only
+  grow. The relabelled chunk is a copy; shared items are never modified.
+- H.264 chunks (0x04) chain per row. An IDR supersedes everything still
+  queued for its row, which is unlinked where it sits. Past the byte budget
+  an incoming delta is dropped and only its row is gated until that row's
+  next IDR; rows whose chain is intact keep flowing. The backlog holds at
+  most the budget plus one IDR per row.
+
+Anything else is queued as-is, and dropped past the byte budget.
+"""
+
+from collections import deque
+from typing import Deque, Dict, List, Optional, Set
+
+WIRE_JPEG = 0x03
+WIRE_H264 = 0x04
+
+
+class RelayBacklog:
+    """One client's queue of not-yet-sent video chunks.
+
+    Items are fan-out dicts whose `data` is the wire chunk; they are shared
+    between every client's backlog and never modified.
+    """
+
+    __slots__ = ('budget', 'bytes', 'live_rows', 'drops', '_queue', '_rows', '_dead',
+                 '_sent_id')
+
+    def __init__(self, budget: int) -> None:
+        self.budget = budget
+        self.bytes = 0
+        # H.264 rows whose IDR this client will receive: only their delta
+        # chunks are chain-continuous for it. Empty means fully gated.
+        self.live_rows: Set[int] = set()
+        # Rows gated by a budget overflow.
+        self.drops = 0
+        # Entries are [item, row]; a superseded entry has its item set to
+        # None and is skipped when it reaches the head, or compacted away
+        # once the dead outnumber the queued.
+        self._queue: Deque[List] = deque()
+        self._rows: Dict[int, Deque[List]] = {}
+        self._dead = 0
+        # Newest JPEG frame id popped while chunks were still queued behind
+        # it; None once the queue drains, as nothing can be out of order then.
+        self._sent_id: Optional[int] = None
+
+    def __len__(self) -> int:
+        return len(self._queue) - self._dead
+
+    def offer(self, item: dict) -> Optional[bool]:
+        """Queue, coalesce, or drop one chunk.
+
+        Returns:
+            None when the chunk was queued and nothing was lost; False when it
+            was gated on a row still waiting for its IDR, or dropped past the
+            budget; True when this offer broke a row's chain (it needs a
+            keyframe).
+        """
+        data = item['data']
+        size = len(data)
+        kind = data[0] if size >= 6 else None
+        row = ((data[4] << 8) | data[5]) if kind in (WIRE_JPEG, WIRE_H264) else None
+        if kind == WIRE_JPEG:
+            entries = self._rows.get(row)
+            if entries:
+                entry = entries[0]
+                self.bytes += size - len(entry[0]['data'])
+                entry[0] = item
+                return None
+        elif kind == WIRE_H264:
+            if size >= 10 and data[1] == 0x01:
+                self._unlink_row(row)
+                self.live_rows.add(row)
+            elif row not in self.live_rows:
+                return False
+            elif len(self) and self.bytes + size > self.budget:
+                self.live_rows.discard(row)
+                self.drops += 1
+                return True
+        elif len(self) and self.bytes + size > self.budget:
+            return False
+        entry = [item, row]
+        self._queue.append(entry)
+        if row is not None:
+            entries = self._rows.get(row)
+            if entries is None:
+                entries = self._rows[row] = deque()
+            entries.append(entry)
+        self.bytes += size
+        return None
+
+    def pop(self) -> Optional[dict]:
+        """The oldest queued chunk, or None when nothing is queued."""
+        queue = self._queue
+        while queue:
+            item, row = queue.popleft()
+            if item is None:
+                self._dead -= 1
+                continue
+            if row is not None:
+                entries = self._rows[row]
+                entries.popleft()
+                if not entries:
+                    del self._rows[row]
+            data = item['data']
+            self.bytes -= len(data)
+            if row is not None and data[0] == WIRE_JPEG:
+                item = self._monotonic(item)
+            if len(queue) == self._dead:
+                self._sent_id = None
+            return item
+        return None
+
+    def _monotonic(self, item: dict) -> dict:
+        """`item`, relabelled to the newest frame id already sent if its own
+        id is older (16-bit ids, compared modulo wrap)."""
+        fid = item['frame_id']
+        sent = self._sent_id
+        if sent is None or not 0 < ((sent - fid) & 0xFFFF) < 0x8000:
+            self._sent_id = fid
+            return item
+        data = item['data']
+        relabelled = dict(item)
+        relabelled['data'] = b"".join((data[:2], sent.to_bytes(2, "big"), data[4:]))
+        relabelled['frame_id'] = sent
+        return relabelled
+
+    def clear(self, gate: bool = False) -> None:
+        """Drop everything queued; with `gate`, every H.264 row also waits for
+        its next IDR."""
+        self._queue.clear()
+        self._rows.clear()
+        self._dead = 0
+        self.bytes = 0
+        self._sent_id = None
+        if gate:
+            self.live_rows.clear()
+
+    def _unlink_row(self, row: int) -> None:
+        entries = self._rows.pop(row, None)
+        if not entries:
+            return
+        for entry in entries:
+            self.bytes -= len(entry[0]['data'])
+            entry[0] = None
+        self._dead += len(entries)
+        if self._dead > 64 and self._dead * 2 > len(self._queue):
+            self._queue = deque(entry for entry in self._queue if entry[0] is not None)
+            self._dead = 0
@@ -23,8 +23,8 @@
 
 Owns the server side of every WebRTC session: peer-connection lifecycle
 (offer building, SDP/ICE plumbing, teardown), per-display media graphs (a
-`MediaRelay` fanning one encoded video/audio source out to every peer of that
-display), and the ordered "input" data channel that carries input, clipboard,
+`MediaRelay` fanning one encoded video source, and an `EncodedFrameFanout`
+the Opus frames, out to every peer of that display), and the ordered "input" data channel that carries input, clipboard,
 cursor, stats, and control messages.
 
 Structural notes:
@@ -32,6 +32,8 @@ Structural notes:
 - Everything runs on one asyncio loop. Capture threads never touch the loop
   directly; encoded frames arrive via `loop.call_soon_threadsafe` into
   `PipelineBridge` queues that the media tracks drain.
+- Audio skips PyAV entirely: each Opus frame becomes one `EncodedAudioFrame`
+  pushed straight into every subscribed sender's queue.
 - Data-channel dispatch is serialized per channel through a bounded queue with
   a single consumer task so input events keep strict arrival order.
 - Behavior deliberately mirrors the websockets transport (broadcast semantics,
@@ -45,6 +47,7 @@ import gzip
 import inspect
 import re
 import json
+import time
 import base64
 import urllib.parse
 import aiohttp
@@ -55,6 +58,8 @@ except (ImportError, RuntimeError):
     pcmflux = None
 
 from .settings import settings as app_settings, inflate_gz_bounded
+from .control_frames import control_frames
+from .instrumentation import observe_stage
 from .webrtc import (
     RTCPeerConnection,
     RTCIceCandidate,
@@ -63,19 +68,25 @@ from .webrtc import (
     VideoStreamTrack,
     RTCConfiguration,
     RTCIceServer,
-    AudioStreamTrack,
     RTCDataChannel,
-    RTCBundlePolicy
+    RTCBundlePolicy,
+    RTCCertificatePool,
 )
 from .webrtc.rtcicetransport import (
     Candidate,
     candidate_from_aioice
 )
+from .ice import candidate_cache
+from .webrtc.codecs import get_encoder
 from .webrtc.exceptions import InvalidStateError
+from .webrtc.pacer import h264_payloads_suggest_idr
+from .webrtc.rtcrtpparameters import RTCRtpCodecParameters
+from .webrtc.rtcrtpsender import RTCEncodedFrame
+from .webrtc.mediastreams import EncodedAudioFrame
 import av
 from fractions import Fraction
 from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
-from .webrtc.contrib.media import MediaRelay
+from .webrtc.contrib.media import EncodedFrameFanout, MediaRelay
 from enum import Enum
 from .media_pipeline import MediaPipeline
 # The viewer/collaborator input-authority lists live with the input protocol
@@ -90,8 +101,30 @@ from .input_handler import (
 from .selkies import current_session_tokens
 
 logger = logging.getLogger("rtc")
+VIDEO_CLOCK_RATE = 90000
 logger.setLevel(logging.INFO)
 
+# Process-wide DTLS certificate pool, started with the first RTCApp and kept
+# across RTCApp instances (mode switches) so it stays warm.
+_dtls_certificate_pool: Optional[RTCCertificatePool] = None
+
+
+def dtls_certificate_pool() -> Optional[RTCCertificatePool]:
+    """Return the process-wide DTLS certificate pool, starting it on first use.
+
+    Returns:
+        The running pool, or None when `webrtc_dtls_cert_pool` is 0 (each
+        peer connection then generates its own certificate).
+    """
+    global _dtls_certificate_pool
+    size = getattr(app_settings, "webrtc_dtls_cert_pool", 0) or 0
+    if size <= 0:
+        return None
+    if _dtls_certificate_pool is None:
+        _dtls_certificate_pool = RTCCertificatePool(size=size)
+        _dtls_certificate_pool.start()
+    return _dtls_certificate_pool
+
 class ConditionalExtraFormatter(logging.Formatter):
     """Log formatter that appends selected `extra` fields when present.
 
@@ -143,6 +176,12 @@ DATA_CHANNEL_FALLBACK_CHUNK_SIZE = ((262144 - 512) * 3) // 4
 # payload on a slow link.
 DATA_CHANNEL_BULK_HIGH_WATER = 1024 * 1024
 
+# Leading byte of a raw clipboard chunk on a channel that sent `_cb,1`: the
+# chunks travel between clipboard-msg-start and clipboard-msg-end as binary
+# messages instead of base64 inside clipboard-msg-data JSON. Never 0x1f, so the
+# gzip sniff cannot mistake one for a compressed message.
+DATA_CHANNEL_CLIPBOARD_OPCODE = 0x06
+
 
 async def drain_data_channel(channel: RTCDataChannel,
                              high: int = DATA_CHANNEL_BULK_HIGH_WATER,
@@ -226,7 +265,8 @@ class PipelineBridge:
     wants continuity so a brief consumer stall doesn't silently drop samples).
     """
     def __init__(self, maxsize: int = 1,
-                 on_drop: Optional[Callable[[], None]] = None) -> None:
+                 on_drop: Optional[Callable[[], None]] = None,
+                 stage: Optional[str] = None) -> None:
         """Initializes the bridge.
 
         Args:
@@ -236,9 +276,12 @@ class PipelineBridge:
                 a dropped ENCODED frame breaks the wire reference chain with no
                 RTP gap, so the browser never requests a PLI and the smear
                 would persist under infinite GOP.
+            stage: Pipeline stage name each item's wait in the bridge is
+                reported under (see `instrumentation`), or None.
         """
         self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
         self._on_drop = on_drop
+        self._stage = stage
 
     def set_data(self, data: Any) -> None:
         """Enqueue an item, dropping the oldest one when the queue is full.
@@ -252,35 +295,44 @@ class PipelineBridge:
             self._queue.get_nowait()
             if self._on_drop is not None:
                 self._on_drop()
-        self._queue.put_nowait(data)
+        self._queue.put_nowait((time.perf_counter(), data))
 
     async def get_data(self) -> Any:
         """Wait until an item is available in the queue and return it."""
-        return await self._queue.get()
-
-class AudioMedia(AudioStreamTrack):
-    """Audio track that serves pre-encoded packets from a `PipelineBridge`."""
-
-    def __init__(self, data_pipeline: PipelineBridge) -> None:
-        super().__init__()
-        self.data_pipeline = data_pipeline
-
-    async def recv(self) -> av.Packet:
-        """Return the next encoded audio packet from the bridge."""
-        packet = await self.data_pipeline.get_data()
-        return packet
+        queued_at, data = await self._queue.get()
+        if self._stage is not None:
+            observe_stage(self._stage, time.perf_counter() - queued_at)
+        return data
 
 class VideoMedia(VideoStreamTrack):
-    """Video track that serves pre-encoded packets from a `PipelineBridge`."""
+    """Video track that packetizes pre-encoded frames once per display.
 
-    def __init__(self, data_pipeline: PipelineBridge) -> None:
+    The display's `MediaRelay` hands whatever `recv` returns to every peer's
+    sender, so splitting the bitstream into RTP payloads here instead of in
+    each sender's `Encoder.pack` does the NAL scan and payload copies once
+    per frame however many peers watch the display. Senders only stamp their
+    own sequence numbers, SSRC and header extensions onto the shared payloads.
+    """
+
+    def __init__(self, data_pipeline: PipelineBridge,
+                 mime_type: str = "video/H264") -> None:
         super().__init__()
         self.data_pipeline = data_pipeline
+        self.mime_type = mime_type
+        self._packer = get_encoder(
+            RTCRtpCodecParameters(mimeType=mime_type, clockRate=VIDEO_CLOCK_RATE))
+        self._is_h264 = mime_type.lower() == "video/h264"
 
-    async def recv(self) -> av.Packet:
-        """Return the next encoded video packet from the bridge."""
+    async def recv(self) -> RTCEncodedFrame:
+        """Return the next encoded video frame from the bridge, packetized."""
         packet = await self.data_pipeline.get_data()
-        return packet
+        payloads, timestamp = self._packer.pack(packet)
+        keyframe_bytes = None
+        if self._is_h264:
+            keyframe_bytes = (sum(len(p) for p in payloads)
+                              if h264_payloads_suggest_idr(payloads) else 0)
+        return RTCEncodedFrame(payloads, timestamp, None,
+                               keyframe_bytes=keyframe_bytes)
 
 class RTCApp:
     """Server-side WebRTC engine: peers, per-display media graphs, channels.
@@ -295,8 +347,7 @@ class RTCApp:
             `client_type`, `display_id`, `client_token`, ...). One entry per
             connected browser page.
         displays: Display id to media graph (`relay`, `video_bridge`,
-            `video_media`, and on the primary display `audio_bridge` /
-            `audio_media`).
+            `video_media`, and on the primary display `audio_fanout`).
     """
 
     def __init__(
@@ -312,9 +363,11 @@ class RTCApp:
         self.turn_servers = turn_servers
         self.encoder = encoder
         self.last_cursor_sent = None
+        # Start filling the DTLS certificate pool before the first peer arrives.
+        dtls_certificate_pool()
 
         # Per-display media graphs: display_id -> {relay, video_bridge, video_media,
-        # audio_bridge?, audio_media?}. A display's graph is created by its first
+        # audio_fanout?}. A display's graph is created by its first
         # controller and torn down with it; only the primary display carries audio.
         self.displays: Dict[str, Dict[str, Any]] = {}
         self.media_pipeline: Optional[MediaPipeline] = None
@@ -463,6 +516,9 @@ class RTCApp:
         `drain_data_channel`) so a multi-MB clipboard neither buffers
         unboundedly in memory nor starves input/cursor/stats behind it on the
         one ordered stream, and the per-chunk gzip runs off the event loop.
+        Channels that sent `_cb,1` get the raw bytes as
+        DATA_CHANNEL_CLIPBOARD_OPCODE messages between clipboard-msg-start and
+        clipboard-msg-end, whatever the size; the rest get base64 JSON.
 
         Args:
             data: Clipboard payload; str is UTF-8 encoded before sending.
@@ -488,21 +544,55 @@ class RTCApp:
         is_text = mime_type == "text/plain"
         data_bytes: bytes = data.encode() if isinstance(data, str) else data
         clipboard_chunk_size = get_adjusted_chunk_size(self.peer_connections)
-        requester = None
         if peer_id is not None:
             peer_obj = self.peer_connections.get(peer_id)
             channel = peer_obj.get("data_channel") if peer_obj else None
             if channel is None or channel.readyState != "open":
                 return
-            requester = channel
+            channels = [channel]
+        else:
+            channels = list(self._iter_open_data_channels())
+            if not channels:
+                logger.info("skipping message because no data channel is ready: clipboard-msg")
+                return
+        framed = [c for c in channels if getattr(c, "_selkies_cb_rx", False)]
+        legacy = [c for c in channels if not getattr(c, "_selkies_cb_rx", False)]
 
-        def send_typed(msg_type: str, payload: Any) -> None:
-            if requester is not None:
-                self.send_message_to_channel(requester, msg_type, payload)
-            else:
-                self.__send_data_channel_message(msg_type, payload)
+        def send_typed(targets: list, msg_type: str, payload: Any) -> None:
+            for channel in targets:
+                self.send_message_to_channel(channel, msg_type, payload)
 
-        if len(data_bytes) <= clipboard_chunk_size:
+        start_payload = {
+            "mime_type": mime_type,
+            "is_binary_data": not is_text,
+            "total_size": len(data_bytes),
+        }
+        if reply_to:
+            start_payload["reply_to"] = reply_to
+
+        if framed:
+            # Raw chunks sized like the base64 ones would be once encoded, so
+            # they stay under every peer's negotiated max-message-size.
+            binary_chunk_size = (clipboard_chunk_size * 4) // 3
+            send_typed(framed, "clipboard-msg-start", start_payload)
+            view = memoryview(data_bytes)
+            prefix = bytes((DATA_CHANNEL_CLIPBOARD_OPCODE,))
+            for read in range(0, len(data_bytes), binary_chunk_size):
+                # A channel that closed mid-transfer gets no further chunks;
+                # the transfer ends once none is left.
+                framed = [c for c in framed if c.readyState == "open"]
+                if not framed:
+                    break
+                message = prefix + view[read:read + binary_chunk_size]
+                for channel in framed:
+                    self._send_prepared_to_channel(
+                        channel, "clipboard-msg-data", message, None)
+                for channel in framed:
+                    await drain_data_channel(channel)
+            if framed:
+                send_typed(framed, "clipboard-msg-end", {})
+
+        if legacy and len(data_bytes) <= clipboard_chunk_size:
             b64data = base64.b64encode(data_bytes).decode('utf-8')
             payload = {
                 "content": b64data,
@@ -512,17 +602,10 @@ class RTCApp:
             }
             if reply_to:
                 payload["reply_to"] = reply_to
-            send_typed("clipboard-msg", payload)
-        else:
+            send_typed(legacy, "clipboard-msg", payload)
+        elif legacy:
             read = 0
-            start_payload = {
-                "mime_type": mime_type,
-                "is_binary_data": not is_text,
-                "total_size": len(data_bytes),
-            }
-            if reply_to:
-                start_payload["reply_to"] = reply_to
-            send_typed("clipboard-msg-start", start_payload)
+            send_typed(legacy, "clipboard-msg-start", start_payload)
             while read < len(data_bytes):
                 chunk = data_bytes[read:read + clipboard_chunk_size]
                 chunk_payload = json.dumps({
@@ -532,18 +615,16 @@ class RTCApp:
                 # One compression per chunk, shared by every gzip-capable
                 # channel; skipped when no open channel completed the handshake.
                 gz_payload = None
-                channels = ([requester] if requester is not None
-                            else list(self._iter_open_data_channels()))
-                if any(getattr(c, "_selkies_gz_tx", False) for c in channels):
+                if any(getattr(c, "_selkies_gz_tx", False) for c in legacy):
                     gz_payload = await asyncio.to_thread(
                         gzip.compress, chunk_payload.encode("utf-8"), 6)
-                for channel in channels:
+                for channel in legacy:
                     self._send_prepared_to_channel(
                         channel, "clipboard-msg-data", chunk_payload, gz_payload)
-                for channel in channels:
+                for channel in legacy:
                     await drain_data_channel(channel)
                 read += len(chunk)
-            send_typed("clipboard-msg-end", {})
+            send_typed(legacy, "clipboard-msg-end", {})
 
         logger.info(f"Sent clipboard data of length {len(data_bytes)} with mime type {mime_type}")
 
@@ -700,18 +781,25 @@ class RTCApp:
 
     def send_message_to_channel(self, channel: RTCDataChannel, msg_type: str,
                                 data: Any) -> None:
-        """Send one typed message to one specific peer's data channel."""
-        payload = json.dumps({"type": msg_type, "data": data})
+        """Send one typed message to one specific peer's data channel.
+
+        The envelope and its gzip come from the shared control-frame cache, so
+        a broadcast serializes and compresses once for all channels, and a
+        repeated payload (a cursor shape seen before) not at all.
+        """
+        frame = control_frames.lookup(
+            "dc:" + msg_type, data,
+            lambda d: json.dumps({"type": msg_type, "data": d}))
         # Large payloads (cursor PNGs, settings, clipboard, stats) compress well;
         # small ones aren't worth the CPU or the risk to input latency. Only
         # channels that completed the _gz handshake may receive gzip.
         gz_payload = None
-        if getattr(channel, "_selkies_gz_tx", False) and len(payload) >= 512:
-            gz_payload = gzip.compress(payload.encode("utf-8"), 6)
-        self._send_prepared_to_channel(channel, msg_type, payload, gz_payload)
+        if getattr(channel, "_selkies_gz_tx", False) and len(frame.text) >= 512:
+            gz_payload = frame.gzipped()
+        self._send_prepared_to_channel(channel, msg_type, frame.text, gz_payload)
 
     def _send_prepared_to_channel(self, channel: RTCDataChannel, msg_type: str,
-                                  payload: str,
+                                  payload: Union[str, bytes],
                                   gz_payload: Optional[bytes]) -> None:
         """Guarded raw send of an already-serialized (and possibly
         pre-compressed) message; bulk senders reuse one compression across
@@ -961,8 +1049,7 @@ class RTCApp:
                     # av.Packet accepts a buffer-protocol object zero-copy and
                     # keeps it as the owning ref, avoiding a per-frame copy.
                     packet = av.Packet(buf)
-                    RTP_VIDEO_CLOCK_RATE = 90000
-                    packet.time_base = Fraction(1, RTP_VIDEO_CLOCK_RATE)
+                    packet.time_base = Fraction(1, VIDEO_CLOCK_RATE)
                     if pts is not None:
                         packet.pts = pts
                         packet.dts = packet.pts
@@ -973,15 +1060,13 @@ class RTCApp:
                     logger.error(f"error processing video sample: {e}")
         elif kind == "audio":
             if buf:
+                fanout = graph.get("audio_fanout")
+                if fanout is None:
+                    return
                 try:
-                    # Zero-copy: av.Packet takes the buffer directly as owner.
-                    packet = av.Packet(buf)
-                    packet.time_base = Fraction(1, 48000)
-                    if pts is not None:
-                        packet.pts = pts
-                    bridge = graph.get("audio_bridge")
-                    if bridge is not None:
-                        bridge.set_data(packet)
+                    # One copy out of the capture buffer, shared by every
+                    # sender; pts is already on the 48 kHz Opus RTP clock.
+                    fanout.push(EncodedAudioFrame(bytes(buf), pts or 0))
                 except Exception as e:
                     logger.error(f"error processing audio sample: {e}")
 
@@ -989,7 +1074,9 @@ class RTCApp:
         """Update the STUN/TURN servers used for every NEW peer connection.
 
         get_rtc_config() reads these at peer-creation time, so a refresh (typically
-        rotated TURN REST credentials) takes effect for every subsequent connection.
+        rotated TURN REST credentials) takes effect for every subsequent connection;
+        a change also drops the shared ICE candidate cache (srflx results and
+        pre-warmed TURN allocations).
         Live sessions deliberately keep their established ICE: their TURN allocations
         stay valid, and forcing an ICE restart on refresh would drop working streams.
         """
@@ -997,6 +1084,9 @@ class RTCApp:
         self.stun_servers = stun_servers
         self.turn_servers = turn_servers
         if changed:
+            # New peers must not reuse srflx results or pooled TURN allocations
+            # made against the old servers or credentials.
+            candidate_cache.invalidate()
             logger.debug(
                 "RTC ICE servers updated; applies to new connections "
                 "(established sessions keep their current ICE)."
@@ -1081,10 +1171,18 @@ class RTCApp:
         public_ips = (
             getattr(app_settings, "webrtc_public_ip", "") or ""
         ).replace(",", " ").split()
+        # Single-port UDP mux: every peer's host candidates share one socket
+        # per address on this port (0 keeps an ephemeral socket per peer).
+        udp_mux_port = getattr(app_settings, "webrtc_udp_mux_port", 0) or 0
+        # DTLS: a pooled certificate with its context already built, so the
+        # peer skips key generation and signing on the loop.
+        certificate_pool = dtls_certificate_pool()
         config = RTCConfiguration(
             iceServers=ice_servers,
             bundlePolicy=RTCBundlePolicy.MAX_BUNDLE,
             iceHostPublicIps=public_ips or None,
+            iceUdpMuxPort=udp_mux_port or None,
+            certificates=[certificate_pool.get()] if certificate_pool else None,
         )
         return config
 
@@ -1353,6 +1451,13 @@ class RTCApp:
             except Exception:
                 logger.warning("Dropping undecodable compressed data channel message")
                 return
+        if msg == "_cb,1":
+            # The peer reassembles raw opcode-tagged clipboard chunks, so
+            # clipboard payloads to THIS channel skip base64 (per channel, like
+            # the compression handshake below).
+            if channel is not None:
+                channel._selkies_cb_rx = True
+            return
         if msg == "_gz,1":
             # The peer can gunzip: echo the capability so it compresses its own large
             # sends, and mark THIS channel so outbound payloads to it may be gzipped.
@@ -1530,6 +1635,33 @@ class RTCApp:
 
         return on_drop
 
+    def _create_display_graph(self, display_id: str) -> Dict[str, Any]:
+        """Build one display's media graph: its bridge from the capture side,
+        the `VideoMedia` that packetizes each frame once, the relay every
+        peer on the display subscribes to, and on the primary display the
+        audio fan-out.
+
+        The graph is packetized for the display's current encoder. A hook
+        that cannot resolve it yet (the service has no state for the display,
+        or is still being built) falls back to the global encoder.
+        """
+        graph: Dict[str, Any] = {"relay": MediaRelay()}
+        graph["video_bridge"] = PipelineBridge(
+            on_drop=self._idr_on_video_drop(display_id), stage="webrtc_bridge")
+        try:
+            graph_encoder = self.get_encoder_for_display(display_id) or self.encoder
+        except (AttributeError, KeyError) as e:
+            logger.debug(f"No encoder for display '{display_id}' ({e!r}); using {self.encoder}")
+            graph_encoder = self.encoder
+        graph["video_media"] = VideoMedia(
+            graph["video_bridge"],
+            mime_type=self.get_mime_by_encoder(graph_encoder) or "video/H264")
+        if display_id == "primary":
+            # Audio uses a small drop-oldest FIFO per sender so a brief stall
+            # keeps continuity instead of dropping a packet on every overtake.
+            graph["audio_fanout"] = EncodedFrameFanout("audio", maxsize=8)
+        return graph
+
     async def _start_rtc_pipeline(
         self,
         client_peer_id: str,
@@ -1562,15 +1694,7 @@ class RTCApp:
         # mic return path) only exist on the primary display — a secondary
         # display page renders video and carries input, matching the WS model.
         if client_type is ClientType.CONTROLLER:
-            graph: Dict[str, Any] = {"relay": MediaRelay()}
-            graph["video_bridge"] = PipelineBridge(on_drop=self._idr_on_video_drop(display_id))
-            graph["video_media"] = VideoMedia(graph["video_bridge"])
-            if display_id == "primary":
-                # Audio uses a small drop-oldest FIFO so a brief sender stall keeps
-                # continuity instead of dropping a packet on every overtake.
-                graph["audio_bridge"] = PipelineBridge(maxsize=8)
-                graph["audio_media"] = AudioMedia(graph["audio_bridge"])
-            self.displays[display_id] = graph
+            self.displays[display_id] = self._create_display_graph(display_id)
             logger.info(f"Media relay and pipeline bridges created for controller of display '{display_id}'")
 
         peer_connection =  RTCPeerConnection(self.get_rtc_config())
@@ -1584,8 +1708,8 @@ class RTCApp:
 
         rtp_video_sender = peer_connection.addTrack(media_relay.subscribe(graph["video_media"]))
         rtp_video_sender.on("pli", lambda cid=client_peer_id, ct=client_type: self.on_pli(cid, ct))
-        if graph.get("audio_media") is not None:
-            peer_connection.addTrack(media_relay.subscribe(graph["audio_media"]))
+        if graph.get("audio_fanout") is not None:
+            peer_connection.addTrack(graph["audio_fanout"].subscribe())
 
         # Microphone: one recvonly audio transceiver inside the SAME bundled SDP (no second
         # negotiation) so the browser can send its mic on demand. The m-line sits inactive
@@ -1628,7 +1752,10 @@ class RTCApp:
         try:
             try:
                 display_encoder = self.get_encoder_for_display(display_id) or self.encoder
-            except Exception:
+            except (AttributeError, KeyError) as e:
+                # Same fallback as _create_display_graph, so the offered codec
+                # matches what the display's graph packetizes.
+                logger.debug(f"No encoder for display '{display_id}' ({e!r}); using {self.encoder}")
                 display_encoder = self.encoder
             try:
                 display_fullcolor = bool(self.get_fullcolor_for_display(display_id))
@@ -1941,6 +2068,9 @@ class RTCApp:
                 await relay.stop()
             except Exception as e_relay:
                 logger.warning(f"Media relay teardown error (continuing): {e_relay}")
+        fanout = graph.get('audio_fanout')
+        if fanout is not None:
+            fanout.stop()
         # The relay's tracks are gone, so every viewer (#shared / #player*) of this
         # display is now bound to a dead source: its sender would block in recv()
         # forever, frozen on the last frame, while ICE stays "connected" so the
@@ -15,9 +15,11 @@ requirement).
 Threading model: one asyncio event loop runs everything control-plane.
 pixelflux/pcmflux deliver frames from their own native threads; those
 callbacks never touch asyncio state directly — they hand zero-copy items to
-the loop via ``call_soon_threadsafe``. Per-client video delivery is bounded
-by ``_VideoRelay`` (drop-and-resync past a byte budget) and audio by a fixed
-queue, so one slow client can never back pressure the shared pipeline.
+the loop via ``call_soon_threadsafe`` (video through a per-display
+``LoopHandoff``, so a frame's stripes cost one wakeup). Per-client video
+delivery is bounded by ``_VideoRelay`` (drop-and-resync past a byte budget)
+and audio by a fixed queue, so one slow client can never back pressure the
+shared pipeline.
 Blocking native calls (capture start/stop, geometry reads) run on executor
 threads. The Wayland path is subprocess-free by design: compositor output
 management, DPI-as-output-scale, and cursor sizing all go through the
@@ -43,6 +45,9 @@ from aiohttp import web, WSMsgType
 
 from . import audio_config
 from . import gpu_stats
+from . import instrumentation
+from .adaptive_bitrate import AdaptiveBitrate, ConsumerSample, RenditionRouter
+from .control_frames import ControlFrame, control_frames
 from .display_utils import (
     apply_common_capture_settings,
     parse_gpu_id,
@@ -76,6 +81,8 @@ from .input_handler import (
     VIEWER_SILENT_DROP_PREFIXES,
     run_client_command,
 )
+from .loop_handoff import LoopHandoff
+from .relay_backlog import RelayBacklog
 from .settings import settings, SETTING_DEFINITIONS, WS_MAX_MESSAGE_BYTES, WS_MESSAGE_SIZE_HARD_CAP, build_client_settings_payload, effective_use_cpu, inflate_gz_bounded, sanitize_client_setting
 from .settings import settings as app_settings
 from .stream_server import BaseStreamingService
@@ -106,15 +113,16 @@ STALLED_CLIENT_TIMEOUT_SECONDS = 4.0
 # means a dead or black-holed socket — and the cancelled write left a torn
 # websocket frame behind, so the socket is dropped, never reused.
 SHARED_STREAM_SEND_TIMEOUT_SECONDS = 1.0
-# Per-client video backlog bound: past it, a relay drops its backlog and the
-# client skips ahead to the next keyframe instead of backing encoded frames up
+# Per-client H.264 backlog bound: past it, a relay drops the incoming delta and
+# gates that stripe row until its next IDR instead of backing encoded frames up
 # into the shared pipeline or the socket transport (whose freed burst peaks the
 # allocator retains, ratcheting RSS). The bound is VIDEO_RELAY_BUDGET_SECONDS of
 # stream at the capture's configured bitrate —
-# backlog is latency debt, so the skip-ahead threshold must track the stream
-# rate, not a fixed byte count — floored so low-bitrate streams keep absorbing
-# transport jitter. Keyframes are exempt (a keyframe is indivisible: part of
-# one is useless), so the true per-client bound is budget + one keyframe burst.
+# backlog is latency debt, so the threshold must track the stream rate, not a
+# fixed byte count — floored so low-bitrate streams keep absorbing transport
+# jitter. Keyframes are exempt (a keyframe is indivisible: part of one is
+# useless) but supersede their row's queued chunks, so the true per-client
+# bound is budget + one IDR per row. JPEG needs no budget: its rows coalesce.
 VIDEO_RELAY_BUDGET_SECONDS = 2.0
 VIDEO_RELAY_BUDGET_MIN_BYTES = 4 * 1024 * 1024
 # Floor between one relay's keyframe (re)requests while it waits for a sync
@@ -122,6 +130,10 @@ VIDEO_RELAY_BUDGET_MIN_BYTES = 4 * 1024 * 1024
 # so this only bounds how much keyframe bitrate a hopelessly slow client can
 # add to the shared stream (~1 IDR/s worst case).
 VIDEO_RELAY_SYNC_FLOOR_SECONDS = 1.0
+# Renditions a websockets viewer can be routed to (SELKIES_WS_LOW_RENDITION):
+# the display's own capture, or the lighter second capture of the same region.
+RENDITION_MAIN = 'main'
+RENDITION_LOW = 'low'
 RTT_SMOOTHING_SAMPLES = 20
 # RFC 2198 RED redundancy depth (distance=2) for the shared Opus audio stream.
 AUDIO_RED_DISTANCE = 2
@@ -524,6 +536,33 @@ WS_GZIP_MIN_BYTES = 512
 # coroutine for tens of milliseconds, while a thread hop costs microseconds.
 WS_GZIP_OFFLOAD_BYTES = 512 * 1024
 
+# Binary clipboard framing for clients that sent the `_cb,1` handshake: the
+# payload travels as raw 0x06-tagged frames between the usual clipboard_start
+# and clipboard_finish text verbs instead of base64 text chunks, so a large image
+# costs neither the 33% expansion nor an encode/decode on either end. Chunks stay
+# well under WS_MAX_MESSAGE_BYTES so video frames interleave with a big paste.
+WS_CLIPBOARD_OPCODE = 0x06
+WS_CLIPBOARD_BINARY_CHUNK_BYTES = 1024 * 1024
+
+# Stat kinds the singleton publisher fans out. A client receives all of them
+# unless it narrows the set with a `_stats,<kind>,...` message (`_stats` alone
+# unsubscribes), e.g. a viewer tab with the stats panel closed.
+WS_STATS_KINDS = frozenset(("system", "gpu", "network"))
+
+
+def _ws_stats_subscription(message: str) -> frozenset:
+    """The stat kinds a `_stats[,<kind>...]` message subscribes to. Unknown
+    kinds are ignored."""
+    return WS_STATS_KINDS.intersection(message.split(",")[1:])
+
+
+def _render_ws_cursor(data: dict) -> str:
+    return f"cursor,{json.dumps(data)}"
+
+
+def _render_ws_display_config(payload: dict) -> str:
+    return f"DISPLAY_CONFIG_UPDATE,{json.dumps(payload)}"
+
 
 def _path_is_within(directory: str, target: str) -> bool:
     """Return True if `target` is `directory` itself or strictly inside it.
@@ -567,7 +606,7 @@ def _close_abandoned_ws(client: web.WebSocketResponse) -> None:
 
 async def _broadcast_to_clients(
     clients: set,
-    message: Union[str, bytes, bytearray, memoryview],
+    message: Union[str, bytes, bytearray, memoryview, ControlFrame],
     per_client_timeout: Optional[float] = None,
     only: Optional[int] = None,
 ) -> set:
@@ -581,7 +620,9 @@ async def _broadcast_to_clients(
     Args:
         clients: The socket set to fan out over; dead sockets are removed from
             it in place.
-        message: Text control message, or raw bytes for binary frames.
+        message: Text control message, or raw bytes for binary frames. A
+            `ControlFrame` from the shared cache sends its text and reuses its
+            memoized gzip frame across broadcasts.
         per_client_timeout: Per-send liveness bound in seconds; None sends
             unbounded.
         only: Connection identity (`id(socket)`) to address alone, for an
@@ -601,6 +642,14 @@ async def _broadcast_to_clients(
     if not recipients:
         return set()
 
+    gzip_frame = None
+    if isinstance(message, ControlFrame):
+        cached = message
+        message = cached.text
+
+        def gzip_frame():
+            return b"\x05" + cached.gzipped()
+
     # Hard per-frame ceiling, both text and binary. Nothing legitimate reaches
     # it — large control payloads (clipboard) are segmented far below
     # WS_MAX_MESSAGE_BYTES before they get here — so an oversized message is an
@@ -621,13 +670,17 @@ async def _broadcast_to_clients(
     # concurrent _send_one coroutines never double-compress. The holder carries
     # either ready bytes or one shared executor future: multi-MB compression runs
     # off the event loop, while small frames compress inline (a thread hop would
-    # cost more than the work).
+    # cost more than the work). A cached ControlFrame goes further and keeps its
+    # gzip frame across broadcasts, so a repeated cursor compresses once.
     gz_frame_holder = []
     loop = asyncio.get_running_loop()
 
     def _gzip_frame():
         return b"\x05" + gzip.compress(message.encode("utf-8"), 6)
 
+    if gzip_frame is None:
+        gzip_frame = _gzip_frame
+
     async def _send_one(client):
         if isinstance(message, (bytes, bytearray, memoryview)):
             # Binary control frames pass through untouched (media has its own
@@ -640,9 +693,9 @@ async def _broadcast_to_clients(
             # they are below the threshold, so compression never touches them.
             if not gz_frame_holder:
                 if len(message) >= WS_GZIP_OFFLOAD_BYTES:
-                    gz_frame_holder.append(loop.run_in_executor(None, _gzip_frame))
+                    gz_frame_holder.append(loop.run_in_executor(None, gzip_frame))
                 else:
-                    gz_frame_holder.append(_gzip_frame())
+                    gz_frame_holder.append(gzip_frame())
             frame = gz_frame_holder[0]
             if asyncio.isfuture(frame):
                 # Shielded: the future is shared by every gzip-capable client, so
@@ -736,43 +789,48 @@ class _VideoRelay:
     The fan-out offers every encoded chunk synchronously and never awaits a
     socket; each relay's own task drains its backlog. One slow client can
     therefore neither pace the other clients nor back frames up into the
-    shared pipeline or its socket transport: past its byte budget (~
-    VIDEO_RELAY_BUDGET_SECONDS of stream at the configured bitrate) it drops
-    its backlog and skips ahead to the next keyframe, the standard
-    broadcast-video contract.
-
-    H.264 chain safety is tracked per stripe ROW (wire-header y_start, bytes
-    4:6): one capture frame can mix IDR and delta stripes (a lone stripe
-    encoder re-init IDRs only its own row), so after any drop a row's delta
-    chunks stay gated until that row's own IDR arrives — a delivered delta
-    otherwise decodes against a reference the client never received. The
-    wire type byte (offset 1) is stamped from the encoder's ACTUAL output
-    picture type on every backend, and a requested recovery IDR covers every
-    row (force_idr_all), so gated rows converge on the next request. JPEG
-    chunks (0x03) have no reference chain: never gated, and a drop only
-    costs a repaint request. A fresh relay starts fully gated, so a joining
-    client waits for a keyframe instead of decoding mid-GOP garbage.
+    shared pipeline or its socket transport. Its RelayBacklog coalesces per
+    stripe ROW (wire-header y_start, bytes 4:6) instead of flushing: a newer
+    JPEG chunk (0x03) supersedes its row's queued one, and past the byte
+    budget (~VIDEO_RELAY_BUDGET_SECONDS of stream at the configured bitrate)
+    only the H.264 row whose delta was dropped waits for its next IDR. A slow
+    client sees a partially updated screen rather than a frozen one.
+
+    H.264 chain safety is tracked per row because one capture frame can mix
+    IDR and delta stripes (a lone stripe encoder re-init IDRs only its own
+    row): a delivered delta otherwise decodes against a reference the client
+    never received. The wire type byte (offset 1) is stamped from the
+    encoder's ACTUAL output picture type on every backend, and a requested
+    recovery IDR covers every row (force_idr_all), so gated rows converge on
+    the next request. A fresh relay starts fully gated, so a joining client
+    waits for a keyframe instead of decoding mid-GOP garbage.
+
+    Cumulative delivery counters (bytes sent, seconds busy, gated rows)
+    feed the websockets adaptive bitrate, which reads a relay that stays busy
+    as a link-limited consumer, and the rendition router, which moves such a
+    viewer to the display's low rendition when one runs. Only the fan-out of
+    the relay's current rendition offers it chunks.
     """
 
-    __slots__ = ('server', 'display_id', 'ws', 'budget', 'backlog',
-                 'backlog_bytes', 'live_rows', 'stopped', '_wake', '_task',
-                 '_next_sync_req')
+    __slots__ = ('server', 'display_id', 'ws', 'backlog', 'stopped', '_wake',
+                 '_task', '_next_sync_req', 'sent_bytes', 'busy_s',
+                 '_busy_since', 'rendition', '_timed_frame')
 
     def __init__(self, server: "DataStreamingServer", display_id: str,
                  ws: web.WebSocketResponse, budget: int) -> None:
         self.server = server
         self.display_id = display_id
         self.ws = ws
-        self.budget = budget
-        self.backlog: deque = deque()
-        self.backlog_bytes = 0
-        # Rows whose IDR was accepted into the current (uncleared) backlog:
-        # only their delta chunks are chain-continuous for this client.
-        self.live_rows: set[int] = set()
+        self.backlog = RelayBacklog(budget)
         self.stopped = False
         self._wake = asyncio.Event()
         self._task: Optional[asyncio.Task] = None
         self._next_sync_req = 0.0
+        self.sent_bytes = 0
+        self.busy_s = 0.0
+        self._busy_since: Optional[float] = None
+        self.rendition = RENDITION_MAIN
+        self._timed_frame: Optional[int] = None
 
     def start(self) -> None:
         self._task = asyncio.create_task(
@@ -783,17 +841,20 @@ class _VideoRelay:
         tear the websocket framing on a socket that stays open for control."""
         self.stopped = True
         self.backlog.clear()
-        self.backlog_bytes = 0
         self._wake.set()
 
     def flush_for_gate(self) -> None:
         """ACK backpressure engaged: drop the undrained backlog and gate every
         row, so the client resumes only at the IDR that
         _set_backpressure_enabled requests when the gate lifts."""
-        if self.backlog or self.live_rows:
-            self.backlog.clear()
-            self.backlog_bytes = 0
-            self.live_rows.clear()
+        self.backlog.clear(gate=True)
+
+    def switch_rendition(self, rendition: str) -> None:
+        """Move to another rendition of the display. The backlog belongs to
+        the old stream's reference chain, so it goes and every row is gated
+        until the new rendition's own IDR, as after a skip-ahead."""
+        self.rendition = rendition
+        self.flush_for_gate()
 
     def _want_sync(self) -> bool:
         """Rate-limit this relay's keyframe (re)requests to the sync floor."""
@@ -804,7 +865,7 @@ class _VideoRelay:
         return False
 
     def offer(self, item: dict) -> bool:
-        """Accept, drop, or gate one encoded chunk.
+        """Queue, coalesce, or gate one encoded chunk.
 
         Runs on the event loop and never awaits.
 
@@ -813,33 +874,24 @@ class _VideoRelay:
                 `frame_id`).
 
         Returns:
-            True when the caller should request a keyframe (data was dropped
+            True when the caller should request a keyframe (a row is gated
             that only a sync point recovers).
         """
-        data = item['data']
-        size = len(data)
-        is_h264 = size >= 10 and data[0] == 0x04
-        is_idr = is_h264 and data[1] == 0x01
-        dropped = False
-        if (not is_idr and self.backlog
-                and self.backlog_bytes + size > self.budget):
-            self.backlog.clear()
-            self.backlog_bytes = 0
-            self.live_rows.clear()
-            dropped = True
-        deliver = True
-        if is_h264:
-            row = (data[4] << 8) | data[5]
-            if is_idr:
-                self.live_rows.add(row)
-            elif row not in self.live_rows:
-                deliver = False
-                dropped = True
-        if deliver:
-            self.backlog.append(item)
-            self.backlog_bytes += size
+        lost = self.backlog.offer(item)
+        if lost is None:
+            if self._busy_since is None:
+                self._busy_since = time.monotonic()
             self._wake.set()
-        return dropped and self._want_sync()
+            return False
+        return self._want_sync()
+
+    def sample(self, rtt_ms: Optional[float] = None) -> ConsumerSample:
+        """Cumulative delivery counters for the adaptive bitrate, counting a
+        busy period still in progress."""
+        busy = self.busy_s
+        if self._busy_since is not None:
+            busy += time.monotonic() - self._busy_since
+        return ConsumerSample(self.sent_bytes, busy, self.backlog.drops, rtt_ms)
 
     async def _run(self) -> None:
         """Drain the backlog onto the socket until stopped or the socket dies."""
@@ -847,13 +899,15 @@ class _VideoRelay:
             while True:
                 if self.stopped:
                     return
-                if not self.backlog:
+                item = self.backlog.pop()
+                if item is None:
+                    if self._busy_since is not None:
+                        self.busy_s += time.monotonic() - self._busy_since
+                        self._busy_since = None
                     self._wake.clear()
                     await self._wake.wait()
                     continue
-                item = self.backlog.popleft()
                 data = item['data']
-                self.backlog_bytes -= len(data)
                 # Stamp the send time BEFORE the await and only when this
                 # socket is the display's registered client, matching what the
                 # ACK RTT math has always measured.
@@ -882,6 +936,13 @@ class _VideoRelay:
                     self.server.clients.discard(self.ws)
                     return
                 self.server._bytes_sent_in_interval += len(data)
+                self.sent_bytes += len(data)
+                # Capture callback to socket write, timed on each frame's
+                # first delivered chunk.
+                if item['frame_id'] != self._timed_frame:
+                    self._timed_frame = item['frame_id']
+                    instrumentation.observe_stage(
+                        'video_relay', time.perf_counter() - item['captured'])
         finally:
             group = self.server.video_relay_groups.get(self.display_id)
             if group is not None and group.get(self.ws) is self:
@@ -950,6 +1011,10 @@ class SelkiesStreamingApp:
     ) -> None:
         """Send clipboard data to the session's clients, multipart when large.
 
+        Clients that sent the `_cb,1` handshake get the raw bytes in 0x06
+        frames between clipboard_start and clipboard_finish, whatever the size;
+        the rest get base64 text as before.
+
         Args:
             data: Clipboard text (str) or binary payload (bytes).
             mime_type: The payload's MIME type; anything but "text/plain" is
@@ -984,32 +1049,49 @@ class SelkiesStreamingApp:
                     only=conn_id)
             data_bytes = data.encode('utf-8') if not is_binary and isinstance(data, str) else data
             total_size = len(data_bytes)
-            if total_size < CLIPBOARD_CHUNK_SIZE:
+            clients = self.data_streaming_server.clients
+            recipients = clients if conn_id is None else {c for c in clients if id(c) == conn_id}
+            framed = {c for c in recipients if getattr(c, "_ws_cb", False)}
+            legacy = recipients - framed
+
+            async def _send(targets, message):
+                # Fans out over a computed subset, so dead sockets are removed
+                # from the authoritative set here (see _broadcast_to_clients).
+                # Bounded: the clipboard monitor task calls this, and one
+                # stalled client must not wedge clipboard delivery for all.
+                dropped = await _broadcast_to_clients(targets, message, per_client_timeout=2.0)
+                clients.difference_update(dropped)
+
+            if framed:
+                await _send(framed, f"clipboard_start,{mime_type},{total_size}")
+                view = memoryview(data_bytes)
+                prefix = bytes((WS_CLIPBOARD_OPCODE,))
+                for offset in range(0, total_size, WS_CLIPBOARD_BINARY_CHUNK_BYTES):
+                    if not framed:
+                        break
+                    await _send(framed, prefix + view[offset:offset + WS_CLIPBOARD_BINARY_CHUNK_BYTES])
+                if framed:
+                    await _send(framed, "clipboard_finish")
+            if legacy and total_size < CLIPBOARD_CHUNK_SIZE:
                 encoded_data = base64.b64encode(data_bytes).decode('ascii')
                 if is_binary:
                     message = f"clipboard_binary,{mime_type},{encoded_data}"
                 else:
                     message = f"clipboard,{encoded_data}"
-                # Bounded: the clipboard monitor task calls this, and one
-                # stalled client must not wedge clipboard delivery for all.
-                await _broadcast_to_clients(self.data_streaming_server.clients, message,
-                                            per_client_timeout=2.0, only=conn_id)
-            else:
+                await _send(legacy, message)
+            elif legacy:
                 data_logger.info(f"Sending large clipboard data ({mime_type}, {total_size} bytes) via multipart.")
                 start_message = f"clipboard_start,{mime_type},{total_size}"
-                await _broadcast_to_clients(self.data_streaming_server.clients, start_message,
-                                            per_client_timeout=2.0, only=conn_id)
+                await _send(legacy, start_message)
                 offset = 0
                 while offset < total_size:
                     chunk = data_bytes[offset:offset + CLIPBOARD_CHUNK_SIZE]
                     encoded_chunk = base64.b64encode(chunk).decode('ascii')
                     data_message = f"clipboard_data,{encoded_chunk}"
-                    await _broadcast_to_clients(self.data_streaming_server.clients, data_message,
-                                                per_client_timeout=2.0, only=conn_id)
+                    await _send(legacy, data_message)
                     offset += len(chunk)
                     await asyncio.sleep(0)
-                await _broadcast_to_clients(self.data_streaming_server.clients, "clipboard_finish",
-                                            per_client_timeout=2.0, only=conn_id)
+                await _send(legacy, "clipboard_finish")
                 data_logger.info("Finished sending multi-part clipboard data.")
         except Exception as e:
             data_logger.error(f"Failed to send clipboard data: {e}", exc_info=True)
@@ -1031,8 +1113,7 @@ class SelkiesStreamingApp:
             and self.async_event_loop.is_running()
         ):
 
-            msg_str = json.dumps(data)
-            msg_to_broadcast = f"cursor,{msg_str}"
+            msg_to_broadcast = control_frames.lookup("ws:cursor", data, _render_ws_cursor)
             clients_ref = self.data_streaming_server.clients
 
             async def _broadcast_cursor_helper():
@@ -1169,9 +1250,13 @@ class DataStreamingServer(BaseStreamingService):
         self._system_monitor_task_ws = None
         self._gpu_monitor_task_ws = None
         self._network_monitor_task_ws = None
+        self._stats_publisher_task_ws = None
         self._shared_stats_ws = {}
         # Instance-wide holder so all connections read one consistent bandwidth value.
         self._shared_network_stats = {}
+        # Set by the collectors when they replace a snapshot (and by a client
+        # joining or resubscribing); wakes the stats publisher.
+        self._stats_updated_ws = asyncio.Event()
         # Cached once; avoids a blocking nvidia-smi probe per connection.
         self._gpu_available = None
         # Serializes the first-connection GPU probe so concurrent first
@@ -1222,6 +1307,14 @@ class DataStreamingServer(BaseStreamingService):
         # display's capture as delivering; relays are created lazily by the
         # fan-out and each one bounds a single client's video backlog.
         self.video_relay_groups = {}
+        # display_id -> AdaptiveBitrate steering that display's shared encoder
+        # to its slowest consumer (SELKIES_WS_ADAPTIVE_BITRATE, CBR only).
+        self.adaptive_bitrates = {}
+        # display_id -> {'module', 'settings', 'kbps'} of the display's low
+        # rendition (SELKIES_WS_LOW_RENDITION), and the RenditionRouter that
+        # moves its viewers between the two.
+        self.low_renditions = {}
+        self.rendition_routers = {}
         self.capture_instances = {}
         self.display_layouts = {}
         # One ScreenCapture per display_id, kept for the server's lifetime: start/stop
@@ -1341,6 +1434,7 @@ class DataStreamingServer(BaseStreamingService):
             app_wayland_display=(settings.app_wayland_display
                                  or settings.wayland_host_display),
             uinput_gamepad=settings.uinput_gamepad,
+            x11_isolation=settings.x11_input_isolation[0],
         )
 
         self.input_handler.on_clipboard_read = self.app.send_ws_clipboard_data
@@ -1445,6 +1539,7 @@ class DataStreamingServer(BaseStreamingService):
             try:
                 module.update_framerate(float(sanitized))
                 self._track_capture_settings(display_id, target_fps=float(sanitized))
+                self._follow_low_rendition(display_id)
                 data_logger.info(f"Applied framerate live via '_arg_fps': {sanitized} fps for '{display_id}'")
             except Exception as e:
                 data_logger.warning(f"Live framerate update failed for '{display_id}' ({e}).")
@@ -1462,15 +1557,96 @@ class DataStreamingServer(BaseStreamingService):
             # Later-registered displays seed their bitrate from this value.
             self._initial_video_bitrate = sanitized
             data_logger.info(f"Session default video_bitrate updated to {int(sanitized)} kbps for new displays.")
+        kbps = int(round(float(sanitized)))
+        if self._apply_live_video_bitrate(display_id, kbps):
+            data_logger.info(f"Applied video bitrate live via 'vb': {kbps} kbps for '{display_id}'")
+
+    def _apply_live_video_bitrate(self, display_id: str, kbps: int) -> bool:
+        """Retarget the display's running encoder without touching the
+        configured bitrate. Returns whether a live capture took it."""
         module = self._opcode_display_module(display_id)
-        if module is not None:
-            kbps = int(round(float(sanitized)))
+        if module is None:
+            return False
+        try:
+            module.update_video_bitrate(kbps)
+            self._track_capture_settings(display_id, video_bitrate_kbps=kbps)
+            return True
+        except Exception as e:
+            data_logger.warning(f"Live bitrate update failed for '{display_id}' ({e}).")
+            return False
+
+    def _adapt_ws_bitrate(self, display_id: str, display_state: dict) -> None:
+        """One adaptive-bitrate step for a display's shared encoder.
+
+        Samples every active relay (plus the owner's ACK round trip) and
+        retargets the encoder between SELKIES_WS_ADAPTIVE_BITRATE_MIN and the
+        display's configured video_bitrate, which stays the ceiling: a slow
+        viewer costs everyone some quality instead of costing itself repeated
+        skips to the next keyframe. CBR only; CRF has no bitrate to steer.
+        """
+        if display_state.get('rate_control_mode', self.rc_mode.value) != RateControlMode.CBR.value:
+            return
+        inst = self.capture_instances.get(display_id)
+        cs = inst.get('settings') if inst else None
+        current = int(getattr(cs, 'video_bitrate_kbps', 0) or 0) if cs is not None else 0
+        if current <= 0:
+            return
+        owner = display_state.get('ws')
+        samples = {
+            relay: relay.sample((display_state.get('smoothed_rtt') or None) if ws is owner else None)
+            for ws, relay in (self.video_relay_groups.get(display_id) or {}).items()
+            if not relay.stopped and relay.rendition == RENDITION_MAIN
+        }
+        lo_kbps, _ = settings.video_bitrate
+        floor = max(lo_kbps, settings.ws_adaptive_bitrate_min)
+        ceiling = float(display_state.get('video_bitrate') or current)
+        controller = self.adaptive_bitrates.get(display_id)
+        if controller is None:
+            controller = self.adaptive_bitrates[display_id] = AdaptiveBitrate()
+        target = controller.update(current, floor, ceiling, samples, time.monotonic())
+        if target is not None and self._apply_live_video_bitrate(display_id, target):
+            slowest = controller.slowest_kbps
+            data_logger.info(
+                f"Adaptive bitrate[{display_id}]: {current} -> {target} kbps "
+                f"(ceiling {ceiling:.0f}, {len(samples)} consumer(s), slowest "
+                f"{'keeping up' if slowest is None else f'{slowest:.0f} kbps'})")
+
+    def _route_ws_renditions(self, display_id: str, display_state: dict) -> None:
+        """One routing step between a display's main and low renditions.
+
+        Samples every viewer's relay and moves the ones short of their
+        current stream per RenditionRouter; a moved relay resumes at the
+        target rendition's next keyframe, requested here. The display owner
+        always stays on the main rendition: its ACKs pace the main encoder.
+        """
+        rendition = self.low_renditions.get(display_id)
+        inst = self.capture_instances.get(display_id)
+        cs = inst.get('settings') if inst else None
+        if rendition is None or cs is None:
+            return
+        main_kbps = int(getattr(cs, 'video_bitrate_kbps', 0) or 0)
+        owner = display_state.get('ws')
+        samples = {
+            relay: relay.sample()
+            for ws, relay in (self.video_relay_groups.get(display_id) or {}).items()
+            if ws is not owner and not relay.stopped
+        }
+        router = self.rendition_routers.get(display_id)
+        if router is None:
+            router = self.rendition_routers[display_id] = RenditionRouter()
+        changes = router.update(main_kbps, rendition['kbps'], samples, time.monotonic())
+        for relay, low in changes.items():
+            relay.switch_rendition(RENDITION_LOW if low else RENDITION_MAIN)
+            data_logger.info(
+                f"Rendition[{display_id}]: viewer moved to the "
+                f"{'low' if low else 'main'} stream ({rendition['kbps'] if low else main_kbps} kbps).")
+        if any(changes.values()):
             try:
-                module.update_video_bitrate(kbps)
-                self._track_capture_settings(display_id, video_bitrate_kbps=kbps)
-                data_logger.info(f"Applied video bitrate live via 'vb': {kbps} kbps for '{display_id}'")
-            except Exception as e:
-                data_logger.warning(f"Live bitrate update failed for '{display_id}' ({e}).")
+                rendition['module'].request_idr_frame()
+            except Exception:
+                pass
+        if not all(changes.values()):
+            self._schedule_idr_for_display(display_id)
 
     async def _handle_opcode_audio_bitrate(self, bitrate: Any) -> None:
         """Live Opus bitrate (bps) for the 'ab' verb; same live-retarget with
@@ -1577,11 +1753,12 @@ class DataStreamingServer(BaseStreamingService):
             "type": "display_config_update",
             "displays": connected_displays
         }
-        message_str = f"DISPLAY_CONFIG_UPDATE,{json.dumps(payload)}"
-        
-        data_logger.info(f"Broadcasting display config update: {message_str}")
+        frame = control_frames.lookup("ws:display_config", payload,
+                                      _render_ws_display_config)
+
+        data_logger.info(f"Broadcasting display config update: {frame.text}")
         # Bounded: callers hold _reconfigure_lock.
-        await _broadcast_to_clients(self.clients, message_str, per_client_timeout=2.0)
+        await _broadcast_to_clients(self.clients, frame, per_client_timeout=2.0)
 
     def refresh_cursor_cache(self) -> Optional[dict]:
         """Refresh and return the cached cursor payload for late-joining clients."""
@@ -1605,8 +1782,8 @@ class DataStreamingServer(BaseStreamingService):
 
         data_logger.info(f"Sending current cursor to client {raddr}")
         try:
-            msg_str = json.dumps(cursor_data)
-            await websocket.send_str(f"cursor,{msg_str}")
+            frame = control_frames.lookup("ws:cursor", cursor_data, _render_ws_cursor)
+            await websocket.send_str(frame.text)
         except Exception as e:
             data_logger.warning(f"Failed to send current cursor to client {raddr}: {e}")
 
@@ -2110,6 +2287,8 @@ class DataStreamingServer(BaseStreamingService):
     def _close_video_relays(self, display_id: str) -> None:
         """Stop every per-client video relay for this display. Graceful: each
         relay finishes its in-flight send and its task removes itself."""
+        self.adaptive_bitrates.pop(display_id, None)
+        self.rendition_routers.pop(display_id, None)
         group = self.video_relay_groups.pop(display_id, None)
         if group:
             for relay in list(group.values()):
@@ -2289,6 +2468,11 @@ class DataStreamingServer(BaseStreamingService):
                     self._set_backpressure_enabled(display_id, display_state, True)
                     continue
 
+                if settings.ws_adaptive_bitrate[0]:
+                    self._adapt_ws_bitrate(display_id, display_state)
+                if display_id in self.low_renditions:
+                    self._route_ws_renditions(display_id, display_state)
+
                 current_server_frame_id = display_state.get('last_sent_frame_id', 0)
                 last_client_acked_frame_id = display_state.get('acknowledged_frame_id', -1)
 
@@ -3101,9 +3285,6 @@ class DataStreamingServer(BaseStreamingService):
         self._previous_ack_id_for_stall_check = -1
         self._previous_sent_id_for_stall_check = -1
         self._last_client_stable_report_time = time.monotonic()
-        # Per-connection stats sender; the system/gpu/network collectors it reads
-        # from are instance-wide singletons created/torn down on self.
-        stats_sender_task_ws = None
         # Per-connection START_AUDIO worker: it blocks on client_settings_received
         # (which may never be set), so it must be cancelled with the connection
         # rather than left to run audio ops for a departed client.
@@ -3155,13 +3336,15 @@ class DataStreamingServer(BaseStreamingService):
                         )
 
             # System/GPU/network collectors are singletons (per-connection would mean
-            # N psutil/NVML polls/sec); they write a shared dict that senders read, not pop.
+            # N psutil/NVML polls/sec); they write a shared dict that one publisher
+            # serializes and fans out to every client.
             if (
                 self._system_monitor_task_ws is None
                 or self._system_monitor_task_ws.done()
             ):
                 self._system_monitor_task_ws = asyncio.create_task(
-                    _collect_system_stats_ws(self._shared_stats_ws)
+                    _collect_system_stats_ws(
+                        self._shared_stats_ws, updated=self._stats_updated_ws)
                 )
             if self._gpu_available and (
                 self._gpu_monitor_task_ws is None
@@ -3171,22 +3354,23 @@ class DataStreamingServer(BaseStreamingService):
                     _collect_gpu_stats_ws(
                         self._shared_stats_ws,
                         gpu_id=gpu_id_for_stats,
+                        interval_seconds=settings.gpu_stats_interval,
                         dri_node=dri_node_for_stats,
                         metrics=getattr(self, 'metrics', None),
+                        updated=self._stats_updated_ws,
                     )
                 )
-            stats_sender_task_ws = asyncio.create_task(
-                _send_stats_periodically_ws(
-                    websocket, self._shared_stats_ws, self
-                )
-            )
-            # Stats sender is per-connection (local, cancelled in finally): an
-            # instance-wide ref would be wrong under multiple concurrent WS clients.
             # Single instance-wide collector; per-connection tasks would race the byte counters.
             if self._network_monitor_task_ws is None or self._network_monitor_task_ws.done():
                 self._network_monitor_task_ws = asyncio.create_task(
                     _collect_network_stats_ws(self._shared_network_stats, self)
                 )
+            if self._stats_publisher_task_ws is None or self._stats_publisher_task_ws.done():
+                self._stats_publisher_task_ws = asyncio.create_task(
+                    _publish_stats_ws(self)
+                )
+            # The new client gets the current snapshots now, not on the next one.
+            self._stats_updated_ws.set()
 
             if PULSEAUDIO_AVAILABLE:
                 # microphone_enabled only picks the client-side default (off): the sink
@@ -3361,6 +3545,18 @@ class DataStreamingServer(BaseStreamingService):
 
                 elif msg.type == WSMsgType.TEXT:
                     message = msg.data
+                    if message == "_cb,1":
+                        # Capability handshake: this client reassembles raw 0x06
+                        # clipboard frames, so clipboard payloads skip base64.
+                        websocket._ws_cb = True
+                        continue
+                    if message == "_stats" or message.startswith("_stats,"):
+                        # Stats subscription: which kinds the publisher sends this
+                        # client.
+                        websocket._ws_stats = _ws_stats_subscription(message)
+                        websocket._ws_stats_sent = {}
+                        self._stats_updated_ws.set()
+                        continue
                     if message == "_gz,1":
                         # Capability handshake: this client can inflate gzip, so
                         # large control text may be sent as 0x05 gzip frames. Echo it
@@ -4257,6 +4453,7 @@ class DataStreamingServer(BaseStreamingService):
                             "_network_monitor_task_ws",
                             "_system_monitor_task_ws",
                             "_gpu_monitor_task_ws",
+                            "_stats_publisher_task_ws",
                         ):
                             _singleton_task = getattr(self, _singleton_attr, None)
                             if _singleton_task and not _singleton_task.done():
@@ -4286,7 +4483,6 @@ class DataStreamingServer(BaseStreamingService):
             # Cancel only the per-connection tasks; the singleton collectors
             # are torn down on last-client disconnect (cancelling here breaks remaining clients).
             monitor_tasks = [
-                stats_sender_task_ws,
                 start_audio_task_ws,
             ]
             for _task_to_cancel in monitor_tasks:
@@ -4365,6 +4561,7 @@ class DataStreamingServer(BaseStreamingService):
                      "_network_monitor_task_ws",
                      "_system_monitor_task_ws",
                      "_gpu_monitor_task_ws",
+                     "_stats_publisher_task_ws",
                  ):
                      _singleton_task = getattr(self, _singleton_attr, None)
                      if _singleton_task and not _singleton_task.done():
@@ -4601,6 +4798,7 @@ class DataStreamingServer(BaseStreamingService):
         """
         data_logger.info(f"Stopping all streams for display '{display_id}'...")
         reset_sent = await self._ensure_backpressure_task_is_stopped(display_id)
+        await self._stop_low_rendition(display_id)
         capture_info = self.capture_instances.pop(display_id, None)
         if capture_info:
             capture_module = capture_info.get('module')
@@ -4860,6 +5058,7 @@ class DataStreamingServer(BaseStreamingService):
                     module = self.capture_instances[did]['module']
                     try:
                         module.update_capture_region(layout['x'], layout['y'], layout['w'], layout['h'])
+                        await self._retarget_low_rendition(did, layout)
                         data_logger.info(f"Re-targeted live capture '{did}' to {layout} (no restart).")
                     except Exception as e:
                         data_logger.warning(f"Live re-target failed for '{did}' ({e}); restarting it.")
@@ -4969,6 +5168,7 @@ class DataStreamingServer(BaseStreamingService):
                             inst['settings'] = self._get_capture_settings(
                                 did, layout['w'], layout['h'], layout['x'], layout['y']
                             )
+                            await self._retarget_low_rendition(did, layout)
                         except Exception as e:
                             data_logger.warning(
                                 f"Re-target to clamped region failed for '{did}' ({e}); restarting it."
@@ -5006,6 +5206,7 @@ class DataStreamingServer(BaseStreamingService):
                             module.update_framerate(float(fresh.target_fps))
                             module.update_video_bitrate(int(fresh.video_bitrate_kbps))
                             module.update_tunables(fresh)
+                            self._follow_low_rendition(display_id)
                         data_logger.info(f"Capture '{display_id}' followed the new layout live (no restart).")
                     else:
                         data_logger.info(f"Client '{display_id}' is active. Starting its capture.")
@@ -5140,10 +5341,10 @@ class DataStreamingServer(BaseStreamingService):
         """Start a capture instance for one display region.
 
         Callers hold _video_capture_lock. Builds the CaptureSettings, installs
-        the zero-copy frame callback (which fans chunks out to the per-client
-        relays via call_soon_threadsafe) and the pixelflux cursor handler, and
-        starts the persistent ScreenCapture module (reused across restarts so
-        the encoder backend stays warm). A genuinely capturing existing
+        the zero-copy frame callback (which batches chunks through a
+        LoopHandoff and fans each batch out to the per-client relays) and the
+        pixelflux cursor handler, and starts the persistent ScreenCapture
+        module (reused across restarts so the encoder backend stays warm). A genuinely capturing existing
         instance is left alone (an IDR is nudged for rejoining clients); a
         stale one is rebuilt.
 
@@ -5207,6 +5408,80 @@ class DataStreamingServer(BaseStreamingService):
                     * 125 * VIDEO_RELAY_BUDGET_SECONDS),
             )
 
+            # Every chunk queued since the loop last ran is fanned out in one
+            # pass: the targets are resolved once and the capture thread wakes
+            # the loop once per batch instead of once per stripe.
+            def do_fanout(items):
+                group = self.video_relay_groups.get(display_id)
+                # No relay group means the capture is stopping: the chunks
+                # are dropped and their buffers freed with the frames.
+                if group is None:
+                    return
+                started = time.perf_counter()
+                pc_ws = None
+                if display_id == 'primary':
+                    secondary_ws = {
+                        ci.get('ws')
+                        for did, ci in self.display_clients.items()
+                        if did != 'primary' and ci.get('ws')
+                    }
+                    # Hidden-tab clients (STOP_VIDEO) are excluded from
+                    # the VIDEO fan-out only; they stay connected for
+                    # control/cursor/audio and rejoin on START_VIDEO.
+                    targets = (self.clients - secondary_ws
+                               - self.video_paused_clients)
+                    keep = set(targets)
+                    ps = self.display_clients.get('primary')
+                    pc_ws = ps.get('ws') if ps else None
+                    if (pc_ws is not None and pc_ws in targets
+                            and not ps.get('backpressure_enabled', True)):
+                        # ACK backpressure throttles the CONTROLLER only;
+                        # its relay stays warm but gated, so it resumes
+                        # exactly at the IDR the gate lift requests.
+                        targets.discard(pc_ws)
+                        relay = group.get(pc_ws)
+                        if relay is not None:
+                            relay.flush_for_gate()
+                else:
+                    ci = self.display_clients.get(display_id)
+                    ws = ci.get('ws') if ci else None
+                    keep = {ws} if ws is not None else set()
+                    if ws is not None and ci.get('backpressure_enabled', True):
+                        targets = {ws}
+                    else:
+                        targets = set()
+                        relay = group.get(ws) if ws is not None else None
+                        if relay is not None:
+                            relay.flush_for_gate()
+                # A socket gone from the fan-out for good (disconnect,
+                # pause, demotion to secondary) takes its relay with
+                # it; gated sockets stay in `keep`. Membership churn
+                # settles within one batch, so the size check is safe.
+                if len(group) > len(keep):
+                    for ws in [w for w in group if w not in keep]:
+                        group.pop(ws).stop()
+                need_sync = False
+                for ws in targets:
+                    relay = group.get(ws)
+                    if relay is None:
+                        relay = _VideoRelay(
+                            self, display_id, ws,
+                            self._video_relay_budget(display_id, relay_budget))
+                        group[ws] = relay
+                        relay.start()
+                    elif relay.rendition != RENDITION_MAIN:
+                        continue
+                    for item in items:
+                        if relay.offer(item):
+                            need_sync = True
+                if need_sync:
+                    self._schedule_idr_for_display(display_id)
+                instrumentation.observe_stage(
+                    'video_fanout', time.perf_counter() - started)
+
+            video_handoff = LoopHandoff(self.capture_loop, do_fanout,
+                                        stage='video_handoff')
+
             def queue_data_for_display(frame):
                 if frame is None:
                     return
@@ -5231,71 +5506,10 @@ class DataStreamingServer(BaseStreamingService):
                             # is what the client ACKs; mask here so sent_timestamps
                             # RTT lookups and the uint16 circular-distance
                             # backpressure math keep matching past frame 65535.
-                            'frame_id': frame.frame_id & 0xFFFF}
-
-                    def do_fanout():
-                        group = self.video_relay_groups.get(display_id)
-                        # No relay group means the capture is stopping: the chunk is
-                        # dropped and its buffer freed with the frame.
-                        if group is None:
-                            return
-                        pc_ws = None
-                        if display_id == 'primary':
-                            secondary_ws = {
-                                ci.get('ws')
-                                for did, ci in self.display_clients.items()
-                                if did != 'primary' and ci.get('ws')
-                            }
-                            # Hidden-tab clients (STOP_VIDEO) are excluded from
-                            # the VIDEO fan-out only; they stay connected for
-                            # control/cursor/audio and rejoin on START_VIDEO.
-                            targets = (self.clients - secondary_ws
-                                       - self.video_paused_clients)
-                            keep = set(targets)
-                            ps = self.display_clients.get('primary')
-                            pc_ws = ps.get('ws') if ps else None
-                            if (pc_ws is not None and pc_ws in targets
-                                    and not ps.get('backpressure_enabled', True)):
-                                # ACK backpressure throttles the CONTROLLER only;
-                                # its relay stays warm but gated, so it resumes
-                                # exactly at the IDR the gate lift requests.
-                                targets.discard(pc_ws)
-                                relay = group.get(pc_ws)
-                                if relay is not None:
-                                    relay.flush_for_gate()
-                        else:
-                            ci = self.display_clients.get(display_id)
-                            ws = ci.get('ws') if ci else None
-                            keep = {ws} if ws is not None else set()
-                            if ws is not None and ci.get('backpressure_enabled', True):
-                                targets = {ws}
-                            else:
-                                targets = set()
-                                relay = group.get(ws) if ws is not None else None
-                                if relay is not None:
-                                    relay.flush_for_gate()
-                        # A socket gone from the fan-out for good (disconnect,
-                        # pause, demotion to secondary) takes its relay with
-                        # it; gated sockets stay in `keep`. Membership churn
-                        # settles within one chunk, so the size check is safe.
-                        if len(group) > len(keep):
-                            for ws in [w for w in group if w not in keep]:
-                                group.pop(ws).stop()
-                        need_sync = False
-                        for ws in targets:
-                            relay = group.get(ws)
-                            if relay is None:
-                                relay = _VideoRelay(
-                                    self, display_id, ws,
-                                    self._video_relay_budget(display_id, relay_budget))
-                                group[ws] = relay
-                                relay.start()
-                            if relay.offer(item):
-                                need_sync = True
-                        if need_sync:
-                            self._schedule_idr_for_display(display_id)
+                            'frame_id': frame.frame_id & 0xFFFF,
+                            'captured': time.perf_counter()}
 
-                    self.capture_loop.call_soon_threadsafe(do_fanout)
+                    video_handoff.put(item)
 
                 except Exception as e:
                     data_logger.error(f"Error in capture callback for {display_id}: {e}", exc_info=False)
@@ -5353,6 +5567,7 @@ class DataStreamingServer(BaseStreamingService):
                 'settings': settings,
             }
             data_logger.info(f"SUCCESS: Capture started for '{display_id}'.")
+            await self._start_low_rendition(display_id, width, height, x_offset, y_offset)
             return True
 
         except Exception as e:
@@ -5361,6 +5576,157 @@ class DataStreamingServer(BaseStreamingService):
             # Failure is reported so callers do not ack a false VIDEO_STARTED.
             return False
 
+    def _low_rendition_kbps(self, display_id: str, main_settings: Any) -> int:
+        """The low rendition's bitrate for a display, or 0 when it should not run.
+
+        Opt-in (SELKIES_WS_LOW_RENDITION) and only where it can help: the
+        primary display (a secondary display streams to its owner alone), X11
+        (a second Wayland capture would drive the compositor output twice),
+        H.264 in CBR, and a main bitrate above the low one.
+        """
+        if not settings.ws_low_rendition[0] or display_id != 'primary' or IS_WAYLAND:
+            return 0
+        if int(getattr(main_settings, 'output_mode', 0)) != 1:
+            return 0
+        display_state = self.display_clients.get(display_id) or {}
+        if display_state.get('rate_control_mode', self.rc_mode.value) != RateControlMode.CBR.value:
+            return 0
+        kbps = int(settings.ws_low_rendition_bitrate)
+        main_kbps = int(getattr(main_settings, 'video_bitrate_kbps', 0) or 0)
+        return kbps if 0 < kbps < main_kbps else 0
+
+    def _low_rendition_settings(self, display_id: str, kbps: int, width: int, height: int,
+                                x: int, y: int) -> Any:
+        """The display's capture settings with the low rendition's bitrate."""
+        cs = self._get_capture_settings(display_id, width, height, x, y)
+        cs.video_bitrate_kbps = kbps
+        return cs
+
+    async def _start_low_rendition(self, display_id: str, width: int, height: int,
+                                   x_offset: int, y_offset: int) -> None:
+        """Start the display's low rendition next to its running capture.
+
+        A second pixelflux capture of the same region at a lower bitrate.
+        pixelflux encodes X11 captures at the captured size, so the rendition
+        is lighter in bitrate, not resolution; same-size stripes also let a
+        viewer switch between the two at a keyframe without a decoder
+        rebuild. Its chunks go only to relays routed to it. The module is kept
+        in _persistent_capture_modules under its own key, so its encoder stays
+        warm across restarts like the main one. Best effort: a failure leaves
+        the display on its main capture alone.
+        """
+        inst = self.capture_instances.get(display_id)
+        kbps = self._low_rendition_kbps(display_id, inst.get('settings') if inst else None)
+        if not kbps or display_id in self.low_renditions:
+            return
+        rendition = {'kbps': kbps}
+
+        def request_idr() -> None:
+            try:
+                rendition['module'].request_idr_frame()
+            except Exception:
+                pass
+
+        def do_fanout(items):
+            group = self.video_relay_groups.get(display_id)
+            if group is None or self.low_renditions.get(display_id) is not rendition:
+                return
+            need_sync = False
+            for relay in list(group.values()):
+                if relay.rendition != RENDITION_LOW or relay.stopped:
+                    continue
+                for item in items:
+                    if relay.offer(item):
+                        need_sync = True
+            if need_sync:
+                request_idr()
+
+        handoff = LoopHandoff(self.capture_loop, do_fanout, stage='video_handoff')
+
+        def queue_low_rendition_data(frame):
+            if frame is None:
+                return
+            try:
+                if not len(frame) or len(frame) > WS_MESSAGE_SIZE_HARD_CAP:
+                    return
+                handoff.put({'data': memoryview(frame), 'owner': frame,
+                             'frame_id': frame.frame_id & 0xFFFF,
+                             'captured': time.perf_counter()})
+            except Exception as e:
+                data_logger.error(f"Error in low rendition callback for {display_id}: {e}", exc_info=False)
+
+        key = f"{display_id}:{RENDITION_LOW}"
+        try:
+            cs = self._low_rendition_settings(display_id, kbps, width, height, x_offset, y_offset)
+            module = self._persistent_capture_modules.get(key)
+            if module is None:
+                module = ScreenCapture()
+                self._persistent_capture_modules[key] = module
+            rendition['module'] = module
+            rendition['settings'] = cs
+            await self.capture_loop.run_in_executor(
+                None, module.start_capture, queue_low_rendition_data, cs)
+        except Exception as e:
+            data_logger.warning(
+                f"Low rendition for '{display_id}' failed to start ({e}); "
+                "every viewer stays on the main stream.")
+            return
+        self.low_renditions[display_id] = rendition
+        data_logger.info(f"Low rendition for '{display_id}' started at {kbps} kbps.")
+
+    async def _stop_low_rendition(self, display_id: str) -> None:
+        """Stop the display's low rendition and send its viewers back to the
+        main stream."""
+        rendition = self.low_renditions.pop(display_id, None)
+        if rendition is None:
+            return
+        self.rendition_routers.pop(display_id, None)
+        moved = False
+        for relay in (self.video_relay_groups.get(display_id) or {}).values():
+            if relay.rendition != RENDITION_MAIN:
+                relay.switch_rendition(RENDITION_MAIN)
+                moved = True
+        if moved:
+            self._schedule_idr_for_display(display_id)
+        try:
+            await asyncio.to_thread(rendition['module'].stop_capture)
+        except Exception as e:
+            data_logger.warning(f"Stopping the low rendition for '{display_id}' failed: {e}")
+
+    async def _retarget_low_rendition(self, display_id: str, layout: dict) -> None:
+        """Follow a live re-target of the display's capture region."""
+        rendition = self.low_renditions.get(display_id)
+        if rendition is None:
+            return
+        try:
+            rendition['module'].update_capture_region(
+                layout['x'], layout['y'], layout['w'], layout['h'])
+            rendition['settings'] = self._low_rendition_settings(
+                display_id, rendition['kbps'], layout['w'], layout['h'], layout['x'], layout['y'])
+        except Exception as e:
+            data_logger.warning(f"Low rendition for '{display_id}' could not follow the layout ({e}); stopping it.")
+            await self._stop_low_rendition(display_id)
+
+    def _follow_low_rendition(self, display_id: str) -> None:
+        """Push the main capture's live framerate and tunables to the low
+        rendition; its own bitrate stays."""
+        rendition = self.low_renditions.get(display_id)
+        inst = self.capture_instances.get(display_id)
+        if rendition is None or inst is None or inst.get('settings') is None:
+            return
+        main_cs = inst['settings']
+        try:
+            cs = self._low_rendition_settings(
+                display_id, rendition['kbps'], main_cs.capture_width, main_cs.capture_height,
+                main_cs.capture_x, main_cs.capture_y)
+            cs.target_fps = main_cs.target_fps
+            module = rendition['module']
+            module.update_framerate(float(cs.target_fps))
+            module.update_tunables(cs)
+            rendition['settings'] = cs
+        except Exception as e:
+            data_logger.warning(f"Low rendition for '{display_id}' did not take the live update ({e}).")
+
     def _get_capture_settings(self, display_id: str, width: int, height: int,
                               x: int, y: int) -> Any:
         """Build a pixelflux CaptureSettings for a specific display region.
@@ -5424,6 +5790,17 @@ class DataStreamingServer(BaseStreamingService):
         )
         return cs
     
+    def _video_relay_depth(self) -> int:
+        """Chunks queued across every video relay (read at metrics scrape)."""
+        return sum(len(relay.backlog)
+                   for group in list(self.video_relay_groups.values())
+                   for relay in list(group.values()))
+
+    def _pcmflux_audio_depth(self) -> int:
+        """Chunks waiting in the pcmflux audio queue (read at metrics scrape)."""
+        q = self.pcmflux_audio_queue
+        return q.qsize() if q is not None else 0
+
     async def run(self) -> None:
         """Start the server's components and block until shutdown is signaled.
 
@@ -5435,6 +5812,10 @@ class DataStreamingServer(BaseStreamingService):
         self.initialize()
 
         logger.info("Starting DataStreamingServer...")
+        instrumentation.track_queue('video_relay', self._video_relay_depth)
+        instrumentation.track_queue('pcmflux_audio', self._pcmflux_audio_depth)
+        if self.metrics:
+            self.metrics.monitor_loop()
         
         self._tasks_to_run = []
         # Start input handler tasks
@@ -5562,6 +5943,9 @@ class DataStreamingServer(BaseStreamingService):
         # callbacks are released with the server.
         self._persistent_capture_modules.clear()
 
+        instrumentation.untrack_queue('video_relay', self._video_relay_depth)
+        instrumentation.untrack_queue('pcmflux_audio', self._pcmflux_audio_depth)
+
         # The registry-global Prometheus gauges must be released, or re-entering
         # this mode after a switch fails with duplicated timeseries (the WebRTC
         # service unregisters on its own shutdown).
@@ -5673,11 +6057,13 @@ class DataStreamingServer(BaseStreamingService):
         return ws
 
 
-async def _collect_system_stats_ws(shared_data: dict, interval_seconds: float = 1) -> None:
+async def _collect_system_stats_ws(shared_data: dict, interval_seconds: float = 1,
+                                   updated: Optional[asyncio.Event] = None) -> None:
     """Singleton collector: poll CPU/memory into the shared stats dict.
 
-    One instance serves every connection's stats sender (per-connection
-    collectors would mean N psutil polls per second).
+    One instance serves every connection through the stats publisher
+    (per-connection collectors would mean N psutil polls per second), which
+    `updated` wakes after each new snapshot.
     """
     data_logger.debug(
         f"System monitor loop (WS mode) started, interval: {interval_seconds}s"
@@ -5693,6 +6079,8 @@ async def _collect_system_stats_ws(shared_data: dict, interval_seconds: float =
                 "mem_total": mem.total,
                 "mem_used": mem.used,
             }
+            if updated is not None:
+                updated.set()
             await asyncio.sleep(interval_seconds)
     except asyncio.CancelledError:
         data_logger.info("System monitor (WS) cancelled.")
@@ -5706,45 +6094,40 @@ async def _collect_gpu_stats_ws(
     interval_seconds: float = 1,
     dri_node: str = "",
     metrics: Optional[Metrics] = None,
+    updated: Optional[asyncio.Event] = None,
 ) -> None:
-    """Singleton collector: poll the pipeline's GPU into the shared stats dict.
+    """Singleton collector: copy the pipeline GPU's samples into the shared stats dict.
+
+    The readings come from the process-wide gpu_stats sampler for this GPU,
+    which the WebRTC GPU monitor shares, so a tick reads its buffer instead of
+    re-enumerating every GPU source.
 
     Args:
-        shared_data: The instance-wide stats dict the per-connection senders read.
+        shared_data: The instance-wide stats dict the stats publisher reads.
         gpu_id: Index into the unfiltered GPU list.
-        interval_seconds: Poll interval.
+        interval_seconds: Sampling and copy interval.
         dri_node: When set and it filters to exactly one GPU, that GPU wins
             over the index — stats must describe the GPU the pipeline
             captures/encodes on.
         metrics: Optional Prometheus gauges fed alongside the dict.
+        updated: Set after each new snapshot to wake the stats publisher.
     """
     data_logger.debug(
         f"GPU monitor loop (WS mode) for GPU {gpu_id} (node {dri_node or 'any'}), "
         f"interval: {interval_seconds}s"
     )
-    def _pick(gpus):
-        # A dri_node match returns exactly the pipeline's GPU; the index only
-        # applies to the unfiltered list.
-        idx = 0 if (dri_node and len(gpus) == 1) else gpu_id
-        return gpus[idx] if 0 <= idx < len(gpus) else None
-
+    sampler = None
     try:
-        # get_gpus() may spawn/block on vendor tools; keep it off the event loop.
-        gpus = await asyncio.to_thread(gpu_stats.get_gpus, dri_node)
-        if not gpus:
-            data_logger.warning("No GPUs detected for GPU monitor (WS).")
-            return
-        if _pick(gpus) is None:
-            data_logger.error(f"Invalid GPU ID {gpu_id} for GPU monitor (WS).")
+        # Resolving the GPU may spawn/block on vendor tools; keep it off the event loop.
+        sampler = await asyncio.to_thread(
+            gpu_stats.acquire_sampler, gpu_id, dri_node, interval_seconds)
+        if sampler is None:
+            data_logger.warning(f"No GPU with ID {gpu_id} found for GPU monitor (WS).")
             return
 
         while True:
-            try:
-                gpus = await asyncio.to_thread(gpu_stats.get_gpus, dri_node)
-                gpu = _pick(gpus) if gpus else None
-                if gpu is None:
-                    data_logger.error(f"GPU {gpu_id} no longer available.")
-                    break
+            gpu = sampler.latest()
+            if gpu is not None:
                 shared_data["gpu"] = {
                     "type": "gpu_stats",
                     "timestamp": datetime.now().isoformat(),
@@ -5759,18 +6142,16 @@ async def _collect_gpu_stats_ws(
                 }
                 if metrics is not None:
                     metrics.set_gpu_utilization(gpu.load * 100)
-            except asyncio.CancelledError:
-                raise
-            except Exception as e_gpu_stat:
-                data_logger.error(
-                    f"GPU monitor (WS): Error getting stats for ID {gpu_id}: {e_gpu_stat}"
-                )
-                await asyncio.sleep(interval_seconds * 2)
+                if updated is not None:
+                    updated.set()
             await asyncio.sleep(interval_seconds)
     except asyncio.CancelledError:
         data_logger.info("GPU monitor (WS) cancelled.")
     except Exception as e:
         data_logger.error(f"GPU monitor (WS) error: {e}", exc_info=True)
+    finally:
+        if sampler is not None:
+            await asyncio.to_thread(gpu_stats.release_sampler, sampler)
 
 async def _collect_network_stats_ws(shared_data: dict, server_instance: DataStreamingServer,
                                     interval_seconds: float = 2) -> None:
@@ -5803,50 +6184,83 @@ async def _collect_network_stats_ws(shared_data: dict, server_instance: DataStre
                 "bandwidth_mbps": round(current_mbps, 2),
                 "latency_ms": round(latency_ms, 1),
             }
+            server_instance._stats_updated_ws.set()
     except asyncio.CancelledError:
         data_logger.info("Network monitor (WS) cancelled.")
     except Exception as e:
         data_logger.error(f"Network monitor (WS) error: {e}", exc_info=True)
 
-async def _send_stats_periodically_ws(
-    websocket: web.WebSocketResponse,
-    shared_data: dict,
+async def _publish_stats_ws(
     server_instance: DataStreamingServer,
     interval_seconds: float = 5,
 ) -> None:
-    """Per-connection sender: push the singleton collectors' stats to one socket.
-
-    Reads (never pops) the shared dicts, since many per-connection senders
-    share the same collectors; ends itself when the socket dies.
+    """Singleton publisher: push the collectors' stats to every subscribed client.
+
+    Wakes on server_instance._stats_updated_ws, which the collectors set when
+    they replace a snapshot. A new snapshot is serialized once however many
+    clients receive it and goes to the clients subscribed to its kind (see
+    WS_STATS_KINDS), at most once per `interval_seconds` per kind; one replaced
+    within the interval goes out when the interval ends. A client that has not
+    received its kinds' current snapshots yet (it just joined or resubscribed)
+    gets them on the next wake rather than after an interval.
     """
+    updated = server_instance._stats_updated_ws
+    current = {}  # kind -> (snapshot, serialized text)
+    sent_at = {}
+    timeout = None
     try:
         while True:
-            await asyncio.sleep(interval_seconds)
-            # Read (don't pop): popping would let one sender starve the others, since
-            # many per-connection senders share these singleton collectors.
-            system_stats = shared_data.get("system")
-            gpu_stats = shared_data.get("gpu")
-            network_stats = server_instance._shared_network_stats.get("network")
             try:
-                # The socket may have been dropped since the last tick.
-                if not websocket:
-                    data_logger.info("Stats sender: WS closed or invalid.")
-                    break
-                if system_stats:
-                    await websocket.send_str(json.dumps(system_stats))
-                if gpu_stats:
-                    await websocket.send_str(json.dumps(gpu_stats))
-                if network_stats:
-                    await websocket.send_str(json.dumps(network_stats))
-            except (ConnectionResetError, OSError, RuntimeError):
-                data_logger.info("Stats sender: WS connection closed.")
-                break
-            except Exception as e_send:
-                data_logger.error(f"Stats sender: Error sending: {e_send}")
+                await asyncio.wait_for(updated.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            updated.clear()
+            now = time.monotonic()
+            timeout = None
+            snapshots = (
+                ("system", server_instance._shared_stats_ws.get("system")),
+                ("gpu", server_instance._shared_stats_ws.get("gpu")),
+                ("network", server_instance._shared_network_stats.get("network")),
+            )
+            for kind, snapshot in snapshots:
+                # Collectors replace their dict on every poll, so identity says
+                # whether this one has already been serialized.
+                if snapshot and (kind not in current or current[kind][0] is not snapshot):
+                    last = sent_at.get(kind)
+                    if last is not None and now < last + interval_seconds:
+                        wait = last + interval_seconds - now
+                        timeout = wait if timeout is None else min(timeout, wait)
+                    else:
+                        current[kind] = (snapshot, json.dumps(snapshot))
+                        sent_at[kind] = now
+                if kind not in current:
+                    continue
+                text = current[kind][1]
+                clients = server_instance.clients
+                recipients = set()
+                for c in clients:
+                    if kind not in getattr(c, "_ws_stats", WS_STATS_KINDS):
+                        continue
+                    sent = getattr(c, "_ws_stats_sent", None)
+                    if sent is None:
+                        sent = c._ws_stats_sent = {}
+                    if sent.get(kind) is not text:
+                        sent[kind] = text
+                        recipients.add(c)
+                if not recipients:
+                    continue
+                try:
+                    dropped = await _broadcast_to_clients(
+                        recipients, text, per_client_timeout=2.0)
+                    # Fanned out over a computed subset; mirror removals into
+                    # the authoritative registry.
+                    clients.difference_update(dropped)
+                except Exception as e_send:
+                    data_logger.error(f"Stats publisher: Error sending {kind}: {e_send}")
     except asyncio.CancelledError:
-        data_logger.info("Stats sender (WS) cancelled.")
+        data_logger.info("Stats publisher (WS) cancelled.")
     except Exception as e:
-        data_logger.error(f"Stats sender (WS) error: {e}", exc_info=True)
+        data_logger.error(f"Stats publisher (WS) error: {e}", exc_info=True)
 
 async def on_resize_handler(
     res_str: str,
@@ -834,6 +834,22 @@ SETTING_DEFINITIONS: List[Dict[str, Any]] = [
         "default": "",
         "help": 'Public IP address(es) to advertise in WebRTC host ICE candidates (Pion-style NAT1TO1), for a host behind static 1:1 NAT such as a cloud instance whose private address maps to a fixed public/elastic IP with the WebRTC UDP ports forwarded. Accepts one IPv4 and/or one IPv6 address (comma- or space-separated); each replaces the private address of host candidates in its own family, while server-reflexive (STUN) and relay (TURN) candidates are left untouched so hole-punching and TURN fallback still work. Empty (default) keeps the gathered addresses unchanged.',
     },
+    {
+        "name": "webrtc_udp_mux_port",
+        "type": "int",
+        "default": 0,
+        "min": 0,
+        "max": 65535,
+        "help": "Single UDP port shared by the host ICE candidates of every WebRTC peer: one socket per host address, with inbound packets routed to their peer by ICE ufrag and then by remote address. Lets the server run behind one published/forwarded UDP port (e.g. a Kubernetes hostPort or NodePort) instead of an ephemeral port range. 0 (default) binds an ephemeral port per peer. TURN relay candidates are unaffected.",
+    },
+    {
+        "name": "webrtc_dtls_cert_pool",
+        "type": "int",
+        "default": 4,
+        "min": 0,
+        "max": 64,
+        "help": "Number of DTLS certificates kept pre-generated for new WebRTC peers. A background thread generates them, with their fingerprints and DTLS context, and replaces each one after an hour; peers take them in turn instead of generating an EC key and signing a certificate on the event loop, which keeps reconnect storms off the time-to-first-frame path. 0 generates a certificate per peer connection.",
+    },
     {
         "name": "enable_cloudflare_turn",
         "type": "bool",
@@ -882,18 +898,60 @@ SETTING_DEFINITIONS: List[Dict[str, Any]] = [
         "default": "auto",
         "help": 'Register gamepads as kernel devices through /dev/uinput, which applications (Steam, Proton, in-desktop browsers) find without the Joystick Interposer or fake-udev: "auto" does so only where the interposer is not configured for the session and /dev/uinput is writable — typically a desktop host rather than a container — while "true" always attempts it and "false" never does.',
     },
+    {
+        "name": "x11_input_isolation",
+        "type": "bool",
+        "default": False,
+        "help": "Run X11 input injection (XTEST) and the X11 clipboard monitor in helper processes with their own interpreter, so bursts of pure-Python X work do not hold the streaming process's GIL and delay frame delivery. Costs two extra Python processes and one pipe hop per input batch.",
+    },
     {
         "name": "gpu_id",
         "type": "str",
         "default": "",
         "help": "GPU ID for hardware video encoders: selects /dev/dri/renderD{128 + n} and the GPU-stats index. Empty (default) sets no explicit pick, encoding on ID 0 — the first GPU — or on the GPU chosen by --auto-gpu; -1 disables hardware encoding. Ignored when --encode-dri specifies a device path.",
     },
+    {
+        "name": "gpu_stats_interval",
+        "type": "float",
+        "default": 1.0,
+        "min": 0.1,
+        "max": 60.0,
+        "help": "Seconds between GPU load/memory samples. One sampler thread per GPU keeps the device handle open and feeds the stats of both streaming modes and the Prometheus GPU gauge.",
+    },
     {
         "name": "congestion_control",
         "type": "bool",
         "default": False,
         "help": "Adapt the video bitrate to the transport-wide-cc (GCC-style) bandwidth estimate from WebRTC receiver feedback. Effective in CBR rate-control mode; may trade quality/stability for congestion responsiveness.",
     },
+    {
+        "name": "ws_adaptive_bitrate",
+        "type": "bool",
+        "default": False,
+        "help": "WebSocket mode: steer each display's shared encoder bitrate to the slowest active viewer's sustainable rate (video relay drain rate and ACK round trip), with hysteresis, instead of letting a slow viewer skip to keyframes repeatedly. The configured video_bitrate is the ceiling. Effective in CBR rate-control mode.",
+    },
+    {
+        "name": "ws_adaptive_bitrate_min",
+        "type": "int",
+        "default": 1000,
+        "min": 100,
+        "max": 1000000,
+        "help": "Floor in kbps for ws_adaptive_bitrate: the shared encoder is never steered below this (nor below the video_bitrate range minimum).",
+    },
+    {
+        "name": "ws_low_rendition",
+        "type": "bool",
+        "default": False,
+        "help": "WebSocket mode: run a second, lower-bitrate H.264 capture of the primary display and move each viewer whose link falls short of the main stream onto it (and back once it keeps up). X11 and CBR only; costs a second encoder session.",
+    },
+    {
+        "name": "ws_low_rendition_bitrate",
+        "type": "int",
+        "default": 1500,
+        "min": 100,
+        "max": 1000000,
+        "help": "Bitrate in kbps of the ws_low_rendition stream. The low rendition only runs while the main stream's bitrate is above it.",
+    },
     {
         "name": "audio_channels",
         "type": "int",
@@ -1031,6 +1089,7 @@ class AppSettings:
     webrtc_pacer: tuple[bool, bool]
     uinput_mouse_socket: str
     uinput_gamepad: str
+    x11_input_isolation: tuple[bool, bool]
     enable_cursors: tuple[bool, bool]
     debug_cursors: tuple[bool, bool]
     enable_resize: tuple[bool, bool]
@@ -47,7 +47,7 @@ except ImportError:
 from aiohttp import web
 from datetime import datetime
 from prometheus_client import generate_latest
-from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
 try:
     # pyrefly: ignore[missing-import]
     import importlib_resources as importlib_resources  # pyright: ignore[reportMissingImports]
@@ -796,6 +796,10 @@ class BaseStreamingService(metaclass=ABCMeta):
         pass
 
 
+# A zero-argument callable that imports a transport and builds its service.
+ServiceFactory = Callable[[], BaseStreamingService]
+
+
 class CentralizedStreamServer:
     """Supervisor that owns the aiohttp application and the streaming services.
 
@@ -809,10 +813,16 @@ class CentralizedStreamServer:
     def __init__(
         self,
         settings: Any,
-        services: Optional[Dict[str, BaseStreamingService]] = None,
+        services: Optional[Dict[str, Union[BaseStreamingService, ServiceFactory]]] = None,
     ) -> None:
         self.settings = settings
-        self.services = services or {}
+        # A value is either a built service or, until the first switch into
+        # it, the factory that builds it (see register_service).
+        self.services: Dict[str, Union[BaseStreamingService, ServiceFactory]] = services or {}
+        # Route patterns of lazily registered services, and the private router
+        # each one's endpoints land on when it is built after the app started.
+        self._lazy_routes: Dict[str, Tuple[str, ...]] = {}
+        self._lazy_routers: Dict[str, web.UrlDispatcher] = {}
         self.current_mode: Optional[str] = None
         self.lock = asyncio.Lock()
         self.active_task: Optional[asyncio.Task] = None
@@ -1317,6 +1327,9 @@ class CentralizedStreamServer:
                 logger.info(f"Mode {mode_name} is already active.")
                 return
 
+            # Build a lazily registered service before stopping the active one,
+            # so a transport that fails to import leaves the current mode up.
+            service = await self._resolve_service(mode_name)
             await self._stop_service()
             logger.info(f"Starting service: {mode_name}")
             # The service reads the settings at start. The encoder knob is
@@ -1329,7 +1342,6 @@ class CentralizedStreamServer:
             self.settings.mode = mode_name
             self.settings.apply_webrtc_encoder_filter()
             self.settings.resolve_rate_control_default()
-            service = self.services[mode_name]
             task = asyncio.create_task(service.start())
             self.active_task = task
             self.current_mode = mode_name
@@ -1377,6 +1389,57 @@ class CentralizedStreamServer:
         self.current_mode = None
         self.active_task = None
 
+    async def _resolve_service(self, name: str) -> BaseStreamingService:
+        """Return the service registered as ``name``, building it on first use.
+
+        A factory runs once, in a worker thread so its imports (seconds for
+        the WebRTC stack) do not stall the active mode's streams; its service
+        then replaces it in ``self.services``. Once the app has started its
+        router is frozen, so the new service's endpoints go on a private
+        router that the placeholder routes registered by start_server
+        dispatch to.
+        """
+        factory = self.services[name]
+        if isinstance(factory, BaseStreamingService):
+            return factory
+        loop = asyncio.get_running_loop()
+
+        def build() -> BaseStreamingService:
+            # Before 3.10, asyncio primitives bind the thread's current loop
+            # when constructed; give them the supervisor's.
+            asyncio.set_event_loop(loop)
+            try:
+                return factory()
+            finally:
+                asyncio.set_event_loop(None)
+
+        start = time.monotonic()
+        service = await asyncio.to_thread(build)
+        self.services[name] = service
+        logger.info(f"Loaded service '{name}' in {time.monotonic() - start:.2f}s")
+        if self.app is not None:
+            router = web.UrlDispatcher()
+            service.register_routes(self.settings.subfolder, router)
+            self._lazy_routers[name] = router
+        return service
+
+    def _lazy_route_handler(
+        self, name: str
+    ) -> Callable[[web.Request], Awaitable[web.StreamResponse]]:
+        """Placeholder handler for a route of the lazily registered ``name``.
+
+        Answers 409, as a built but inactive service does, until the service
+        is built; then resolves the request on its private router.
+        """
+        async def handler(request: web.Request) -> web.StreamResponse:
+            router = self._lazy_routers.get(name)
+            if router is None:
+                return web.Response(status=409, text=f"{name} mode is inactive")
+            match_info = await router.resolve(request)
+            return await match_info.handler(request)
+
+        return handler
+
     def _get_status(self) -> Dict[str, Any]:
         return {
             "current_mode": self.current_mode,
@@ -1972,8 +2035,13 @@ class CentralizedStreamServer:
             routes.append(web.get(f"{api_prefix}/api/metrics", self.handle_metrics))
         self.app.add_routes(routes)
 
-        for service in self.services.values():
-            service.register_routes(api_prefix, self.app.router)
+        for name, service in self.services.items():
+            if isinstance(service, BaseStreamingService):
+                service.register_routes(api_prefix, self.app.router)
+                continue
+            handler = self._lazy_route_handler(name)
+            for path in self._lazy_routes.get(name, ()):
+                self.app.router.add_route("*", f"{api_prefix}{path}", handler)
 
         self.static_fs_path = await self._get_static_content_path()
         if self.static_fs_path:
@@ -2127,6 +2195,24 @@ class CentralizedStreamServer:
         finally:
             await self.stop_server()
 
-    def register_service(self, name: str, service: BaseStreamingService) -> None:
-        """Register a streaming service under ``name`` for later activation."""
+    def register_service(
+        self,
+        name: str,
+        service: Union[BaseStreamingService, ServiceFactory],
+        routes: Iterable[str] = (),
+    ) -> None:
+        """Register a streaming service under ``name`` for later activation.
+
+        Args:
+            name: Mode name passed to ``switch_to_mode``.
+            service: The service, or a zero-argument factory that imports and
+                builds it on the first switch into ``name``, so a transport
+                that is never selected never loads its module graph. The
+                factory runs in a worker thread.
+            routes: For a factory, the path patterns (below the api prefix)
+                its ``register_routes`` adds. They are reserved when the app
+                starts and answer 409 until the service is built.
+        """
         self.services[name] = service
+        if not isinstance(service, BaseStreamingService):
+            self._lazy_routes[name] = tuple(routes)
@@ -46,6 +46,7 @@ from .rtcconfiguration import RTCBundlePolicy, RTCConfiguration, RTCIceServer
 from .rtcdatachannel import RTCDataChannel, RTCDataChannelParameters
 from .rtcdtlstransport import (
     RTCCertificate,
+    RTCCertificatePool,
     RTCDtlsFingerprint,
     RTCDtlsParameters,
     RTCDtlsTransport,
@@ -97,6 +98,7 @@ __all__ = [
     "MediaStreamTrack",
     "RTCBundlePolicy",
     "RTCCertificate",
+    "RTCCertificatePool",
     "RTCConfiguration",
     "RTCDataChannel",
     "RTCDataChannelParameters",
@@ -32,14 +32,14 @@
 #   OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 import fractions
-from typing import Optional, cast
+from typing import Optional, Union, cast
 
 from av import AudioFrame, AudioResampler, CodecContext
 from av.frame import Frame
 from av.packet import Packet
 
 from ..jitterbuffer import JitterFrame
-from ..mediastreams import convert_timebase
+from ..mediastreams import EncodedAudioFrame, convert_timebase
 from .base import Decoder, Encoder
 
 SAMPLE_RATE = 48000
@@ -105,6 +105,8 @@ class OpusEncoder(Encoder):
             # No packets were returned due to buffering.
             return [], None
 
-    def pack(self, packet: Packet) -> tuple[list[bytes], int]:
+    def pack(self, packet: Union[Packet, EncodedAudioFrame]) -> tuple[list[bytes], int]:
+        if isinstance(packet, EncodedAudioFrame):
+            return [packet.data], packet.pts
         timestamp = convert_timebase(packet.pts, packet.time_base, TIME_BASE)
         return [bytes(packet)], timestamp
@@ -32,13 +32,13 @@
 #   OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 import collections
-from typing import Optional
+from typing import Optional, Union
 
 from av.frame import Frame
 from av.packet import Packet
 
 from ... import audio_config
-from ..mediastreams import convert_timebase
+from ..mediastreams import EncodedAudioFrame, convert_timebase
 from .base import Encoder
 from .opus import TIME_BASE, OpusEncoder
 
@@ -130,9 +130,12 @@ class RedOpusEncoder(Encoder):
             self.history.append((payload, timestamp))
         return red_payloads, timestamp
 
-    def pack(self, packet: Packet) -> tuple[list[bytes], int]:
-        timestamp = convert_timebase(packet.pts, packet.time_base, TIME_BASE)
-        primary = bytes(packet)
+    def pack(self, packet: Union[Packet, EncodedAudioFrame]) -> tuple[list[bytes], int]:
+        if isinstance(packet, EncodedAudioFrame):
+            timestamp, primary = packet.pts, packet.data
+        else:
+            timestamp = convert_timebase(packet.pts, packet.time_base, TIME_BASE)
+            primary = bytes(packet)
         red = _build_red(list(self.history), primary, timestamp, self.block_pt)
         self.history.append((primary, timestamp))
         return [red], timestamp
@@ -686,3 +686,77 @@ class MediaRelay:
         self.__log_debug("Stop reading source %s", id(track))
         del self.__proxies[track]
         del self.__tasks[track]
+
+
+class FanoutStreamTrack(MediaStreamTrack):
+    """
+    One consumer of an :class:`EncodedFrameFanout`, with its own bounded
+    drop-oldest queue.
+    """
+
+    def __init__(self, kind: str, maxsize: int) -> None:
+        super().__init__()
+        self.kind = kind
+        self._queue: asyncio.Queue[Any] = asyncio.Queue(maxsize=maxsize)
+
+    def _put(self, frame: Any) -> None:
+        if self._queue.full():
+            self._queue.get_nowait()
+        self._queue.put_nowait(frame)
+
+    async def recv(self) -> Any:
+        if self.readyState != "live":
+            raise MediaStreamError
+        frame = await self._queue.get()
+        if frame is None:
+            raise MediaStreamError
+        return frame
+
+    def stop(self) -> None:
+        if self.readyState == "live":
+            # wake a consumer blocked in recv()
+            self._put(None)
+        super().stop()
+
+
+class EncodedFrameFanout:
+    """
+    Pushes pre-encoded frames straight to every consumer's track.
+
+    Unlike :class:`MediaRelay` there is no source track and no worker task:
+    the producer calls :meth:`push` (on the loop thread) and each frame lands in
+    every subscribed track's queue at once, for a sender to `pack()` as it is.
+    A consumer that falls behind drops its own oldest frames only.
+
+    :param kind: Media kind of the subscribed tracks.
+    :param maxsize: Per-consumer queue depth.
+    """
+
+    def __init__(self, kind: str, maxsize: int = 8) -> None:
+        self.kind = kind
+        self.maxsize = maxsize
+        self.__tracks: set[FanoutStreamTrack] = set()
+
+    def subscribe(self) -> MediaStreamTrack:
+        """
+        Create a track for a new consumer; it unsubscribes when it ends.
+        """
+        track = FanoutStreamTrack(self.kind, self.maxsize)
+        self.__tracks.add(track)
+        track.on("ended", lambda: self.__tracks.discard(track))
+        return track
+
+    def push(self, frame: Any) -> None:
+        """
+        Queue `frame` for every consumer.
+        """
+        for track in self.__tracks:
+            track._put(frame)
+
+    def stop(self) -> None:
+        """
+        End every consumer's track, waking any blocked in `recv()`.
+        """
+        for track in list(self.__tracks):
+            track.stop()
+        self.__tracks.clear()
@@ -57,6 +57,25 @@ def convert_timebase(
     return pts
 
 
+class EncodedAudioFrame:
+    """
+    One pre-encoded audio frame with its pts already in the codec clock.
+
+    A lightweight stand-in for :class:`av.Packet` that a track may return from
+    `recv()` for a codec whose `pack()` accepts it: no PyAV allocation and no
+    time-base conversion per frame.
+
+    :param data: The encoded frame.
+    :param pts: Timestamp in the RTP clock of the codec (48 kHz for Opus).
+    """
+
+    __slots__ = ("data", "pts")
+
+    def __init__(self, data: bytes, pts: int) -> None:
+        self.data = data
+        self.pts = pts
+
+
 class MediaStreamError(Exception):
     pass
 
@@ -13,7 +13,8 @@
 # nothing is queued and credit covers it; otherwise it queues and the drain
 # task sleeps to the exact instant credit covers the highest-priority head. An
 # enqueue that credit already covers pokes the drain awake, so neither sleep
-# overshoot nor coalescing adds latency to another class.
+# overshoot nor coalescing adds latency to another class. Senders hand over
+# whole frames (send_batch); affordable runs leave in one batched write.
 #
 # Invariants:
 #   * The burst budget always covers one max-size packet, otherwise a packet
@@ -38,9 +39,11 @@ import asyncio
 import logging
 import os
 import time
-from typing import Awaitable, Callable, Dict, Deque, Optional
+from typing import Awaitable, Callable, Dict, Deque, List, Optional
 from collections import deque
 
+from ..instrumentation import observe_stage
+
 logger = logging.getLogger("selkies_webrtc_pacer")
 
 # Priority classes (lower value wins). RTCP + audio share a class: both are
@@ -121,6 +124,7 @@ VIDEO_STALE_S = _stale_deadline_s()
 MIN_GOODPUT_SAMPLE_BYTES = 2048
 
 SendNow = Callable[[bytes], Awaitable[None]]
+SendNowBatch = Callable[[List[bytes]], Awaitable[None]]
 
 
 def h264_payloads_suggest_idr(payloads) -> bool:
@@ -163,11 +167,16 @@ class RtpPacer:
         send_now_data: Optional[SendNow] = None,
         request_keyframe: Optional[Callable[[], None]] = None,
         loop: Optional[asyncio.AbstractEventLoop] = None,
+        send_now_batch: Optional[SendNowBatch] = None,
     ) -> None:
         self._encoder_bps = max(int(encoder_bps), 100_000)
         self._goodput_bps: Optional[int] = None
         self._send_now = send_now
         self._send_now_data = send_now_data or send_now
+        # Whole runs of affordable packets go out through one call: a frame's
+        # worth of datagrams is written in a single pass instead of one
+        # coroutine hop per packet.
+        self._send_now_batch = send_now_batch or self._send_each
         self._request_keyframe = request_keyframe
         self._loop = loop or asyncio.get_running_loop()
 
@@ -291,13 +300,23 @@ class RtpPacer:
         self._apply_pace()
 
     def _make_class_table(self) -> None:
-        """Precomputed per-class (class, queue, sender) triples in priority
-        order: per-packet work must not re-derive what never changes."""
+        """Precomputed per-class (class, queue, batch sender) triples in
+        priority order: per-packet work must not re-derive what never changes.
+        Data-channel records stay one send per record (each is its own DTLS
+        record); video runs go out through the batch sender."""
         self._class_table = [
-            (CLASS_DC, self._queues[CLASS_DC], self._send_now_data),
-            (CLASS_VIDEO, self._queues[CLASS_VIDEO], self._send_now),
+            (CLASS_DC, self._queues[CLASS_DC], self._send_each_data),
+            (CLASS_VIDEO, self._queues[CLASS_VIDEO], self._send_now_batch),
         ]
 
+    async def _send_each(self, batch: List[bytes]) -> None:
+        for data in batch:
+            await self._send_now(data)
+
+    async def _send_each_data(self, batch: List[bytes]) -> None:
+        for data in batch:
+            await self._send_now_data(data)
+
     def _apply_pace(self) -> None:
         """Re-derive the burst budget from the current pace and clamp credit to
         it. Credit saturates at the budget, so the budget is floored at
@@ -467,6 +486,112 @@ class RtpPacer:
             self._poke.set()
         self._kick()
 
+    async def send_batch(self, batch: List[bytes], cls: int) -> None:
+        """Admit or drop one frame's packets as a unit.
+
+        Same admission rules as `send`, applied to the frame rather than to
+        each packet: a dead GOP or a stale backlog drops the whole frame, and
+        a frame that overflows the video budget resets the GOP and is kept
+        only if, after purging older video, all of it fits — a frame with a
+        missing tail would break the reference chain anyway. An admitted
+        frame is not necessarily written at once: on an empty queue the
+        prefix that credit covers goes straight out in one batched write and
+        the rest is queued behind it for the drain, which writes affordable
+        runs in one batched write too. That prefix is only sent when the
+        rest is sure to be admitted, so a frame is never half sent.
+        """
+        if len(batch) == 1:
+            await self.send(batch[0], cls)
+            return
+        if self._stopped:
+            raise ConnectionError("pacer stopped")
+        if not batch:
+            return
+        total = 0
+        for data in batch:
+            total += len(data)
+
+        if cls == CLASS_RTCP:
+            self.stats["fastpath_bytes"] += total
+            await self._send_now_batch(batch)
+            return
+
+        self._maybe_recover_pace()
+
+        if cls != CLASS_VIDEO:
+            # Reliable classes keep per-packet backpressure and ordering.
+            for data in batch:
+                await self.send(data, cls)
+            return
+
+        if self._gop_dead:
+            if time.monotonic() - self._gop_dead_at >= RESURRECT_TIMEOUT_S:
+                self._gop_dead = False
+                self.stats["timeout_resurrects"] += 1
+                logger.info("pacer: no keyframe within %.1fs of reset; "
+                            "resurrecting video optimistically", RESURRECT_TIMEOUT_S)
+            else:
+                self.stats["video_dropped"] += len(batch)
+                return
+
+        if VIDEO_STALE_S > 0 and self._video_ts:
+            deadline = VIDEO_STALE_S
+            if self._idr_floor_bytes:
+                idr_time = self._idr_floor_bytes * 8.0 / max(self._pace_bps, 1)
+                if idr_time > deadline:
+                    deadline = idr_time
+            if time.monotonic() - self._video_ts[0] > deadline:
+                self._stale_reset(deadline)
+                self.stats["video_dropped"] += len(batch)
+                return
+
+        start = 0
+        if not self._bytes_queued:
+            self._accrue()
+            covered = 0
+            while start < len(batch) and covered + len(batch[start]) <= self.credit:
+                covered += len(batch[start])
+                start += 1
+            if start and total - covered > self._video_cap_bytes():
+                # The queue is empty, so nothing can be purged to make room
+                # for the tail: leave the whole frame to the overflow drop
+                # below rather than send a head without it.
+                start = 0
+            if start:
+                self.credit -= covered
+                self.stats["fastpath_bytes"] += covered
+                await self._send_now_batch(batch if start == len(batch) else batch[:start])
+                if start == len(batch):
+                    return
+                total -= covered
+
+        cap = self._video_cap_bytes()
+        if self._video_bytes + total > cap:
+            self._reset_gop()
+            while self._queues[CLASS_VIDEO] and self._video_bytes + total > cap:
+                old = self._queues[CLASS_VIDEO].popleft()
+                self._video_ts.popleft()
+                self._video_bytes -= len(old)
+                self._bytes_queued -= len(old)
+                self.stats["video_dropped"] += 1
+            if self._video_bytes + total > cap:
+                self.stats["video_dropped"] += len(batch) - start
+                return
+
+        dq = self._queues[CLASS_VIDEO]
+        now = time.monotonic()
+        for i in range(start, len(batch)):
+            dq.append(batch[i])
+            self._video_ts.append(now)
+        self._video_bytes += total
+        self._bytes_queued += total
+        if self._bytes_queued > self.stats["queue_max_bytes"]:
+            self.stats["queue_max_bytes"] = self._bytes_queued
+        self._accrue()
+        if len(batch[start]) <= self.credit:
+            self._poke.set()
+        self._kick()
+
     def _stale_reset(self, deadline_s: float) -> None:
         """Latency-first branch of GOP reset used when queued video outlives
         its usefulness: unlike a cap overflow (which trims only what doesn't
@@ -533,6 +658,9 @@ class RtpPacer:
                 self._maybe_recover_pace()
                 self._accrue()
                 for cls, dq, sender in self._class_table:
+                    run: List[bytes] = []
+                    run_bytes = 0
+                    oldest = 0.0
                     while dq:
                         size = len(dq[0])
                         if size > self.credit:
@@ -547,14 +675,18 @@ class RtpPacer:
                                     "pacer: %d-byte packet exceeds the %d-byte burst "
                                     "budget; releasing oversized packets on a full "
                                     "bucket", size, int(self._debt_cap))
-                        data = dq.popleft()
+                        run.append(dq.popleft())
+                        run_bytes += size
                         self._bytes_queued -= size
                         if cls == CLASS_VIDEO:
                             self._video_bytes -= size
-                            self._video_ts.popleft()
+                            queued_at = self._video_ts.popleft()
+                            if not oldest:
+                                oldest = queued_at
                         self.credit -= size
+                    if run:
                         try:
-                            await sender(data)
+                            await sender(run)
                         except Exception:
                             logger.warning("pacer: send failed; dropping queue",
                                            exc_info=True)
@@ -568,13 +700,16 @@ class RtpPacer:
                             self._bytes_queued = self._video_bytes = 0
                             self._release_senders()
                             return
-                        self.stats["paced_bytes"] += size
+                        self.stats["paced_bytes"] += run_bytes
+                        if oldest:
+                            # Queue residence of the run's oldest video packet.
+                            observe_stage("webrtc_pacer", time.monotonic() - oldest)
                 if self._bytes_queued <= DC_LOW_WATER_BYTES:
                     self._release_senders()
                 if not self._bytes_queued:
                     return
                 head = 0
-                for _, dq, _sender in self._class_table:
+                for _cls, dq, _sender in self._class_table:
                     if dq:
                         head = len(dq[0])
                         break
@@ -619,6 +754,7 @@ class RtpPacer:
         out["pace_bps"] = int(self._pace_bps)
         out["queued_bytes"] = self._bytes_queued
         out["video_bytes"] = self._video_bytes
+        out["queued_packets"] = sum(len(dq) for dq in self._queues.values())
         out["idr_floor_bytes"] = int(self._idr_floor_bytes)
         out["gop_dead"] = int(self._gop_dead)
         return out
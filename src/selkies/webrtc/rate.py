@@ -38,6 +38,7 @@ from typing import Any, Optional
 from .utils import uint32_add, uint32_gt
 
 BURST_DELTA_THRESHOLD_MS = 5
+MAX_BURST_DURATION_MS = 100
 
 # overuse detector
 MAX_ADAPT_OFFSET_MS = 15
@@ -52,6 +53,9 @@ INTER_ARRIVAL_SHIFT = 26
 TIMESTAMP_GROUP_LENGTH_MS = 5
 TIMESTAMP_TO_MS = 1000.0 / (1 << INTER_ARRIVAL_SHIFT)
 
+# send-side estimator: send times in microseconds
+SEND_GROUP_LENGTH_US = 5000
+
 
 class BandwidthUsage(Enum):
     NORMAL = 0
@@ -218,6 +222,7 @@ class AimdRateControl:
 class TimestampGroup:
     def __init__(self, timestamp: Optional[int] = None) -> None:
         self.arrival_time: Optional[int] = None
+        self.first_arrival_time: Optional[int] = None
         self.first_timestamp = timestamp
         self.last_timestamp = timestamp
         self.size = 0
@@ -271,6 +276,8 @@ class InterArrival:
         elif uint32_gt(timestamp, self.current_group.last_timestamp):
             self.current_group.last_timestamp = timestamp
 
+        if self.current_group.first_arrival_time is None:
+            self.current_group.first_arrival_time = arrival_time
         self.current_group.size += packet_size
         self.current_group.arrival_time = arrival_time
 
@@ -280,9 +287,13 @@ class InterArrival:
         timestamp_delta = uint32_add(timestamp, -self.current_group.last_timestamp)
         timestamp_delta_ms = round(self.timestamp_to_ms * timestamp_delta)
         arrival_time_delta = arrival_time - self.current_group.arrival_time
+        # A saturated queue delivers back to back: without a duration cap
+        # every later frame would merge into one never-ending burst.
         return timestamp_delta_ms == 0 or (
             (arrival_time_delta - timestamp_delta_ms) < 0
             and arrival_time_delta <= BURST_DELTA_THRESHOLD_MS
+            and arrival_time - self.current_group.first_arrival_time
+            < MAX_BURST_DURATION_MS
         )
 
     def new_timestamp_group(self, timestamp: int, arrival_time: int) -> bool:
@@ -610,3 +621,116 @@ class RemoteBitrateEstimator:
                 return target_bitrate, list(self.ssrcs.keys())
 
         return None
+
+
+class SendSideBandwidthEstimator:
+    """
+    Delay-based bandwidth estimate on the sending side, from transport-wide-cc
+    feedback.
+
+    The send-side twin of :class:`RemoteBitrateEstimator`: each acknowledged
+    packet's send time (from the sender's history) and arrival time (from the
+    feedback) go through the same InterArrival / OveruseEstimator /
+    OveruseDetector chain, and AimdRateControl turns the detector state and
+    the acknowledged bitrate into one target. A growing one-way delay means a
+    queue is building on the path, so the target drops before that queue
+    overflows into loss.
+
+    The target starts at the upper bound (the configured video bitrate):
+    damage-gated encoders are application-limited, so waiting for measured
+    throughput to bootstrap it, as the receive side does, would start a
+    session far below what the link carries.
+    """
+
+    def __init__(self, min_bitrate: int, max_bitrate: int) -> None:
+        self.acked_bitrate = RateCounter(1000, 8000)
+        self.inter_arrival = InterArrival(SEND_GROUP_LENGTH_US, 0.001)
+        self.estimator = OveruseEstimator()
+        self.detector = OveruseDetector()
+        self.rate_control = AimdRateControl()
+        self.min_bitrate = min_bitrate
+        self.max_bitrate = max_bitrate
+        self.target_bitrate = max_bitrate
+        self.last_arrival_ms: Optional[int] = None
+        self.last_update_ms: Optional[int] = None
+
+    def set_bounds(self, min_bitrate: int, max_bitrate: int) -> None:
+        """
+        Bound the target, e.g. when the user changes the video bitrate.
+        """
+        self.min_bitrate = min_bitrate
+        self.max_bitrate = max(min_bitrate, max_bitrate)
+        self._apply(self.target_bitrate)
+
+    def add(self, send_time: float, arrival_time_ms: float, size: int) -> None:
+        """
+        Add one acknowledged packet.
+
+        :param send_time: Local send time in seconds.
+        :param arrival_time_ms: Arrival time in the receiver's clock, in
+            milliseconds; only differences between arrivals are used.
+        :param size: Packet size in bytes.
+        """
+        arrival_ms = int(arrival_time_ms)
+        if self.last_arrival_ms is None:
+            self.rate_control.set_estimate(self.target_bitrate, arrival_ms)
+        elif arrival_ms < self.last_arrival_ms:
+            # Reordered in the feedback: the rate counter needs monotonic time.
+            arrival_ms = self.last_arrival_ms
+        elif arrival_ms - self.last_arrival_ms > 1000:
+            # Idle for longer than the rate window: nothing in it is current.
+            self.acked_bitrate.reset()
+        self.last_arrival_ms = arrival_ms
+        self.acked_bitrate.add(size, arrival_ms)
+
+        timestamp = int(send_time * 1000000) & 0xFFFFFFFF
+        deltas = self.inter_arrival.compute_deltas(timestamp, arrival_ms, size)
+        if deltas is not None:
+            timestamp_delta_ms = deltas.timestamp * 0.001
+            self.estimator.update(
+                deltas.arrival_time,
+                timestamp_delta_ms,
+                deltas.size,
+                self.detector.state(),
+                arrival_ms,
+            )
+            self.detector.detect(
+                self.estimator.offset(),
+                timestamp_delta_ms,
+                self.estimator.num_of_deltas(),
+                arrival_ms,
+            )
+
+    def update(self) -> int:
+        """
+        Update the target after a feedback message's packets were added.
+
+        The rate control runs once per feedback interval, or at once while
+        the detector reports overuse.
+        """
+        now_ms = self.last_arrival_ms
+        if now_ms is None:
+            return self.target_bitrate
+        overusing = self.detector.state() == BandwidthUsage.OVERUSING
+        if (
+            overusing
+            or self.last_update_ms is None
+            or now_ms - self.last_update_ms > self.rate_control.feedback_interval()
+        ):
+            bitrate = self.rate_control.update(
+                self.detector.state(), self.acked_bitrate.rate(now_ms), now_ms
+            )
+            if bitrate is not None:
+                self.last_update_ms = now_ms
+                if overusing:
+                    # The decrease is relative to acknowledged throughput, which
+                    # for an application-limited encoder (an idle screen) says
+                    # nothing about the link: back off at most by half per step.
+                    bitrate = max(bitrate, self.target_bitrate // 2)
+                self._apply(bitrate)
+        return self.target_bitrate
+
+    def _apply(self, bitrate: int) -> None:
+        self.target_bitrate = max(self.min_bitrate, min(self.max_bitrate, bitrate))
+        # Keep the rate control from winding up outside the bounds.
+        self.rate_control.current_bitrate = self.target_bitrate
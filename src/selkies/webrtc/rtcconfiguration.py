@@ -33,7 +33,10 @@
 
 import enum
 from dataclasses import dataclass
-from typing import Optional, Union
+from typing import TYPE_CHECKING, Optional, Union
+
+if TYPE_CHECKING:
+    from .rtcdtlstransport import RTCCertificate
 
 
 @dataclass
@@ -103,3 +106,12 @@ class RTCConfiguration:
 
     iceHostPublicIps: Optional[list[str]] = None
     "Public IPv4/IPv6 addresses to advertise in host ICE candidates (static 1:1 NAT)."
+
+    iceUdpMuxPort: Optional[int] = None
+    "A local UDP port shared by the host ICE candidates of every peer (single-port mux)."
+
+    certificates: Optional[list["RTCCertificate"]] = None
+    """
+    The :class:`RTCCertificate` to use for DTLS (only one is allowed). When
+    omitted, the connection generates its own.
+    """
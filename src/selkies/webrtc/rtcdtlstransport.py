@@ -38,8 +38,10 @@ import enum
 import logging
 import os
 import struct
+import threading
 import time
 import traceback
+from array import array
 from dataclasses import dataclass, field
 from typing import Callable, Optional, Protocol, Type, TypeVar, Union
 
@@ -60,6 +62,7 @@ from .pacer import (
     MIN_GOODPUT_SAMPLE_BYTES,
     RtpPacer,
 )
+from .rate import SendSideBandwidthEstimator
 from .rtcicetransport import RTCIceTransport
 from .rtcrtpparameters import RTCRtpReceiveParameters, RTCRtpSendParameters
 from .rtp import (
@@ -81,6 +84,12 @@ V = TypeVar("V")
 
 logger = logging.getLogger(__name__)
 
+# Transport-wide sequence numbers are 16 bits, so the send history has one slot
+# per number: recording a packet is two array stores, and a slot is simply
+# overwritten when the sequence space wraps (~14 s at 4500 packets/s) instead
+# of being evicted.
+TWCC_HISTORY_SIZE = 0x10000
+
 # Mapping of supported `RTCDtlsFingerprint` algorithms to the
 # corresponding argument for `x509.Certificate.fingerprint`.
 X509_DIGEST_ALGORITHMS = {
@@ -201,6 +210,10 @@ class RTCCertificate:
     def __init__(self, key: ec.EllipticCurvePrivateKey, cert: x509.Certificate) -> None:
         self._key = key
         self._cert = cert
+        # Both are fixed for the certificate's life; a pooled certificate
+        # serves many connections, so they are computed once.
+        self._fingerprints: Optional[list[RTCDtlsFingerprint]] = None
+        self._ssl_contexts: dict[tuple[SRTPProtectionProfile, ...], SSL.Context] = {}
 
     @property
     def expires(self) -> datetime.datetime:
@@ -214,13 +227,15 @@ class RTCCertificate:
         Returns the list of certificate fingerprints, one of which is computed
         with the digest algorithm used in the certificate signature.
         """
-        return [
-            RTCDtlsFingerprint(
-                algorithm=algorithm,
-                value=certificate_digest(self._cert, algorithm),
-            )
-            for algorithm in X509_DIGEST_ALGORITHMS.keys()
-        ]
+        if self._fingerprints is None:
+            self._fingerprints = [
+                RTCDtlsFingerprint(
+                    algorithm=algorithm,
+                    value=certificate_digest(self._cert, algorithm),
+                )
+                for algorithm in X509_DIGEST_ALGORITHMS.keys()
+            ]
+        return list(self._fingerprints)
 
     @classmethod
     def generateCertificate(cls: Type[CERTIFICATE_T]) -> CERTIFICATE_T:
@@ -235,6 +250,17 @@ class RTCCertificate:
 
     def _create_ssl_context(
         self, srtp_profiles: list[SRTPProtectionProfile]
+    ) -> SSL.Context:
+        # The context only carries configuration; each SSL.Connection made from
+        # it keeps its own handshake state, so one context serves them all.
+        profiles = tuple(srtp_profiles)
+        ctx = self._ssl_contexts.get(profiles)
+        if ctx is None:
+            ctx = self._ssl_contexts[profiles] = self.__build_ssl_context(profiles)
+        return ctx
+
+    def __build_ssl_context(
+        self, srtp_profiles: tuple[SRTPProtectionProfile, ...]
     ) -> SSL.Context:
         ctx = SSL.Context(SSL.DTLS_METHOD)
         ctx.set_verify(
@@ -250,6 +276,90 @@ class RTCCertificate:
         return ctx
 
 
+class RTCCertificatePool:
+    """
+    A pool of ready :class:`RTCCertificate` objects for new connections.
+
+    Generating a certificate means an EC key and an X.509 signature, which
+    would otherwise run on the event loop for every :class:`RTCPeerConnection`.
+    A background thread keeps `size` certificates ready, with their
+    fingerprints and DTLS context already built, and replaces each one
+    `lifetime` seconds after it was made. :meth:`get` hands them out in turn;
+    a connection keeps the certificate it got for its whole life.
+
+    :param size: Number of certificates kept ready.
+    :param lifetime: Seconds a certificate is handed out before it is replaced.
+    """
+
+    def __init__(self, size: int = 4, lifetime: float = 3600.0) -> None:
+        self.size = max(1, size)
+        self.lifetime = lifetime
+        self._certificates: list[tuple[float, RTCCertificate]] = []
+        self._next = 0
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """
+        Start filling the pool in the background.
+        """
+        if self._thread is None:
+            self._stopped.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="dtls-certificates", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop the background thread; certificates already handed out stay valid.
+        """
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stopped.set()
+            thread.join()
+
+    def get(self) -> RTCCertificate:
+        """
+        Return a ready certificate, or a freshly generated one while the pool
+        is still empty.
+        """
+        with self._lock:
+            if self._certificates:
+                certificate = self._certificates[self._next % len(self._certificates)][1]
+                self._next += 1
+                return certificate
+        return self._prepare(RTCCertificate.generateCertificate())
+
+    @staticmethod
+    def _prepare(certificate: RTCCertificate) -> RTCCertificate:
+        certificate.getFingerprints()
+        certificate._create_ssl_context(srtp_profiles=SRTP_PROFILES)
+        return certificate
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            with self._lock:
+                born = [made for made, _ in self._certificates]
+            now = time.monotonic()
+            if len(born) >= self.size and now - min(born) < self.lifetime:
+                self._stopped.wait(min(born) + self.lifetime - now)
+                continue
+            try:
+                certificate = self._prepare(RTCCertificate.generateCertificate())
+            except Exception:
+                logger.exception("Could not generate a DTLS certificate")
+                self._stopped.wait(1.0)
+                continue
+            with self._lock:
+                if len(self._certificates) >= self.size:
+                    self._certificates.remove(
+                        min(self._certificates, key=lambda entry: entry[0])
+                    )
+                self._certificates.append((time.monotonic(), certificate))
+
+
 @dataclass
 class RTCDtlsParameters:
     """
@@ -418,17 +528,23 @@ class RTCDtlsTransport(AsyncIOEventEmitter):
         self._transport = transport
 
         # transport-wide congestion control: one sequence-number space shared by
-        # every sender on this transport, a bounded send history for matching the
-        # receiver's feedback, and the latest loss/delay estimate derived from it.
+        # every sender on this transport, a send history (size and send-time
+        # columns indexed by sequence number; size 0 once acknowledged) for
+        # matching the receiver's feedback, and the latest loss/delay estimate
+        # derived from it. The delay-based estimator is off until the
+        # application bounds it with configure_bwe().
         self._twcc_seq = 0
-        self._twcc_history: dict[int, tuple[int, float]] = {}
+        self._twcc_sizes = array("I", [0]) * TWCC_HISTORY_SIZE
+        self._twcc_send_times = array("d", [0.0]) * TWCC_HISTORY_SIZE
         self.twcc_estimate: Optional[dict] = None
+        self.bwe: Optional[SendSideBandwidthEstimator] = None
 
         # Optional strict-priority packet pacer (SELKIES_WEBRTC_PACER): queues
         # video behind audio/RTCP/data instead of blasting frames to the wire,
         # with an IDR-aware budget and GOP-reset recovery. Off unless enabled by
         # the application with enable_pacer().
         self._pacer: Optional[RtpPacer] = None
+        self._pacer_encoder_bps = 0
 
         # counters
         self.__rx_bytes = 0
@@ -788,24 +904,48 @@ class RTCDtlsTransport(AsyncIOEventEmitter):
         request_keyframe: Optional[Callable[[], None]] = None,
     ) -> None:
         """Attach the packet pacer to this transport (idempotent)."""
+        self._pacer_encoder_bps = encoder_bps
         if self._pacer is None:
             async def _send_now_data(payload: bytes) -> None:
                 self._ssl.send(payload)
                 await self._write_ssl()
             self._pacer = RtpPacer(
-                encoder_bps=encoder_bps,
+                encoder_bps=self._paced_encoder_bps(),
                 # Bound coroutine fn directly: the RTP hot path cannot afford
                 # a wrapper frame around every packet.
                 send_now=self.transport._send,
                 send_now_data=_send_now_data,
                 request_keyframe=request_keyframe,
+                send_now_batch=self.transport._send_batch,
             )
         elif request_keyframe is not None:
             self._pacer._request_keyframe = request_keyframe
 
     def set_pacer_encoder_bps(self, bps: int) -> None:
+        """Set the encoder ceiling the pacer paces against; with the delay-based
+        estimator configured, the pacer follows its target below that ceiling."""
+        self._pacer_encoder_bps = bps
         if self._pacer is not None:
-            self._pacer.set_encoder_bps(bps)
+            self._pacer.set_encoder_bps(self._paced_encoder_bps())
+
+    def _paced_encoder_bps(self) -> int:
+        if self.bwe is None:
+            return self._pacer_encoder_bps
+        return min(self._pacer_encoder_bps, self.bwe.target_bitrate)
+
+    def configure_bwe(self, min_bps: int, max_bps: int) -> None:
+        """Enable (or re-bound) the delay-based send-side bandwidth estimator.
+
+        From then on every transport-cc feedback updates its target, publishes
+        it as ``twcc_estimate["target_bps"]`` for the encoder, and applies it to
+        the pacer straight away rather than on the application's next tick.
+        """
+        if self.bwe is None:
+            self.bwe = SendSideBandwidthEstimator(min_bps, max_bps)
+        else:
+            self.bwe.set_bounds(min_bps, max_bps)
+        if self._pacer is not None:
+            self._pacer.set_encoder_bps(self._paced_encoder_bps())
 
     def note_video_keyframe(self, total_payload_bytes: int, natural: bool = True) -> None:
         """Video senders report keyframe emissions here so the pacer can keep
@@ -836,15 +976,38 @@ class RTCDtlsTransport(AsyncIOEventEmitter):
         self.__tx_bytes += len(data)
         self.__tx_packets += 1
 
+    async def _send_rtp_batch(
+        self, packets: list[bytes], rtc_class: Optional[int] = None
+    ) -> None:
+        """
+        Protect and send one frame's RTP packets as a unit.
+
+        All packets are SRTP-protected in one pass, handed to the pacer as one
+        batch (which keeps its whole-GOP drop semantics per frame) and written
+        to the ICE transport in one batched write, instead of one `protect()`,
+        pacer hop and datagram write per packet.
+        """
+        if self._state != State.CONNECTED:
+            raise ConnectionError("Cannot send encrypted RTP, not connected")
+
+        protect = self._tx_srtp.protect
+        batch = [protect(data) for data in packets]
+        cls = rtc_class if rtc_class is not None else CLASS_VIDEO
+        if self._pacer is not None:
+            await self._pacer.send_batch(batch, cls)
+        else:
+            await self.transport._send_batch(batch)
+        for data in batch:
+            self.__tx_bytes += len(data)
+        self.__tx_packets += len(batch)
+
     def _twcc_next(self, size: int) -> int:
         """Allocate the next transport-wide sequence number and record the packet's
         size and send time for matching against the receiver's transport-cc feedback."""
         seq = self._twcc_seq
-        self._twcc_seq = (self._twcc_seq + 1) & 0xFFFF
-        self._twcc_history[seq] = (size, time.time())
-        if len(self._twcc_history) > 2048:
-            for old in sorted(self._twcc_history)[:1024]:
-                self._twcc_history.pop(old, None)
+        self._twcc_seq = (seq + 1) & 0xFFFF
+        self._twcc_sizes[seq] = size
+        self._twcc_send_times[seq] = time.time()
         return seq
 
     def _twcc_process_feedback(self, fci: bytes) -> None:
@@ -853,64 +1016,122 @@ class RTCDtlsTransport(AsyncIOEventEmitter):
         history, and publish a loss / throughput / one-way-delay-trend estimate."""
         if len(fci) < 8:
             return
-        base_seq, status_count = struct.unpack("!HH", fci[0:4])
+        base_seq, status_count = struct.unpack_from("!HH", fci)
+        end = len(fci)
+
+        # The receive deltas follow the packet-status chunks, so collect the
+        # chunk words first (one per run or vector, not one per packet).
         pos = 8
-        statuses: list[int] = []
-        while len(statuses) < status_count and pos + 2 <= len(fci):
-            chunk = struct.unpack("!H", fci[pos : pos + 2])[0]
+        chunks: list[int] = []
+        covered = 0
+        while covered < status_count and pos + 2 <= end:
+            chunk = struct.unpack_from("!H", fci, pos)[0]
             pos += 2
+            chunks.append(chunk)
             if chunk & 0x8000 == 0:
-                symbol = (chunk >> 13) & 0x3
-                run = chunk & 0x1FFF
-                statuses.extend([symbol] * run)
+                covered += chunk & 0x1FFF
             elif chunk & 0x4000 == 0:
-                for i in range(14):
-                    statuses.append((chunk >> (13 - i)) & 0x1)
+                covered += 14
             else:
-                for i in range(7):
-                    statuses.append((chunk >> (12 - 2 * i)) & 0x3)
-        statuses = statuses[:status_count]
+                covered += 7
+        reported = min(covered, status_count)
+        if not reported:
+            return
 
+        sizes = self._twcc_sizes
+        send_times = self._twcc_send_times
+        bwe = self.bwe
+        # Arrival times: a 24-bit reference time in 64 ms units, then each
+        # received packet's delta from the previous one.
+        reference_us = (
+            int.from_bytes(fci[4:7], "big", signed=True) * 64000 if bwe is not None else 0
+        )
+        seq = base_seq
+        remaining = reported
         received = bytes_acked = 0
         delta_sum_us = 0.0
-        for i, symbol in enumerate(statuses):
-            if symbol in (1, 2):
+        for chunk in chunks:
+            # Each symbol is read off the chunk word as its packet is matched:
+            # a run repeats one symbol (width 0), a vector shifts to the next.
+            if chunk & 0x8000 == 0:
+                # run length: one symbol repeated
+                count, shift, width, mask = chunk & 0x1FFF, 13, 0, 0x3
+                if (chunk >> 13) & 0x3 not in (1, 2):
+                    # a run of lost (or reserved) symbols carries no deltas
+                    count = min(count, remaining)
+                    remaining -= count
+                    seq += count
+                    if not remaining:
+                        break
+                    continue
+            elif chunk & 0x4000 == 0:
+                # status vector, 14 one-bit symbols
+                count, shift, width, mask = 14, 13, 1, 0x1
+            else:
+                # status vector, 7 two-bit symbols
+                count, shift, width, mask = 7, 12, 2, 0x3
+            if count > remaining:
+                count = remaining
+            remaining -= count
+            for s in range(seq, seq + count):
+                symbol = (chunk >> shift) & mask
+                shift -= width
+                if symbol != 1 and symbol != 2:
+                    continue
                 received += 1
-                if pos < len(fci):
+                timed = False
+                if pos < end:
                     if symbol == 1:
                         delta_sum_us += fci[pos] * 250
                         pos += 1
-                    elif pos + 2 <= len(fci):
+                        timed = True
+                    elif pos + 2 <= end:
                         delta_sum_us += (
-                            struct.unpack("!h", fci[pos : pos + 2])[0] * 250
+                            struct.unpack_from("!h", fci, pos)[0] * 250
                         )
                         pos += 2
-                sent = self._twcc_history.pop((base_seq + i) & 0xFFFF, None)
-                if sent is not None:
-                    bytes_acked += sent[0]
-        if not statuses:
-            return
-        lost = len(statuses) - received
+                        timed = True
+                s &= 0xFFFF
+                size = sizes[s]
+                if size:
+                    # Count each packet once, however often reported.
+                    bytes_acked += size
+                    sizes[s] = 0
+                    if bwe is not None and timed:
+                        bwe.add(
+                            send_times[s],
+                            (reference_us + delta_sum_us) / 1000,
+                            size,
+                        )
+            seq += count
+            if not remaining:
+                break
+        lost = reported - received
         # Receive-side pacing span; against bytes_acked this bounds goodput, and its
         # growth across feedbacks indicates queuing delay building up.
         span_s = max(delta_sum_us / 1e6, 1e-4)
         self.twcc_estimate = {
             "received": received,
             "lost": lost,
-            "loss_fraction": lost / len(statuses),
+            "loss_fraction": lost / reported,
             "bytes_acked": bytes_acked,
             "recv_span_s": span_s,
             "goodput_bps": int(bytes_acked * 8 / span_s) if received else 0,
         }
+        if bwe is not None:
+            self.twcc_estimate["target_bps"] = bwe.update()
+            if self._pacer is not None:
+                self._pacer.set_encoder_bps(self._paced_encoder_bps())
         if self._pacer is not None and bytes_acked >= MIN_GOODPUT_SAMPLE_BYTES:
             # Windows carrying almost no data (pure keepalive / control)
             # carry no rate signal; feeding them to the pacer slams the pace.
             self._pacer.set_goodput_bps(self.twcc_estimate["goodput_bps"])
         logger.debug(
-            "TWCC feedback: recv=%d lost=%d goodput=%s bps",
+            "TWCC feedback: recv=%d lost=%d goodput=%s bps target=%s bps",
             received,
             lost,
             self.twcc_estimate["goodput_bps"],
+            self.twcc_estimate.get("target_bps"),
         )
 
     def _set_role(self, role: str) -> None:
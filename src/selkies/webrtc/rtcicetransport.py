@@ -220,6 +220,7 @@ class RTCIceGatherer(AsyncIOEventEmitter):
         local_username: Optional[str] = None,
         local_password: Optional[str] = None,
         ice_host_public_ips: Optional[list[str]] = None,
+        ice_udp_mux_port: Optional[int] = None,
     ) -> None:
         super().__init__()
 
@@ -232,6 +233,7 @@ class RTCIceGatherer(AsyncIOEventEmitter):
             local_username=local_username,
             local_password=local_password,
             nat1to1_ips=ice_host_public_ips,
+            udp_mux_port=ice_udp_mux_port,
             **ice_kwargs,
         )
         self._remote_candidates_end = False
@@ -304,6 +306,7 @@ class RTCIceTransport(AsyncIOEventEmitter):
         # expose recv / send methods
         self._recv = self._connection.recv
         self._send = self._connection.send
+        self._send_batch = self._connection.send_batch
 
     @property
     def iceGatherer(self) -> RTCIceGatherer:
@@ -359,9 +359,11 @@ class RTCPeerConnection(AsyncIOEventEmitter):
 
     def __init__(self, configuration: Optional[RTCConfiguration] = None) -> None:
         super().__init__()
-        self.__certificates = [RTCCertificate.generateCertificate()]
-        self.__cname = f"{uuid.uuid4()}"
         self.__configuration = configuration or RTCConfiguration()
+        self.__certificates = list(
+            self.__configuration.certificates or [RTCCertificate.generateCertificate()]
+        )
+        self.__cname = f"{uuid.uuid4()}"
         self.__dtlsTransports: set[RTCDtlsTransport] = set()
         self.__iceTransports: set[RTCIceTransport] = set()
         self.__remoteDtls: dict[
@@ -1235,11 +1237,13 @@ class RTCPeerConnection(AsyncIOEventEmitter):
                 local_username=parameters.usernameFragment,
                 local_password=parameters.password,
                 ice_host_public_ips=self.__configuration.iceHostPublicIps,
+                ice_udp_mux_port=self.__configuration.iceUdpMuxPort,
             )
         else:
             iceGatherer = RTCIceGatherer(
                 iceServers=self.__configuration.iceServers,
                 ice_host_public_ips=self.__configuration.iceHostPublicIps,
+                ice_udp_mux_port=self.__configuration.iceUdpMuxPort,
             )
 
         iceGatherer.on("statechange", self.__updateIceGatheringState)
@@ -38,11 +38,13 @@ import time
 import traceback
 import uuid
 from collections.abc import Callable
+from struct import unpack_from
 from typing import Optional, Union
 
 from av import AudioFrame
 from av.frame import Frame
 
+from ..instrumentation import observe_stage
 from . import clock, rtp
 from .pacer import CLASS_AUDIO, CLASS_VIDEO, h264_payloads_suggest_idr
 from .codecs import get_capabilities, get_encoder, is_rtx
@@ -88,6 +90,10 @@ logger = logging.getLogger(__name__)
 
 RTT_ALPHA = 0.85
 
+# https://webrtc.googlesource.com/src/+/main/docs/native-code/rtp-hdrext/playout-delay/README.md
+# set min and max to 0 to hint the receiver to render frames as soon as possible
+PLAYOUT_DELAY = (0, 0)
+
 
 def random_sequence_number() -> int:
     """
@@ -103,10 +109,30 @@ def random_sequence_number() -> int:
 
 
 class RTCEncodedFrame:
-    def __init__(self, payloads: list[bytes], timestamp: int, audio_level: int):
+    """
+    One frame's RTP payloads, ready for a sender to stamp and send.
+
+    A track may return one straight from `recv()` to packetize a frame once
+    for every sender subscribed to it: the payload list is shared read-only,
+    and each sender only adds its own sequence numbers, SSRC and header
+    extensions.
+
+    :param keyframe_bytes: Total payload size when the packetizer classified
+        the frame as a keyframe, `0` when it classified it as a delta frame,
+        `None` when it did not look (the sender then inspects the payloads).
+    """
+
+    def __init__(
+        self,
+        payloads: list[bytes],
+        timestamp: int,
+        audio_level: Optional[int],
+        keyframe_bytes: Optional[int] = None,
+    ):
         self.payloads = payloads
         self.timestamp = timestamp
         self.audio_level = audio_level
+        self.keyframe_bytes = keyframe_bytes
 
 
 class RTCRtpSender(AsyncIOEventEmitter):
@@ -155,7 +181,10 @@ class RTCRtpSender(AsyncIOEventEmitter):
         self.__rtp_header_extensions_map = rtp.HeaderExtensionsMap()
         self.__rtp_started = asyncio.Event()
         self.__rtp_task: Optional[asyncio.Future[None]] = None
-        self.__rtp_history: dict[int, RtpPacket] = {}
+        # Serialized packets by sequence number slot; NACKs are rare, so a
+        # retransmission re-parses the bytes instead of every packet keeping
+        # an RtpPacket alive.
+        self.__rtp_history: list[Optional[bytes]] = [None] * RTP_HISTORY_SIZE
         self.__rtcp_exited = asyncio.Event()
         self.__rtcp_started = asyncio.Event()
         self.__rtcp_task: Optional[asyncio.Future[None]] = None
@@ -380,6 +409,10 @@ class RTCRtpSender(AsyncIOEventEmitter):
         if not self._enabled:
             return None
 
+        # Packetized upstream, once for every sender of the source track.
+        if isinstance(data, RTCEncodedFrame):
+            return data if data.payloads else None
+
         audio_level = None
 
         if self.__encoder is None:
@@ -412,8 +445,9 @@ class RTCRtpSender(AsyncIOEventEmitter):
         """
         Retransmit an RTP packet which was reported as lost.
         """
-        packet = self.__rtp_history.get(sequence_number % RTP_HISTORY_SIZE)
-        if packet and packet.sequence_number == sequence_number:
+        data = self.__rtp_history[sequence_number % RTP_HISTORY_SIZE]
+        if data is not None and unpack_from("!H", data, 2)[0] == sequence_number:
+            packet = RtpPacket.parse(data, self.__rtp_header_extensions_map)
             if self.__rtx_payload_type is not None:
                 packet = wrap_rtx(
                     packet,
@@ -454,6 +488,17 @@ class RTCRtpSender(AsyncIOEventEmitter):
         # (flushed per frame, or every 10 packets within a large frame).
         fec_group: list[bytes] = []
         fec_first_seq = 0
+        # Everything fixed for this stream is serialized once; per packet only
+        # seq / timestamp / marker / abs-send-time / TWCC seq are patched in.
+        header = rtp.RtpHeaderTemplate(
+            self.__rtp_header_extensions_map,
+            payload_type=codec.payloadType,
+            ssrc=self._ssrc,
+            mid=self.__mid,
+            playout_delay=PLAYOUT_DELAY,
+        )
+        # Frame handed over by the track to frame accepted by the pacer.
+        send_stage = f"webrtc_{self.__kind}_send"
         try:
             while True:
                 if not self.__track:
@@ -466,11 +511,16 @@ class RTCRtpSender(AsyncIOEventEmitter):
                 if enc_frame is None:
                     continue
                 frame_time = time.time()
+                fetched = time.perf_counter()
 
                 if self.__kind == "video" and (
                     self.__force_keyframe_used
                     or "jpeg" in codec.mimeType.lower()
-                    or h264_payloads_suggest_idr(enc_frame.payloads)
+                    or (
+                        enc_frame.keyframe_bytes
+                        if enc_frame.keyframe_bytes is not None
+                        else h264_payloads_suggest_idr(enc_frame.payloads)
+                    )
                 ):
                     # Report keyframe size to the pacer: feeds its IDR-aware
                     # queue budget and resurrects video after a GOP reset.
@@ -479,89 +529,117 @@ class RTCRtpSender(AsyncIOEventEmitter):
                     # so every one feeds the floor (else a floor-0 cap would
                     # reset-churn full-image frames). Remember for late attach.
                     natural = not self.__force_keyframe_used
-                    size = sum(len(p_) for p_ in enc_frame.payloads)
+                    size = enc_frame.keyframe_bytes or sum(
+                        len(p_) for p_ in enc_frame.payloads
+                    )
                     self._keyframe_bytes = size
                     self._keyframe_natural = natural
                     self.transport.note_video_keyframe(size, natural=natural)
 
                 timestamp = uint32_add(timestamp_origin, enc_frame.timestamp)
 
+                # The whole frame (media packets plus any FlexFEC repair
+                # packets, in wire order) is protected and sent as one batch.
+                frame_packets: list[bytes] = []
+                last = len(enc_frame.payloads) - 1
                 for i, payload in enumerate(enc_frame.payloads):
-                    packet = RtpPacket(
-                        payload_type=codec.payloadType,
-                        sequence_number=sequence_number,
-                        timestamp=timestamp,
-                    )
-                    packet.ssrc = self._ssrc
-                    packet.payload = payload
-                    packet.marker = (i == len(enc_frame.payloads) - 1) and 1 or 0
-
-                    # set header extensions
-                    packet.extensions.abs_send_time = (
-                        clock.current_ntp_time() >> 14
-                    ) & 0x00FFFFFF
-                    packet.extensions.mid = self.__mid
-                    packet.extensions.transport_sequence_number = (
-                        self.transport._twcc_next(len(payload))
-                    )
-                    if enc_frame.audio_level is not None:
-                        packet.extensions.audio_level = (False, -enc_frame.audio_level)
-                    # https://webrtc.googlesource.com/src/+/main/docs/native-code/rtp-hdrext/playout-delay/README.md
-                    # set min and max to 0 to hint the receiver to render frames as soon as possible
-                    packet.extensions.playout_delay = (0, 0)
+                    marker = 1 if i == last else 0
+                    abs_send_time = (clock.current_ntp_time() >> 14) & 0x00FFFFFF
+                    twcc_seq = self.transport._twcc_next(len(payload))
                     # video-timing rides the LAST packet of a frame. The encode legs
                     # happen in the capture library and aren't visible here (0 =
                     # unknown). packetization-complete is real; pacer-exit repeats it
                     # because the stamp is taken before the packet reaches the pacer,
                     # so any pacing delay is not reflected.
+                    video_timing = None
                     if (
-                        packet.marker
+                        marker
                         and self.__kind == "video"
                         and frame_time - last_video_timing >= 0.2
                     ):
                         last_video_timing = frame_time
                         delta_ms = min(0xFFFF, max(0, int((time.time() - frame_time) * 1000)))
-                        packet.extensions.video_timing = (
+                        video_timing = (
                             # flags: triggered by timer
                             0x01,
                             0, 0, delta_ms, delta_ms, 0, 0,
                         )
+
+                    if video_timing is None and enc_frame.audio_level is None:
+                        # Common case: only the header template's per-packet
+                        # fields differ from packet to packet.
+                        packet_bytes = header.serialize(
+                            payload,
+                            sequence_number,
+                            timestamp,
+                            marker,
+                            abs_send_time,
+                            twcc_seq,
+                        )
+                    else:
+                        packet = RtpPacket(
+                            payload_type=codec.payloadType,
+                            marker=marker,
+                            sequence_number=sequence_number,
+                            timestamp=timestamp,
+                            ssrc=self._ssrc,
+                            payload=payload,
+                        )
+                        packet.extensions.abs_send_time = abs_send_time
+                        packet.extensions.mid = self.__mid
+                        packet.extensions.transport_sequence_number = twcc_seq
+                        if enc_frame.audio_level is not None:
+                            packet.extensions.audio_level = (
+                                False,
+                                -enc_frame.audio_level,
+                            )
+                        packet.extensions.playout_delay = PLAYOUT_DELAY
+                        packet.extensions.video_timing = video_timing
+                        packet_bytes = packet.serialize(self.__rtp_header_extensions_map)
+
                     # send packet
-                    self.__log_debug("> %s", packet)
-                    self.__rtp_history[packet.sequence_number % RTP_HISTORY_SIZE] = (
-                        packet
+                    self.__log_debug(
+                        "> RTP seq=%d ts=%d marker=%d %d bytes",
+                        sequence_number,
+                        timestamp,
+                        marker,
+                        len(payload),
                     )
-                    packet_bytes = packet.serialize(self.__rtp_header_extensions_map)
-                    await self.transport._send_rtp(
-                        packet_bytes,
-                        rtc_class=CLASS_AUDIO if self.__kind == "audio" else CLASS_VIDEO,
+                    self.__rtp_history[sequence_number % RTP_HISTORY_SIZE] = (
+                        packet_bytes
                     )
+                    frame_packets.append(packet_bytes)
 
                     self.__ntp_timestamp = clock.current_ntp_time()
-                    self.__rtp_timestamp = packet.timestamp
+                    self.__rtp_timestamp = timestamp
                     self.__octet_count += len(payload)
                     self.__packet_count += 1
-                    sequence_number = uint16_add(sequence_number, 1)
 
                     if self.__fec_payload_type is not None:
                         if not fec_group:
-                            fec_first_seq = packet.sequence_number
+                            fec_first_seq = sequence_number
                         fec_group.append(packet_bytes)
-                        if packet.marker or len(fec_group) == 10:
+                        if marker or len(fec_group) == 10:
                             fec_bytes = build_flexfec_03(
                                 fec_group,
                                 fec_first_seq,
                                 self._ssrc,
                                 self.__fec_payload_type,
                                 self.__fec_sequence_number,
-                                packet.timestamp,
+                                timestamp,
                                 self._fec_ssrc,
                             )
                             self.__fec_sequence_number = uint16_add(
                                 self.__fec_sequence_number, 1
                             )
                             fec_group = []
-                            await self.transport._send_rtp(fec_bytes, rtc_class=CLASS_VIDEO)
+                            frame_packets.append(fec_bytes)
+                    sequence_number = uint16_add(sequence_number, 1)
+                await self.transport._send_rtp_batch(
+                    frame_packets,
+                    rtc_class=CLASS_AUDIO if self.__kind == "audio" else CLASS_VIDEO,
+                )
+                observe_stage(send_stage, time.perf_counter() - fetched)
         except (asyncio.CancelledError, ConnectionError, MediaStreamError):
             pass
         except Exception:
@@ -435,6 +435,10 @@ SCTP_COMMON_HEADER_LENGTH = 12
 SCTP_CHUNK_HEADER_LENGTH = 4
 # An SCTP packet must contain the common header plus at least one chunk header.
 SCTP_PACKET_MINIMUM_LENGTH = SCTP_COMMON_HEADER_LENGTH + SCTP_CHUNK_HEADER_LENGTH
+# Largest packet _transmit bundles chunks into: one full DATA chunk (16-byte
+# header + USERDATA_MAX_LENGTH) behind the common header, so bundling never
+# yields a datagram larger than an unbundled full-size chunk already does.
+SCTP_BUNDLE_MAX_LENGTH = SCTP_COMMON_HEADER_LENGTH + 16 + USERDATA_MAX_LENGTH
 
 
 def parse_packet(data: bytes) -> tuple[int, int, int, list[Chunk]]:
@@ -474,8 +478,17 @@ def parse_packet(data: bytes) -> tuple[int, int, int, list[Chunk]]:
 def serialize_packet(
     source_port: int, destination_port: int, verification_tag: int, chunk: Chunk
 ) -> bytes:
+    return serialize_bundle(source_port, destination_port, verification_tag, [bytes(chunk)])
+
+
+def serialize_bundle(
+    source_port: int, destination_port: int, verification_tag: int, chunks: list[bytes]
+) -> bytes:
+    """
+    Serialize already-encoded (padded) chunks into one packet, in order.
+    """
     header = pack("!HHL", source_port, destination_port, verification_tag)
-    data = bytes(chunk)
+    data = b"".join(chunks)
     checksum = crc32c(header + b"\x00\x00\x00\x00" + data)
     return header + pack("<L", checksum) + data
 
@@ -780,6 +793,8 @@ class RTCSctpTransport(AsyncIOEventEmitter):
         # A received DATA chunk carried the RFC 7053 I-bit: acknowledge at once
         # (the peer is cwnd-limited and waiting on this SACK to send more).
         self._sack_immediate = False
+        # Pending next-iteration SACK (see _handle_data).
+        self._sack_flush_handle: Optional[asyncio.Handle] = None
 
         # outbound
         # True while at least one sent chunk is flagged for retransmit, so
@@ -795,6 +810,9 @@ class RTCSctpTransport(AsyncIOEventEmitter):
         self._last_sacked_tsn = tsn_minus_one(self._local_tsn)
         self._advanced_peer_ack_tsn = tsn_minus_one(self._local_tsn)
         self._outbound_queue: Deque[DataChunk] = deque()
+        # User bytes in _outbound_queue, so _data_channel_flush can hand over
+        # as many messages as the window can send in one bundled _transmit.
+        self._outbound_queue_bytes = 0
         self._outbound_stream_seq: dict[int, int] = {}
         self._outbound_streams_count = MAX_STREAMS
         self._partial_bytes_acked = 0
@@ -1021,13 +1039,16 @@ class RTCSctpTransport(AsyncIOEventEmitter):
         for chunk in chunks:
             await self._receive_chunk(chunk)
 
-        # SACK immediately on a gap/duplicate (so the peer can fast-retransmit)
+        # SACK promptly on a gap/duplicate (so the peer can fast-retransmit)
         # or on every second in-order packet; otherwise arm a short timer to
-        # flush the deferred acknowledgement.
+        # flush the deferred acknowledgement. "Promptly" is the next loop
+        # iteration, not inline: a burst of datagrams drained in one go then
+        # shares a single SACK, and data we send meanwhile carries it instead.
         if self._sack_needed:
             if (self._sack_immediate or self._sack_misordered or self._sack_duplicates
                     or self._sack_packets_since >= 1):
-                await self._send_sack()
+                if self._sack_flush_handle is None:
+                    self._sack_flush_handle = self._loop.call_soon(self._sack_flush)
             else:
                 self._sack_packets_since += 1
                 if self._sack_delay_handle is None:
@@ -1487,9 +1508,13 @@ class RTCSctpTransport(AsyncIOEventEmitter):
         expiry: Optional[float] = None,
         max_retransmits: Optional[int] = None,
         ordered: bool = True,
+        transmit: bool = True,
     ) -> None:
         """
         Send data ULP -> stream.
+
+        With `transmit` False the chunks are only queued, for a caller that
+        queues several messages and then bundles them in one `_transmit`.
         """
         if ordered:
             stream_seq = self._outbound_stream_seq.get(stream_id, 0)
@@ -1528,16 +1553,18 @@ class RTCSctpTransport(AsyncIOEventEmitter):
             pos += USERDATA_MAX_LENGTH
             self._local_tsn = tsn_plus_one(self._local_tsn)
             self._outbound_queue.append(chunk)
+            self._outbound_queue_bytes += chunk._book_size
 
         if ordered:
             self._outbound_stream_seq[stream_id] = uint16_add(stream_seq, 1)
 
         # transmit outbound data
-        await self._transmit()
+        if transmit:
+            await self._transmit()
 
     async def _send_chunk(self, chunk: Chunk) -> None:
         """
-        Transmit a chunk (no bundling for now).
+        Transmit a single chunk in its own packet.
         """
         self.__log_debug("> %s", chunk)
         await self.__transport._send_data(
@@ -1549,6 +1576,19 @@ class RTCSctpTransport(AsyncIOEventEmitter):
             )
         )
 
+    async def _send_bundle(self, chunks: list[bytes]) -> None:
+        """
+        Transmit encoded chunks bundled in one packet.
+        """
+        await self.__transport._send_data(
+            serialize_bundle(
+                self._local_port,
+                self._remote_port,
+                self._remote_verification_tag,
+                chunks,
+            )
+        )
+
     async def _send_reconfig_param(
         self,
         param: Union[
@@ -1569,7 +1609,14 @@ class RTCSctpTransport(AsyncIOEventEmitter):
 
     async def _send_sack(self) -> None:
         """
-        Build and send a selective acknowledgement (SACK) chunk.
+        Send a selective acknowledgement (SACK) chunk on its own.
+        """
+        await self._send_chunk(self._build_sack())
+
+    def _build_sack(self) -> SackChunk:
+        """
+        Build a selective acknowledgement (SACK) chunk and clear the pending
+        acknowledgement state; the caller must send it.
         """
         gaps: list[list[int]] = []
         gap_next = None
@@ -1587,8 +1634,6 @@ class RTCSctpTransport(AsyncIOEventEmitter):
         sack.duplicates = self._sack_duplicates[:]
         sack.gaps = [tuple(x) for x in gaps]
 
-        await self._send_chunk(sack)
-
         self._sack_duplicates.clear()
         self._sack_needed = False
         self._sack_immediate = False
@@ -1596,12 +1641,21 @@ class RTCSctpTransport(AsyncIOEventEmitter):
         if self._sack_delay_handle is not None:
             self._sack_delay_handle.cancel()
             self._sack_delay_handle = None
+        if self._sack_flush_handle is not None:
+            self._sack_flush_handle.cancel()
+            self._sack_flush_handle = None
+        return sack
 
     def _sack_delay_expired(self) -> None:
         self._sack_delay_handle = None
         if self._sack_needed:
             asyncio.ensure_future(self._send_sack())
 
+    def _sack_flush(self) -> None:
+        self._sack_flush_handle = None
+        if self._sack_needed:
+            asyncio.ensure_future(self._send_sack())
+
     def _set_state(self, state: "RTCSctpTransport.State") -> None:
         """
         Transition the SCTP association to a new state.
@@ -1623,6 +1677,9 @@ class RTCSctpTransport(AsyncIOEventEmitter):
             if self._sack_delay_handle is not None:
                 self._sack_delay_handle.cancel()
                 self._sack_delay_handle = None
+            if self._sack_flush_handle is not None:
+                self._sack_flush_handle.cancel()
+                self._sack_flush_handle = None
             self.__state = "closed"
 
             # close data channels
@@ -1729,10 +1786,43 @@ class RTCSctpTransport(AsyncIOEventEmitter):
     async def _transmit(self) -> None:
         """
         Transmit outbound data.
+
+        Chunks are bundled into packets of up to SCTP_BUNDLE_MAX_LENGTH bytes,
+        so a burst of small messages (input events) costs one DTLS record and
+        one datagram per packet rather than per message. A pending SACK rides
+        in front of the first DATA chunk (RFC 4960 6.1: control chunks first)
+        instead of waiting for its own packet.
         """
+        packet: list[bytes] = []
+        packet_length = SCTP_COMMON_HEADER_LENGTH
+        packet_has_data = False
+
+        async def flush() -> None:
+            nonlocal packet_length, packet_has_data
+            await self._send_bundle(packet)
+            packet.clear()
+            packet_length = SCTP_COMMON_HEADER_LENGTH
+            packet_has_data = False
+
+        async def bundle(chunk: Chunk) -> None:
+            nonlocal packet_length, packet_has_data
+            is_data = isinstance(chunk, DataChunk)
+            if is_data and self._sack_needed:
+                # A SACK may not follow DATA within a packet.
+                if packet_has_data:
+                    await flush()
+                await bundle(self._build_sack())
+            self.__log_debug("> %s", chunk)
+            data = bytes(chunk)
+            if packet and packet_length + len(data) > SCTP_BUNDLE_MAX_LENGTH:
+                await flush()
+            packet.append(data)
+            packet_length += len(data)
+            packet_has_data = packet_has_data or is_data
+
         # send FORWARD TSN
         if self._forward_tsn_chunk is not None:
-            await self._send_chunk(self._forward_tsn_chunk)
+            await bundle(self._forward_tsn_chunk)
             self._forward_tsn_chunk = None
 
             # ensure T3 is running
@@ -1751,27 +1841,34 @@ class RTCSctpTransport(AsyncIOEventEmitter):
         # leaves the flag set so the remaining marked chunks are retried later.
         if self._retransmit_pending:
             retransmit_earliest = True
+            cwnd_full = False
             for chunk in self._sent_queue:
                 if chunk._retransmit:
                     if self._fast_recovery_transmit:
                         self._fast_recovery_transmit = False
                     elif self._flight_size >= cwnd:
-                        return
+                        cwnd_full = True
+                        break
                     self._flight_size_increase(chunk)
 
                     chunk._misses = 0
                     chunk._retransmit = False
                     chunk._sent_count += 1
-                    await self._send_chunk(chunk)
+                    await bundle(chunk)
                     if retransmit_earliest:
                         # restart the T3 timer as the earliest outstanding TSN
                         # is being retransmitted
                         self._t3_restart()
                 retransmit_earliest = False
+            if cwnd_full:
+                if packet:
+                    await flush()
+                return
             self._retransmit_pending = False
 
         while self._outbound_queue and self._flight_size < cwnd:
             chunk = self._outbound_queue.popleft()
+            self._outbound_queue_bytes -= chunk._book_size
             self._sent_queue.append(chunk)
             self._flight_size_increase(chunk)
 
@@ -1785,10 +1882,13 @@ class RTCSctpTransport(AsyncIOEventEmitter):
             if self._flight_size + USERDATA_MAX_LENGTH >= self._cwnd:
                 chunk.flags |= SCTP_DATA_SACK_IMMEDIATELY
 
-            await self._send_chunk(chunk)
+            await bundle(chunk)
             if not self._t3_handle:
                 self._t3_start()
 
+        if packet:
+            await flush()
+
     async def _transmit_reconfig(self) -> None:
         if (
             self._association_state == self.State.ESTABLISHED
@@ -1884,7 +1984,14 @@ class RTCSctpTransport(AsyncIOEventEmitter):
         if self._association_state != self.State.ESTABLISHED:
             return
 
-        while self._data_channel_queue and not self._outbound_queue:
+        # Hand over every queued message the window can send right now and
+        # transmit them together, so a burst of sends bundles into full
+        # packets; the rest waits here, where it still counts as buffered.
+        handed_over = False
+        while self._data_channel_queue and (
+            not self._outbound_queue
+            or self._flight_size + self._outbound_queue_bytes < self._cwnd
+        ):
             channel, protocol, user_data = self._data_channel_queue.popleft()
 
             # register channel if necessary
@@ -1898,7 +2005,7 @@ class RTCSctpTransport(AsyncIOEventEmitter):
 
             # send data
             if protocol == WEBRTC_DCEP:
-                await self._send(stream_id, protocol, user_data)
+                await self._send(stream_id, protocol, user_data, transmit=False)
             else:
                 if channel.maxPacketLifeTime:
                     expiry = time.time() + (channel.maxPacketLifeTime / 1000)
@@ -1911,8 +2018,13 @@ class RTCSctpTransport(AsyncIOEventEmitter):
                     expiry=expiry,
                     max_retransmits=channel.maxRetransmits,
                     ordered=channel.ordered,
+                    transmit=False,
                 )
                 channel._addBufferedAmount(-len(user_data))
+            handed_over = True
+
+        if handed_over:
+            await self._transmit()
 
     def _data_channel_add_negotiated(self, channel: RTCDataChannel) -> None:
         if channel.id in self._data_channels:
@@ -91,6 +91,14 @@ class HeaderExtensionsMap:
     def __init__(self) -> None:
         self.__ids = HeaderExtensions()
 
+    @property
+    def ids(self) -> HeaderExtensions:
+        """
+        The negotiated extension ID of each header extension (None when the
+        extension was not negotiated).
+        """
+        return self.__ids
+
     def configure(self, parameters: RTCRtpParameters) -> None:
         for ext in parameters.headerExtensions:
             if ext.uri == "urn:ietf:params:rtp-hdrext:sdes:mid":
@@ -394,6 +402,31 @@ def pack_header_extensions(extensions: list[tuple[int, bytes]]) -> tuple[int, by
     return extension_profile, extension_value
 
 
+def header_extension_offsets(
+    extension_profile: int, extension_value: bytes
+) -> dict[int, int]:
+    """
+    Map each extension ID to the offset of its value within `extension_value`.
+    """
+    offsets = {}
+    pos = 0
+    two_byte = extension_profile == 0x1000
+    while pos < len(extension_value):
+        if extension_value[pos] == 0:
+            pos += 1
+            continue
+        if two_byte:
+            x_id, x_length = extension_value[pos], extension_value[pos + 1]
+            pos += 2
+        else:
+            x_id = (extension_value[pos] & 0xF0) >> 4
+            x_length = (extension_value[pos] & 0x0F) + 1
+            pos += 1
+        offsets[x_id] = pos
+        pos += x_length
+    return offsets
+
+
 def compute_audio_level_dbov(frame: AudioFrame) -> int:
     """
     Compute the energy level as spelled out in RFC 6465, Appendix A.
@@ -841,6 +874,97 @@ class RtpPacket:
         return data
 
 
+_HEADER_FIELDS = struct.Struct("!BHL")
+_ABS_SEND_TIME = struct.Struct("!BH")
+_TRANSPORT_SEQUENCE_NUMBER = struct.Struct("!H")
+
+
+class RtpHeaderTemplate:
+    """
+    Precompiled RTP header for one sender's media packets.
+
+    Everything fixed for the stream (version, payload type, SSRC and the mid /
+    playout-delay extension bytes) is serialized once through the sender's
+    :class:`HeaderExtensionsMap`, so the layout is exactly what
+    :meth:`RtpPacket.serialize` produces. Per packet only the marker,
+    sequence number, timestamp, abs-send-time and transport-wide sequence
+    number are patched into a reusable buffer before the payload is appended.
+
+    Packets carrying other per-packet extensions (audio level, video timing)
+    must go through :meth:`RtpPacket.serialize` instead.
+    """
+
+    def __init__(
+        self,
+        extensions_map: HeaderExtensionsMap,
+        payload_type: int,
+        ssrc: int,
+        mid: Optional[str] = None,
+        playout_delay: Optional[tuple[int, int]] = None,
+    ) -> None:
+        ids = extensions_map.ids
+        extension_profile, extension_value = extensions_map.set(
+            HeaderExtensions(
+                abs_send_time=0,
+                mid=mid,
+                transport_sequence_number=0,
+                playout_delay=playout_delay,
+            )
+        )
+        self.payload_type = payload_type
+        self._m_pt = payload_type & 0x7F
+        header = bytearray(
+            pack(
+                "!BBHLL",
+                0x80 | (0x10 if extension_value else 0),
+                self._m_pt,
+                0,
+                0,
+                ssrc,
+            )
+        )
+        self._abs_send_time_at: Optional[int] = None
+        self._transport_sequence_number_at: Optional[int] = None
+        if extension_value:
+            header += pack("!HH", extension_profile, len(extension_value) >> 2)
+            base = len(header)
+            header += extension_value
+            offsets = header_extension_offsets(extension_profile, extension_value)
+            if ids.abs_send_time in offsets:
+                self._abs_send_time_at = base + offsets[ids.abs_send_time]
+            if ids.transport_sequence_number in offsets:
+                self._transport_sequence_number_at = (
+                    base + offsets[ids.transport_sequence_number]
+                )
+        self._buffer = header
+
+    def serialize(
+        self,
+        payload: bytes,
+        sequence_number: int,
+        timestamp: int,
+        marker: int,
+        abs_send_time: int = 0,
+        transport_sequence_number: int = 0,
+    ) -> bytes:
+        buf = self._buffer
+        _HEADER_FIELDS.pack_into(
+            buf, 1, (marker << 7) | self._m_pt, sequence_number, timestamp
+        )
+        if self._abs_send_time_at is not None:
+            _ABS_SEND_TIME.pack_into(
+                buf,
+                self._abs_send_time_at,
+                (abs_send_time >> 16) & 0xFF,
+                abs_send_time & 0xFFFF,
+            )
+        if self._transport_sequence_number_at is not None:
+            _TRANSPORT_SEQUENCE_NUMBER.pack_into(
+                buf, self._transport_sequence_number_at, transport_sequence_number
+            )
+        return b"".join((buf, payload))
+
+
 def unwrap_rtx(rtx: RtpPacket, payload_type: int, ssrc: int) -> RtpPacket:
     """
     Recover initial packet from a retransmission packet.
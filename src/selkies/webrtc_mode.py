@@ -48,6 +48,7 @@ from aiohttp import web
 from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
 
 from .rtc import RTCApp, ClientType
+from . import instrumentation
 from . import selkies as selkies_module
 from .selkies import current_session_tokens, SCALING_DPI_MIN, SCALING_DPI_MAX
 from .media_pipeline import (MediaPipelinePixel, RateControlMode,
@@ -306,6 +307,8 @@ class WebRTCService(BaseStreamingService):
         if self.args.enable_metrics_http or self.args.enable_webrtc_statistics:
             webrtc_csv = self.args.enable_webrtc_statistics
             self.metrics = Metrics(using_webrtc_csv=webrtc_csv)
+            self.metrics.monitor_loop()
+        instrumentation.track_queue("webrtc_pacer", self._pacer_queue_depth)
 
         # Init signaling client
         self.signaling_client = self.create_signaling_client()
@@ -393,6 +396,7 @@ class WebRTCService(BaseStreamingService):
             # Same setting as the websockets service: kernel gamepads are
             # process-wide, so both transports must resolve them identically.
             uinput_gamepad=getattr(self.args, "uinput_gamepad", "auto"),
+            x11_isolation=getattr(self.args, "x11_input_isolation", False),
             # Duck-typed layout source: send_x11_mouse offsets a secondary
             # display's coordinates by display_layouts[display_id].
             data_server_instance=self,
@@ -414,6 +418,7 @@ class WebRTCService(BaseStreamingService):
         stats_gpu_id = parse_gpu_id(getattr(self.args, "gpu_id", ""))
         self.gpu_monitor = GPUMonitor(
             gpu_id=stats_gpu_id if (stats_gpu_id or 0) > 0 else 0,
+            period=settings.gpu_stats_interval,
             enabled=True,
             dri_node=getattr(self.args, "encode_dri", "") or "",
         )
@@ -2056,16 +2061,9 @@ class WebRTCService(BaseStreamingService):
             logger.debug("updating STUN/TURN servers in RTC app")
             self.rtc_app.update_rtc_config(stun_servers, turn_servers)
 
-    def _ensure_pacer(self, pc: Any, peer: Dict[str, Any], display_id: str) -> Optional[Any]:
-        """Ensure the per-transport packet pacer is enabled/configured (called
-        from the congestion loop; idempotent and cheap).
-
-        Encoder ceiling: the display's configured video bitrate, CBR or not.
-
-        Returns:
-            The DTLS transport (so callers can snapshot its pacer), or None
-            when it is not available yet.
-        """
+    @staticmethod
+    def _peer_dtls_transport(pc: Any) -> Optional[Any]:
+        """The peer's shared RTCDtlsTransport, or None before one exists."""
         # The shared DTLS transport is reachable via pc.sctp only once the
         # data-channel m-line is negotiated; media can flow (and TWCC
         # estimates accumulate) BEFORE that. Fall back to any transceiver's
@@ -2076,11 +2074,45 @@ class WebRTCService(BaseStreamingService):
                 transport = getattr(getattr(tr, "sender", None), "transport", None)
                 if transport is not None:
                     break
+        return transport
+
+    def _pacer_queue_depth(self) -> int:
+        """Packets queued across every peer's pacer (read at metrics scrape)."""
+        rtc_app = self.rtc_app
+        if not rtc_app:
+            return 0
+        depth = 0
+        for peer in list(rtc_app.peer_connections.values()):
+            pc = peer.get("peer_conn")
+            transport = self._peer_dtls_transport(pc) if pc is not None else None
+            snap = transport.pacer_snapshot() if transport is not None else None
+            if snap:
+                depth += snap["queued_packets"]
+        return depth
+
+    def _video_bitrate_ceiling_kbps(self, display_id: str) -> float:
+        """The display's configured video bitrate, clamped to the allowed range.
+
+        Congestion control only backs off below it and recovers up to it.
+        """
+        lo_kbps, hi_kbps = settings.video_bitrate
+        ceiling = float(self._display_setting(display_id, "video_bitrate") or hi_kbps)
+        return max(lo_kbps, min(hi_kbps, ceiling))
+
+    def _ensure_pacer(self, pc: Any, peer: Dict[str, Any], display_id: str) -> Optional[Any]:
+        """Ensure the per-transport packet pacer is enabled/configured (called
+        from the congestion loop; idempotent and cheap).
+
+        Encoder ceiling: the display's configured video bitrate, CBR or not.
+
+        Returns:
+            The DTLS transport (so callers can snapshot its pacer), or None
+            when it is not available yet.
+        """
+        transport = self._peer_dtls_transport(pc)
         if transport is None:
             return None
-        lo_kbps, hi_kbps = settings.video_bitrate
-        enc_kbps = float(self._display_setting(display_id, "video_bitrate") or hi_kbps)
-        enc_bps = int(max(lo_kbps, min(hi_kbps, enc_kbps)) * 1000)
+        enc_bps = int(self._video_bitrate_ceiling_kbps(display_id) * 1000)
         if not transport.pacer_enabled():
             vsender = None
             for tr in pc.getTransceivers() or []:
@@ -2113,8 +2145,9 @@ class WebRTCService(BaseStreamingService):
 
     async def _congestion_control_loop(self) -> None:
         """GCC-style bitrate adaptation from transport-wide-cc receiver feedback:
-        per display, follow the slowest of ITS peers' goodput estimates with
-        headroom, back off multiplicatively on loss, and retarget that display's
+        per display, follow the lowest of ITS peers' delay-based targets (each
+        transport's send-side estimator, which also drives that transport's
+        pacer), back off multiplicatively on loss, and retarget that display's
         encoder within the allowed video_bitrate range — one display's congested
         link never steers another's stream. Only CBR mode has a target to steer."""
         lo_kbps, hi_kbps = settings.video_bitrate
@@ -2150,14 +2183,23 @@ class WebRTCService(BaseStreamingService):
                             self.metrics.set_pacer_snapshot(did, dtls.pacer_snapshot())
                     except Exception:
                         logger.exception("_ensure_pacer failed (display %s)", did)
-                sctp = getattr(pc, "sctp", None)
-                estimate = getattr(getattr(sctp, "transport", None), "twcc_estimate", None)
+                transport = self._peer_dtls_transport(pc)
+                if transport is None:
+                    continue
+                if self.args.congestion_control:
+                    # Bounded by the display's range every tick, so a bitrate
+                    # change reaches the estimator (and the pacer) at once.
+                    transport.configure_bwe(
+                        int(lo_kbps * 1000), int(self._video_bitrate_ceiling_kbps(did) * 1000))
+                estimate = transport.twcc_estimate
                 if not estimate:
                     continue
                 bucket = per_display.setdefault(
-                    did, {"goodputs": [], "worst_loss": 0.0})
+                    did, {"goodputs": [], "targets": [], "worst_loss": 0.0})
                 if estimate.get("goodput_bps"):
                     bucket["goodputs"].append(estimate["goodput_bps"])
+                if estimate.get("target_bps"):
+                    bucket["targets"].append(estimate["target_bps"])
                 bucket["worst_loss"] = max(bucket["worst_loss"], estimate.get("loss_fraction", 0.0))
             for did, bucket in per_display.items():
                 if not self.args.congestion_control:
@@ -2168,8 +2210,9 @@ class WebRTCService(BaseStreamingService):
                     or getattr(pipeline, "rc_mode", None) != RateControlMode.CBR
                 ):
                     continue
-                goodputs, worst_loss = bucket["goodputs"], bucket["worst_loss"]
-                if not goodputs:
+                goodputs, targets = bucket["goodputs"], bucket["targets"]
+                worst_loss = bucket["worst_loss"]
+                if not goodputs and not targets:
                     continue
                 current = float(pipeline.video_bitrate)
                 # The user-selected bitrate is the CEILING: congestion control only
@@ -2177,9 +2220,14 @@ class WebRTCService(BaseStreamingService):
                 # RANGE instead let a fast local segment ramp an 8000 kbps session to
                 # 80000+ kbps, saturating the real path (TURN/WAN) with queuing lag and
                 # loss-corrupted frames.
-                ceiling = float(self._display_setting(did, "video_bitrate") or hi_kbps)
-                ceiling = max(lo_kbps, min(hi_kbps, ceiling))
-                if worst_loss > 0.10:
+                ceiling = self._video_bitrate_ceiling_kbps(did)
+                if targets:
+                    # Delay-based: reacts to queue buildup before it turns into
+                    # loss. The pacers already follow the same targets.
+                    target = min(targets) / 1_000
+                    if worst_loss > 0.10:
+                        target = min(target, current * 0.7)
+                elif worst_loss > 0.10:
                     target = current * 0.7
                 else:
                     # Damage-gated encoders are application-limited: measured goodput
@@ -2193,7 +2241,9 @@ class WebRTCService(BaseStreamingService):
                 if target != round(current):
                     logger.info(
                         f"Congestion control[{did}]: video bitrate {current:.0f} -> {target:.0f} kbps "
-                        f"(goodput {min(goodputs) / 1e3:.1f} kbps, loss {worst_loss:.1%})"
+                        f"(delay target {min(targets) / 1e3 if targets else 0:.1f} kbps, "
+                        f"goodput {min(goodputs) / 1e3 if goodputs else 0:.1f} kbps, "
+                        f"loss {worst_loss:.1%})"
                     )
                     await pipeline.set_video_bitrate(target)
 
@@ -2448,6 +2498,7 @@ class WebRTCService(BaseStreamingService):
                 logger.exception(
                     "Unexpected error during concurrent component shutdown"
                 )
+        instrumentation.untrack_queue("webrtc_pacer", self._pacer_queue_depth)
         if self.metrics:
             try:
                 # unregister() drains the CSV executor via shutdown(wait=True);
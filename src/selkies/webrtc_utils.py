@@ -46,9 +46,11 @@ from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from collections import OrderedDict
 from prometheus_client import REGISTRY
-from prometheus_client import Gauge, Histogram, Info
+from prometheus_client import Counter, Gauge, Histogram, Info
+from prometheus_client.core import GaugeMetricFamily
 
 from . import gpu_stats
+from . import instrumentation
 
 
 # ---------------- RTC ICE config utilities ----------------
@@ -1091,12 +1093,32 @@ logger_metrics = logging.getLogger("metrics")
 logger_metrics.setLevel(logging.INFO)
 
 FPS_HIST_BUCKETS = (0, 20, 40, 60)
+# Seconds; the low end resolves sub-millisecond hand-offs, the high end a
+# frame stuck behind a stalled socket.
+STAGE_HIST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+LOOP_LAG_HIST_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
 
 # Bound the diagnostic stats CSV: field names come from the untrusted client, so cap
 # header width and retained rows so it can't grow the file unbounded.
 WEBRTC_CSV_MAX_HEADERS = 2048
 WEBRTC_CSV_MAX_RETAINED_ROWS = 100000
 
+
+class _QueueDepthCollector:
+    """Reads the queues tracked through `instrumentation.track_queue` at
+    scrape time, so queue depths cost nothing between scrapes."""
+
+    def describe(self):
+        return []
+
+    def collect(self):
+        family = GaugeMetricFamily(
+            'queue_depth', 'Items waiting in a streaming pipeline queue', labels=['queue'])
+        for name, depth in sorted(instrumentation.queue_depths().items()):
+            family.add_metric([name], depth)
+        yield family
+
+
 class Metrics:
     """Prometheus metrics plus optional CSV capture of client WebRTC stats.
 
@@ -1106,6 +1128,10 @@ class Metrics:
     client-reported stat dictionaries are also appended to per-connection CSV
     files whose column schema follows the (untrusted) client's field set with
     bounded width and row count.
+
+    While registered it is also the `instrumentation` sink: hot-path stage
+    timings land in `pipeline_stage_seconds`, and `monitor_loop()` adds event
+    loop lag and slow callback sampling.
     """
 
     def __init__(self, using_webrtc_csv: bool = False):
@@ -1126,6 +1152,22 @@ class Metrics:
             'webrtc_pacer_idr_floor_bytes', 'IDR floor of the pacer video queue budget in bytes', ['display'])
         self.webrtc_pacer_events = Gauge(
             'webrtc_pacer_events', 'Cumulative pacer event counter', ['display', 'event'])
+        # Hot-path instrumentation (see selkies.instrumentation).
+        self.pipeline_stage_seconds = Histogram(
+            'pipeline_stage_seconds', 'Time a frame spent in one streaming pipeline stage',
+            ['stage'], buckets=STAGE_HIST_BUCKETS)
+        self.event_loop_lag_seconds = Histogram(
+            'event_loop_lag_seconds', 'How late the event loop ran a timer due now',
+            buckets=LOOP_LAG_HIST_BUCKETS)
+        self.event_loop_slow_callbacks = Counter(
+            'event_loop_slow_callbacks', 'Event loop stalls by the code running during the stall',
+            ['callback'])
+        self.queue_depth = _QueueDepthCollector()
+        REGISTRY.register(self.queue_depth)
+        # Labelled children are cached: labels() takes a lock per call.
+        self._stage_children: Dict[str, Any] = {}
+        self._loop_monitor: Optional[instrumentation.LoopMonitor] = None
+        instrumentation.install(self)
         self.stats_video_file_path: Optional[str] = None
         self.stats_audio_file_path: Optional[str] = None
         self.prev_stats_video_header_len: Optional[int]  = None
@@ -1169,6 +1211,26 @@ class Metrics:
     def set_gpu_utilization(self, utilization: float) -> None:
         self.gpu_utilization.set(utilization)
 
+    def observe_stage(self, stage: str, seconds: float) -> None:
+        """Record one item's time in a pipeline stage (instrumentation sink)."""
+        child = self._stage_children.get(stage)
+        if child is None:
+            child = self._stage_children[stage] = self.pipeline_stage_seconds.labels(stage)
+        child.observe(seconds)
+
+    def observe_loop_lag(self, seconds: float) -> None:
+        self.event_loop_lag_seconds.observe(seconds)
+
+    def count_slow_callback(self, name: str) -> None:
+        self.event_loop_slow_callbacks.labels(name).inc()
+
+    def monitor_loop(self) -> None:
+        """Sample lag and slow callbacks of the running event loop until
+        `unregister()`. Must be called on the loop's thread."""
+        if self._loop_monitor is None:
+            self._loop_monitor = instrumentation.LoopMonitor(self)
+            self._loop_monitor.start()
+
     def set_latency(self, latency_ms: float) -> None:
         self.latency.set(latency_ms)
 
@@ -1184,6 +1246,10 @@ class Metrics:
             fut.cancel()
         self._csv_tasks.clear()
         self._csv_executor.shutdown(wait=True)
+        instrumentation.uninstall(self)
+        if self._loop_monitor is not None:
+            self._loop_monitor.stop()
+            self._loop_monitor = None
         # Every collector built in __init__ must be released here: any one left
         # behind makes the next Metrics() raise DuplicateTimeseries, so a mode
         # switch back into metrics-enabled streaming would fail to start. Each
@@ -1192,7 +1258,9 @@ class Metrics:
         for collector in (self.fps, self.fps_hist, self.gpu_utilization,
                           self.latency, self.webrtc_statistics,
                           self.webrtc_pacer_pace_bps, self.webrtc_pacer_queue_bytes,
-                          self.webrtc_pacer_idr_floor_bytes, self.webrtc_pacer_events):
+                          self.webrtc_pacer_idr_floor_bytes, self.webrtc_pacer_events,
+                          self.pipeline_stage_seconds, self.event_loop_lag_seconds,
+                          self.event_loop_slow_callbacks, self.queue_depth):
             try:
                 REGISTRY.unregister(collector)
             except KeyError:
@@ -1610,20 +1678,21 @@ class SystemMonitor:
         logger_system.info("System monitor stopped")
 
 class GPUMonitor:
-    """Periodically samples GPU load and memory for the pipeline's card.
+    """Periodically reports GPU load and memory for the pipeline's card.
 
     Each sample is delivered through the optional async `on_stats` callback
-    as `(load, mem_total, mem_used)`. GPU queries run in a worker thread so
-    sampling never blocks the event loop. When no GPU is found on the first
-    probe, the loop exits instead of polling forever.
+    as `(load, mem_total, mem_used)`. Readings come from the process-wide
+    gpu_stats sampler for the card, which the WebSocket GPU collector shares;
+    resolving it runs in a worker thread so the event loop never blocks. When
+    no GPU is found, the loop exits instead of polling forever.
     """
 
-    def __init__(self, gpu_id: int = 0, period: int = 1, enabled: bool = True, dri_node: str = ""):
-        self.period = max(1, int(period))
+    def __init__(self, gpu_id: int = 0, period: float = 1, enabled: bool = True, dri_node: str = ""):
+        self.period = max(0.1, float(period))
         self.enabled = enabled
         self.gpu_id = gpu_id
         # The render node the pipeline captures/encodes on; stats must describe
-        # the same card, so get_gpus() filters by it when set.
+        # the same card, so the sampler resolves its GPU by it when set.
         self.dri_node = dri_node
         self.stop_event = asyncio.Event()
         self.task: Optional[asyncio.Task] = None
@@ -1637,42 +1706,25 @@ class GPUMonitor:
         self.task = asyncio.create_task(self._monitor_loop())
         logger_gpu.info("GPU monitor started")
 
-    def _get_gpu_stats(self) -> Optional[Tuple]:
-        """Returns `(load, mem_total, mem_used)` for the target GPU; blocking.
-
-        Returns:
-            The stats tuple, or None when the GPU cannot be found or queried.
-        """
-        try:
-            gpus = gpu_stats.get_gpus(self.dri_node)
-            # A dri_node match returns exactly the pipeline's GPU; the index only
-            # applies to the unfiltered list.
-            idx = 0 if (self.dri_node and len(gpus) == 1) else self.gpu_id
-            if not gpus or idx >= len(gpus):
-                return None
-            gpu = gpus[idx]
-            return (gpu.load, gpu.memoryTotal, gpu.memoryUsed)
-        except Exception as e:
-            logger_gpu.warning(f"Error while fetching GPU stats: {e}")
-            return None
-
     async def _monitor_loop(self) -> None:
         # No GPU present: report nothing and stop, mirroring the WebSocket GPU monitor.
         # CPU load and system memory are surfaced separately by SystemMonitor; the GPU
         # gauge contract (fractional load, MB memory) cannot carry CPU stats without
         # mislabeling and unit errors (percent-as-fraction, bytes-as-MB).
+        sampler = None
         try:
-            if await asyncio.to_thread(self._get_gpu_stats) is None:
+            sampler = await asyncio.to_thread(
+                gpu_stats.acquire_sampler, self.gpu_id, self.dri_node, self.period)
+            if sampler is None:
                 logger_gpu.info(
                     f"No GPU with ID {self.gpu_id} found; GPU stats disabled "
                     "(CPU and system memory are reported by the system monitor)."
                 )
                 return
             while not self.stop_event.is_set():
-                stats = await asyncio.to_thread(self._get_gpu_stats)
-                if stats is not None and self.on_stats:
-                    load, mem_total, mem_used = stats
-                    await self.on_stats(load, mem_total, mem_used)
+                gpu = sampler.latest()
+                if gpu is not None and self.on_stats:
+                    await self.on_stats(gpu.load, gpu.memoryTotal, gpu.memoryUsed)
                 try:
                     await asyncio.wait_for(self.stop_event.wait(), timeout=self.period)
                 except asyncio.TimeoutError:
@@ -1682,6 +1734,8 @@ class GPUMonitor:
         except Exception as e:
             logger_gpu.error(f"GPU monitor error: {e}", exc_info=True)
         finally:
+            if sampler is not None:
+                await asyncio.to_thread(gpu_stats.release_sampler, sampler)
             logger_gpu.debug("GPU monitor loop exited")
 
     async def stop(self) -> None:
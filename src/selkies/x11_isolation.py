@@ -0,0 +1,458 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""X11 input injection and clipboard monitoring in a helper process.
+
+python-xlib is pure Python. Encoding XTEST batches and running the clipboard
+monitor's event thread hold the GIL, so that work competes with the event
+loop's fan-out and with the capture callbacks handing frames to the loop.
+With ``x11_input_isolation`` on, WebRTCInput hosts the XTEST injector and the
+X11 clipboard monitor in helper processes (``python -m
+selkies.x11_isolation``), each with its own interpreter and GIL. The proxies
+here keep the interfaces of ``_XTestInjector`` and ``_X11ClipboardMonitor``,
+so their callers are unchanged.
+
+A subinterpreter with its own GIL (PEP 684/734) would be lighter, but
+input_handler imports C extensions (msgpack, Pillow) that cannot be loaded
+into one, so the helper is a process.
+
+The channel is the helper's stdin and stdout carrying msgpack arrays, each
+prefixed with its length as a 4-byte little-endian integer:
+
+- ``[MSG_INPUT, [[op, a, b], ...]]``: one batch of pointer and key events,
+  never answered.
+- ``[MSG_CALL, id, method, args]``: answered by ``[MSG_REPLY, id, result]``
+  or ``[MSG_ERROR, id, message]``.
+- ``[MSG_READY]`` / ``[MSG_ERROR, 0, message]``: the helper built its object,
+  or could not.
+- ``[MSG_CHANGED]``: the clipboard owner changed.
+"""
+
+import asyncio
+import itertools
+import logging
+import os
+import queue
+import struct
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import msgpack
+
+logger = logging.getLogger("webrtc_input")
+
+MSG_INPUT, MSG_CALL, MSG_REPLY, MSG_ERROR, MSG_READY, MSG_CHANGED = range(6)
+
+# Matches input_handler.INPUT_X_REPLY_TIMEOUT_S: a sync waits on the same
+# round trip, wherever it runs.
+SYNC_TIMEOUT_S = 20.0
+# Interpreter start, imports and the X handshake of a fresh helper.
+READY_TIMEOUT_S = 30.0
+# A clipboard read is up to a few bounded conversions (5 s each).
+CLIPBOARD_CALL_TIMEOUT_S = 30.0
+
+_HEADER = struct.Struct("<I")
+# Largest frame either side accepts: a clipboard payload (64 MiB cap) plus
+# framing.
+_MAX_FRAME = 80 * 1024 * 1024
+
+
+def _read_frame(stream: Any) -> Optional[list]:
+    """Read one message, or None at end of stream."""
+    header = stream.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        return None
+    (size,) = _HEADER.unpack(header)
+    if size > _MAX_FRAME:
+        raise ValueError(f"oversized frame ({size} bytes)")
+    body = stream.read(size)
+    if len(body) < size:
+        return None
+    return msgpack.unpackb(body, raw=False)
+
+
+def _write_frame(stream: Any, message: list) -> None:
+    body = msgpack.packb(message, use_bin_type=True)
+    stream.write(_HEADER.pack(len(body)) + body)
+    stream.flush()
+
+
+class _Helper:
+    """One helper process hosting one object, and the channel to it.
+
+    Args:
+        kind: What the helper hosts, "injector" or "clipboard".
+        display_name: X display for the helper's own connection, or None for
+            $DISPLAY.
+        on_changed: Called on the reader thread for every MSG_CHANGED.
+    """
+
+    def __init__(self, kind: str, display_name: Optional[str] = None,
+                 on_changed: Optional[Callable[[], None]] = None) -> None:
+        self.kind = kind
+        self._on_changed = on_changed
+        self._write_lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._calls: Dict[int, list] = {}
+        self._ready = threading.Event()
+        self._ready_error: Optional[str] = None
+        env = dict(os.environ)
+        # The helper imports selkies from wherever this process did.
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env["PYTHONPATH"] = os.pathsep.join(
+            p for p in (root, env.get("PYTHONPATH", "")) if p)
+        self._proc = subprocess.Popen(
+            [sys.executable, "-m", "selkies.x11_isolation", kind, display_name or ""],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, env=env, close_fds=True)
+        self._reader = threading.Thread(target=self._read, name=f"x11-{kind}-channel",
+                                        daemon=True)
+        self._reader.start()
+
+    def wait_ready(self, timeout: float = READY_TIMEOUT_S) -> None:
+        """Block until the helper built its object.
+
+        Raises:
+            RuntimeError: The helper failed to build it, exited, or did not
+                report within `timeout`.
+        """
+        if not self._ready.wait(timeout):
+            raise RuntimeError(f"x11 {self.kind} helper did not start within {timeout}s")
+        if self._ready_error is not None:
+            raise RuntimeError(self._ready_error)
+
+    def send(self, message: list) -> None:
+        """Send one message. Raises OSError once the helper is gone."""
+        with self._write_lock:
+            _write_frame(self._proc.stdin, message)
+
+    def call(self, method: str, *args: Any, timeout: float) -> Any:
+        """Call `method` on the hosted object and return its result.
+
+        Raises:
+            RuntimeError: The call raised in the helper, the helper exited, or
+                no answer came within `timeout`.
+        """
+        call_id = next(self._ids)
+        pending = [threading.Event(), None, None]
+        self._calls[call_id] = pending
+        try:
+            self.send([MSG_CALL, call_id, method, list(args)])
+            if not pending[0].wait(timeout):
+                raise RuntimeError(f"x11 {self.kind} helper: {method} timed out")
+        except OSError as e:
+            raise RuntimeError(f"x11 {self.kind} helper is gone: {e}") from e
+        finally:
+            self._calls.pop(call_id, None)
+        if pending[2] is not None:
+            raise RuntimeError(pending[2])
+        return pending[1]
+
+    def alive(self) -> bool:
+        return self._proc.poll() is None and self._reader.is_alive()
+
+    def close(self, timeout: float = 2.0) -> None:
+        """End the helper: closing its stdin asks it to stop, then it is killed
+        if it has not within `timeout`."""
+        try:
+            with self._write_lock:
+                self._proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            self._proc.wait(timeout)
+        except subprocess.TimeoutExpired:
+            self._proc.kill()
+            self._proc.wait()
+        self._reader.join(timeout)
+
+    def _read(self) -> None:
+        stream = self._proc.stdout
+        try:
+            while True:
+                message = _read_frame(stream)
+                if message is None:
+                    break
+                kind = message[0]
+                if kind in (MSG_REPLY, MSG_ERROR) and message[1]:
+                    pending = self._calls.get(message[1])
+                    if pending is not None:
+                        if kind == MSG_REPLY:
+                            pending[1] = message[2]
+                        else:
+                            pending[2] = message[2]
+                        pending[0].set()
+                elif kind == MSG_CHANGED:
+                    if self._on_changed is not None:
+                        self._on_changed()
+                elif kind == MSG_READY:
+                    self._ready.set()
+                elif kind == MSG_ERROR:
+                    self._ready_error = message[2]
+                    self._ready.set()
+        except Exception as e:
+            logger.warning(f"x11 {self.kind} helper channel failed: {e}")
+        finally:
+            if not self._ready.is_set():
+                self._ready_error = f"x11 {self.kind} helper exited during startup"
+                self._ready.set()
+            for pending in list(self._calls.values()):
+                pending[2] = f"x11 {self.kind} helper exited"
+                pending[0].set()
+            try:
+                stream.close()
+            except OSError:
+                pass
+
+
+class IsolatedXTestInjector:
+    """`_XTestInjector` with the XTEST work in a helper process.
+
+    The event loop only queues, as with the threaded injector. A feeder
+    thread drains the queue, collapses runs of absolute motions the same way,
+    and sends each pass to the helper as one message; the helper's own
+    injector writes it to the X server. The helper is started on the feeder
+    thread and restarted after it dies, no more than once per `_RETRY_S`.
+    """
+
+    _MOTION, _RELATIVE, _EVENT, _SYNC = range(4)
+    _RETRY_S = 1.0
+
+    def __init__(self, display_name: Optional[str] = None) -> None:
+        self._display_name = display_name
+        self._helper: Optional[_Helper] = None
+        self._retry_at = 0.0
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.coalesced = 0
+        self._thread = threading.Thread(target=self._run, name="x-input-isolated",
+                                        daemon=True)
+        self._thread.start()
+
+    def motion(self, x: int, y: int) -> None:
+        """Queue an absolute pointer move."""
+        self._queue.put((self._MOTION, x, y))
+
+    def relative(self, dx: int, dy: int) -> None:
+        """Queue a relative pointer move."""
+        self._queue.put((self._RELATIVE, dx, dy))
+
+    def event(self, event_type: int, detail: int) -> None:
+        """Queue a button or key press/release."""
+        self._queue.put((self._EVENT, event_type, detail))
+
+    def sync(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything queued so far was processed by the server.
+
+        Returns:
+            False when the helper did not get there within `timeout`
+            (SYNC_TIMEOUT_S by default).
+        """
+        done = threading.Event()
+        self._queue.put((self._SYNC, done))
+        return done.wait(SYNC_TIMEOUT_S if timeout is None else timeout)
+
+    def stop(self) -> None:
+        """Send what is queued, then end the helper and the feeder thread."""
+        self._queue.put(None)
+
+    def _connect(self) -> Optional[_Helper]:
+        if self._helper is not None and not self._helper.alive():
+            self._close()
+            self._retry_at = time.monotonic() + self._RETRY_S
+        if self._helper is None and time.monotonic() >= self._retry_at:
+            try:
+                self._helper = _Helper("injector", self._display_name)
+            except Exception as e:
+                self._retry_at = time.monotonic() + self._RETRY_S
+                logger.error(f"XTEST helper could not start: {e}")
+        return self._helper
+
+    def _close(self) -> None:
+        helper, self._helper = self._helper, None
+        if helper is not None:
+            helper.close()
+
+    def _run(self) -> None:
+        get, get_nowait = self._queue.get, self._queue.get_nowait
+        motion, sync = self._MOTION, self._SYNC
+        while True:
+            batch = [get()]
+            try:
+                while batch[-1] is not None:
+                    batch.append(get_nowait())
+            except queue.Empty:
+                pass
+            stopping = batch[-1] is None
+            if stopping:
+                batch.pop()
+            ops: List[Tuple[int, int, int]] = []
+            waiters = []
+            last = len(batch) - 1
+            for i, op in enumerate(batch):
+                kind = op[0]
+                if kind == sync:
+                    waiters.append(op[1])
+                elif kind == motion and i < last and batch[i + 1][0] == motion:
+                    self.coalesced += 1
+                else:
+                    ops.append(op)
+            helper = self._connect()
+            if helper is not None:
+                try:
+                    if ops:
+                        helper.send([MSG_INPUT, ops])
+                    if waiters:
+                        helper.call("sync", timeout=SYNC_TIMEOUT_S)
+                except Exception as e:
+                    logger.warning(f"XTEST helper failed, restarting: {e}")
+                    self._close()
+            for done in waiters:
+                done.set()
+            if stopping:
+                self._close()
+                return
+
+
+class IsolatedClipboardMonitor:
+    """`_X11ClipboardMonitor` with the X connection and event thread in a
+    helper process.
+
+    Construction blocks until the helper built its monitor and raises like
+    the in-process constructor when it could not, so the caller's retry and
+    polling fallback work unchanged. A helper whose monitor dies exits, and
+    alive() then reports False.
+    """
+
+    def __init__(self, display_name: Optional[str] = None) -> None:
+        self._changed = threading.Event()
+        self._helper = _Helper("clipboard", display_name, on_changed=self._changed.set)
+        try:
+            self._helper.wait_ready()
+        except BaseException:
+            self._helper.close()
+            raise
+
+    def read(self, use_binary: bool) -> tuple:
+        """Blocking read (call via executor): (data, mime), or (None, None)."""
+        try:
+            data, mime = self._helper.call("read", use_binary,
+                                           timeout=CLIPBOARD_CALL_TIMEOUT_S)
+        except RuntimeError as e:
+            logger.warning(f"X11 clipboard helper read failed: {e}")
+            return None, None
+        return data, mime
+
+    def offer(self, data: Union[str, bytes], mime_type: str) -> bool:
+        """Blocking (call via executor): take CLIPBOARD ownership in the
+        helper. Returns True when ownership was acquired."""
+        try:
+            return bool(self._helper.call("offer", data, mime_type,
+                                          timeout=CLIPBOARD_CALL_TIMEOUT_S))
+        except RuntimeError as e:
+            logger.warning(f"X11 clipboard helper offer failed: {e}")
+            return False
+
+    async def wait_change(self, timeout: float) -> bool:
+        """Await a selection-owner change (True) or timeout (False)."""
+        loop = asyncio.get_running_loop()
+        got = await loop.run_in_executor(None, self._changed.wait, timeout)
+        if got:
+            self._changed.clear()
+        return got
+
+    def alive(self) -> bool:
+        return self._helper.alive()
+
+    def close(self) -> None:
+        self._helper.close()
+
+
+def _serve_injector(injector: Any, message: list) -> Any:
+    if message[0] == MSG_INPUT:
+        handlers = (injector.motion, injector.relative, injector.event)
+        for op, a, b in message[1]:
+            handlers[op](a, b)
+        return None
+    if message[2] == "sync":
+        return injector.sync(SYNC_TIMEOUT_S)
+    raise ValueError(f"unknown call {message[2]!r}")
+
+
+def _serve_clipboard(monitor: Any, message: list) -> Any:
+    method, args = message[2], message[3]
+    if method == "read":
+        data, mime = monitor.read(*args)
+        return [data, mime]
+    if method == "offer":
+        return monitor.offer(*args)
+    raise ValueError(f"unknown call {method!r}")
+
+
+def main(argv: List[str]) -> int:
+    """Helper entry point: host one object and serve the channel on stdio."""
+    kind, display_name = argv[1], argv[2] or None
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+    channel_in = sys.stdin.buffer
+    # Only framed messages may reach the parent: anything else printing to
+    # stdout goes to stderr instead.
+    channel_out = os.fdopen(os.dup(1), "wb")
+    os.dup2(2, 1)
+    write_lock = threading.Lock()
+
+    def send(message: list) -> None:
+        with write_lock:
+            _write_frame(channel_out, message)
+
+    from . import input_handler
+    try:
+        if kind == "injector":
+            hosted = input_handler._XTestInjector(display_name)
+            serve = _serve_injector
+        elif kind == "clipboard":
+            hosted = input_handler._X11ClipboardMonitor(display_name)
+            serve = _serve_clipboard
+        else:
+            raise ValueError(f"unknown helper kind {kind!r}")
+    except Exception as e:
+        send([MSG_ERROR, 0, f"{type(e).__name__}: {e}"])
+        return 1
+
+    if kind == "clipboard":
+        def forward_changes() -> None:
+            while hosted.alive():
+                if hosted._changed.wait(1.0):
+                    hosted._changed.clear()
+                    send([MSG_CHANGED])
+            # A dead monitor never reports again: exit so the parent rebuilds.
+            os._exit(0)
+
+        threading.Thread(target=forward_changes, name="clipboard-changes",
+                         daemon=True).start()
+
+    send([MSG_READY])
+    try:
+        while True:
+            message = _read_frame(channel_in)
+            if message is None:
+                break
+            if message[0] == MSG_INPUT:
+                serve(hosted, message)
+                continue
+            try:
+                send([MSG_REPLY, message[1], serve(hosted, message)])
+            except Exception as e:
+                send([MSG_ERROR, message[1], f"{type(e).__name__}: {e}"])
+    finally:
+        if kind == "injector":
+            hosted.stop()
+            hosted._thread.join(timeout=2.0)
+        else:
+            hosted.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
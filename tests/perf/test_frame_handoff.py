@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Loop wakeups and lag for striped video handed from a capture thread.
+
+A producer thread stands in for pixelflux in a striped mode: FPS frames a
+second, each delivered as STRIPES chunks in a quick burst. The chunks reach a
+fan-out on the loop either one ``call_soon_threadsafe`` per chunk (as before)
+or through a LoopHandoff. Meanwhile a ticker task on the loop records how
+late each of its TICK sleeps wakes up, which is the lag every other task on
+the loop sees. Each fan-out call also does a little per-batch work (resolving
+the target set), as the real fan-out does.
+
+Both runs must deliver every chunk in order. The handoff must cut loop
+wakeups at least tenfold and must not add loop lag.
+"""
+import asyncio
+import os
+import statistics
+import sys
+import threading
+import time
+
+TESTS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO = os.path.dirname(TESTS)
+sys.path.insert(0, os.path.join(REPO, "src"))
+
+from selkies.loop_handoff import LoopHandoff  # noqa: E402
+
+FPS = 60
+STRIPES = 40
+SECONDS = 3.0
+TICK = 0.002
+CLIENTS = 4
+
+passed = failed = 0
+
+
+def check(label: str, ok, detail="") -> None:
+    global passed, failed
+    if ok:
+        passed += 1
+    else:
+        failed += 1
+    print(f"{'PASS' if ok else 'FAIL'}  [frame-handoff] {label}  {detail}", flush=True)
+
+
+async def run(batched: bool) -> dict:
+    loop = asyncio.get_running_loop()
+    received = []
+    calls = [0]
+    clients = {f"client-{i}": [] for i in range(CLIENTS)}
+
+    def fanout(items) -> None:
+        calls[0] += 1
+        targets = {name for name in clients if not name.endswith("-paused")}
+        for name in targets:
+            clients[name].extend(items)
+        received.extend(items)
+
+    handoff = LoopHandoff(loop, fanout)
+    frames = int(FPS * SECONDS)
+    done = threading.Event()
+
+    def capture() -> None:
+        start = time.monotonic()
+        for frame in range(frames):
+            for stripe in range(STRIPES):
+                chunk = (frame, stripe)
+                if batched:
+                    handoff.put(chunk)
+                else:
+                    loop.call_soon_threadsafe(fanout, [chunk])
+            delay = start + (frame + 1) / FPS - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        done.set()
+
+    lags = []
+
+    async def ticker() -> None:
+        while not done.is_set():
+            t0 = time.perf_counter()
+            await asyncio.sleep(TICK)
+            lags.append(time.perf_counter() - t0 - TICK)
+
+    thread = threading.Thread(target=capture)
+    tick = asyncio.ensure_future(ticker())
+    cpu0 = time.process_time()
+    t0 = time.monotonic()
+    thread.start()
+    while not (done.is_set() and len(received) == frames * STRIPES):
+        await asyncio.sleep(0.01)
+    elapsed = time.monotonic() - t0
+    cpu = time.process_time() - cpu0
+    thread.join()
+    await tick
+    expected = [(f, s) for f in range(frames) for s in range(STRIPES)]
+    lags.sort()
+    return {
+        "in_order": received == expected and all(c == expected for c in clients.values()),
+        "wakeups": (handoff.wakeups if batched else calls[0]) / elapsed,
+        "lag_median": statistics.median(lags),
+        "lag_p99": lags[int(len(lags) * 0.99)],
+        "cpu": cpu,
+    }
+
+
+def report(tag: str, r: dict) -> None:
+    print(f"INFO  [frame-handoff] {tag}: {r['wakeups']:,.0f} wakeups/s, loop lag median "
+          f"{r['lag_median'] * 1e6:.0f} us p99 {r['lag_p99'] * 1e6:.0f} us, "
+          f"CPU {r['cpu']:.2f}s", flush=True)
+
+
+per_chunk = asyncio.run(run(False))
+report("call_soon_threadsafe per chunk", per_chunk)
+handoff = asyncio.run(run(True))
+report("LoopHandoff", handoff)
+
+check("every chunk reaches every client in order, per chunk", per_chunk["in_order"])
+check("every chunk reaches every client in order, handed off", handoff["in_order"])
+check("the handoff cuts loop wakeups at least tenfold",
+      handoff["wakeups"] * 10 <= per_chunk["wakeups"],
+      f"{handoff['wakeups']:,.0f} vs {per_chunk['wakeups']:,.0f}/s")
+check("the handoff does not add loop lag",
+      handoff["lag_median"] <= per_chunk["lag_median"] * 1.5 + 50e-6,
+      f"median {handoff['lag_median'] * 1e6:.0f} vs {per_chunk['lag_median'] * 1e6:.0f} us")
+
+print(f"[frame-handoff] {passed}/{passed + failed} passed")
+sys.exit(1 if failed else 0)
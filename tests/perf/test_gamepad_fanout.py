@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""Gamepad fan-out latency under an axis flood, on the interposer sockets.
+
+A SelkiesGamepad serves its JS and EVDEV interposer sockets from a temporary
+directory, as tests/tools/gamepad/gpserver.py does, and several clients of
+each kind connect through the interposer handshake (config payload in,
+architecture byte out), one of them 32-bit. Every 4 ms a burst of stick and
+trigger updates arrives, the way a controller reports dozens of axis samples
+per frame, with a button tap and a d-pad tap in some bursts.
+
+Each EVDEV client must receive about one SYN_REPORT frame per wakeup rather
+than one per event, every tap must arrive as a press and a release on every
+client, the final axis values must be the last ones sent, and the latency
+from a burst to its frame on the slowest client must stay low.
+"""
+import asyncio
+import os
+import statistics
+import struct
+import sys
+import tempfile
+import time
+
+TESTS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO = os.path.dirname(TESTS)
+sys.path.insert(0, os.path.join(REPO, "src"))
+
+import selkies.input_handler as ih  # noqa: E402
+
+BURSTS = 500
+PERIOD = 0.004
+SAMPLES_PER_AXIS = 6
+AXES = 4
+CLIENTS = 3
+
+passed = failed = 0
+
+
+def check(label: str, ok, detail="") -> None:
+    global passed, failed
+    if ok:
+        passed += 1
+    else:
+        failed += 1
+    print(f"{'PASS' if ok else 'FAIL'}  [gamepad-fanout] {label}  {detail}", flush=True)
+
+
+class Client:
+    """One interposer client reading its socket and timestamping arrivals."""
+
+    def __init__(self, path: str, evdev: bool, arch_bits: int = 64) -> None:
+        self.path = path
+        self.evdev = evdev
+        self.arch_bits = arch_bits
+        self.frames = []          # (arrival, [(type, code, value), ...])
+        self.js_events = []       # (arrival, type, number, value)
+        self.task = None
+
+    async def connect(self) -> None:
+        reader, writer = await asyncio.open_unix_connection(self.path)
+        await reader.readexactly(ih.C_INTERPOSER_STRUCT_SIZE)
+        writer.write(struct.pack("=B", self.arch_bits // 8))
+        await writer.drain()
+        if not self.evdev:
+            controls = len(ih.STANDARD_XPAD_CONFIG["btn_map"]) + len(ih.STANDARD_XPAD_CONFIG["axes_map"])
+            await reader.readexactly(8 * controls)
+        self.writer = writer
+        self.task = asyncio.create_task(self._read(reader))
+
+    async def _read(self, reader) -> None:
+        fmt = struct.Struct("=qqHHi" if self.arch_bits == 64 else "=llHHi")
+        size = fmt.size if self.evdev else 8
+        pending = []
+        buf = b""
+        while True:
+            chunk = await reader.read(65536)
+            if not chunk:
+                return
+            now = time.perf_counter()
+            buf += chunk
+            whole = len(buf) - len(buf) % size
+            for off in range(0, whole, size):
+                if self.evdev:
+                    _, _, ev_type, code, value = fmt.unpack_from(buf, off)
+                    if ev_type == ih.EV_SYN and code == ih.SYN_REPORT:
+                        self.frames.append((now, pending))
+                        pending = []
+                    else:
+                        pending.append((ev_type, code, value))
+                else:
+                    _, value, ev_type, number = struct.unpack_from("=IhBB", buf, off)
+                    self.js_events.append((now, ev_type, number, value))
+            buf = buf[whole:]
+
+
+def axis_value(burst: int, sample: int, axis: int) -> float:
+    return round(((burst * SAMPLES_PER_AXIS + sample + axis * 7) % 200 - 100) / 100, 2)
+
+
+async def main() -> None:
+    with tempfile.TemporaryDirectory() as d:
+        gp = ih.SelkiesGamepad(os.path.join(d, "selkies_js0.sock"),
+                               os.path.join(d, "selkies_event1000.sock"),
+                               asyncio.get_running_loop())
+        gp.set_config("Selkies Test Pad", 17, AXES)
+        server = asyncio.create_task(gp.run_servers())
+        while gp.js_server is None or gp.evdev_server is None:
+            await asyncio.sleep(0.01)
+
+        evdev = [Client(gp.evdev_sock_path, True, 64 if i else 32) for i in range(CLIENTS)]
+        js = [Client(gp.js_sock_path, False) for _ in range(CLIENTS)]
+        for client in evdev + js:
+            await client.connect()
+        await asyncio.sleep(0.1)
+
+        sent = []
+        taps = 0
+        events = 0
+        for burst in range(BURSTS):
+            for sample in range(SAMPLES_PER_AXIS):
+                for axis in range(AXES):
+                    gp.send_event(axis, axis_value(burst, sample, axis), False)
+                    events += 1
+            if burst % 10 == 0:
+                gp.send_event(0, 1, True)
+                gp.send_event(0, 0, True)
+                gp.send_event(12, 1, True)
+                gp.send_event(12, 0, True)
+                taps += 1
+                events += 4
+            sent.append(time.perf_counter())
+            await asyncio.sleep(PERIOD)
+        await asyncio.sleep(0.5)
+
+        latencies = []
+        for start in sent:
+            arrivals = [next((t for t, _ in c.frames if t >= start), None) for c in evdev]
+            if None not in arrivals:
+                latencies.append(max(arrivals) - start)
+        frames = [len(c.frames) for c in evdev]
+        print(f"  {events} events in {BURSTS} bursts; frames per client {frames}; "
+              f"latency median {statistics.median(latencies) * 1e3:.2f} ms "
+              f"p99 {sorted(latencies)[int(len(latencies) * 0.99)] * 1e3:.2f} ms", flush=True)
+
+        check("each EVDEV client gets about one frame per wakeup, not per event",
+              all(f <= 2 * BURSTS + 2 * taps for f in frames), f"{frames} for {events} events")
+        check("a burst reaches every client within a few ms",
+              len(latencies) == BURSTS
+              and sorted(latencies)[int(len(latencies) * 0.99)] < 0.05,
+              f"p99 {sorted(latencies)[int(len(latencies) * 0.99)] * 1e3:.2f} ms")
+
+        def key_edges(client, code):
+            return [v for _, events in client.frames for t, c, v in events
+                    if t == ih.EV_KEY and c == code]
+
+        def hat_edges(client):
+            return [v for _, events in client.frames for t, c, v in events
+                    if t == ih.EV_ABS and c == ih.ABS_HAT0Y]
+
+        check("every button tap arrives as a press and a release on EVDEV",
+              all(key_edges(c, ih.BTN_A) == [1, 0] * taps for c in evdev))
+        check("every d-pad tap arrives as a press and a release on EVDEV",
+              all(hat_edges(c) == [-1, 0] * taps for c in evdev),
+              f"{hat_edges(evdev[0])[:6]}")
+        check("every button tap arrives as a press and a release on JS",
+              all([v for _, t, n, v in c.js_events if t == ih.JS_EVENT_BUTTON and n == 0]
+                  == [1, 0] * taps for c in js))
+
+        last = gp.mapper.get_mapped_events(0, axis_value(BURSTS - 1, SAMPLES_PER_AXIS - 1, 0), False)
+        want = last["evdev_event_template"]
+        final = [[(t, c, v) for _, events in cl.frames for t, c, v in events
+                  if (t, c) == want[:2]][-1] for cl in evdev]
+        check("the last axis value wins on every client",
+              all(got[2] == int(want[2]) for got in final), f"{final[0]} vs {want}")
+        check("32-bit and 64-bit clients see the same frames",
+              [e for _, e in evdev[0].frames] == [e for _, e in evdev[1].frames])
+
+        for client in evdev + js:
+            client.writer.close()
+            client.task.cancel()
+        await gp.close()
+        await server
+
+
+asyncio.run(main())
+print(f"[gamepad-fanout] {passed}/{passed + failed} passed")
+sys.exit(1 if failed else 0)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Cold import cost of the entry point, from `python -X importtime`.
+
+selkies.__main__ registers the WebRTC service as a lazy factory, so importing
+it must not load selkies.webrtc_mode or the WebRTC stack under it (selkies.rtc,
+the vendored selkies.webrtc package, PyAV). The cumulative import time of the
+entry point and of webrtc_mode are recorded, and the entry point must cost
+less than the entry point plus the transport it no longer imports.
+
+Skips when the runtime dependencies of the entry point are not installed.
+"""
+import os
+import re
+import subprocess
+import sys
+
+TESTS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO = os.path.dirname(TESTS)
+sys.path.insert(0, TESTS)
+
+import helpers as H  # noqa: E402
+
+# Modules that belong to the WebRTC transport alone.
+WEBRTC_ONLY = ("selkies.webrtc_mode", "selkies.rtc", "selkies.webrtc_signaling",
+               "selkies.webrtc", "av")
+RUNS = 3
+
+passed = failed = 0
+
+
+def check(label: str, ok, detail="") -> None:
+    global passed, failed
+    if ok:
+        passed += 1
+    else:
+        failed += 1
+    print(f"{'PASS' if ok else 'FAIL'}  [import-budget] {label}  {detail}", flush=True)
+
+
+def importtime(statement: str) -> tuple:
+    """Run `statement` in a fresh interpreter under -X importtime.
+
+    Returns:
+        (exit status, {module: cumulative us} for top-level imports, names of
+        every module imported, stderr).
+    """
+    env = dict(os.environ, PYTHONPATH=os.path.join(REPO, "src"))
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                          capture_output=True, text=True, env=env, timeout=120)
+    top, names = {}, set()
+    for line in proc.stderr.splitlines():
+        m = re.match(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$", line)
+        if not m:
+            continue
+        names.add(m.group(4))
+        if len(m.group(3)) == 1:
+            top[m.group(4)] = int(m.group(2))
+    return proc.returncode, top, names, proc.stderr
+
+
+def total_ms(statement: str) -> tuple:
+    """Best of RUNS summed top-level cumulative import times, in ms."""
+    best, names = None, set()
+    for _ in range(RUNS):
+        status, top, names, stderr = importtime(statement)
+        if status != 0:
+            H.skip_suite(f"cannot import: {stderr.strip().splitlines()[-1]}")
+        ms = sum(top.values()) / 1000
+        best = ms if best is None else min(best, ms)
+    return best, names
+
+
+main_ms, main_names = total_ms("import selkies.__main__")
+both_ms, _ = total_ms("import selkies.__main__, selkies.webrtc_mode")
+print(f"  selkies.__main__ {main_ms:.1f} ms; with selkies.webrtc_mode {both_ms:.1f} ms",
+      flush=True)
+
+loaded = sorted(n for n in main_names
+                if any(n == m or n.startswith(m + ".") for m in WEBRTC_ONLY))
+check("the entry point imports none of the WebRTC transport", not loaded, f"{loaded[:5]}")
+check("the entry point costs less than the entry point plus webrtc_mode",
+      main_ms < both_ms, f"{main_ms:.1f} vs {both_ms:.1f} ms")
+
+print(f"[import-budget] {passed}/{passed + failed} passed")
+sys.exit(1 if failed else 0)
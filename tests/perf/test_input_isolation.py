@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Frame delivery jitter under an input flood, injector threaded vs isolated.
+
+A capture thread hands a 60 fps frame stream to the event loop through a
+LoopHandoff, as the video path does, while an asyncio task floods a private
+Xvfb with absolute pointer motions and key presses. The flood runs twice:
+through an _XTestInjector, whose writer thread encodes XTEST batches under
+this process's GIL, and through an IsolatedXTestInjector, which hands the
+batches to a helper process with a GIL of its own.
+
+The isolated injector must deliver frames with no more jitter than the
+threaded one, and the pointer must end on the last motion in both modes.
+"""
+import asyncio
+import os
+import statistics
+import sys
+import threading
+import time
+
+TESTS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO = os.path.dirname(TESTS)
+sys.path.insert(0, TESTS)
+sys.path.insert(0, os.path.join(REPO, "src"))
+
+import helpers as H  # noqa: E402
+
+MOTIONS = 60_000
+BURST = 16
+FRAME_INTERVAL = 1 / 60
+# Keycode of "a" on the default Xvfb keymap; pressed between bursts so the
+# flood is not all coalescable motion.
+KEYCODE = 38
+
+passed = failed = 0
+
+
+def check(label: str, ok, detail="") -> None:
+    global passed, failed
+    if ok:
+        passed += 1
+    else:
+        failed += 1
+    print(f"{'PASS' if ok else 'FAIL'}  [input-isolation] {label}  {detail}", flush=True)
+
+
+def p99(samples: list) -> float:
+    return sorted(samples)[int(len(samples) * 0.99)] if samples else 0.0
+
+
+async def flood(mouse, injector) -> dict:
+    """Drive MOTIONS moves through `mouse` while timing frame delivery."""
+    from selkies.Xlib import X
+    from selkies.loop_handoff import LoopHandoff
+
+    loop = asyncio.get_running_loop()
+    delays = []
+    handoff = LoopHandoff(
+        loop, lambda frames: delays.extend(time.perf_counter() - f for f in frames))
+    stop = threading.Event()
+
+    def capture() -> None:
+        due = time.perf_counter()
+        while not stop.is_set():
+            due += FRAME_INTERVAL
+            time.sleep(max(due - time.perf_counter(), 0.0))
+            handoff.put(time.perf_counter())
+
+    thread = threading.Thread(target=capture, name="capture", daemon=True)
+    thread.start()
+    start = time.perf_counter()
+    for i in range(0, MOTIONS, BURST):
+        for j in range(i, i + BURST):
+            mouse.position = (j % 1000, (j // 1000) % 700)
+        injector.event(X.KeyPress, KEYCODE)
+        injector.event(X.KeyRelease, KEYCODE)
+        await asyncio.sleep(0)
+    synced = await asyncio.to_thread(injector.sync)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await asyncio.to_thread(thread.join)
+    await asyncio.sleep(0)
+    return {"synced": synced,
+            "seconds": elapsed,
+            "frames": len(delays),
+            "p99_ms": p99(delays) * 1e3,
+            "median_ms": statistics.median(delays) * 1e3 if delays else 0.0}
+
+
+def main() -> None:
+    from selkies.Xlib import display
+    from selkies.input_handler import _XTestInjector, _XTestMouse
+    from selkies.x11_isolation import IsolatedXTestInjector
+
+    d = display.Display(DISPLAY)
+    last = MOTIONS - 1
+    results = {}
+    try:
+        for name, factory in (("threaded", _XTestInjector),
+                              ("isolated", IsolatedXTestInjector)):
+            injector = factory(DISPLAY)
+            try:
+                # The helper starts on first use; keep its start-up out of
+                # the measurement.
+                injector.sync()
+                mouse = _XTestMouse(d, injector)
+                results[name] = asyncio.run(flood(mouse, injector))
+                print(f"  {name:8} {results[name]} coalesced={injector.coalesced}",
+                      flush=True)
+                check(f"{name}: the flood lands and the pointer ends on the last motion",
+                      results[name]["synced"]
+                      and mouse.position == (last % 1000, (last // 1000) % 700),
+                      f"{mouse.position}")
+            finally:
+                injector.stop()
+    finally:
+        d.close()
+
+    threaded, isolated = results["threaded"], results["isolated"]
+    check("frames keep flowing in both modes",
+          threaded["frames"] > 0 and isolated["frames"] > 0,
+          f"{threaded['frames']} / {isolated['frames']}")
+    check("isolation delivers frames with no more jitter",
+          isolated["p99_ms"] <= threaded["p99_ms"] * 1.1 + 0.5,
+          f"p99 {isolated['p99_ms']:.2f} vs {threaded['p99_ms']:.2f} ms")
+
+
+if __name__ == "__main__":
+    try:
+        xvfb, DISPLAY = H.private_x_server(1280, 720)
+    except RuntimeError as e:
+        H.skip_suite(str(e))
+    try:
+        main()
+    finally:
+        H.stop_x_server(xvfb, DISPLAY)
+    print(f"[input-isolation] {passed}/{passed + failed} passed")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Cost of leaving the hot-path instrumentation on.
+
+Times observe_stage with no Metrics and with one installed, and the CPU an
+otherwise idle loop spends on a running LoopMonitor. At the instrumented
+call rates (a few hundred observations a second per display and client) a
+few microseconds per observation stays far below 0.1% of a core; the loop
+monitor must cost under 1% of a core.
+"""
+import asyncio
+import os
+import sys
+import time
+
+TESTS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO = os.path.dirname(TESTS)
+sys.path.insert(0, os.path.join(REPO, "src"))
+
+from selkies import instrumentation  # noqa: E402
+from selkies.webrtc_utils import Metrics  # noqa: E402
+
+CALLS = 200_000
+IDLE_SECONDS = 3.0
+
+passed = failed = 0
+
+
+def check(label: str, ok, detail="") -> None:
+    global passed, failed
+    if ok:
+        passed += 1
+    else:
+        failed += 1
+    print(f"{'PASS' if ok else 'FAIL'}  [instrumentation-overhead] {label}  {detail}", flush=True)
+
+
+def per_call() -> float:
+    observe = instrumentation.observe_stage
+    t0 = time.perf_counter()
+    for _ in range(CALLS):
+        observe("video_fanout", 0.0012)
+    return (time.perf_counter() - t0) / CALLS
+
+
+async def idle_cpu(metrics: Metrics) -> float:
+    metrics.monitor_loop()
+    cpu0 = time.process_time()
+    await asyncio.sleep(IDLE_SECONDS)
+    return (time.process_time() - cpu0) / IDLE_SECONDS
+
+
+off = per_call()
+metrics = Metrics()
+on = per_call()
+print(f"INFO  [instrumentation-overhead] observe_stage: {off * 1e9:.0f} ns without a sink, "
+      f"{on * 1e9:.0f} ns with Metrics", flush=True)
+check("observe_stage without a sink is nearly free", off < 0.5e-6, f"{off * 1e9:.0f} ns")
+check("observe_stage into Metrics stays within a few microseconds", on < 5e-6,
+      f"{on * 1e6:.2f} us")
+
+share = asyncio.run(idle_cpu(metrics))
+metrics.unregister()
+check("the loop monitor costs under 1% of a core", share < 0.01, f"{share * 100:.3f}%")
+
+print(f"[instrumentation-overhead] {passed}/{passed + failed} passed")
+sys.exit(1 if failed else 0)
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""SCTP chunk bundling under a synthetic input flood, on a loopback pair.
+
+Two RTCPeerConnections on the vendored stack connect over loopback and the
+client side floods its data channel with small input messages (``m,x,y,...``
+pointer motion) in bursts, the way a 120+ Hz mouse plus key events arrive
+between loop iterations. Each run counts the SCTP packets (one DTLS record and
+one UDP datagram each) both sides hand to DTLS, and the process CPU spent.
+
+The flood runs twice: with bundling, and with SCTP_BUNDLE_MAX_LENGTH forced to
+zero so every chunk travels alone, as before bundling existed. Bundling must
+deliver every message in order with far fewer datagrams and less CPU.
+"""
+import asyncio
+import os
+import sys
+import time
+
+TESTS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO = os.path.dirname(TESTS)
+sys.path.insert(0, os.path.join(REPO, "src"))
+
+from selkies.webrtc import RTCConfiguration, RTCPeerConnection  # noqa: E402
+from selkies.webrtc import rtcsctptransport  # noqa: E402
+
+MESSAGES = 10_000
+BURST = 4
+TICK = 0.002
+
+passed = failed = 0
+
+
+def check(label: str, ok, detail="") -> None:
+    global passed, failed
+    if ok:
+        passed += 1
+    else:
+        failed += 1
+    print(f"{'PASS' if ok else 'FAIL'}  [sctp-bundling] {label}  {detail}", flush=True)
+
+
+def count_packets(pc: RTCPeerConnection) -> list:
+    """Count every SCTP packet `pc` hands to its DTLS transport."""
+    counter = [0]
+    dtls = pc.sctp.transport
+    send_data = dtls._send_data
+
+    async def counting(data: bytes) -> None:
+        counter[0] += 1
+        await send_data(data)
+
+    dtls._send_data = counting
+    return counter
+
+
+async def flood() -> dict:
+    client = RTCPeerConnection(RTCConfiguration(iceServers=[]))
+    server = RTCPeerConnection(RTCConfiguration(iceServers=[]))
+    channel = client.createDataChannel("input")
+    received = []
+    done = asyncio.Event()
+    opened = asyncio.Event()
+
+    @server.on("datachannel")
+    def on_datachannel(remote):
+        @remote.on("message")
+        def on_message(message):
+            received.append(message)
+            if len(received) == MESSAGES:
+                done.set()
+
+    channel.on("open", opened.set)
+
+    await client.setLocalDescription(await client.createOffer())
+    await server.setRemoteDescription(client.localDescription)
+    await server.setLocalDescription(await server.createAnswer())
+    await client.setRemoteDescription(server.localDescription)
+    await asyncio.wait_for(opened.wait(), 20)
+    # Let the DCEP handshake settle before counting.
+    await asyncio.sleep(0.2)
+
+    sent_up = count_packets(client)
+    sent_down = count_packets(server)
+    expected = [f"m,{i % 1920},{i % 1080},0,0" for i in range(MESSAGES)]
+    cpu0 = time.process_time()
+    t0 = time.monotonic()
+    for start in range(0, MESSAGES, BURST):
+        for message in expected[start:start + BURST]:
+            channel.send(message)
+        await asyncio.sleep(TICK)
+    await asyncio.wait_for(done.wait(), 120)
+    elapsed = time.monotonic() - t0
+    cpu = time.process_time() - cpu0
+
+    await client.close()
+    await server.close()
+    return {
+        "in_order": received == expected,
+        "up": sent_up[0],
+        "down": sent_down[0],
+        "elapsed": elapsed,
+        "cpu": cpu,
+    }
+
+
+def report(tag: str, run: dict) -> None:
+    datagrams = run["up"] + run["down"]
+    print(f"INFO  [sctp-bundling] {tag}: {run['up']} up + {run['down']} down datagrams "
+          f"for {MESSAGES} messages ({datagrams / run['elapsed']:,.0f}/s), "
+          f"CPU {run['cpu']:.2f}s ({run['cpu'] / MESSAGES * 1e6:.0f} us/message)",
+          flush=True)
+
+
+bundled = asyncio.run(flood())
+report("bundled", bundled)
+default_limit = rtcsctptransport.SCTP_BUNDLE_MAX_LENGTH
+rtcsctptransport.SCTP_BUNDLE_MAX_LENGTH = 0
+try:
+    single = asyncio.run(flood())
+finally:
+    rtcsctptransport.SCTP_BUNDLE_MAX_LENGTH = default_limit
+report("one chunk per packet", single)
+
+check("every message arrives, in order, with bundling", bundled["in_order"])
+check("every message arrives, in order, without bundling", single["in_order"])
+check("bundling at least halves the sender's datagrams",
+      bundled["up"] * 2 <= single["up"], f"{bundled['up']} vs {single['up']}")
+check("the receiver acknowledges with fewer datagrams than it receives",
+      bundled["down"] < bundled["up"], f"{bundled['down']} SACKs for {bundled['up']} packets")
+check("bundling spends less CPU on the flood",
+      bundled["cpu"] < single["cpu"], f"{bundled['cpu']:.2f}s vs {single['cpu']:.2f}s")
+
+print(f"[sctp-bundling] {passed}/{passed + failed} passed")
+sys.exit(1 if failed else 0)
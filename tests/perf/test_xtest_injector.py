@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Event-loop latency under a synthetic pointer flood, XTEST inline vs injector.
+
+A private Xvfb takes a flood of absolute pointer motions from an asyncio task,
+in bursts the way a 120+ Hz mouse lands between loop iterations, while a ticker
+on the same loop measures how late each of its 1 ms wake-ups runs. The flood
+runs twice: with every fake_input and flush written on the loop, as before the
+injector existed, and through an _XTestInjector that only queues on the loop.
+
+The injector must cost the loop less per motion and keep the ticker no later,
+coalesce part of the flood, and still leave the pointer at the last position
+once synced. Button transitions queued between motions must not be merged.
+"""
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+TESTS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO = os.path.dirname(TESTS)
+sys.path.insert(0, TESTS)
+sys.path.insert(0, os.path.join(REPO, "src"))
+
+import helpers as H  # noqa: E402
+
+MOTIONS = 20_000
+BURST = 8
+TICK = 0.001
+
+passed = failed = 0
+
+
+def check(label: str, ok, detail="") -> None:
+    global passed, failed
+    if ok:
+        passed += 1
+    else:
+        failed += 1
+    print(f"{'PASS' if ok else 'FAIL'}  [xtest-injector] {label}  {detail}", flush=True)
+
+
+def p99(samples: list) -> float:
+    return sorted(samples)[int(len(samples) * 0.99)] if samples else 0.0
+
+
+async def flood(mouse) -> dict:
+    """Drive MOTIONS absolute moves through `mouse` and time the loop."""
+    lateness = []
+    done = asyncio.Event()
+
+    async def ticker() -> None:
+        while not done.is_set():
+            due = time.perf_counter() + TICK
+            await asyncio.sleep(TICK)
+            lateness.append(time.perf_counter() - due)
+
+    tick = asyncio.create_task(ticker())
+    spent = 0.0
+    for i in range(0, MOTIONS, BURST):
+        start = time.perf_counter()
+        for j in range(i, i + BURST):
+            mouse.position = (j % 1000, (j // 1000) % 700)
+        spent += time.perf_counter() - start
+        await asyncio.sleep(0)
+    done.set()
+    await tick
+    return {"per_motion_us": spent / MOTIONS * 1e6,
+            "p99_ms": p99(lateness) * 1e3,
+            "median_ms": statistics.median(lateness) * 1e3 if lateness else 0.0}
+
+
+def main() -> None:
+    from selkies.Xlib import X, display
+    from selkies.input_handler import _XTestInjector, _XTestMouse
+
+    d = display.Display(DISPLAY)
+    try:
+        inline = asyncio.run(flood(_XTestMouse(d)))
+        print(f"  inline   {inline}", flush=True)
+
+        injector = _XTestInjector(DISPLAY)
+        mouse = _XTestMouse(d, injector)
+        try:
+            queued = asyncio.run(flood(mouse))
+            synced = injector.sync()
+            print(f"  injector {queued} coalesced={injector.coalesced}", flush=True)
+
+            check("the injector costs the loop less per motion",
+                  queued["per_motion_us"] < inline["per_motion_us"],
+                  f"{queued['per_motion_us']:.1f} vs {inline['per_motion_us']:.1f} us")
+            check("the ticker runs no later with the injector",
+                  queued["p99_ms"] <= inline["p99_ms"] * 1.1 + 0.5,
+                  f"p99 {queued['p99_ms']:.2f} vs {inline['p99_ms']:.2f} ms")
+            check("the flood coalesces", synced and injector.coalesced > 0,
+                  f"{injector.coalesced}/{MOTIONS}")
+            last = MOTIONS - 1
+            check("the pointer ends on the last motion",
+                  mouse.position == (last % 1000, (last // 1000) % 700),
+                  f"{mouse.position}")
+
+            mouse.position = (10, 10)
+            mouse.position = (20, 20)
+            mouse.press(1)
+            mouse.position = (30, 30)
+            mouse.position = (40, 40)
+            injector.sync()
+            held = d.screen().root.query_pointer().mask & X.Button1Mask
+            mouse.release(1)
+            mouse.position = (50, 50)
+            injector.sync()
+            pointer = d.screen().root.query_pointer()
+            check("a press between motions is not merged away",
+                  held and not pointer.mask & X.Button1Mask
+                  and (pointer.root_x, pointer.root_y) == (50, 50),
+                  f"held={bool(held)} mask={pointer.mask:#x}")
+        finally:
+            injector.stop()
+    finally:
+        d.close()
+
+
+if __name__ == "__main__":
+    try:
+        xvfb, DISPLAY = H.private_x_server(1280, 720)
+    except RuntimeError as e:
+        H.skip_suite(str(e))
+    try:
+        main()
+    finally:
+        H.stop_x_server(xvfb, DISPLAY)
+    print(f"[xtest-injector] {passed}/{passed + failed} passed")
+    sys.exit(1 if failed else 0)
@@ -37,7 +37,29 @@ SUITES: list = [
     {"path": "unit/test_encoder_cpu_policy.py", "tier": "unit", "timeout": 120},
     {"path": "unit/test_rate_control_defaults.py", "tier": "unit", "timeout": 180},
     {"path": "unit/test_transfer_pacer.py", "tier": "unit", "timeout": 180},
+    {"path": "unit/test_rtp_pacer_batch.py", "tier": "unit", "timeout": 120},
+    {"path": "unit/test_control_frames.py", "tier": "unit", "timeout": 120},
+    {"path": "unit/test_twcc_history.py", "tier": "unit", "timeout": 120},
+    {"path": "unit/test_send_side_bwe.py", "tier": "unit", "timeout": 120},
+    {"path": "unit/test_ws_adaptive_bitrate.py", "tier": "unit", "timeout": 120},
+    {"path": "unit/test_ws_renditions.py", "tier": "unit", "timeout": 120},
+    {"path": "unit/test_relay_backlog.py", "tier": "unit", "timeout": 120},
+    {"path": "unit/test_ice_demux.py", "tier": "unit", "timeout": 120},
+    {"path": "unit/test_ice_udp_mux.py", "tier": "unit", "timeout": 120},
+    {"path": "unit/test_xtest_encoder.py", "tier": "unit", "timeout": 120},
+    {"path": "unit/test_gamepad_frames.py", "tier": "unit", "timeout": 120},
+    {"path": "unit/test_lazy_services.py", "tier": "unit", "timeout": 120},
     {"path": "unit/test_nvml_failfast.py", "tier": "unit", "timeout": 120},
+    {"path": "unit/test_gpu_sampler.py", "tier": "unit", "timeout": 120},
+    {"path": "unit/test_audio_fanout.py", "tier": "unit", "timeout": 120},
+    {"path": "unit/test_dtls_cert_pool.py", "tier": "unit", "timeout": 120},
+    {"path": "unit/test_loop_handoff.py", "tier": "unit", "timeout": 120},
+    {"path": "unit/test_ice_candidate_cache.py", "tier": "unit", "timeout": 120},
+    {"path": "unit/test_instrumentation.py", "tier": "unit", "timeout": 120},
+    {"path": "unit/test_x11_isolation.py", "tier": "unit", "timeout": 120},
+    {"path": "unit/test_video_packetize_once.py", "tier": "unit", "timeout": 120},
+    {"path": "unit/test_ws_stats_publisher.py", "tier": "unit", "timeout": 120},
+    {"path": "unit/test_clipboard_framing.py", "tier": "unit", "timeout": 120},
     {"path": "unit/test_per_display_settings.py", "tier": "unit", "timeout": 120},
     {"path": "unit/test_realized_layout.py", "tier": "unit", "timeout": 120},
     {"path": "unit/test_release_version.py", "tier": "unit", "timeout": 120},
@@ -95,6 +117,15 @@ SUITES: list = [
     # --- on request -------------------------------------------------------
     {"path": "perf/test_pacer.py", "tier": "perf", "timeout": 3600},
     {"path": "perf/test_transfer_saturation.py", "tier": "perf", "timeout": 1800},
+    {"path": "perf/test_rtp_serialize.py", "tier": "perf", "timeout": 300},
+    {"path": "perf/test_sctp_bundling.py", "tier": "perf", "timeout": 600},
+    {"path": "perf/test_xtest_injector.py", "tier": "perf", "timeout": 600},
+    {"path": "perf/test_gamepad_fanout.py", "tier": "perf", "timeout": 300},
+    {"path": "perf/test_import_budget.py", "tier": "perf", "timeout": 600},
+    {"path": "perf/test_dtls_setup.py", "tier": "perf", "timeout": 300},
+    {"path": "perf/test_frame_handoff.py", "tier": "perf", "timeout": 300},
+    {"path": "perf/test_instrumentation_overhead.py", "tier": "perf", "timeout": 300},
+    {"path": "perf/test_input_isolation.py", "tier": "perf", "timeout": 600},
     {"path": "soak/test_capture_api.py", "tier": "soak", "timeout": 2400},
     {"path": "soak/test_capture_api_extra.py", "tier": "soak", "timeout": 2400},
 ]
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""WebRTC audio pass-through: EncodedAudioFrame and EncodedFrameFanout.
+
+pcmflux Opus frames reach the audio senders as EncodedAudioFrame objects
+pushed through an EncodedFrameFanout, with no av.Packet or Fraction per frame.
+The Opus and RED encoders must pack one exactly as they pack the equivalent
+av.Packet on the 48 kHz clock. Every subscriber must see every frame in
+order; a stalled one drops only its own oldest frames; a track that ends
+unsubscribes; stopping the fan-out wakes a sender blocked in recv. The new
+path must cost less per frame than building and packing an av.Packet.
+"""
+import asyncio
+import os
+import sys
+import time
+from fractions import Fraction
+
+TESTS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO = os.path.dirname(TESTS)
+sys.path.insert(0, os.path.join(REPO, "src"))
+
+import av  # noqa: E402
+
+from selkies.webrtc.codecs.opus import OpusEncoder  # noqa: E402
+from selkies.webrtc.codecs.red import RedOpusEncoder  # noqa: E402
+from selkies.webrtc.contrib.media import EncodedFrameFanout  # noqa: E402
+from selkies.webrtc.mediastreams import EncodedAudioFrame, MediaStreamError  # noqa: E402
+
+FRAME_SAMPLES = 960
+
+passed = failed = 0
+
+
+def check(label: str, ok, detail="") -> None:
+    global passed, failed
+    if ok:
+        passed += 1
+    else:
+        failed += 1
+    print(f"{'PASS' if ok else 'FAIL'}  [audio-fanout] {label}  {detail}", flush=True)
+
+
+def opus_frames(n: int, start: int = 0) -> list:
+    return [(bytes([0xFC, i & 0xFF]) * 40, start + i * FRAME_SAMPLES) for i in range(n)]
+
+
+def av_packet(data: bytes, pts: int) -> av.Packet:
+    packet = av.Packet(data)
+    packet.time_base = Fraction(1, 48000)
+    packet.pts = pts
+    return packet
+
+
+frames = opus_frames(6, start=123456)
+opus = OpusEncoder()
+check("Opus packs an EncodedAudioFrame like the av.Packet",
+      all(opus.pack(EncodedAudioFrame(d, p)) == opus.pack(av_packet(d, p)) for d, p in frames))
+frame = EncodedAudioFrame(frames[0][0], frames[0][1])
+check("Opus passes the frame's bytes through without a copy",
+      opus.pack(frame)[0][0] is frame.data)
+red_light, red_av = RedOpusEncoder(block_pt=111), RedOpusEncoder(block_pt=111)
+check("RED builds the same redundancy from either input",
+      [red_light.pack(EncodedAudioFrame(d, p)) for d, p in frames]
+      == [red_av.pack(av_packet(d, p)) for d, p in frames])
+
+
+async def main() -> None:
+    fanout = EncodedFrameFanout("audio", maxsize=4)
+    fast, slow = fanout.subscribe(), fanout.subscribe()
+    check("subscribed tracks carry the fan-out's kind", fast.kind == slow.kind == "audio")
+
+    sent = [EncodedAudioFrame(d, p) for d, p in opus_frames(10)]
+    got = []
+    for f in sent:
+        fanout.push(f)
+        got.append(await fast.recv())
+    check("a keeping-up subscriber gets every frame, in order, as the same objects",
+          got == sent)
+    slow_got = [await slow.recv() for _ in range(4)]
+    check("a stalled subscriber keeps only its newest frames", slow_got == sent[-4:],
+          f"{[f.pts // FRAME_SAMPLES for f in slow_got]}")
+
+    slow.stop()
+    fanout.push(sent[0])
+    check("an ended track no longer receives frames",
+          fast._queue.qsize() == 1 and slow._queue.qsize() == 1, f"{slow._queue.qsize()}")
+    try:
+        await slow.recv()
+        ended = False
+    except MediaStreamError:
+        ended = True
+    check("recv on an ended track raises MediaStreamError", ended)
+    await fast.recv()
+
+    waiter = asyncio.ensure_future(fast.recv())
+    await asyncio.sleep(0)
+    fanout.stop()
+    try:
+        await asyncio.wait_for(waiter, 1.0)
+        woke = False
+    except MediaStreamError:
+        woke = True
+    check("stopping the fan-out wakes a blocked sender", woke)
+
+    n = 20000
+    data = frames[0][0]
+    fanout = EncodedFrameFanout("audio")
+    track = fanout.subscribe()
+    encoder = OpusEncoder()
+    start = time.perf_counter()
+    for i in range(n):
+        fanout.push(EncodedAudioFrame(bytes(memoryview(data)), i * FRAME_SAMPLES))
+        encoder.pack(track._queue.get_nowait())
+    light = (time.perf_counter() - start) / n
+    start = time.perf_counter()
+    for i in range(n):
+        encoder.pack(av_packet(memoryview(data), i * FRAME_SAMPLES))
+    heavy = (time.perf_counter() - start) / n
+    check("the pass-through costs less per frame than an av.Packet",
+          light < heavy, f"{light * 1e6:.2f} vs {heavy * 1e6:.2f} us/frame")
+
+
+asyncio.run(main())
+print(f"[audio-fanout] {passed}/{passed + failed} passed")
+sys.exit(1 if failed else 0)
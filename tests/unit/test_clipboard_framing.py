@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""Framed versus legacy clipboard delivery, WebSocket and data channel.
+
+A client that sent the `_cb,1` handshake must receive a clipboard payload as a
+start message, raw 0x06 chunks carrying the bytes verbatim, and a finish
+message, with no base64 anywhere. A legacy client must receive base64 text. A
+mixed set of clients must get each its own format from the one send, and a
+framed client dropped mid-transfer must end the framed loop rather than be
+sent the remaining chunks.
+"""
+import asyncio
+import base64
+import json
+import os
+import sys
+import types
+
+TESTS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO = os.path.dirname(TESTS)
+sys.path.insert(0, TESTS)
+sys.path.insert(0, os.path.join(REPO, "src"))
+
+import helpers as H  # noqa: E402
+
+H.without_libpulse()
+
+from selkies import rtc  # noqa: E402
+from selkies import selkies as sk  # noqa: E402
+from selkies.webrtc.exceptions import InvalidStateError  # noqa: E402
+
+PAYLOAD = bytes(range(256)) * 4
+# Small enough that PAYLOAD spans several chunks on both transports.
+WS_CHUNK = 100
+DC_CHUNK = 75  # raw framed chunks are 4/3 of this: 100 bytes
+
+passed = failed = 0
+
+
+def check(label: str, ok, detail="") -> None:
+    global passed, failed
+    if ok:
+        passed += 1
+    else:
+        failed += 1
+    print(f"{'PASS' if ok else 'FAIL'}  [clipboard-framing] {label}  {detail}", flush=True)
+
+
+class Socket:
+    """A WebSocket that records its frames; closes after `drop_after` binary frames."""
+
+    def __init__(self, framed: bool, drop_after: int = -1) -> None:
+        if framed:
+            self._ws_cb = True
+        self.closed = False
+        self.drop_after = drop_after
+        self.sent = []
+
+    async def send_str(self, text: str) -> None:
+        self.sent.append(text)
+
+    async def send_bytes(self, data) -> None:
+        self.sent.append(bytes(data))
+        if sum(isinstance(m, bytes) for m in self.sent) == self.drop_after:
+            self.closed = True
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class Channel:
+    """A data channel that records its messages; closes after `drop_after` binary ones."""
+
+    def __init__(self, framed: bool, drop_after: int = -1) -> None:
+        if framed:
+            self._selkies_cb_rx = True
+        self.readyState = "open"
+        self.bufferedAmount = 0
+        self.drop_after = drop_after
+        self.sent = []
+
+    def send(self, data) -> None:
+        if self.readyState != "open":
+            raise InvalidStateError("RTCDataChannel is not open")
+        self.sent.append(bytes(data) if isinstance(data, (bytes, memoryview)) else data)
+        if sum(isinstance(m, bytes) for m in self.sent) == self.drop_after:
+            self.readyState = "closed"
+
+
+def ws_framed_ok(sent: list) -> bool:
+    """start, raw 0x06 chunks reassembling PAYLOAD, finish; nothing else."""
+    chunks = sent[1:-1]
+    return (sent[0] == f"clipboard_start,application/octet-stream,{len(PAYLOAD)}"
+            and sent[-1] == "clipboard_finish"
+            and len(chunks) > 1
+            and all(isinstance(c, bytes) and c[0] == sk.WS_CLIPBOARD_OPCODE for c in chunks)
+            and b"".join(c[1:] for c in chunks) == PAYLOAD)
+
+
+def dc_types(sent: list) -> list:
+    return ["binary" if isinstance(m, bytes) else json.loads(m)["type"] for m in sent]
+
+
+def dc_framed_ok(sent: list) -> bool:
+    chunks = sent[1:-1]
+    start = json.loads(sent[0])
+    return (start["type"] == "clipboard-msg-start"
+            and start["data"]["total_size"] == len(PAYLOAD)
+            and "content" not in start["data"]
+            and json.loads(sent[-1])["type"] == "clipboard-msg-end"
+            and len(chunks) > 1
+            and all(isinstance(c, bytes) and c[0] == rtc.DATA_CHANNEL_CLIPBOARD_OPCODE
+                    for c in chunks)
+            and b"".join(c[1:] for c in chunks) == PAYLOAD)
+
+
+async def websocket_checks() -> None:
+    app = sk.SelkiesStreamingApp.__new__(sk.SelkiesStreamingApp)
+
+    async def send(*clients) -> None:
+        app.data_streaming_server = types.SimpleNamespace(
+            clients=set(clients), enable_binary_clipboard=True)
+        await app.send_ws_clipboard_data(PAYLOAD, "application/octet-stream")
+
+    framed = Socket(framed=True)
+    await send(framed)
+    check("ws: a _cb,1 client gets start, raw 0x06 chunks and finish",
+          ws_framed_ok(framed.sent), f"{len(framed.sent)} frames")
+    check("ws: and never base64",
+          not any(isinstance(m, str) and m.startswith(("clipboard_binary,", "clipboard_data,"))
+                  for m in framed.sent))
+
+    legacy = Socket(framed=False)
+    await send(legacy)
+    check("ws: a legacy client gets base64 text",
+          legacy.sent == ["clipboard_binary,application/octet-stream,"
+                          + base64.b64encode(PAYLOAD).decode("ascii")],
+          f"{[m[:30] for m in legacy.sent]}")
+
+    framed, legacy = Socket(framed=True), Socket(framed=False)
+    await send(framed, legacy)
+    check("ws: a mixed client set gets each format",
+          ws_framed_ok(framed.sent)
+          and legacy.sent == ["clipboard_binary,application/octet-stream,"
+                              + base64.b64encode(PAYLOAD).decode("ascii")])
+
+    dropped = Socket(framed=True, drop_after=2)
+    await send(dropped)
+    check("ws: a client dropped mid-transfer ends the framed loop",
+          len(dropped.sent) == 3 and app.data_streaming_server.clients == set(),
+          f"{len(dropped.sent)} frames")
+
+    dropped, staying = Socket(framed=True, drop_after=2), Socket(framed=True)
+    await send(dropped, staying)
+    check("ws: and the other framed clients still get the whole payload",
+          len(dropped.sent) == 3 and ws_framed_ok(staying.sent)
+          and app.data_streaming_server.clients == {staying})
+
+
+async def data_channel_checks() -> None:
+    app = rtc.RTCApp(asyncio.get_running_loop(), "h264enc")
+
+    async def send(*channels) -> None:
+        app.peer_connections = {
+            f"peer{i}": {"peer_conn": types.SimpleNamespace(connectionState="connected"),
+                         "data_channel": channel}
+            for i, channel in enumerate(channels)}
+        await app.send_clipboard_data(PAYLOAD, "application/octet-stream")
+
+    framed = Channel(framed=True)
+    await send(framed)
+    check("dc: a _cb,1 channel gets start, raw 0x06 chunks and end",
+          dc_framed_ok(framed.sent), f"{dc_types(framed.sent)}")
+    check("dc: and never base64", "clipboard-msg-data" not in dc_types(framed.sent)
+          and "clipboard-msg" not in dc_types(framed.sent))
+
+    legacy = Channel(framed=False)
+    await send(legacy)
+    types_sent = dc_types(legacy.sent)
+    contents = [json.loads(m)["data"]["content"] for m in legacy.sent
+                if json.loads(m)["type"] == "clipboard-msg-data"]
+    check("dc: a legacy channel gets base64 JSON",
+          types_sent[0] == "clipboard-msg-start" and types_sent[-1] == "clipboard-msg-end"
+          and b"".join(base64.b64decode(c) for c in contents) == PAYLOAD,
+          f"{len(contents)} chunks")
+
+    framed, legacy = Channel(framed=True), Channel(framed=False)
+    await send(framed, legacy)
+    check("dc: a mixed channel set gets each format",
+          dc_framed_ok(framed.sent) and "binary" not in dc_types(legacy.sent)
+          and "clipboard-msg-data" in dc_types(legacy.sent))
+
+    dropped, staying = Channel(framed=True, drop_after=2), Channel(framed=True)
+    await send(dropped, staying)
+    check("dc: a channel closed mid-transfer gets no further chunks",
+          dc_types(dropped.sent) == ["clipboard-msg-start", "binary", "binary"]
+          and dc_framed_ok(staying.sent),
+          f"{dc_types(dropped.sent)}")
+
+    dropped = Channel(framed=True, drop_after=2)
+    calls = []
+    send_prepared = app._send_prepared_to_channel
+    app._send_prepared_to_channel = lambda *a: calls.append(a) or send_prepared(*a)
+    await send(dropped)
+    check("dc: and the framed loop ends once no channel is left",
+          len(calls) == 3, f"{len(calls)} sends")  # start and two chunks
+
+
+async def main() -> None:
+    saved = sk.WS_CLIPBOARD_BINARY_CHUNK_BYTES, rtc.get_adjusted_chunk_size
+    sk.WS_CLIPBOARD_BINARY_CHUNK_BYTES = WS_CHUNK
+    rtc.get_adjusted_chunk_size = lambda peers=None: DC_CHUNK
+    try:
+        await websocket_checks()
+        await data_channel_checks()
+    finally:
+        sk.WS_CLIPBOARD_BINARY_CHUNK_BYTES, rtc.get_adjusted_chunk_size = saved
+
+
+asyncio.run(main())
+print(f"[clipboard-framing] {passed}/{passed + failed} passed")
+sys.exit(1 if failed else 0)
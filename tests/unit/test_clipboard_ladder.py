@@ -60,6 +60,7 @@ def make_handler(is_wayland: bool = False) -> WebRTCInput:
     h._x11_clipboard_monitor = None
     h._x11_monitor_retry_at = 0.0
     h._x11_monitor_unavail_logged = False
+    h.x11_isolation = False
     h._xclip_missing_warned = False
     h._x11_monitor_build_lock = asyncio.Lock()
     return h
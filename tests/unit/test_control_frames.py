@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Shared control-frame cache used by both transports' control broadcasts.
+
+A repeated payload (a cursor flapping between two shapes, the same stats dict
+read by every per-connection sender) must render and gzip once; different wire
+formats of the same payload must never share an entry; and the cache must stay
+within its byte budget, counting the gzip it produces, without ever retaining
+a payload large enough to flush everything else.
+"""
+import gzip
+import json
+import os
+import sys
+
+TESTS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO = os.path.dirname(TESTS)
+sys.path.insert(0, os.path.join(REPO, "src"))
+
+from selkies import control_frames as cf  # noqa: E402
+
+passed = failed = 0
+
+
+def check(label: str, ok, detail="") -> None:
+    global passed, failed
+    if ok:
+        passed += 1
+    else:
+        failed += 1
+    print(f"{'PASS' if ok else 'FAIL'}  [control-frames] {label}  {detail}", flush=True)
+
+
+class Counting:
+    """A render function that counts its calls."""
+
+    def __init__(self, prefix: str = "cursor,") -> None:
+        self.prefix = prefix
+        self.calls = 0
+
+    def __call__(self, data) -> str:
+        self.calls += 1
+        return self.prefix + json.dumps(data)
+
+
+def cursor(shape: int) -> dict:
+    # A fresh dict (and fresh string) each time, the way capture threads
+    # deliver them.
+    return {"curdata": "".join(["iVBORw0KGgo", str(shape) * 4000]),
+            "width": 32, "height": 32, "hotx": shape, "hoty": 0, "handle": shape}
+
+
+cache = cf.ControlFrameCache()
+render = Counting()
+frames = [cache.lookup("ws:cursor", cursor(i % 2), render)
+          for i in range(200)]
+check("a cursor flapping between two shapes renders each shape once",
+      render.calls == 2 and cache.hits == 198, f"renders={render.calls} hits={cache.hits}")
+check("the rendered text is the exact wire message",
+      frames[0].text == "cursor," + json.dumps(cursor(0)))
+
+real_compress = gzip.compress
+compressions = []
+
+
+def counting_compress(data, level=9):
+    compressions.append(len(data))
+    return real_compress(data, level)
+
+
+cf.gzip.compress = counting_compress
+try:
+    gz = [f.gzipped() for f in frames]
+finally:
+    cf.gzip.compress = real_compress
+check("each shape compresses once across every broadcast",
+      len(compressions) == 2, f"compressions={len(compressions)}")
+check("the gzip form inflates to the text",
+      gzip.decompress(gz[1]).decode() == frames[1].text)
+
+dc = cache.lookup("dc:cursor", cursor(0),
+                  lambda d: json.dumps({"type": "cursor", "data": d}))
+check("another wire format of the same payload gets its own entry",
+      dc is not frames[0] and json.loads(dc.text)["type"] == "cursor")
+
+flags = [cache.lookup("dc:system", {"resize": v}, json.dumps).text for v in (True, 1, 1.0)]
+check("values that compare equal but serialize differently never share an entry",
+      flags == ['{"resize": true}', '{"resize": 1}', '{"resize": 1.0}'], str(flags))
+
+nested = Counting("DISPLAY_CONFIG_UPDATE,")
+payload = {"type": "display_config_update", "displays": ["primary", "display2"]}
+first = cache.lookup("ws:display_config", payload, nested)
+again = cache.lookup("ws:display_config", dict(payload, displays=["primary", "display2"]), nested)
+changed = cache.lookup("ws:display_config", dict(payload, displays=["primary"]), nested)
+check("a non-flat payload is keyed by its rendered text",
+      first is again and changed is not first and '"display2"' not in changed.text)
+
+small = cf.ControlFrameCache(max_bytes=64 * 1024)
+for shape in range(40):
+    small.lookup("ws:cursor", cursor(shape), render).gzipped()
+check("the byte budget holds, gzip included",
+      small.size_bytes <= small.max_bytes and len(small) < 40,
+      f"{small.size_bytes}/{small.max_bytes} bytes, {len(small)} entries")
+recent = small.lookup("ws:cursor", cursor(39), render)
+calls = render.calls
+small.lookup("ws:cursor", cursor(39), render)
+oldest = small.lookup("ws:cursor", cursor(0), render)
+check("eviction is least-recently-used",
+      render.calls == calls + 1 and oldest.text.startswith("cursor,"),
+      f"renders after={render.calls - calls}")
+accounted = sum(len(f.text) + len(f._gz or b"") for f in small._entries.values())
+check("the byte count matches the entries held",
+      accounted == small.size_bytes, f"{accounted} vs {small.size_bytes}")
+
+big = small.lookup("dc:clipboard-msg", {"content": "x" * 40_000}, json.dumps)
+check("an oversized payload is rendered but not retained",
+      big.text.endswith('"}') and all(f is not big for f in small._entries.values()))
+
+print(f"[control-frames] {passed}/{passed + failed} passed")
+sys.exit(1 if failed else 0)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Pre-generated DTLS certificates for new peer connections.
+
+An RTCCertificate computes its fingerprints and builds its DTLS context once,
+however many connections use it. RTCCertificatePool keeps `size` of them
+ready on a background thread, hands them out in turn, replaces each after
+its lifetime, and still serves a certificate before it has filled. A peer
+connection given one in its RTCConfiguration offers that certificate's
+fingerprint instead of generating its own.
+"""
+import asyncio
+import os
+import sys
+import time
+
+TESTS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO = os.path.dirname(TESTS)
+sys.path.insert(0, os.path.join(REPO, "src"))
+
+from selkies.webrtc import (  # noqa: E402
+    RTCCertificate,
+    RTCCertificatePool,
+    RTCConfiguration,
+    RTCPeerConnection,
+)
+from selkies.webrtc.rtcdtlstransport import SRTP_PROFILES  # noqa: E402
+
+passed = failed = 0
+
+
+def check(label: str, ok, detail="") -> None:
+    global passed, failed
+    if ok:
+        passed += 1
+    else:
+        failed += 1
+    print(f"{'PASS' if ok else 'FAIL'}  [dtls-cert-pool] {label}  {detail}", flush=True)
+
+
+def wait_for(predicate, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+certificate = RTCCertificate.generateCertificate()
+check("a certificate builds one DTLS context per SRTP profile set",
+      certificate._create_ssl_context(SRTP_PROFILES)
+      is certificate._create_ssl_context(list(SRTP_PROFILES)))
+check("and a separate one for a different set",
+      certificate._create_ssl_context(SRTP_PROFILES[-1:])
+      is not certificate._create_ssl_context(SRTP_PROFILES))
+fingerprints = certificate.getFingerprints()
+fingerprints.clear()
+check("its fingerprints are cached without exposing the cache",
+      len(certificate.getFingerprints()) == 3 and certificate._fingerprints is not None)
+
+pool = RTCCertificatePool(size=3, lifetime=3600.0)
+early = pool.get()
+check("an empty pool still serves a prepared certificate",
+      isinstance(early, RTCCertificate) and early._fingerprints and early._ssl_contexts)
+
+pool.start()
+check("the pool fills in the background", wait_for(lambda: len(pool._certificates) == 3),
+      f"{len(pool._certificates)}")
+handed = [pool.get() for _ in range(6)]
+check("certificates are handed out in turn",
+      len({id(c) for c in handed}) == 3 and handed[:3] == handed[3:])
+check("pooled certificates are prepared",
+      all(c._fingerprints and c._ssl_contexts for c in handed))
+
+first = {id(c) for _, c in pool._certificates}
+pool.stop()
+pool.lifetime = 0.2
+pool.start()
+check("each certificate is replaced after its lifetime",
+      wait_for(lambda: first.isdisjoint(id(c) for _, c in pool._certificates)))
+check("rotation keeps the pool at its size", len(pool._certificates) == 3,
+      f"{len(pool._certificates)}")
+pool.stop()
+check("stop ends the thread", pool._thread is None)
+check("a stopped pool still serves what it holds", pool.get() in [c for _, c in pool._certificates])
+
+
+async def offer_fingerprint(configuration: RTCConfiguration) -> str:
+    pc = RTCPeerConnection(configuration)
+    pc.createDataChannel("input")
+    await pc.setLocalDescription(await pc.createOffer())
+    await pc.close()
+    return [line for line in pc.localDescription.sdp.splitlines()
+            if line.startswith("a=fingerprint:sha-256")][0].split()[1]
+
+
+pooled = pool.get()
+offered = asyncio.run(offer_fingerprint(RTCConfiguration(iceServers=[], certificates=[pooled])))
+check("a peer connection offers the certificate it was given",
+      offered == pooled.getFingerprints()[0].value)
+offered = asyncio.run(offer_fingerprint(RTCConfiguration(iceServers=[])))
+check("without one it generates its own",
+      offered not in {c.getFingerprints()[0].value for _, c in pool._certificates})
+
+print(f"[dtls-cert-pool] {passed}/{passed + failed} passed")
+sys.exit(1 if failed else 0)
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Framing of a drained gamepad batch before fan-out.
+
+SelkiesGamepad._frame_events turns every event queued since the last wakeup
+into SYN_REPORT frames. Stick and trigger samples coalesce to the latest value
+per axis in place; a button or d-pad hat that changes twice starts a new frame
+so a tap is never lost. get_evdev_frame_packed must end each frame with one
+SYN_REPORT and match get_evdev_events_packed for a single event.
+"""
+import os
+import struct
+import sys
+
+TESTS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO = os.path.dirname(TESTS)
+sys.path.insert(0, os.path.join(REPO, "src"))
+
+import selkies.input_handler as ih  # noqa: E402
+
+passed = failed = 0
+
+
+def check(label: str, ok, detail="") -> None:
+    global passed, failed
+    if ok:
+        passed += 1
+    else:
+        failed += 1
+    print(f"{'PASS' if ok else 'FAIL'}  [gamepad-frames] {label}  {detail}", flush=True)
+
+
+mapper = ih.GamepadMapper(ih.STANDARD_XPAD_CONFIG, "Test Pad", 17, 4)
+
+
+def ev(idx, value, button=False):
+    return mapper.get_mapped_events(idx, value, button)
+
+
+def templates(frames):
+    return [events for _, events in frames]
+
+
+stick = [ev(0, v) for v in (0.1, 0.4, -0.2)] + [ev(1, 0.5), ev(0, 0.9)]
+frames = ih.SelkiesGamepad._frame_events(stick)
+check("stick samples coalesce to the latest value per axis in one frame",
+      templates(frames) == [[ev(0, 0.9)["evdev_event_template"], ev(1, 0.5)["evdev_event_template"]]],
+      f"{templates(frames)}")
+# js_event_data leads with a millisecond timestamp; compare what follows it.
+check("the JS payload coalesces alongside",
+      [p[4:] for p in frames[0][0]]
+      == [ev(0, 0.9)["js_event_data"][4:], ev(1, 0.5)["js_event_data"][4:]])
+
+tap = [ev(0, 0.3), ev(0, 1, True), ev(0, 0, True), ev(0, 0.6)]
+frames = ih.SelkiesGamepad._frame_events(tap)
+check("a button tap splits the batch so press and release both go out",
+      templates(frames) == [[ev(0, 0.3)["evdev_event_template"], ev(0, 1, True)["evdev_event_template"]],
+                            [ev(0, 0, True)["evdev_event_template"], ev(0, 0.6)["evdev_event_template"]]],
+      f"{templates(frames)}")
+
+dpad = [ev(12, 1, True), ev(12, 0, True)]
+frames = ih.SelkiesGamepad._frame_events(dpad)
+check("a d-pad tap on the hat axis is not coalesced away",
+      [e[0][2] for e in templates(frames)] == [-1, 0], f"{templates(frames)}")
+
+check("an empty batch has no frames", ih.SelkiesGamepad._frame_events([]) == [])
+
+events = [(ih.EV_ABS, ih.ABS_X, 100), (ih.EV_KEY, ih.BTN_A, 1)]
+for bits, fmt in ((64, "=qqHHi"), (32, "=llHHi")):
+    packed = ih.get_evdev_frame_packed(events, bits)
+    size = struct.calcsize(fmt)
+    rows = [struct.unpack_from(fmt, packed, off)[2:] for off in range(0, len(packed), size)]
+    check(f"a {bits}-bit frame is its events and one SYN_REPORT",
+          rows == [(ih.EV_ABS, ih.ABS_X, 100), (ih.EV_KEY, ih.BTN_A, 1),
+                   (ih.EV_SYN, ih.SYN_REPORT, 0)], f"{rows}")
+    single = ih.get_evdev_frame_packed([(ih.EV_KEY, ih.BTN_A, 1)], bits)
+    check(f"a single-event {bits}-bit frame matches get_evdev_events_packed",
+          len(single) == len(ih.get_evdev_events_packed(ih.EV_KEY, ih.BTN_A, 1, bits)))
+
+print(f"[gamepad-frames] {passed}/{passed + failed} passed")
+sys.exit(1 if failed else 0)
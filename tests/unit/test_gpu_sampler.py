@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""GPU telemetry from a long-lived sampler instead of per-poll enumeration.
+
+A GPUSampler resolves its GPU once and then reads only that device on its
+own thread: an amdgpu card through its counter files held open, an NVIDIA
+card through the NVML handle found at start. Neither path may re-enumerate
+the GPU sources per sample. The ring buffer is bounded, a stale sample is
+not served, consumers of one GPU share one sampler, and the last release
+stops it and closes its files.
+"""
+import os
+import sys
+import tempfile
+import time
+
+TESTS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO = os.path.dirname(TESTS)
+sys.path.insert(0, os.path.join(REPO, "src"))
+
+import selkies.gpu_stats as gpu_stats  # noqa: E402
+
+INTERVAL = 0.1
+
+passed = failed = 0
+
+
+def check(label: str, ok, detail="") -> None:
+    global passed, failed
+    if ok:
+        passed += 1
+    else:
+        failed += 1
+    print(f"{'PASS' if ok else 'FAIL'}  [gpu-sampler] {label}  {detail}", flush=True)
+
+
+def write(path: str, value) -> None:
+    with open(path, "w") as f:
+        f.write(f"{value}\n")
+
+
+def wait_for(predicate, timeout: float = 3.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+class Value:
+    def __init__(self, **fields):
+        self.__dict__.update(fields)
+
+
+class FakeNvml:
+    def __init__(self) -> None:
+        self.util = [10, 20]
+        self.handle_lookups = 0
+
+    def nvmlInit(self):
+        pass
+
+    def nvmlDeviceGetCount(self):
+        return 2
+
+    def nvmlDeviceGetHandleByIndex(self, idx):
+        self.handle_lookups += 1
+        return idx
+
+    def nvmlDeviceGetUtilizationRates(self, handle):
+        return Value(gpu=self.util[handle])
+
+    def nvmlDeviceGetMemoryInfo(self, handle):
+        return Value(total=8 << 30, used=(handle + 1) << 30)
+
+    def nvmlDeviceGetPciInfo(self, handle):
+        return Value(busId=f"00000000:0{handle + 1}:00.0".encode())
+
+
+enumerations = 0
+real_get_gpus = gpu_stats.get_gpus
+
+
+def counting_get_gpus(dri_node=None):
+    global enumerations
+    enumerations += 1
+    return real_get_gpus(dri_node)
+
+
+saved = (gpu_stats.pynvml, gpu_stats._nvml_ready, gpu_stats.GPUMonitorFactory,
+         gpu_stats._SYSFS_DRM_ROOT, gpu_stats.shutil.which)
+gpu_stats.get_gpus = counting_get_gpus
+gpu_stats.GPUMonitorFactory = None
+gpu_stats.shutil.which = lambda tool: None
+try:
+    with tempfile.TemporaryDirectory() as root:
+        drm = os.path.join(root, "drm")
+        device = os.path.join(root, "devices", "0000:03:00.0")
+        os.makedirs(os.path.join(drm, "card0"))
+        os.makedirs(device)
+        os.makedirs(os.path.join(root, "drivers", "amdgpu"))
+        os.symlink(device, os.path.join(drm, "card0", "device"))
+        os.symlink(os.path.join(root, "drivers", "amdgpu"), os.path.join(device, "driver"))
+        write(os.path.join(device, "gpu_busy_percent"), 25)
+        write(os.path.join(device, "mem_info_vram_total"), 8 << 30)
+        write(os.path.join(device, "mem_info_vram_used"), 1 << 30)
+        gpu_stats._SYSFS_DRM_ROOT = drm
+        gpu_stats.pynvml = None
+        gpu_stats._nvml_ready = None
+
+        sampler = gpu_stats.acquire_sampler(0, "", INTERVAL)
+        check("an amdgpu card is sampled from its counter files",
+              sampler is not None and sampler.source == "sysfs",
+              sampler and sampler.source)
+        first = sampler.latest()
+        check("the first sample is served at once",
+              first is not None and first.load == 0.25 and first.memoryUsed == 1024,
+              first and (first.load, first.memoryUsed))
+        again = gpu_stats.acquire_sampler(0, "", INTERVAL)
+        check("a second consumer of the GPU shares the sampler", again is sampler)
+
+        before = enumerations
+        write(os.path.join(device, "gpu_busy_percent"), 75)
+        write(os.path.join(device, "mem_info_vram_used"), 3 << 30)
+        check("a counter change shows up in the next samples",
+              wait_for(lambda: sampler.latest().load == 0.75
+                       and sampler.latest().memoryUsed == 3072))
+        time.sleep(INTERVAL * 3)
+        check("sampling never re-enumerates the GPU sources",
+              enumerations == before, f"{enumerations - before} enumerations")
+
+        gpu_stats.release_sampler(again)
+        check("the sampler keeps running while a consumer holds it",
+              sampler._thread is not None and sampler._thread.is_alive())
+        fds = list(sampler._fds)
+        gpu_stats.release_sampler(sampler)
+        check("the last release stops the thread", sampler._thread is None)
+        closed = 0
+        for fd in fds:
+            try:
+                os.fstat(fd)
+            except OSError:
+                closed += 1
+        check("the last release closes the counter files", fds and closed == len(fds),
+              f"{closed}/{len(fds)}")
+        fresh = gpu_stats.acquire_sampler(0, "", INTERVAL)
+        check("a later acquire starts a fresh sampler", fresh is not sampler)
+        gpu_stats.release_sampler(fresh)
+
+        nvml = FakeNvml()
+        gpu_stats.pynvml = nvml
+        gpu_stats._nvml_ready = None
+        sampler = gpu_stats.GPUSampler(1, "", INTERVAL, history=4)
+        started = sampler.start()
+        lookups = nvml.handle_lookups
+        check("an NVIDIA card is sampled through NVML",
+              started and sampler.source == "nvml" and sampler.latest().load == 0.2,
+              sampler.source)
+        nvml.util[1] = 90
+        check("its utilization is followed",
+              wait_for(lambda: sampler.latest().load == 0.9))
+        time.sleep(INTERVAL * 6)
+        check("the NVML handle is resolved once", nvml.handle_lookups == lookups,
+              f"{nvml.handle_lookups - lookups} extra lookups")
+        check("the ring buffer is bounded", len(sampler.history()) == 4,
+              f"{len(sampler.history())}")
+        sampler.stop()
+        sampler.samples.append((time.monotonic() - 10, sampler.samples[-1][1]))
+        check("a stale sample is not served", sampler.latest() is None)
+
+        check("no GPU means no sampler", gpu_stats.acquire_sampler(7, "", INTERVAL) is None)
+finally:
+    gpu_stats.get_gpus = real_get_gpus
+    (gpu_stats.pynvml, gpu_stats._nvml_ready, gpu_stats.GPUMonitorFactory,
+     gpu_stats._SYSFS_DRM_ROOT, gpu_stats.shutil.which) = saved
+
+print(f"[gpu-sampler] {passed}/{passed + failed} passed")
+sys.exit(1 if failed else 0)
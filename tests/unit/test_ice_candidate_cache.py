@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""Server-reflexive and TURN results shared across ICE connections.
+
+Connections gather against a fake STUN/TURN server on loopback. Connections
+sharing a socket through the UDP mux must reuse one server-reflexive query
+until its TTL runs out; ephemeral sockets must still query each time. The
+first TURN candidate is allocated inline and fills a pool in the
+background; the next connection must take a pooled allocation instead of
+allocating, and the pool must be refilled. invalidate() and an idle pool
+must release their allocations on the server.
+"""
+import asyncio
+import os
+import socket
+import sys
+from collections import Counter
+
+TESTS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO = os.path.dirname(TESTS)
+sys.path.insert(0, os.path.join(REPO, "src"))
+
+from selkies.ice import Connection, candidate_cache, stun  # noqa: E402
+
+ADDRESSES = ["127.0.0.1"]
+
+passed = failed = 0
+
+
+def check(label: str, ok, detail="") -> None:
+    global passed, failed
+    if ok:
+        passed += 1
+    else:
+        failed += 1
+    print(f"{'PASS' if ok else 'FAIL'}  [ice-candidate-cache] {label}  {detail}", flush=True)
+
+
+def free_udp_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class FakeServer(asyncio.DatagramProtocol):
+    """Answers BINDING, ALLOCATE and REFRESH without authentication."""
+
+    def __init__(self) -> None:
+        self.requests = Counter()
+        self.relays = 0
+
+    def connection_made(self, transport) -> None:
+        self.transport = transport
+
+    def datagram_received(self, data, addr) -> None:
+        if not stun.is_stun_message(data):
+            return
+        request = stun.parse_message(data)
+        method = request.message_method
+        response = stun.Message(message_method=method,
+                                message_class=stun.Class.RESPONSE,
+                                transaction_id=request.transaction_id)
+        if method == stun.Method.BINDING:
+            response.attributes["XOR-MAPPED-ADDRESS"] = addr
+        elif method == stun.Method.ALLOCATE:
+            self.relays += 1
+            response.attributes["LIFETIME"] = 600
+            response.attributes["XOR-RELAYED-ADDRESS"] = ("127.0.0.1", 40000 + self.relays)
+        elif method == stun.Method.REFRESH:
+            lifetime = request.attributes.get("LIFETIME")
+            response.attributes["LIFETIME"] = lifetime
+            method = "DELETE" if lifetime == 0 else method
+        else:
+            return
+        self.requests[getattr(method, "name", method)] += 1
+        self.transport.sendto(bytes(response), addr)
+
+
+async def gather(conn: Connection) -> list:
+    return await conn.get_component_candidates(1, ADDRESSES)
+
+
+async def settle(predicate, timeout: float = 3.0) -> bool:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while asyncio.get_running_loop().time() < deadline:
+        if predicate():
+            return True
+        await asyncio.sleep(0.01)
+    return False
+
+
+def of_type(candidates: list, kind: str) -> list:
+    return [(c.host, c.port) for c in candidates if c.type == kind]
+
+
+async def main() -> None:
+    loop = asyncio.get_running_loop()
+    transport, server = await loop.create_datagram_endpoint(
+        FakeServer, local_addr=("127.0.0.1", 0))
+    addr = transport.get_extra_info("sockname")
+
+    port = free_udp_port()
+    muxed = [Connection(ice_controlling=False, stun_server=addr, udp_mux_port=port)
+             for _ in range(3)]
+    srflx = [of_type(await gather(conn), "srflx") for conn in muxed]
+    check("connections sharing the mux socket reuse one srflx query",
+          server.requests["BINDING"] == 1 and srflx[0] and srflx[0] == srflx[1] == srflx[2],
+          f"{server.requests['BINDING']} queries")
+
+    own = [Connection(ice_controlling=False, stun_server=addr) for _ in range(2)]
+    for conn in own:
+        await gather(conn)
+    check("ephemeral sockets still query per connection",
+          server.requests["BINDING"] == 3, f"{server.requests['BINDING']} queries")
+
+    saved_ttl = candidate_cache.SRFLX_TTL
+    candidate_cache.SRFLX_TTL = 0.05
+    try:
+        candidate_cache.get_candidate_cache()._srflx.clear()
+        late = Connection(ice_controlling=False, stun_server=addr, udp_mux_port=port)
+        await gather(late)
+        await asyncio.sleep(0.1)
+        later = Connection(ice_controlling=False, stun_server=addr, udp_mux_port=port)
+        await gather(later)
+        check("an expired srflx mapping is queried again",
+              server.requests["BINDING"] == 5, f"{server.requests['BINDING']} queries")
+    finally:
+        candidate_cache.SRFLX_TTL = saved_ttl
+    for conn in muxed + own + [late, later]:
+        await conn.close()
+
+    first = Connection(ice_controlling=False, turn_server=addr)
+    relay = of_type(await gather(first), "relay")
+    check("the first relay candidate is allocated inline",
+          relay == [("127.0.0.1", 40001)], f"{relay}")
+    cache = candidate_cache.get_candidate_cache()
+    pooled = lambda: sum(len(p) for p in cache._turn_pools.values())  # noqa: E731
+    check("and the pool fills in the background",
+          await settle(lambda: pooled() == candidate_cache.TURN_POOL_SIZE),
+          f"{pooled()} pooled")
+
+    second = Connection(ice_controlling=False, turn_server=addr)
+    allocations = server.requests["ALLOCATE"]
+    relay = of_type(await gather(second), "relay")
+    check("the next connection takes a pooled allocation",
+          relay == [("127.0.0.1", 40002)] and server.requests["ALLOCATE"] == allocations,
+          f"{relay}")
+    check("the pool is refilled after a take",
+          await settle(lambda: pooled() == candidate_cache.TURN_POOL_SIZE
+                       and server.requests["ALLOCATE"] == allocations + 1))
+    protocol = second._protocols[-1]
+    check("a taken allocation relays to its new connection",
+          protocol.transport._TurnTransport__inner_protocol.receiver is protocol)
+
+    await second.close()
+    check("closing the connection deletes its allocation",
+          await settle(lambda: server.requests["DELETE"] == 1))
+
+    candidate_cache.invalidate()
+    fresh = candidate_cache.get_candidate_cache()
+    check("invalidate replaces the cache",
+          fresh is not cache and not fresh._turn_pools and not fresh._srflx)
+    check("and releases every pooled allocation on the server",
+          await settle(lambda: server.requests["DELETE"] == 1 + candidate_cache.TURN_POOL_SIZE),
+          f"{server.requests['DELETE']} deletes")
+
+    saved_idle = candidate_cache.TURN_POOL_IDLE
+    candidate_cache.TURN_POOL_IDLE = 0.2
+    try:
+        third = Connection(ice_controlling=False, turn_server=addr)
+        await gather(third)
+        deletes = server.requests["DELETE"]
+        check("a pool nobody draws from is released",
+              await settle(lambda: server.requests["DELETE"] == deletes + candidate_cache.TURN_POOL_SIZE
+                           and not fresh._turn_pools))
+    finally:
+        candidate_cache.TURN_POOL_IDLE = saved_idle
+    await third.close()
+    await first.close()
+    transport.close()
+
+
+asyncio.run(main())
+print(f"[ice-candidate-cache] {passed}/{passed + failed} passed")
+sys.exit(1 if failed else 0)
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""RFC 7983 demultiplexing of inbound datagrams in the ICE StunProtocol.
+
+Every datagram a peer sends lands in StunProtocol.datagram_received. Only
+STUN (first byte 0-3, magic cookie at offset 4) may reach the STUN parser;
+DTLS records (20-63) and SRTP/SRTCP (128-191) must go straight to the
+connection queue without a parse attempt, byte for byte. A binding request
+must still reach request_received and a transaction's response must still
+complete it; a STUN-looking datagram that fails to parse keeps falling
+through to the queue as before.
+"""
+import os
+import sys
+
+TESTS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO = os.path.dirname(TESTS)
+sys.path.insert(0, os.path.join(REPO, "src"))
+
+from selkies.ice import ice, stun  # noqa: E402
+from selkies.ice.candidate import Candidate  # noqa: E402
+
+ADDR = ("192.0.2.7", 50000)
+
+passed = failed = 0
+
+
+def check(label: str, ok, detail="") -> None:
+    global passed, failed
+    if ok:
+        passed += 1
+    else:
+        failed += 1
+    print(f"{'PASS' if ok else 'FAIL'}  [ice-demux] {label}  {detail}", flush=True)
+
+
+class Receiver:
+    def __init__(self) -> None:
+        self.data = []
+        self.requests = []
+
+    def data_received(self, data, component) -> None:
+        self.data.append((data, component))
+
+    def request_received(self, message, addr, protocol, raw_data) -> None:
+        self.requests.append((message, addr))
+
+
+class Transaction:
+    def __init__(self) -> None:
+        self.responses = []
+
+    def response_received(self, message, addr) -> None:
+        self.responses.append((message, addr))
+
+
+parses = 0
+real_parse = stun.parse_message
+
+
+def counting_parse(data, integrity_key=None):
+    global parses
+    parses += 1
+    return real_parse(data, integrity_key=integrity_key)
+
+
+stun.parse_message = counting_parse
+
+receiver = Receiver()
+protocol = ice.StunProtocol(receiver)
+protocol.local_candidate = Candidate(
+    foundation="1", component=1, transport="udp", priority=1,
+    host="192.0.2.1", port=40000, type="host")
+
+media = {
+    "DTLS handshake": bytes([22, 0xFE, 0xFD]) + bytes(40),
+    "DTLS application data": bytes([23, 0xFE, 0xFD]) + bytes(40),
+    "SRTP": bytes([0x80, 102]) + bytes(60),
+    "SRTCP transport-cc": bytes([0x8F, 205]) + bytes(30),
+    "SRTP with a cookie-like payload": bytes([0x90, 111, 0, 1]) + stun.COOKIE_BYTES + bytes(20),
+}
+for label, data in media.items():
+    check(f"{label} is not STUN", not stun.is_stun_message(data))
+    protocol.datagram_received(data, ADDR + (0, 0))
+check("media goes straight to the queue without a parse",
+      parses == 0 and receiver.data == [(data, 1) for data in media.values()],
+      f"{parses} parses")
+
+request = stun.Message(stun.Method.BINDING, stun.Class.REQUEST)
+request.attributes["USERNAME"] = "a:b"
+request.attributes["PRIORITY"] = 1
+raw = bytes(request)
+check("a binding request is STUN", stun.is_stun_message(raw))
+receiver.data.clear()
+protocol.datagram_received(raw, ADDR + (0, 0))
+check("a binding request reaches request_received as a two-tuple",
+      len(receiver.requests) == 1 and receiver.requests[0][1] == ADDR
+      and receiver.requests[0][0].transaction_id == request.transaction_id
+      and not receiver.data)
+
+transaction = Transaction()
+response = stun.Message(stun.Method.BINDING, stun.Class.RESPONSE)
+protocol.transactions[response.transaction_id] = transaction
+protocol.datagram_received(bytes(response), ADDR)
+check("a response completes its transaction", len(transaction.responses) == 1)
+
+truncated = raw[:-4]
+protocol.datagram_received(truncated, ADDR)
+check("a STUN-looking datagram that fails to parse still reaches the queue",
+      receiver.data == [(truncated, 1)])
+
+print(f"[ice-demux] {passed}/{passed + failed} passed")
+sys.exit(1 if failed else 0)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Single-port UDP mux for the host candidates of every ICE connection.
+
+Several server-side connections gather through one mux port on loopback while
+browser-side connections keep ephemeral sockets. Every server host candidate
+must advertise the mux port and the mux must hold one socket, ICE must
+complete for every pair, and the data each browser peer sends must reach its
+own server connection and no other (and back). Closing one connection must
+leave the others flowing on the shared socket; closing the last one must
+release the port. A ufrag already on the mux must fall back to a socket of
+its own instead of stealing the route.
+"""
+import asyncio
+import os
+import socket
+import sys
+
+TESTS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO = os.path.dirname(TESTS)
+sys.path.insert(0, os.path.join(REPO, "src"))
+
+from selkies.ice import Connection, mux  # noqa: E402
+
+PEERS = 4
+ADDRESSES = ["127.0.0.1"]
+
+passed = failed = 0
+
+
+def check(label: str, ok, detail="") -> None:
+    global passed, failed
+    if ok:
+        passed += 1
+    else:
+        failed += 1
+    print(f"{'PASS' if ok else 'FAIL'}  [ice-udp-mux] {label}  {detail}", flush=True)
+
+
+def free_udp_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def gather(conn: Connection) -> None:
+    # get_host_addresses() skips loopback; gather it directly instead.
+    conn._local_candidates += await conn.get_component_candidates(1, ADDRESSES)
+    conn._local_candidates_end = True
+
+
+async def pair_up(server: Connection, client: Connection) -> None:
+    for local, remote in ((server, client), (client, server)):
+        local.remote_username = remote.local_username
+        local.remote_password = remote.local_password
+        for candidate in remote.local_candidates:
+            await local.add_remote_candidate(candidate)
+        await local.add_remote_candidate(None)
+    await asyncio.gather(server.connect(), client.connect())
+
+
+async def main() -> None:
+    port = free_udp_port()
+    servers = [Connection(ice_controlling=False, udp_mux_port=port) for _ in range(PEERS)]
+    clients = [Connection(ice_controlling=True) for _ in range(PEERS)]
+    await asyncio.gather(*(gather(conn) for conn in servers + clients))
+
+    ports = {c.port for conn in servers for c in conn.local_candidates}
+    udp_mux = servers[0]._udp_mux
+    check("every server host candidate advertises the mux port",
+          ports == {port} and len(udp_mux._sockets) == 1, f"ports {sorted(ports)}")
+    check("mux ufrags are long enough to stay unique across peers",
+          all(len(conn.local_username) >= 16 for conn in servers)
+          and len({conn.local_username for conn in servers}) == PEERS)
+
+    await asyncio.wait_for(
+        asyncio.gather(*(pair_up(s, c) for s, c in zip(servers, clients))), 10)
+    check("ICE completes for every peer through the shared socket",
+          all(conn._nominated for conn in servers + clients))
+
+    for i, client in enumerate(clients):
+        await client.send(b"from client %d" % i)
+    received = await asyncio.wait_for(
+        asyncio.gather(*(server.recv() for server in servers)), 5)
+    check("each peer's data reaches its own connection",
+          received == [b"from client %d" % i for i in range(PEERS)], f"{received}")
+
+    for i, server in enumerate(servers):
+        await server.send(b"from server %d" % i)
+    replies = await asyncio.wait_for(
+        asyncio.gather(*(client.recv() for client in clients)), 5)
+    check("replies come back from the mux port",
+          replies == [b"from server %d" % i for i in range(PEERS)]
+          and all(client._nominated[1].remote_addr[1] == port for client in clients))
+
+    await servers[0].close()
+    await clients[0].close()
+    await clients[1].send(b"still here")
+    still = await asyncio.wait_for(servers[1].recv(), 5)
+    check("closing one connection leaves the others on the shared socket",
+          still == b"still here" and len(udp_mux._sockets) == 1)
+
+    duplicate = Connection(ice_controlling=False, udp_mux_port=port,
+                           local_username=servers[1].local_username,
+                           local_password=servers[1].local_password)
+    await gather(duplicate)
+    check("a ufrag already on the mux falls back to a socket of its own",
+          [c.port for c in duplicate.local_candidates] != [port]
+          and len(duplicate.local_candidates) == 1)
+    await duplicate.close()
+
+    for conn in servers[1:] + clients[1:]:
+        await conn.close()
+    released = port not in mux._udp_mux.subscribers.values()
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        try:
+            sock.bind(("127.0.0.1", port))
+            rebound = True
+        except OSError:
+            rebound = False
+    check("closing the last connection releases the port", released and rebound)
+
+
+asyncio.run(main())
+print(f"[ice-udp-mux] {passed}/{passed + failed} passed")
+sys.exit(1 if failed else 0)
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""Hot-path instrumentation exported through Metrics (selkies.instrumentation).
+
+Stage timings must be dropped while no Metrics exists and land in
+pipeline_stage_seconds while one does, from a LoopHandoff (once per batch)
+and from the pacer (once per drained video run). Queue depths must be read
+at scrape time, skipping a failing probe. The loop monitor must record loop
+lag and name the function that stalled the loop. unregister() must stop all
+of it and leave the registry free for the next Metrics.
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+
+TESTS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO = os.path.dirname(TESTS)
+sys.path.insert(0, os.path.join(REPO, "src"))
+
+from prometheus_client import REGISTRY, generate_latest  # noqa: E402
+
+from selkies import instrumentation  # noqa: E402
+from selkies.loop_handoff import LoopHandoff  # noqa: E402
+from selkies.webrtc.pacer import CLASS_VIDEO, RtpPacer  # noqa: E402
+from selkies.webrtc_utils import Metrics  # noqa: E402
+
+passed = failed = 0
+
+
+def check(label: str, ok, detail="") -> None:
+    global passed, failed
+    if ok:
+        passed += 1
+    else:
+        failed += 1
+    print(f"{'PASS' if ok else 'FAIL'}  [instrumentation] {label}  {detail}", flush=True)
+
+
+def stage_count(stage: str) -> float:
+    return REGISTRY.get_sample_value("pipeline_stage_seconds_count", {"stage": stage}) or 0.0
+
+
+def stall_the_loop(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+class Depths:
+    def __init__(self) -> None:
+        self.depth = 7
+
+    def probe(self) -> int:
+        return self.depth
+
+
+async def main() -> None:
+    loop = asyncio.get_running_loop()
+
+    instrumentation.observe_stage("orphan", 0.01)
+    metrics = Metrics()
+    check("timings without a Metrics are dropped", stage_count("orphan") == 0)
+
+    instrumentation.observe_stage("fanout", 0.002)
+    instrumentation.observe_stage("fanout", 0.004)
+    check("timings land in pipeline_stage_seconds", stage_count("fanout") == 2
+          and abs(REGISTRY.get_sample_value("pipeline_stage_seconds_sum",
+                                            {"stage": "fanout"}) - 0.006) < 1e-9)
+
+    batches = []
+    handoff = LoopHandoff(loop, batches.append, stage="handoff")
+    for i in range(20):
+        handoff.put(i)
+    await asyncio.sleep(0)
+    handoff.put(20)
+    await asyncio.sleep(0)
+    check("a staged LoopHandoff reports once per batch",
+          len(batches) == 2 and stage_count("handoff") == 2)
+
+    sent = []
+
+    async def send_now(data: bytes) -> None:
+        sent.append(data)
+
+    pacer = RtpPacer(encoder_bps=1_000_000, send_now=send_now)
+    frame = [bytes(1200)] * 20
+    await pacer.send_batch(frame, CLASS_VIDEO)
+    deadline = time.monotonic() + 3
+    while len(sent) < len(frame) and time.monotonic() < deadline:
+        await asyncio.sleep(0.01)
+    await pacer.close()
+    check("the pacer reports queue residence of drained video runs",
+          len(sent) == len(frame) and stage_count("webrtc_pacer") >= 1,
+          f"{stage_count('webrtc_pacer'):.0f} runs")
+
+    depths = Depths()
+    instrumentation.track_queue("relays", depths.probe)
+    instrumentation.track_queue("broken", lambda: 1 // 0)
+    text = generate_latest().decode()
+    check("queue depths are read at scrape time",
+          'queue_depth{queue="relays"} 7.0' in text)
+    check("a failing probe is skipped", 'queue="broken"' not in text)
+    depths.depth = 3
+    check("and re-read on the next scrape",
+          'queue_depth{queue="relays"} 3.0' in generate_latest().decode())
+    instrumentation.untrack_queue("relays", depths.probe)
+    instrumentation.untrack_queue("broken")
+    check("untracking by bound method works", not instrumentation.queue_depths())
+
+    metrics.monitor_loop()
+    await asyncio.sleep(0.35)
+    stall_the_loop(0.5)
+    await asyncio.sleep(0.35)
+    lag_count = REGISTRY.get_sample_value("event_loop_lag_seconds_count")
+    under_quarter = REGISTRY.get_sample_value("event_loop_lag_seconds_bucket", {"le": "0.25"})
+    check("loop lag is sampled", lag_count >= 4, f"{lag_count:.0f} samples")
+    check("and the stall shows up in it", under_quarter < lag_count)
+    stalls = REGISTRY.get_sample_value(
+        "event_loop_slow_callbacks_total", {"callback": "__main__.stall_the_loop"})
+    check("the slow callback is named once", stalls == 1, f"{stalls}")
+
+    await asyncio.to_thread(metrics.unregister)
+    await asyncio.sleep(0)
+    check("unregister stops the watchdog",
+          not any(t.name == "loop-watchdog" for t in threading.enumerate()))
+    check("and the sampling task",
+          not any(t.get_name() == "LoopMonitor" for t in asyncio.all_tasks()))
+    instrumentation.observe_stage("late", 0.01)
+    again = Metrics()
+    check("a later Metrics registers cleanly and saw nothing meanwhile",
+          stage_count("late") == 0 and stage_count("fanout") == 0)
+    again.unregister()
+
+
+asyncio.run(main())
+print(f"[instrumentation] {passed}/{passed + failed} passed")
+sys.exit(1 if failed else 0)
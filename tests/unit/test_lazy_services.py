@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""Lazily registered streaming services on CentralizedStreamServer.
+
+register_service accepts a zero-argument factory in place of a built service.
+The factory must not run until the first switch_to_mode into its name, and
+only once. Its reserved routes must answer 409 until then, like an inactive
+built service. A service built after the app started must be reachable
+through those routes, and one built before must register its routes directly.
+A factory runs off the event loop, and one that raises must leave the active
+mode running. The routes __main__ reserves for the WebRTC factory must be the
+ones WebRTCService.register_routes adds.
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import types
+
+TESTS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO = os.path.dirname(TESTS)
+sys.path.insert(0, TESTS)
+sys.path.insert(0, os.path.join(REPO, "src"))
+
+import helpers as H  # noqa: E402
+
+H.without_libpulse()
+
+from aiohttp import web  # noqa: E402
+from aiohttp.test_utils import TestClient, TestServer  # noqa: E402
+
+from selkies.__main__ import WEBRTC_ROUTES  # noqa: E402
+from selkies.stream_server import BaseStreamingService, CentralizedStreamServer  # noqa: E402
+from selkies.webrtc_mode import WebRTCService  # noqa: E402
+
+passed = failed = 0
+
+
+def check(label: str, ok, detail="") -> None:
+    global passed, failed
+    if ok:
+        passed += 1
+    else:
+        failed += 1
+    print(f"{'PASS' if ok else 'FAIL'}  [lazy-services] {label}  {detail}", flush=True)
+
+
+class _Settings:
+    """Only what the supervisor reads to build its app and switch modes."""
+    enable_basic_auth = (False,)
+    basic_auth_user = ""
+    basic_auth_password = ""
+    basic_auth_viewonly_password = ""
+    master_token = ""
+    subfolder = ""
+    mode = ""
+    file_transfer_limit_mbps = 0.0
+    file_transfer_cc = (True,)
+    file_manager_path = tempfile.gettempdir()
+    enable_metrics_http = (False,)
+    wayland = (False,)
+    web_root = ""
+
+    def apply_webrtc_encoder_filter(self) -> None:
+        pass
+
+    def resolve_rate_control_default(self) -> None:
+        pass
+
+
+class Service(BaseStreamingService):
+    def __init__(self, name: str, supervisor: CentralizedStreamServer) -> None:
+        super().__init__(name)
+        self.supervisor = supervisor
+        self.stopped = asyncio.Event()
+
+    async def start(self) -> None:
+        self.stopped.clear()
+        await self.stopped.wait()
+
+    async def stop(self) -> None:
+        self.stopped.set()
+
+    def register_routes(self, api_prefix: str, main_router: web.UrlDispatcher) -> None:
+        main_router.add_get(f"{api_prefix}/api/{self.mode}{{slash:/?}}", self.handle)
+
+    async def handle(self, request: web.Request) -> web.Response:
+        if self.supervisor.current_mode != self.mode:
+            return web.Response(status=409, text=f"{self.mode} inactive")
+        return web.Response(text=self.mode)
+
+
+async def main() -> None:
+    server = CentralizedStreamServer(_Settings())
+    built = []
+    threads = []
+
+    def factory(name: str):
+        def build() -> BaseStreamingService:
+            built.append(name)
+            threads.append(threading.current_thread())
+            return Service(name, server)
+        return build
+
+    def broken() -> BaseStreamingService:
+        raise ImportError("transport not installed")
+
+    server.register_service("eager", Service("eager", server))
+    server.register_service("early", factory("early"), routes=["/api/early{slash:/?}"])
+    server.register_service("late", factory("late"), routes=["/api/late{slash:/?}"])
+    server.register_service("broken", broken, routes=["/api/broken"])
+    check("registering a factory builds nothing", built == [])
+    check("lazy modes are listed as available",
+          server._get_status()["available_modes"] == ["eager", "early", "late", "broken"])
+
+    await server.switch_to_mode("early")
+    check("the first switch builds only its service", built == ["early"])
+    check("the factory runs off the event loop's thread",
+          threads and threads[0] is not threading.main_thread())
+
+    client = TestClient(TestServer(await server.initialize_app()))
+    await client.start_server()
+    try:
+        resp = await client.get("/api/early/")
+        check("a service built before the app serves its own routes",
+              resp.status == 200 and await resp.text() == "early", f"{resp.status}")
+        resp = await client.get("/api/late")
+        check("an unbuilt service's reserved route answers 409",
+              resp.status == 409 and built == ["early"], f"{resp.status}")
+
+        await server.switch_to_mode("late")
+        await server.switch_to_mode("eager")
+        await server.switch_to_mode("late")
+        check("a factory runs once across repeated switches", built == ["early", "late"],
+              f"{built}")
+        resp = await client.get("/api/late/")
+        check("a service built after the app started is reached through its route",
+              resp.status == 200 and await resp.text() == "late", f"{resp.status}")
+        resp = await client.post("/api/late")
+        check("its private router still rejects a wrong method", resp.status == 405,
+              f"{resp.status}")
+
+        try:
+            await server.switch_to_mode("broken")
+            raised = False
+        except ImportError:
+            raised = True
+        check("a failing factory raises and leaves the active mode running",
+              raised and server.current_mode == "late" and not server.active_task.done()
+              and callable(server.services["broken"]))
+    finally:
+        await server._stop_service()
+        await client.close()
+
+
+async def reserved_webrtc_routes() -> None:
+    async def handler(request: web.Request) -> web.Response:
+        return web.Response()
+
+    def paths(router: web.UrlDispatcher) -> list:
+        infos = [resource.get_info() for resource in router.resources()]
+        return sorted(info.get("path") or info["pattern"].pattern for info in infos)
+
+    reserved = web.UrlDispatcher()
+    for path in WEBRTC_ROUTES:
+        reserved.add_get(path, handler)
+    registered = web.UrlDispatcher()
+    WebRTCService.register_routes(
+        types.SimpleNamespace(rtc_ws_handler=handler, handle_turn_req=handler), "", registered)
+    check("the reserved WebRTC routes match WebRTCService.register_routes",
+          paths(reserved) == paths(registered), f"{paths(reserved)} vs {paths(registered)}")
+
+
+asyncio.run(main())
+asyncio.run(reserved_webrtc_routes())
+print(f"[lazy-services] {passed}/{passed + failed} passed")
+sys.exit(1 if failed else 0)
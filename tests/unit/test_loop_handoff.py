@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Coalesced capture-thread to loop handoff (selkies.loop_handoff).
+
+A LoopHandoff must deliver every chunk put from another thread, in order, in
+batches, and never call its drain with nothing. It asks for a loop wakeup
+only when its queue goes from empty to non-empty, so a burst put while the
+loop is busy costs one wakeup. Putting to a closed loop raises and leaves the
+handoff able to signal again.
+"""
+import asyncio
+import os
+import sys
+import threading
+
+TESTS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO = os.path.dirname(TESTS)
+sys.path.insert(0, os.path.join(REPO, "src"))
+
+from selkies.loop_handoff import LoopHandoff  # noqa: E402
+
+passed = failed = 0
+
+
+def check(label: str, ok, detail="") -> None:
+    global passed, failed
+    if ok:
+        passed += 1
+    else:
+        failed += 1
+    print(f"{'PASS' if ok else 'FAIL'}  [loop-handoff] {label}  {detail}", flush=True)
+
+
+async def main() -> None:
+    loop = asyncio.get_running_loop()
+    batches = []
+    handoff = LoopHandoff(loop, batches.append)
+
+    # A burst put while the loop is not running the handoff: one wakeup.
+    for i in range(30):
+        handoff.put(i)
+    check("a burst asks for one wakeup", handoff.wakeups == 1, f"{handoff.wakeups}")
+    await asyncio.sleep(0)
+    check("the burst is drained in one batch, in order",
+          batches == [list(range(30))], f"{[len(b) for b in batches]}")
+
+    handoff.put(30)
+    await asyncio.sleep(0)
+    check("a chunk after a drain wakes the loop again",
+          handoff.wakeups == 2 and batches[-1] == [30])
+
+    batches.clear()
+    total = 5000
+    done = threading.Event()
+
+    def produce():
+        for i in range(total):
+            handoff.put(i)
+        done.set()
+
+    thread = threading.Thread(target=produce)
+    thread.start()
+    while not (done.is_set() and sum(map(len, batches)) == total):
+        await asyncio.sleep(0.001)
+    thread.join()
+    flat = [i for batch in batches for i in batch]
+    check("every chunk from another thread arrives, in order", flat == list(range(total)))
+    check("the drain is never called with nothing", all(batches))
+    check("wakeups are one per batch", handoff.wakeups - 2 == len(batches),
+          f"{handoff.wakeups - 2} wakeups, {len(batches)} batches")
+
+
+asyncio.run(main())
+
+closed = asyncio.new_event_loop()
+closed.close()
+handoff = LoopHandoff(closed, lambda items: None)
+try:
+    handoff.put(1)
+    raised = False
+except RuntimeError:
+    raised = True
+check("a put to a closed loop raises", raised)
+check("and leaves nothing queued or scheduled", not handoff._items and not handoff._scheduled)
+
+print(f"[loop-handoff] {passed}/{passed + failed} passed")
+sys.exit(1 if failed else 0)
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""Per-client video backlog: coalesce stripes per row instead of flushing.
+
+A capture of 16 stripe rows streams to a client whose link drains a fraction
+of it. For JPEG the backlog must keep at most one chunk per row, every row
+the client receives must be that row's newest at the time, no row may starve
+while the screen repaints faster than the link drains, and the frame ids on
+the wire must only grow, across rows too, since the client ACKs them. For H.264 a budget overflow must gate only the
+row whose delta was dropped while the other rows keep flowing, an IDR must
+resume its row and supersede what was still queued for it, and the bytes held
+must stay within the budget plus one IDR per row, and superseded entries
+must not pile up in the queue. Chunks of any other type must stay within the
+budget.
+"""
+import os
+import sys
+
+TESTS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO = os.path.dirname(TESTS)
+sys.path.insert(0, os.path.join(REPO, "src"))
+
+from selkies.relay_backlog import RelayBacklog  # noqa: E402
+
+ROWS = 16
+STRIPE_H = 64
+
+passed = failed = 0
+
+
+def check(label: str, ok, detail="") -> None:
+    global passed, failed
+    if ok:
+        passed += 1
+    else:
+        failed += 1
+    print(f"{'PASS' if ok else 'FAIL'}  [relay-backlog] {label}  {detail}", flush=True)
+
+
+def chunk(kind: int, frame_id: int, row: int, size: int, idr: bool = False) -> dict:
+    y = row * STRIPE_H
+    header = bytes([kind, 0x01 if idr else 0x00, frame_id >> 8, frame_id & 0xFF,
+                    y >> 8, y & 0xFF, 0, 0, 0, 0])
+    # The payload names the capture frame it came from, whatever id the
+    # backlog sends it under.
+    payload = frame_id.to_bytes(2, "big") + bytes(size - 2)
+    return {"data": memoryview(header + payload), "frame_id": frame_id}
+
+
+def captured_in(item: dict) -> int:
+    return int.from_bytes(item["data"][10:12], "big")
+
+
+def wire_id(item: dict) -> int:
+    return int.from_bytes(item["data"][2:4], "big")
+
+
+def row_of(item: dict) -> int:
+    data = item["data"]
+    return ((data[4] << 8) | data[5]) // STRIPE_H
+
+
+# JPEG: every row repaints every frame; the client drains 4 chunks a frame.
+backlog = RelayBacklog(budget=1)
+latest = {}
+delivered = []
+per_row = {}
+stale = 0
+peak_len = peak_bytes = 0
+for frame_id in range(1, 601):
+    for row in range(ROWS):
+        backlog.offer(chunk(0x03, frame_id, row, 2000 + row))
+        latest[row] = frame_id
+    peak_len = max(peak_len, len(backlog))
+    peak_bytes = max(peak_bytes, backlog.bytes)
+    for _ in range(4):
+        item = backlog.pop()
+        if item is None:
+            break
+        delivered.append(item)
+        per_row.setdefault(row_of(item), []).append(item["frame_id"])
+        stale += captured_in(item) != latest[row_of(item)]
+check("JPEG keeps at most one chunk per row",
+      peak_len <= ROWS and peak_bytes <= ROWS * (2000 + ROWS + 10),
+      f"peak {peak_len} chunks, {peak_bytes} bytes")
+check("every JPEG chunk delivered is its row's newest", stale == 0, f"{stale} stale")
+check("each row's frame ids only grow",
+      all(ids == sorted(ids) for ids in per_row.values()))
+
+counts = [len(per_row.get(row, ())) for row in range(ROWS)]
+check("no row starves under coalescing",
+      len(delivered) == 2400 and min(counts) >= max(counts) - 1,
+      f"{min(counts)}-{max(counts)} chunks per row")
+
+# Partial repaints: row r changes every (r % 4 + 1) frames, so a replaced row
+# sits ahead of rows still queued under older frame ids.
+backlog = RelayBacklog(budget=1)
+partial = []
+for frame_id in range(1, 401):
+    for row in range(ROWS):
+        if frame_id % (row % 4 + 1) == 0:
+            backlog.offer(chunk(0x03, frame_id, row, 2000))
+    for _ in range(3):
+        item = backlog.pop()
+        if item is None:
+            break
+        partial.append(item)
+sent_ids = [item["frame_id"] for item in partial]
+check("frame ids on the wire never step back across rows",
+      sent_ids == sorted(sent_ids)
+      and all(wire_id(item) == item["frame_id"] for item in partial),
+      f"{sum(a > b for a, b in zip(sent_ids, sent_ids[1:]))} steps back")
+check("and no chunk is sent under an id older than its capture",
+      all(item["frame_id"] >= captured_in(item) for item in partial)
+      and any(item["frame_id"] > captured_in(item) for item in partial))
+
+wrap = RelayBacklog(budget=1)
+for frame_id, row in ((65535, 0), (65535, 1), (0, 0)):
+    wrap.offer(chunk(0x03, frame_id, row, 100))
+wrapped = [wrap.pop()["frame_id"], wrap.pop()["frame_id"]]
+check("the id comparison follows the 16-bit wrap", wrapped == [0, 0], f"{wrapped}")
+
+# H.264: every row starts with an IDR, then deltas.
+BUDGET = 40_000
+backlog = RelayBacklog(budget=BUDGET)
+joining = backlog.offer(chunk(0x04, 1, 0, 100))
+for row in range(ROWS):
+    backlog.offer(chunk(0x04, 1, row, 1500, idr=True))
+check("a joining client is gated until each row's IDR",
+      joining is False and backlog.live_rows == {row * STRIPE_H for row in range(ROWS)})
+results = {}
+for row in range(ROWS):
+    results[row] = backlog.offer(chunk(0x04, 2, row, 2000))
+gated = {row for row, lost in results.items() if lost}
+check("the budget overflow gates only the rows whose delta was dropped",
+      gated and backlog.drops == len(gated)
+      and backlog.live_rows == {row * STRIPE_H for row in range(ROWS) if row not in gated},
+      f"gated rows {sorted(gated)}")
+for _ in range(4):
+    backlog.pop()
+check("rows with an intact chain keep flowing once the client drains",
+      backlog.offer(chunk(0x04, 3, 0, 2000)) is None)
+row = min(gated)
+check("a gated row's deltas wait for its IDR",
+      backlog.offer(chunk(0x04, 3, row, 10)) is False)
+backlog.offer(chunk(0x04, 4, 1, 1500, idr=True))
+backlog.offer(chunk(0x04, 4, row, 1500, idr=True))
+rows_queued = [row_of(item) for item in iter(backlog.pop, None)]
+check("an IDR resumes its row and supersedes what was queued for it",
+      row * STRIPE_H in backlog.live_rows and rows_queued.count(row) == 1 and rows_queued.count(1) == 1
+      and rows_queued[-2:] == [1, row], f"queued rows {rows_queued}")
+
+# A stalled client: nothing drains while every row keeps refreshing.
+for frame_id in range(5, 1005):
+    for row in range(ROWS):
+        backlog.offer(chunk(0x04, frame_id, row, 1000, idr=True))
+check("superseded entries do not pile up behind a stalled client",
+      len(backlog) == ROWS and len(backlog._queue) <= 2 * ROWS + 64,
+      f"{len(backlog._queue)} queue slots for {len(backlog)} chunks")
+
+# Sustained overload: bytes stay bounded by the budget plus one IDR per row.
+backlog = RelayBacklog(budget=BUDGET)
+peak = 0
+for frame_id in range(1, 2001):
+    for row in range(ROWS):
+        idr = frame_id % 60 == 1 or row not in backlog.live_rows and frame_id % 10 == 0
+        backlog.offer(chunk(0x04, frame_id, row, 8000 if idr else 400, idr=idr))
+    peak = max(peak, backlog.bytes)
+    for _ in range(3):
+        backlog.pop()
+check("H.264 bytes stay within the budget plus one IDR per row",
+      peak <= BUDGET + ROWS * 8010, f"peak {peak} bytes")
+
+backlog.clear(gate=True)
+check("a gate clears the queue and every row",
+      len(backlog) == 0 and backlog.bytes == 0 and not backlog.live_rows
+      and backlog.pop() is None)
+
+other = RelayBacklog(budget=5000)
+queued = sum(other.offer({"data": memoryview(bytes([0x7F]) + bytes(1999)),
+                          "frame_id": 0}) is None for _ in range(10))
+check("other chunk types stay within the budget",
+      other.bytes <= 5000 and queued == 2, f"{queued} queued, {other.bytes} bytes")
+
+print(f"[relay-backlog] {passed}/{passed + failed} passed")
+sys.exit(1 if failed else 0)
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Frame-level send path of the RTP pacer.
+
+A sender hands the pacer a whole frame at once. What credit covers on an idle
+link must leave in ONE batched write rather than a write per packet; what it
+does not cover must queue and drain in batched runs; and a frame that cannot
+fit the video budget resets the GOP and is dropped whole, never sent with a
+missing tail that would break the receiver's reference chain, even when credit
+covers its head. A dead GOP drops every later frame until a keyframe
+resurrects the class.
+"""
+import asyncio
+import os
+import sys
+
+TESTS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO = os.path.dirname(TESTS)
+sys.path.insert(0, os.path.join(REPO, "src"))
+
+from selkies.webrtc.pacer import CLASS_AUDIO, CLASS_VIDEO, RtpPacer  # noqa: E402
+
+passed = failed = 0
+
+
+def check(label: str, ok, detail="") -> None:
+    global passed, failed
+    if ok:
+        passed += 1
+    else:
+        failed += 1
+    print(f"{'PASS' if ok else 'FAIL'}  [rtp-pacer-batch] {label}  {detail}", flush=True)
+
+
+class Wire:
+    """Records every write the pacer makes, one entry per call."""
+
+    def __init__(self) -> None:
+        self.single = []
+        self.batches = []
+
+    async def send(self, data: bytes) -> None:
+        self.single.append(data)
+
+    async def send_batch(self, batch: list) -> None:
+        self.batches.append(list(batch))
+
+    def packets(self) -> list:
+        return self.single + [p for b in self.batches for p in b]
+
+
+def frame(n: int, size: int = 1100, tag: int = 0) -> list:
+    return [bytes([tag, i & 0xFF]) + b"\x00" * (size - 2) for i in range(n)]
+
+
+async def main() -> None:
+    # Idle link with ample credit: a small frame goes out in one write.
+    wire = Wire()
+    pacer = RtpPacer(50_000_000, wire.send, send_now_batch=wire.send_batch)
+    pacer.credit = pacer._debt_cap
+    small = frame(3)
+    await pacer.send_batch(small, CLASS_VIDEO)
+    check("a covered frame leaves in one batched write",
+          wire.batches == [small] and not wire.single,
+          f"batches={len(wire.batches)} single={len(wire.single)}")
+
+    # Audio bypasses the bucket and goes out at once, batched.
+    audio = frame(2, size=160, tag=1)
+    await pacer.send_batch(audio, CLASS_AUDIO)
+    check("audio bypasses the bucket in one write", wire.batches[-1] == audio)
+    await pacer.close()
+
+    # A frame larger than the burst budget is split: the covered prefix is
+    # written at once, the rest queues and drains in order, in batched runs.
+    wire = Wire()
+    pacer = RtpPacer(5_000_000, wire.send, send_now_batch=wire.send_batch)
+    pacer.credit = pacer._debt_cap
+    big = frame(40, tag=2)
+    await pacer.send_batch(big, CLASS_VIDEO)
+    for _ in range(200):
+        if not pacer._bytes_queued:
+            break
+        await asyncio.sleep(0.01)
+    check("an uncovered frame drains completely and in order",
+          wire.packets() == big, f"{len(wire.packets())}/{len(big)} packets")
+    check("the drain writes runs, not single packets",
+          not wire.single and len(wire.batches) < len(big),
+          f"{len(wire.batches)} writes for {len(big)} packets")
+    await pacer.close()
+
+    # Overflow: a frame that cannot fit the budget even after purging resets
+    # the GOP and is dropped whole; the next frame is dropped too until a
+    # keyframe resurrects the class.
+    wire = Wire()
+    pacer = RtpPacer(1_000_000, wire.send, send_now_batch=wire.send_batch)
+    # Freeze the bucket empty, so nothing takes the fast path.
+    pacer.credit = 0.0
+    pacer._accrue = lambda: None
+    cap = pacer._video_cap_bytes()
+    huge = frame(cap // 1100 + 5, tag=3)
+    await pacer.send_batch(huge, CLASS_VIDEO)
+    check("an overflowing frame is dropped whole",
+          pacer._video_bytes == 0 and not wire.packets(),
+          f"queued={pacer._video_bytes}")
+    check("and resets the GOP", pacer._gop_dead and pacer.stats["gop_resets"] == 1)
+    await pacer.send_batch(frame(2, tag=4), CLASS_VIDEO)
+    check("frames after the reset are dropped until a keyframe",
+          pacer._video_bytes == 0, f"queued={pacer._video_bytes}")
+    dropped = pacer.stats["video_dropped"]
+    pacer.note_keyframe(2200)
+    await pacer.send_batch(frame(2, tag=5), CLASS_VIDEO)
+    check("a keyframe resurrects the class",
+          pacer.stats["video_dropped"] == dropped and not pacer._gop_dead,
+          f"dropped {pacer.stats['video_dropped'] - dropped}")
+    await pacer.close()
+
+    # Credit covers the head of an overflowing frame: the head must not go
+    # out on the fast path ahead of a tail that is then dropped.
+    wire = Wire()
+    pacer = RtpPacer(1_000_000, wire.send, send_now_batch=wire.send_batch)
+    pacer.credit = 4 * 1100
+    pacer._accrue = lambda: None
+    cap = pacer._video_cap_bytes()
+    huge = frame(cap // 1100 + 10, tag=6)
+    await pacer.send_batch(huge, CLASS_VIDEO)
+    check("a covered head is not sent without its tail",
+          not wire.packets() and pacer._video_bytes == 0 and pacer._gop_dead,
+          f"sent={len(wire.packets())} queued={pacer._video_bytes}")
+    await pacer.close()
+
+
+asyncio.run(main())
+print(f"[rtp-pacer-batch] {passed}/{passed + failed} passed")
+sys.exit(1 if failed else 0)
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""Delay-based send-side bandwidth estimation from transport-cc feedback.
+
+A simulated sender streams 60 fps video through a FIFO bottleneck and feeds the
+transport's feedback decoder with the arrival times a receiver would report
+every 100 ms. After a calm start the link drops to half the ceiling (a shared
+Wi-Fi hotspot filling up). No packet is ever lost, so the only congestion
+signal is the queue building behind the bottleneck: the estimator must pull its
+target below the link rate from delay alone, keep the queue short and drain it
+once the sender follows that target (an open-loop sender at the ceiling queues
+for seconds), hold the ceiling on an uncongested link, recover once the
+bottleneck clears, stay within its bounds, and steer the pacer with the same
+target.
+"""
+import asyncio
+import os
+import struct
+import sys
+
+TESTS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO = os.path.dirname(TESTS)
+sys.path.insert(0, os.path.join(REPO, "src"))
+
+from selkies.webrtc.rtcdtlstransport import RTCCertificate, RTCDtlsTransport  # noqa: E402
+from selkies.webrtc.rtcicetransport import RTCIceGatherer, RTCIceTransport  # noqa: E402
+
+MIN_BPS = 500_000
+MAX_BPS = 8_000_000
+FPS = 60
+MTU_PAYLOAD = 1200
+PROPAGATION_S = 0.02
+FEEDBACK_S = 0.1
+START = 1000.0
+CALM_S = 5.0
+
+
+def hotspot(t: float) -> int:
+    """20 Mbps for the first CALM_S seconds, then a 4 Mbps bottleneck."""
+    return 20_000_000 if t < START + CALM_S else 4_000_000
+
+passed = failed = 0
+
+
+def check(label: str, ok, detail="") -> None:
+    global passed, failed
+    if ok:
+        passed += 1
+    else:
+        failed += 1
+    print(f"{'PASS' if ok else 'FAIL'}  [send-side-bwe] {label}  {detail}", flush=True)
+
+
+def encode_feedback(base: int, arrivals_us: list) -> bytes:
+    """Transport-cc FCI for consecutive received packets, 2-bit vector chunks."""
+    reference = int(arrivals_us[0] // 64000)
+    previous = reference * 64000 // 250
+    symbols, deltas = [], b""
+    for arrival in arrivals_us:
+        ticks = int(arrival // 250)
+        delta = ticks - previous
+        previous = ticks
+        if 0 <= delta <= 255:
+            symbols.append(1)
+            deltas += bytes([delta])
+        else:
+            symbols.append(2)
+            deltas += struct.pack("!h", delta)
+    chunks = b""
+    for i in range(0, len(symbols), 7):
+        word = 0xC000
+        for j, symbol in enumerate(symbols[i:i + 7]):
+            word |= symbol << (12 - 2 * j)
+        chunks += struct.pack("!H", word)
+    header = struct.pack("!HH", base, len(symbols)) + reference.to_bytes(3, "big") + b"\0"
+    return header + chunks + deltas
+
+
+def new_transport() -> RTCDtlsTransport:
+    return RTCDtlsTransport(RTCIceTransport(RTCIceGatherer()),
+                            [RTCCertificate.generateCertificate()])
+
+
+def simulate(transport, seconds: float, link_bps, follow: bool, rate_bps: int = MAX_BPS,
+             start: float = START, link_free: float = 0.0) -> dict:
+    """Stream for `seconds` through a bottleneck of `link_bps` (a function of
+    time); the sender sends `rate_bps`, or the estimator's target if `follow`."""
+    now = start
+    pending = []
+    next_feedback = start + FEEDBACK_S
+    delays, targets = [], []
+    while now < start + seconds:
+        rate = transport.bwe.target_bitrate if follow else rate_bps
+        frame = int(rate / 8 / FPS)
+        while frame > 0:
+            size = min(frame, MTU_PAYLOAD)
+            frame -= size
+            seq = transport._twcc_next(size)
+            transport._twcc_send_times[seq] = now
+            arrival = max(now + PROPAGATION_S, link_free) + size * 8 / link_bps(now)
+            link_free = arrival
+            pending.append((seq, arrival))
+            delays.append(arrival - now - PROPAGATION_S)
+        now += 1 / FPS
+        if now >= next_feedback:
+            next_feedback += FEEDBACK_S
+            arrived = [p for p in pending if p[1] <= now]
+            if arrived:
+                pending = pending[len(arrived):]
+                transport._twcc_process_feedback(
+                    encode_feedback(arrived[0][0], [a * 1e6 for _, a in arrived]))
+                targets.append((now - start, transport.twcc_estimate["target_bps"]))
+    return {"delays": delays, "targets": targets, "end": now, "link_free": link_free}
+
+
+async def main() -> None:
+    # An uncongested link: the delay stays flat and the target at the ceiling.
+    transport = new_transport()
+    transport.configure_bwe(MIN_BPS, MAX_BPS)
+    calm = simulate(transport, 10, lambda t: 20_000_000, follow=False, rate_bps=3_000_000)
+    lowest = min(t for _, t in calm["targets"])
+    check("an uncongested link holds the target at the ceiling",
+          lowest >= MAX_BPS * 0.95, f"lowest {lowest / 1e6:.2f} Mbps")
+
+    # The ceiling pushed into the bottleneck, sender not following.
+    transport = new_transport()
+    transport.configure_bwe(MIN_BPS, MAX_BPS)
+    open_loop = simulate(transport, 15, hotspot, follow=False)
+    first_drop = next((t for t, target in open_loop["targets"] if target < 4_000_000), None)
+    check("queue buildup alone pulls the target below the bottleneck",
+          first_drop is not None and first_drop - CALM_S < 1.5,
+          f"{first_drop - CALM_S:.2f} s after the drop, no loss" if first_drop else "")
+
+    # The same bottleneck with the encoder following the target.
+    transport = new_transport()
+    transport.configure_bwe(MIN_BPS, MAX_BPS)
+    transport.enable_pacer(MAX_BPS)
+    closed = simulate(transport, 15, hotspot, follow=True)
+    peak, unbraked = max(closed["delays"]), max(open_loop["delays"])
+    print(f"INFO  [send-side-bwe] queueing delay after the drop: open loop {unbraked:.2f} s, "
+          f"following the target {peak:.2f} s peak, {closed['delays'][-1] * 1e3:.0f} ms at the end",
+          flush=True)
+    check("following the target keeps the bottleneck queue short",
+          peak < 1.0 and unbraked > 3.0, f"{peak:.2f} s vs {unbraked:.2f} s")
+    check("the queue drains once the target is below the link",
+          closed["delays"][-1] < 0.05, f"{closed['delays'][-1] * 1e3:.0f} ms")
+    target = transport.bwe.target_bitrate
+    check("the pacer paces against the same target",
+          transport._pacer._encoder_bps == max(target, 100_000) and target < MAX_BPS,
+          f"pacer {transport._pacer._encoder_bps} vs target {target}")
+
+    # The bottleneck clears: the target climbs back toward the ceiling
+    # (additively: the last overuse marked the rate as near the link's).
+    recovered = simulate(transport, 30, lambda t: 50_000_000, follow=True,
+                         start=closed["end"], link_free=closed["link_free"])
+    climb = [t for _, t in recovered["targets"]]
+    check("the target recovers once the bottleneck clears",
+          climb == sorted(climb) and climb[-1] >= target * 1.5,
+          f"{target / 1e6:.2f} -> {recovered['targets'][-1][1] / 1e6:.2f} Mbps")
+    await transport._pacer.close()
+
+    # A bottleneck below the floor never drives the target under it.
+    transport = new_transport()
+    transport.configure_bwe(MIN_BPS, MAX_BPS)
+    starved = simulate(transport, 10, lambda t: 200_000, follow=True)
+    check("the target stays within its bounds",
+          all(MIN_BPS <= t <= MAX_BPS for _, t in starved["targets"]),
+          f"min {min(t for _, t in starved['targets'])}")
+
+    # Rebounding (a lower user bitrate) applies at once.
+    transport.configure_bwe(MIN_BPS, 600_000)
+    check("new bounds apply to the current target",
+          transport.bwe.target_bitrate <= 600_000)
+
+    # Without configure_bwe the feedback estimate carries no target.
+    transport = new_transport()
+    seqs = [transport._twcc_next(1000) for _ in range(5)]
+    transport._twcc_process_feedback(encode_feedback(seqs[0], [1e6 + i * 1000 for i in range(5)]))
+    check("the estimator is off until configured",
+          transport.bwe is None and "target_bps" not in transport.twcc_estimate)
+
+
+asyncio.run(main())
+print(f"[send-side-bwe] {passed}/{passed + failed} passed")
+sys.exit(1 if failed else 0)
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""Transport-wide congestion control send history and feedback decoding.
+
+The send history is a fixed ring with one slot per 16-bit sequence number, so
+recording a packet never evicts or sorts, and the feedback decoder walks the
+status chunks without expanding them into a per-packet list or per-chunk
+tuples. Against a
+reference decoder (the list-based walk over a dict history) it must publish
+the same estimate for every chunk type — run length, 1-bit and 2-bit vectors,
+small and large deltas, losses — across the sequence-number wrap, and must
+count each packet's bytes once however often feedback repeats it.
+"""
+import asyncio
+import os
+import random
+import struct
+import sys
+
+TESTS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO = os.path.dirname(TESTS)
+sys.path.insert(0, os.path.join(REPO, "src"))
+
+from selkies.webrtc.rtcdtlstransport import RTCCertificate, RTCDtlsTransport  # noqa: E402
+from selkies.webrtc.rtcicetransport import RTCIceGatherer, RTCIceTransport  # noqa: E402
+
+passed = failed = 0
+
+
+def check(label: str, ok, detail="") -> None:
+    global passed, failed
+    if ok:
+        passed += 1
+    else:
+        failed += 1
+    print(f"{'PASS' if ok else 'FAIL'}  [twcc-history] {label}  {detail}", flush=True)
+
+
+def reference_estimate(fci: bytes, history: dict) -> dict:
+    """The list-based decode the ring replaced, over a dict history."""
+    base_seq, status_count = struct.unpack("!HH", fci[0:4])
+    pos = 8
+    statuses = []
+    while len(statuses) < status_count and pos + 2 <= len(fci):
+        chunk = struct.unpack("!H", fci[pos:pos + 2])[0]
+        pos += 2
+        if chunk & 0x8000 == 0:
+            statuses.extend([(chunk >> 13) & 0x3] * (chunk & 0x1FFF))
+        elif chunk & 0x4000 == 0:
+            statuses.extend((chunk >> (13 - i)) & 0x1 for i in range(14))
+        else:
+            statuses.extend((chunk >> (12 - 2 * i)) & 0x3 for i in range(7))
+    statuses = statuses[:status_count]
+    received = bytes_acked = 0
+    delta_sum_us = 0.0
+    for i, symbol in enumerate(statuses):
+        if symbol in (1, 2):
+            received += 1
+            if pos < len(fci):
+                if symbol == 1:
+                    delta_sum_us += fci[pos] * 250
+                    pos += 1
+                elif pos + 2 <= len(fci):
+                    delta_sum_us += struct.unpack("!h", fci[pos:pos + 2])[0] * 250
+                    pos += 2
+            sent = history.pop((base_seq + i) & 0xFFFF, None)
+            if sent is not None:
+                bytes_acked += sent
+    span_s = max(delta_sum_us / 1e6, 1e-4)
+    return {
+        "received": received,
+        "lost": len(statuses) - received,
+        "loss_fraction": (len(statuses) - received) / len(statuses),
+        "bytes_acked": bytes_acked,
+        "recv_span_s": span_s,
+        "goodput_bps": int(bytes_acked * 8 / span_s) if received else 0,
+    }
+
+
+def encode_feedback(base: int, statuses: list, rng: random.Random) -> bytes:
+    """Encode statuses with a random mix of run-length and vector chunks."""
+    chunks = b""
+    deltas = b""
+    i = 0
+    while i < len(statuses):
+        kind = rng.choice(("run", "vec1", "vec2"))
+        if kind == "run":
+            run = 1
+            while i + run < len(statuses) and statuses[i + run] == statuses[i] and run < 8191:
+                run += 1
+            chunks += struct.pack("!H", (statuses[i] << 13) | run)
+            i += run
+        elif kind == "vec1" and all(s in (0, 1) for s in statuses[i:i + 14]):
+            word = 0x8000
+            for j, s in enumerate(statuses[i:i + 14]):
+                word |= s << (13 - j)
+            chunks += struct.pack("!H", word)
+            i += 14
+        else:
+            word = 0xC000
+            for j, s in enumerate(statuses[i:i + 7]):
+                word |= s << (12 - 2 * j)
+            chunks += struct.pack("!H", word)
+            i += 7
+    for s in statuses:
+        if s == 1:
+            deltas += bytes([rng.randrange(256)])
+        elif s == 2:
+            deltas += struct.pack("!h", rng.randrange(-32768, 32768))
+    return struct.pack("!HHI", base, len(statuses), 0) + chunks + deltas
+
+
+async def main() -> None:
+    rng = random.Random(7)
+    transport = RTCDtlsTransport(RTCIceTransport(RTCIceGatherer()),
+                                 [RTCCertificate.generateCertificate()])
+    history = {}
+    # Start close to the wrap so feedback windows straddle 65535 -> 0.
+    transport._twcc_seq = 0xFFFF - 3000
+    sent = []
+    mismatches = []
+    for _ in range(60):
+        for _ in range(rng.randrange(50, 400)):
+            size = rng.randrange(100, 1300)
+            seq = transport._twcc_next(size)
+            history[seq] = size
+            sent.append(seq)
+        base = sent[-rng.randrange(20, 300)]
+        count = rng.randrange(1, 300)
+        statuses = [rng.choice((0, 1, 1, 1, 2)) for _ in range(count)]
+        fci = encode_feedback(base, statuses, rng)
+        expected = reference_estimate(fci, history)
+        transport._twcc_process_feedback(fci)
+        if transport.twcc_estimate != expected:
+            mismatches.append((base, transport.twcc_estimate, expected))
+    check("the ring decoder matches the reference on mixed chunk types",
+          not mismatches, str(mismatches[:1]))
+    check("feedback windows crossed the sequence-number wrap",
+          any(s < 0x100 for s in sent) and any(s > 0xFF00 for s in sent))
+
+    # Repeated feedback for the same packets acknowledges their bytes once.
+    seqs = [transport._twcc_next(1000) for _ in range(10)]
+    fci = encode_feedback(seqs[0], [1] * 10, rng)
+    transport._twcc_process_feedback(fci)
+    first = transport.twcc_estimate["bytes_acked"]
+    transport._twcc_process_feedback(fci)
+    check("bytes are acknowledged once per packet",
+          first == 10_000 and transport.twcc_estimate["bytes_acked"] == 0,
+          f"{first} then {transport.twcc_estimate['bytes_acked']}")
+
+    # A status count beyond the chunks present is truncated, not invented.
+    fci = struct.pack("!HHI", seqs[0], 50, 0) + struct.pack("!H", (1 << 13) | 4) + bytes(4)
+    transport._twcc_process_feedback(fci)
+    check("statuses are bounded by the chunks present",
+          transport.twcc_estimate["received"] == 4 and transport.twcc_estimate["lost"] == 0,
+          str(transport.twcc_estimate))
+
+    # The history is a fixed allocation: recording never grows or evicts.
+    before = (len(transport._twcc_sizes), len(transport._twcc_send_times))
+    for _ in range(70_000):
+        transport._twcc_next(1200)
+    check("the history stays at one slot per sequence number",
+          (len(transport._twcc_sizes), len(transport._twcc_send_times)) == before == (65536, 65536))
+    check("packet sizes are held in 4-byte slots",
+          transport._twcc_sizes.itemsize == 4, f"{transport._twcc_sizes.itemsize} bytes")
+
+
+asyncio.run(main())
+print(f"[twcc-history] {passed}/{passed + failed} passed")
+sys.exit(1 if failed else 0)
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""One packetization per frame for every WebRTC peer on a display.
+
+A display's media graph packetizes each encoded frame in its VideoMedia and
+relays the result to every subscribed sender. Two peers on one display must
+receive the very same payloads for every frame while the packetizer runs once
+per frame; a second display must packetize its own frames. An encoder hook
+with no state for a display yet must fall back to the global encoder, and any
+other failure in it must surface instead of being swallowed.
+"""
+import asyncio
+import os
+import sys
+
+TESTS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO = os.path.dirname(TESTS)
+sys.path.insert(0, TESTS)
+sys.path.insert(0, os.path.join(REPO, "src"))
+
+import helpers as H  # noqa: E402
+
+H.without_libpulse()
+
+from selkies.rtc import RTCApp  # noqa: E402
+
+FRAMES = 5
+
+passed = failed = 0
+
+
+def check(label: str, ok, detail="") -> None:
+    global passed, failed
+    if ok:
+        passed += 1
+    else:
+        failed += 1
+    print(f"{'PASS' if ok else 'FAIL'}  [video-packetize-once] {label}  {detail}", flush=True)
+
+
+def access_unit(i: int) -> bytes:
+    """An Annex-B access unit: SPS + IDR on the first frame, a slice after,
+    large enough to be fragmented into several payloads."""
+    slice_nal = bytes([0x65 if i == 0 else 0x41]) + bytes([i & 0xFF]) * 3000
+    if i == 0:
+        return b"\x00\x00\x00\x01\x67\x42\x00\x1f" + b"\x00\x00\x00\x01" + slice_nal
+    return b"\x00\x00\x00\x01" + slice_nal
+
+
+def count_packs(graph: dict) -> list:
+    calls = []
+    packer = graph["video_media"]._packer
+    pack = packer.pack
+
+    def counted(packet):
+        calls.append(packet.pts)
+        return pack(packet)
+
+    packer.pack = counted
+    return calls
+
+
+async def settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def main() -> None:
+    app = RTCApp(asyncio.get_running_loop(), "h264enc")
+    app.request_idr_frame = lambda display_id="primary": None
+    for display_id in ("primary", "second"):
+        app.displays[display_id] = app._create_display_graph(display_id)
+    primary, second = app.displays["primary"], app.displays["second"]
+    primary_packs, second_packs = count_packs(primary), count_packs(second)
+
+    peers = [primary["relay"].subscribe(primary["video_media"]) for _ in range(2)]
+    other = second["relay"].subscribe(second["video_media"])
+    received = [[], [], []]
+    for i in range(FRAMES):
+        waits = [asyncio.ensure_future(track.recv()) for track in peers + [other]]
+        await settle()
+        app.consume_data(access_unit(i), i * 3000, "video", "primary")
+        app.consume_data(access_unit(i), i * 3000, "video", "second")
+        frames = await asyncio.wait_for(asyncio.gather(*waits), 5.0)
+        for seen, frame in zip(received, frames):
+            seen.append(frame)
+
+    a, b, c = received
+    check("both peers receive every frame", len(a) == len(b) == FRAMES)
+    check("and the very same payloads",
+          all(x is y and x.payloads is y.payloads for x, y in zip(a, b)))
+    check("the frames were fragmented", all(len(f.payloads) > 1 for f in a),
+          f"{len(a[0].payloads)} payloads")
+    check("the packetizer runs once per frame on the display",
+          primary_packs == [i * 3000 for i in range(FRAMES)], f"{len(primary_packs)} packs")
+    check("a second display packetizes its own frames",
+          len(second_packs) == FRAMES and all(x is not y for x, y in zip(a, c)))
+    check("the keyframe is classified once for every peer",
+          a[0].keyframe_bytes and all(f.keyframe_bytes == 0 for f in a[1:]))
+    for track in peers + [other]:
+        track.stop()
+
+    def no_state(display_id):
+        raise KeyError(display_id)
+
+    resolved = []
+    mime_by_encoder = app.get_mime_by_encoder
+    app.get_mime_by_encoder = lambda encoder: resolved.append(encoder) or mime_by_encoder(encoder)
+    app.get_encoder_for_display = no_state
+    graph = app._create_display_graph("third")
+    check("an encoder hook with no state falls back to the global encoder",
+          resolved == ["h264enc"] and graph["video_media"].mime_type == "video/H264",
+          f"{resolved}")
+
+    def broken(display_id):
+        raise TypeError("bug")
+
+    app.get_encoder_for_display = broken
+    try:
+        app._create_display_graph("fourth")
+        check("any other failure in the hook surfaces", False)
+    except TypeError:
+        check("any other failure in the hook surfaces", True)
+
+
+asyncio.run(main())
+print(f"[video-packetize-once] {passed}/{passed + failed} passed")
+sys.exit(1 if failed else 0)
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""Websockets adaptive bitrate: the shared encoder follows the slowest viewer.
+
+Viewers of one display are simulated as relays in front of links of fixed
+capacity, sampled every backpressure tick the way `_VideoRelay.sample` reports
+them: cumulative bytes sent, seconds busy, and skip-ahead drops when the
+backlog outgrows the relay budget. With the controller off, a viewer on a
+3 Mbps link under an 8 Mbps stream keeps overflowing and skipping to
+keyframes. With it on, the encoder must settle below that viewer's link with
+no further skips, stay put between probes, return to the ceiling once the
+viewer leaves, honour the floor and a lowered ceiling, and react to a growing
+(not a standing) ACK round trip.
+"""
+import os
+import sys
+
+TESTS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO = os.path.dirname(TESTS)
+sys.path.insert(0, os.path.join(REPO, "src"))
+
+from selkies.adaptive_bitrate import AdaptiveBitrate, ConsumerSample  # noqa: E402
+
+TICK_S = 0.5
+CEILING = 8000
+FLOOR = 1000
+BUDGET_BYTES = 4 * 1024 * 1024
+
+passed = failed = 0
+
+
+def check(label: str, ok, detail="") -> None:
+    global passed, failed
+    if ok:
+        passed += 1
+    else:
+        failed += 1
+    print(f"{'PASS' if ok else 'FAIL'}  [ws-abr] {label}  {detail}", flush=True)
+
+
+class Viewer:
+    """A relay draining into a link of `link_kbps`."""
+
+    def __init__(self, link_kbps: float) -> None:
+        self.link_kbps = link_kbps
+        self.backlog = 0.0
+        self.sent = 0
+        self.busy = 0.0
+        self.drops = 0
+
+    def tick(self, stream_kbps: float) -> None:
+        capacity = self.link_kbps * 125 * TICK_S
+        self.backlog += stream_kbps * 125 * TICK_S
+        if self.backlog > BUDGET_BYTES:
+            # Skip ahead: the backlog is dropped and the viewer waits for a
+            # keyframe.
+            self.backlog = 0.0
+            self.drops += 1
+        sent = min(self.backlog, capacity)
+        self.backlog -= sent
+        self.sent += int(sent)
+        self.busy += TICK_S if self.backlog > 0 else sent / (self.link_kbps * 125)
+
+    def sample(self, rtt_ms=None) -> ConsumerSample:
+        return ConsumerSample(self.sent, self.busy, self.drops, rtt_ms)
+
+
+def run(viewers: dict, seconds: float, abr, bitrate: float = CEILING, now: float = 0.0,
+        ceiling: float = CEILING, history=None):
+    history = [] if history is None else history
+    for _ in range(int(seconds / TICK_S)):
+        now += TICK_S
+        for viewer in viewers.values():
+            viewer.tick(bitrate)
+        if abr is not None:
+            target = abr.update(bitrate, FLOOR, ceiling,
+                                {k: v.sample() for k, v in viewers.items()}, now)
+            if target is not None:
+                bitrate = target
+        history.append((now, bitrate))
+    return bitrate, now, history
+
+
+# Without the controller the slow viewer keeps skipping to keyframes.
+viewers = {"fast": Viewer(50_000), "office": Viewer(20_000), "hotel": Viewer(3_000)}
+run(viewers, 120, None)
+baseline_drops = viewers["hotel"].drops
+check("without adaptive bitrate a slow viewer skips to keyframes repeatedly",
+      baseline_drops >= 10, f"{baseline_drops} skips in 120 s")
+
+viewers = {"fast": Viewer(50_000), "office": Viewer(20_000), "hotel": Viewer(3_000)}
+abr = AdaptiveBitrate()
+bitrate, now, history = run(viewers, 20, abr)
+settled_at = next((t for t, b in history if b < 3_000), None)
+check("the encoder steps below the slowest viewer's link",
+      settled_at is not None and settled_at <= 5, f"below 3000 kbps after {settled_at} s")
+drops_before = viewers["hotel"].drops
+bitrate, now, history = run(viewers, 120, abr, bitrate, now, history=history)
+late = [b for t, b in history if t > 20]
+check("the slow viewer stops skipping once the encoder follows it",
+      viewers["hotel"].drops == drops_before == 0,
+      f"{viewers['hotel'].drops} skips (was {baseline_drops} without)")
+changes = sum(1 for a, b in zip(late, late[1:]) if a != b)
+check("hysteresis keeps the bitrate steady between probes",
+      changes <= 120 / 8 and min(late) >= 3_000 * 0.7 and max(late) <= 3_000 * 1.2,
+      f"{changes} changes in 120 s, range {min(late)}-{max(late)} kbps")
+check("no change is smaller than the minimum step",
+      all(abs(b - a) >= a * 0.03 for a, b in zip(late, late[1:]) if a != b))
+
+del viewers["hotel"]
+bitrate, now, history = run(viewers, 60, abr, bitrate, now)
+check("the encoder climbs back to the ceiling once the slow viewer leaves",
+      bitrate == CEILING, f"{bitrate} kbps")
+fast_changes = sum(1 for a, b in zip(history, history[1:]) if a[1] != b[1] and a[1] == CEILING)
+check("fast viewers alone leave the ceiling alone", fast_changes == 0)
+
+bitrate, now, _ = run(viewers, 1, abr, bitrate, now, ceiling=5000)
+check("a lowered ceiling applies at the next tick", bitrate == 5000, f"{bitrate} kbps")
+
+viewers = {"dialup": Viewer(300)}
+abr = AdaptiveBitrate()
+_, _, history = run(viewers, 60, abr)
+check("the floor holds under a link slower than it",
+      min(b for _, b in history) == FLOOR, f"min {min(b for _, b in history)} kbps")
+
+# ACK round trip: growth past the baseline steps down, a standing queue
+# does not keep stepping.
+abr = AdaptiveBitrate()
+bitrate, now = CEILING, 0.0
+owner = Viewer(50_000)
+steps = []
+for rtt in [40] * 4 + [120, 260, 420, 600] + [600] * 20:
+    now += TICK_S
+    owner.tick(bitrate)
+    target = abr.update(bitrate, FLOOR, CEILING, {"owner": owner.sample(rtt)}, now)
+    if target is not None:
+        steps.append((rtt, target))
+        bitrate = target
+check("a growing round trip steps the bitrate down", steps and steps[0][1] < CEILING, str(steps))
+check("a standing round trip does not keep stepping", len(steps) <= 2, str(steps))
+
+print(f"[ws-abr] {passed}/{passed + failed} passed")
+sys.exit(1 if failed else 0)
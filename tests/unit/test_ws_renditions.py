@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""Websockets renditions: each viewer is routed to the stream its link carries.
+
+Viewers of one display are simulated as relays in front of links of fixed
+capacity, as in the adaptive bitrate test, except that each receives the
+rendition the router currently assigns it: the 8 Mbps main stream or the
+1.5 Mbps low one. A viewer on a 3 Mbps link must move to the low rendition
+and stop skipping to keyframes there, while viewers on fast links keep the
+main stream untouched. Probing back to the main stream must back off while the
+link stays short, succeed once the link recovers, and stop once the main
+stream is no heavier than the low one.
+"""
+import os
+import sys
+
+TESTS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO = os.path.dirname(TESTS)
+sys.path.insert(0, os.path.join(REPO, "src"))
+
+from selkies.adaptive_bitrate import ConsumerSample, RenditionRouter  # noqa: E402
+
+TICK_S = 0.5
+MAIN = 8000
+LOW = 1500
+BUDGET_BYTES = 4 * 1024 * 1024
+
+passed = failed = 0
+
+
+def check(label: str, ok, detail="") -> None:
+    global passed, failed
+    if ok:
+        passed += 1
+    else:
+        failed += 1
+    print(f"{'PASS' if ok else 'FAIL'}  [ws-renditions] {label}  {detail}", flush=True)
+
+
+class Viewer:
+    """A relay draining into a link of `link_kbps`."""
+
+    def __init__(self, link_kbps: float) -> None:
+        self.link_kbps = link_kbps
+        self.low = False
+        self.backlog = 0.0
+        self.sent = 0
+        self.busy = 0.0
+        self.drops = 0
+        self.switches = []
+
+    def tick(self, main_kbps: float) -> None:
+        capacity = self.link_kbps * 125 * TICK_S
+        self.backlog += (LOW if self.low else main_kbps) * 125 * TICK_S
+        if self.backlog > BUDGET_BYTES:
+            self.backlog = 0.0
+            self.drops += 1
+        sent = min(self.backlog, capacity)
+        self.backlog -= sent
+        self.sent += int(sent)
+        self.busy += TICK_S if self.backlog > 0 else sent / (self.link_kbps * 125)
+
+    def switch(self, low: bool, now: float) -> None:
+        # A switch drops the old stream's backlog (switch_rendition).
+        self.low = low
+        self.backlog = 0.0
+        self.switches.append((now, low))
+
+    def sample(self) -> ConsumerSample:
+        return ConsumerSample(self.sent, self.busy, self.drops)
+
+
+def run(viewers: dict, seconds: float, router, now: float = 0.0, main_kbps: float = MAIN) -> float:
+    for _ in range(int(seconds / TICK_S)):
+        now += TICK_S
+        for viewer in viewers.values():
+            viewer.tick(main_kbps)
+        changes = router.update(main_kbps, LOW, {k: v.sample() for k, v in viewers.items()}, now)
+        for key, low in changes.items():
+            viewers[key].switch(low, now)
+    return now
+
+
+viewers = {"fast": Viewer(50_000), "office": Viewer(20_000), "hotel": Viewer(3_000)}
+router = RenditionRouter()
+now = run(viewers, 10, router)
+hotel = viewers["hotel"]
+moved_at = hotel.switches[0][0] if hotel.switches and hotel.switches[0][1] else None
+check("a viewer short of the main stream moves to the low rendition",
+      moved_at is not None and moved_at <= 3, f"after {moved_at} s")
+check("fast viewers stay on the main stream",
+      not viewers["fast"].switches and not viewers["office"].switches
+      and viewers["fast"].drops == viewers["office"].drops == 0)
+
+drops_before = hotel.drops
+now = run(viewers, 200, router, now)
+time_on_low = sum(
+    (b[0] if b else now) - a[0]
+    for a, b in zip(hotel.switches, hotel.switches[1:] + [None]) if a[1])
+check("probes of the main stream back off while the link stays short",
+      len(hotel.switches) <= 12 and time_on_low >= 0.9 * (now - moved_at),
+      f"{len(hotel.switches)} switches in {now:.0f} s, {time_on_low / (now - moved_at):.0%} on low")
+gaps = [b[0] - a[0] for a, b in zip(hotel.switches, hotel.switches[1:]) if a[1] and not b[1]]
+check("each failed probe doubles the wait before the next",
+      all(later >= earlier for earlier, later in zip(gaps, gaps[1:])) and gaps[-1] >= 60,
+      f"waits {gaps}")
+check("a failed probe costs at most one skip each",
+      hotel.drops - drops_before <= len(gaps), f"{hotel.drops - drops_before} skips")
+
+hotel.link_kbps = 20_000
+now = run(viewers, 80, router, now)
+check("a viewer whose link recovers returns to the main stream",
+      not hotel.low, f"last switch {hotel.switches[-1]}")
+drops_before = hotel.drops
+now = run(viewers, 60, router, now)
+check("and stays there", not hotel.low and hotel.drops == drops_before)
+
+hotel.link_kbps = 3_000
+run(viewers, 20, router, now)
+demoted, promoted = [switch for switch in hotel.switches if switch[0] > now][:2]
+check("a held promotion restarts probing from the short hold",
+      demoted[1] and not promoted[1] and promoted[0] - demoted[0] < 16,
+      f"probed again after {promoted[0] - demoted[0]} s")
+
+# The main stream steered down to the low rendition's rate: nobody is routed.
+viewers = {"hotel": Viewer(3_000)}
+router = RenditionRouter()
+now = run(viewers, 10, router)
+run(viewers, 2, router, now, main_kbps=LOW)
+check("nobody stays on the low rendition once the main stream is no heavier",
+      not viewers["hotel"].low and len(viewers["hotel"].switches) == 2)
+
+# A departed viewer is forgotten; one that comes back starts on main.
+router = RenditionRouter()
+viewers = {"hotel": Viewer(3_000)}
+run(viewers, 10, router)
+router.update(MAIN, LOW, {}, 11.0)
+check("a departed viewer is forgotten", not router._routed)
+
+print(f"[ws-renditions] {passed}/{passed + failed} passed")
+sys.exit(1 if failed else 0)
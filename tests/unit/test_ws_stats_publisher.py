@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""The single WebSocket stats publisher and per-socket kind subscriptions.
+
+One task publishes the collectors' stats snapshots, woken by the event the
+collectors set when they replace one. A new snapshot must go out on that wake,
+serialized once, with the same text sent to every recipient. A snapshot the
+publisher has already sent must not go out again, and a kind must not be sent
+more than once per interval: a snapshot replaced within it goes out when it
+ends, and only the latest one. A client that joins or resubscribes must get the
+current snapshots on the next wake without a new serialization. A socket that
+narrowed its subscription with `_stats,<kind>,...` must receive only those
+kinds, and `_stats` alone must silence it. A closed socket must be dropped from
+the server's client set.
+"""
+import asyncio
+import json
+import os
+import sys
+import types
+
+TESTS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO = os.path.dirname(TESTS)
+sys.path.insert(0, TESTS)
+sys.path.insert(0, os.path.join(REPO, "src"))
+
+import helpers as H  # noqa: E402
+
+H.without_libpulse()
+
+from selkies import selkies as sk  # noqa: E402
+
+INTERVAL = 0.3
+
+passed = failed = 0
+
+
+def check(label: str, ok, detail="") -> None:
+    global passed, failed
+    if ok:
+        passed += 1
+    else:
+        failed += 1
+    print(f"{'PASS' if ok else 'FAIL'}  [ws-stats-publisher] {label}  {detail}", flush=True)
+
+
+class Socket:
+    """Records the text frames sent to it."""
+
+    def __init__(self, subscription=None, closed=False) -> None:
+        self.closed = closed
+        self.sent = []
+        if subscription is not None:
+            self._ws_stats = sk._ws_stats_subscription(subscription)
+
+    async def send_str(self, text: str) -> None:
+        self.sent.append(text)
+
+    async def send_bytes(self, data: bytes) -> None:
+        self.sent.append(data)
+
+    def kinds(self) -> list:
+        return [json.loads(text)["type"] for text in self.sent]
+
+
+async def wake(server) -> None:
+    """Signal the publisher as a collector does, then let it send."""
+    server._stats_updated_ws.set()
+    await asyncio.sleep(0.03)
+
+
+async def main() -> None:
+    dumps = []
+
+    def counted_dumps(obj, *args, **kwargs):
+        dumps.append(obj)
+        return json.dumps(obj, *args, **kwargs)
+
+    saved_json = sk.json
+    sk.json = types.SimpleNamespace(dumps=counted_dumps, loads=json.loads)
+
+    everything = Socket()
+    explicit = Socket("_stats,system,gpu,network")
+    gpu_only = Socket("_stats,gpu,bogus")
+    silenced = Socket("_stats")
+    closed = Socket(closed=True)
+    server = types.SimpleNamespace(
+        clients={everything, explicit, gpu_only, silenced, closed},
+        _shared_stats_ws={}, _shared_network_stats={},
+        _stats_updated_ws=asyncio.Event())
+    check("subscriptions parse to the known kinds",
+          gpu_only._ws_stats == {"gpu"} and silenced._ws_stats == frozenset()
+          and explicit._ws_stats == sk.WS_STATS_KINDS)
+
+    publisher = asyncio.create_task(sk._publish_stats_ws(server, interval_seconds=INTERVAL))
+    try:
+        server._shared_stats_ws["system"] = {"type": "system_stats", "cpu_percent": 10}
+        server._shared_stats_ws["gpu"] = {"type": "gpu_stats", "gpu_percent": 20}
+        server._shared_network_stats["network"] = {"type": "network_stats", "latency_ms": 3}
+        await wake(server)
+        check("new snapshots go out on the collectors' signal, not after an interval",
+              len(everything.sent) == 3, f"{len(everything.sent)} sends")
+        check("each new snapshot is serialized once", len(dumps) == 3, f"{len(dumps)} dumps")
+        check("and the same text goes to every recipient",
+              len(explicit.sent) == 3
+              and all(a is b for a, b in zip(everything.sent, explicit.sent)))
+        check("a narrowed subscription gets only its kinds",
+              gpu_only.kinds() == ["gpu_stats"], f"{gpu_only.kinds()}")
+        check("an empty subscription gets nothing", not silenced.sent)
+        check("a closed socket is dropped from the client set",
+              closed not in server.clients and not closed.sent)
+
+        await wake(server)
+        check("an unchanged snapshot is not sent again",
+              len(dumps) == 3 and len(everything.sent) == 3,
+              f"{len(dumps)} dumps, {len(everything.sent)} sends")
+
+        server._shared_stats_ws["system"] = {"type": "system_stats", "cpu_percent": 11}
+        await wake(server)
+        server._shared_stats_ws["system"] = latest = {"type": "system_stats", "cpu_percent": 10}
+        await wake(server)
+        check("a kind is not sent twice within the interval",
+              len(dumps) == 3 and len(everything.sent) == 3, f"{len(dumps)} dumps")
+        await asyncio.sleep(INTERVAL)
+        check("the latest replacement goes out when the interval ends, even with equal content",
+              dumps[3:] == [latest] and everything.kinds()[-1] == "system_stats"
+              and gpu_only.kinds() == ["gpu_stats"],
+              f"{len(dumps)} dumps")
+
+        joined = Socket()
+        server.clients.add(joined)
+        await wake(server)
+        check("a joining client gets the current snapshots at once",
+              sorted(joined.kinds()) == ["gpu_stats", "network_stats", "system_stats"]
+              and len(dumps) == 4 and len(everything.sent) == 4,
+              f"{joined.kinds()}")
+
+        gpu_only._ws_stats = sk._ws_stats_subscription("_stats,gpu,system")
+        gpu_only._ws_stats_sent = {}
+        await wake(server)
+        check("a widened subscription gets the added kind at once",
+              "system_stats" in gpu_only.kinds()[1:] and len(dumps) == 4,
+              f"{gpu_only.kinds()}")
+    finally:
+        publisher.cancel()
+        await asyncio.gather(publisher, return_exceptions=True)
+        sk.json = saved_json
+
+
+asyncio.run(main())
+print(f"[ws-stats-publisher] {passed}/{passed + failed} passed")
+sys.exit(1 if failed else 0)
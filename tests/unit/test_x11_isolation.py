@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""X11 input injection and clipboard monitoring in helper processes
+(selkies.x11_isolation).
+
+No X server is needed: the helpers point at a display nobody serves. The
+channel must frame messages intact and reject truncated or oversized ones.
+An isolated injector must queue on the caller, coalesce motion runs, and
+answer sync() through its helper even when the helper has no X connection;
+a killed helper must be replaced, and stop() must end it. An isolated
+clipboard monitor that cannot reach its display must raise like the
+in-process monitor and leave no helper behind.
+"""
+import glob
+import io
+import os
+import signal
+import sys
+import time
+
+TESTS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO = os.path.dirname(TESTS)
+sys.path.insert(0, os.path.join(REPO, "src"))
+
+from selkies import x11_isolation as xi  # noqa: E402
+
+NO_DISPLAY = ":987"
+
+passed = failed = 0
+
+
+def check(label: str, ok, detail="") -> None:
+    global passed, failed
+    if ok:
+        passed += 1
+    else:
+        failed += 1
+    print(f"{'PASS' if ok else 'FAIL'}  [x11-isolation] {label}  {detail}", flush=True)
+
+
+def children() -> set:
+    pids = set()
+    for path in glob.glob(f"/proc/{os.getpid()}/task/*/children"):
+        with open(path) as f:
+            pids.update(int(pid) for pid in f.read().split())
+    return pids
+
+
+def running(pid: int) -> bool:
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().split(")")[-1].split()[0] != "Z"
+    except FileNotFoundError:
+        return False
+
+
+stream = io.BytesIO()
+message = [xi.MSG_CALL, 7, "offer", ["text", b"\x00\xff" * 10]]
+xi._write_frame(stream, message)
+xi._write_frame(stream, [xi.MSG_READY])
+framed = stream.getvalue()
+stream.seek(0)
+check("frames round-trip in order",
+      xi._read_frame(stream) == message and xi._read_frame(stream) == [xi.MSG_READY]
+      and xi._read_frame(stream) is None)
+check("a truncated frame reads as end of stream",
+      xi._read_frame(io.BytesIO(framed[:xi._HEADER.size + 5])) is None)
+try:
+    xi._read_frame(io.BytesIO(xi._HEADER.pack(xi._MAX_FRAME + 1)))
+    check("an oversized frame is rejected", False)
+except ValueError:
+    check("an oversized frame is rejected", True)
+
+before = children()
+injector = xi.IsolatedXTestInjector(NO_DISPLAY)
+for i in range(2000):
+    injector.motion(i, i)
+injector.event(2, 38)
+injector.motion(1, 1)
+check("sync answers through a helper without an X connection",
+      injector.sync(timeout=30.0) is True)
+helper = injector._helper
+check("the helper is a separate process",
+      helper is not None and helper._proc.pid in children() - before)
+check("motion runs are coalesced before crossing the channel",
+      injector.coalesced > 0, f"{injector.coalesced} coalesced")
+
+try:
+    helper.call("nope", timeout=10.0)
+    check("an unknown call raises", False)
+except RuntimeError as e:
+    check("an unknown call raises", "nope" in str(e), str(e))
+
+first = helper._proc.pid
+os.kill(first, signal.SIGKILL)
+helper._proc.wait()
+injector._RETRY_S = 0.0
+deadline = time.monotonic() + 30.0
+while time.monotonic() < deadline:
+    injector.sync(timeout=30.0)
+    if injector._helper is not None and injector._helper._proc.pid != first:
+        break
+    time.sleep(0.05)
+check("a killed helper is replaced",
+      injector._helper is not None and injector._helper._proc.pid != first
+      and injector.sync(timeout=30.0))
+
+second = injector._helper._proc.pid
+injector.stop()
+injector._thread.join(10.0)
+check("stop() ends the feeder and its helper",
+      not injector._thread.is_alive() and not running(second))
+
+before = children()
+try:
+    xi.IsolatedClipboardMonitor(NO_DISPLAY)
+    check("an unreachable display raises", False)
+except RuntimeError as e:
+    check("an unreachable display raises", "987" in str(e), str(e))
+check("and leaves no helper behind", not any(running(p) for p in children() - before))
+
+print(f"[x11-isolation] {passed}/{passed + failed} passed")
+sys.exit(1 if failed else 0)
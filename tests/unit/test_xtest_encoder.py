@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""Precompiled XTEST FakeInput encoding in the vendored python-xlib.
+
+fake_input and fake_input_batch pack FakeInput from one cached struct rather
+than through the generic rq.Struct machinery. The bytes must be identical to
+what FakeInput._request produces for every event type, relative and absolute
+motion, negative coordinates and a root window object. A batch of N events
+must queue as one request entry whose serial advances the display's counter
+by N, so the sequence numbers of later replies still line up, and an empty
+batch must queue nothing. The fast path must be cheaper than the generic one.
+"""
+import os
+import sys
+import threading
+import time
+
+TESTS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO = os.path.dirname(TESTS)
+sys.path.insert(0, os.path.join(REPO, "src"))
+
+from selkies.Xlib import X  # noqa: E402
+from selkies.Xlib.ext import xtest  # noqa: E402
+from selkies.Xlib.protocol import display as protocol_display  # noqa: E402
+
+OPCODE = 132
+
+passed = failed = 0
+
+
+def check(label: str, ok, detail="") -> None:
+    global passed, failed
+    if ok:
+        passed += 1
+    else:
+        failed += 1
+    print(f"{'PASS' if ok else 'FAIL'}  [xtest-encoder] {label}  {detail}", flush=True)
+
+
+class ProtocolDisplay:
+    """The request-queue surface of protocol.display.Display."""
+
+    def __init__(self) -> None:
+        self.socket_error = None
+        self.request_queue_lock = threading.Lock()
+        self.request_serial = 65530
+        self.request_queue = []
+
+    send_request = protocol_display.Display.send_request
+
+    def get_extension_major(self, extname):
+        return OPCODE
+
+
+class Display:
+    def __init__(self) -> None:
+        self.display = ProtocolDisplay()
+
+
+class Root:
+    def __window__(self):
+        return 0x1e5
+
+
+def generic(**fields) -> bytes:
+    fields.setdefault("detail", 0)
+    fields.setdefault("time", X.CurrentTime)
+    fields.setdefault("root", X.NONE)
+    fields.setdefault("x", 0)
+    fields.setdefault("y", 0)
+    return xtest.FakeInput._request.to_binary(opcode=OPCODE, **fields)
+
+
+cases = [
+    {"event_type": X.KeyPress, "detail": 38},
+    {"event_type": X.KeyRelease, "detail": 255},
+    {"event_type": X.ButtonPress, "detail": 1},
+    {"event_type": X.ButtonRelease, "detail": 5},
+    {"event_type": X.MotionNotify, "detail": False, "x": 1919, "y": 1079},
+    {"event_type": X.MotionNotify, "detail": True, "x": -12, "y": 7},
+    {"event_type": X.MotionNotify, "x": 3, "y": 4, "root": Root(), "time": 12345},
+]
+for fields in cases:
+    d = Display()
+    xtest.fake_input(d, **fields)
+    queued = d.display.request_queue
+    want = generic(**fields)
+    check(f"fake_input matches FakeInput for {fields}",
+          len(queued) == 1 and queued[0][0]._binary == want and queued[0][1] is False
+          and len(want) == 36,
+          f"{queued[0][0]._binary.hex() if queued else None}")
+
+d = Display()
+events = [(X.MotionNotify, False, 10, 20), (X.ButtonPress, 1, 0, 0),
+          (X.MotionNotify, True, -3, 2), (X.ButtonRelease, 1, 0, 0),
+          (X.KeyPress, 38, 0, 0), (X.KeyRelease, 38, 0, 0),
+          (X.MotionNotify, False, 30, 40), (X.MotionNotify, False, 50, 60)]
+xtest.fake_input_batch(d, events)
+want = b"".join(generic(event_type=t, detail=detail, x=x, y=y)
+                for t, detail, x, y in events)
+queued = d.display.request_queue
+check("a batch queues one entry holding every request in order",
+      len(queued) == 1 and queued[0][0]._binary == want)
+check("a batch advances the serial once per request, wrapping at 16 bits",
+      queued[0][0]._serial == 65530
+      and d.display.request_serial == (65530 + len(events)) % 65536,
+      f"serial {d.display.request_serial}")
+xtest.fake_input(d, X.KeyPress, 38)
+check("the next request takes the serial after the batch",
+      d.display.request_queue[-1][0]._serial == (65530 + len(events)) % 65536)
+
+d = Display()
+xtest.fake_input_batch(d, [])
+check("an empty batch queues nothing",
+      d.display.request_queue == [] and d.display.request_serial == 65530)
+
+d = Display()
+d.display.socket_error = ConnectionError("closed")
+try:
+    xtest.fake_input(d, X.KeyPress, 38)
+    raised = False
+except ConnectionError:
+    raised = True
+check("a dead connection raises its socket error", raised)
+
+
+def per_event(fn, n: int = 20000) -> float:
+    d = Display()
+    start = time.perf_counter()
+    for i in range(n):
+        fn(d, i)
+    return (time.perf_counter() - start) / n
+
+
+fast = per_event(lambda d, i: xtest.fake_input(d, X.MotionNotify, x=i & 1023, y=7))
+slow = per_event(lambda d, i: xtest.FakeInput(
+    display=d.display, opcode=OPCODE, event_type=X.MotionNotify, detail=0,
+    time=X.CurrentTime, root=X.NONE, x=i & 1023, y=7))
+check("the precompiled path is cheaper than the generic one", fast < slow,
+      f"{fast * 1e6:.2f} vs {slow * 1e6:.2f} us/event")
+
+print(f"[xtest-encoder] {passed}/{passed + failed} passed")
+sys.exit(1 if failed else 0)